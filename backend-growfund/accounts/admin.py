@@ -4,7 +4,7 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
 from django.db.models import Sum, Count
 from django.urls import reverse
-from .models import User, UserSettings, Referral
+from .models import User, UserSettings, Referral, BulkCredit
 
 
 # Inline admin classes for related models
@@ -360,3 +360,15 @@ class ReferralAdmin(admin.ModelAdmin):
     
     claim_rewards.short_description = 'Claim selected referral rewards'
 
+
+
+@admin.register(BulkCredit)
+class BulkCreditAdmin(admin.ModelAdmin):
+    """Admin configuration for BulkCredit runs (read-only)"""
+    
+    list_display = ('id', 'amount', 'status', 'processed', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('note', 'created_by__email')
+    exclude = ('user_ids', 'credited_ids', 'failed_ids')
+    readonly_fields = ('id', 'created_by', 'amount', 'note', 'status', 'processed', 'error',
+                       'created_at', 'updated_at', 'finished_at')
@@ -0,0 +1,85 @@
+"""
+JWT authentication shared by ``AdminSecurityMiddleware`` and DRF.
+
+Every ``/api/admin/`` request used to decode its token and load the user
+twice: once in the middleware, once in DRF. ``CachedJWTAuthentication``
+stores its result on the underlying ``HttpRequest``, so whichever runs
+first does the work and the other reuses it (a rejected token is cached as
+the exception and raised again for DRF's 401).
+
+Optionally (``AUTH_USER_CACHE_TTL`` > 0) the user row itself is cached for
+safe-method requests, keyed by user id and a per-user version that bumps
+whenever the user is saved or deleted. Unsafe methods always load a fresh
+row, since views modify ``request.user`` (e.g. its balance) and save it.
+Code that changes users with ``update()`` must call
+``invalidate_cached_users``.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from core.cache import bump_versions
+
+RESULT_ATTR = '_jwt_auth_result'
+_UNSET = object()
+
+
+def _version_key(user_id):
+    return f'auth:user-version:{user_id}'
+
+
+def _user_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def _bump(user_ids):
+    bump_versions(*[_version_key(user_id) for user_id in user_ids])
+
+
+def invalidate_cached_users(user_ids):
+    """Drop the users' cached rows once the current transaction commits."""
+    user_ids = [uid for uid in user_ids if uid]
+    if user_ids:
+        transaction.on_commit(lambda: _bump(user_ids))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that runs once per request and can cache the user row."""
+
+    def authenticate(self, request):
+        # DRF passes its Request wrapper; the middleware passes the HttpRequest
+        http_request = getattr(request, '_request', request)
+        result = getattr(http_request, RESULT_ATTR, _UNSET)
+        if result is _UNSET:
+            self._cache_user = request.method in SAFE_METHODS
+            try:
+                result = super().authenticate(request)
+            except AuthenticationFailed as exc:
+                result = exc
+            setattr(http_request, RESULT_ATTR, result)
+
+        if isinstance(result, AuthenticationFailed):
+            raise result
+        return result
+
+    def get_user(self, validated_token):
+        ttl = getattr(settings, 'AUTH_USER_CACHE_TTL', 0)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (not ttl or user_id is None or api_settings.CHECK_REVOKE_TOKEN
+                or not getattr(self, '_cache_user', False)):
+            return super().get_user(validated_token)
+
+        found = cache.get_many([_version_key(user_id), _user_key(user_id)])
+        version = found.get(_version_key(user_id), 0)
+        entry = found.get(_user_key(user_id))
+        if entry and entry[0] == version:
+            return entry[1]
+
+        # Checks existence and is_active; deactivating a user bumps the version
+        user = super().get_user(validated_token)
+        cache.set(_user_key(user_id), (version, user), ttl)
+        return user
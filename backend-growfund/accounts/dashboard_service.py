@@ -0,0 +1,171 @@
+"""
+Per-user dashboard snapshot.
+
+The figures behind ``dashboard_stats``, ``live_dashboard_stats`` and
+``transaction_summary`` (plan, trade, transaction and referral totals plus
+recent activity) are built once with a handful of aggregate queries and
+kept in the cache, so a dashboard load is a single cache read. Balance and
+unread notifications are not part of the snapshot; they are already on the
+request user and in the unread counter cache.
+
+Snapshots are keyed by a per-user version. Signals on Transaction, Trade,
+CapitalInvestmentPlan and Referral bump the version once the writing
+transaction commits, and the next read rebuilds. Code that writes with
+``bulk_create``/``update()`` must call ``invalidate_dashboards`` itself.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from core.cache import bump_versions
+
+RECENT_TRANSACTIONS = 5
+# Part of the cache key; bump it when the snapshot's shape changes so
+# snapshots cached by the previous release are not read
+SNAPSHOT_LAYOUT = 2
+
+
+def _version_key(user_id):
+    return f'dashboard:version:{user_id}'
+
+
+def _snapshot_key(user_id, version):
+    return f'dashboard:{user_id}:l{SNAPSHOT_LAYOUT}:v{version}'
+
+
+def _ttl():
+    # Upper bound on staleness for writes that bypass signals
+    return getattr(settings, 'DASHBOARD_SNAPSHOT_TTL', 300)
+
+
+def _money(value):
+    return str(value if value is not None else Decimal('0'))
+
+
+def build_snapshot(user_id):
+    """Compute a user's dashboard figures (five queries)."""
+    from investments.models import CapitalInvestmentPlan, Trade
+    from transactions.models import Transaction
+    from transactions.serializers import TransactionSerializer
+    from .models import Referral
+
+    money = models.DecimalField(max_digits=24, decimal_places=8)
+
+    plans = CapitalInvestmentPlan.objects.filter(user_id=user_id).aggregate(
+        active_count=Count('id', filter=Q(status='active')),
+        total_invested=Sum('initial_amount'),
+        active_invested=Sum('initial_amount', filter=Q(status='active')),
+    )
+
+    is_open = Q(status='open')
+    is_crypto = is_open & ~Q(asset__in=['gold'])
+    invested = F('entry_price') * F('quantity')
+    trades = Trade.objects.filter(user_id=user_id).aggregate(
+        total_trades=Count('id'),
+        open_trades=Count('id', filter=is_open),
+        open_invested=Sum(invested, filter=is_open, output_field=money),
+        open_value=Sum(
+            Coalesce('current_price', 'entry_price') * F('quantity'),
+            filter=is_open, output_field=money,
+        ),
+        crypto_count=Count('id', filter=is_crypto),
+        crypto_invested=Sum(invested, filter=is_crypto, output_field=money),
+    )
+
+    deposit_types = ['deposit', 'admin_credit']
+    withdrawal_types = ['withdrawal', 'admin_debit']
+    in_flight = ['pending', 'processing']
+    txns = Transaction.objects.filter(user_id=user_id)
+    totals = txns.aggregate(
+        deposits=Sum('amount', filter=Q(transaction_type='deposit', status='completed')),
+        withdrawals=Sum('amount', filter=Q(transaction_type='withdrawal', status='completed')),
+        all_deposits=Sum('amount', filter=Q(transaction_type__in=deposit_types, status='completed')),
+        all_withdrawals=Sum('amount', filter=Q(transaction_type__in=withdrawal_types, status='completed')),
+        pending_deposits=Count('id', filter=Q(transaction_type__in=deposit_types, status__in=in_flight)),
+        pending_withdrawals=Count('id', filter=Q(transaction_type__in=withdrawal_types, status__in=in_flight)),
+    )
+    recent = list(txns.order_by('-created_at')[:RECENT_TRANSACTIONS])
+
+    referrals = Referral.objects.filter(referrer_id=user_id).aggregate(
+        total_count=Count('id'),
+        total_earnings=Sum('reward_amount', filter=Q(reward_claimed=True)),
+    )
+
+    open_invested = Decimal(trades['open_invested'] or 0)
+    open_value = Decimal(trades['open_value'] or 0)
+    profit_loss = open_value - open_invested
+
+    return {
+        'investments': {
+            'active_count': plans['active_count'],
+            'total_invested': _money(plans['total_invested'] or 0),
+            'active_invested': _money(plans['active_invested'] or 0),
+        },
+        'crypto': {
+            'total_value': _money(open_value),
+            'total_invested': _money(open_invested),
+            'profit_loss': _money(profit_loss),
+            'profit_loss_percentage': float(profit_loss / open_invested * 100) if open_invested > 0 else 0,
+            'holdings_count': trades['open_trades'],
+            'live_count': trades['crypto_count'],
+            'live_invested': _money(trades['crypto_invested'] or 0),
+        },
+        'trading': {
+            'open_trades': trades['open_trades'],
+            'total_trades': trades['total_trades'],
+        },
+        'transactions': {
+            'total_deposits': _money(totals['deposits'] or 0),
+            'total_withdrawals': _money(totals['withdrawals'] or 0),
+            'all_deposits': _money(totals['all_deposits'] or Decimal('0')),
+            'all_withdrawals': _money(totals['all_withdrawals'] or Decimal('0')),
+            'pending_deposits': totals['pending_deposits'],
+            'pending_withdrawals': totals['pending_withdrawals'],
+        },
+        'referrals': {
+            'total_count': referrals['total_count'],
+            'total_earnings': _money(referrals['total_earnings'] or 0),
+        },
+        # Full rows for transaction_summary, the dashboards' compact format for the rest
+        'recent_transactions': [dict(row) for row in TransactionSerializer(recent, many=True).data],
+        'recent_activity': [
+            {
+                'id': txn.id,
+                'type': txn.transaction_type,
+                'amount': f"{txn.amount:.2f}",
+                'description': txn.description,
+                'status': txn.status,
+                'date': txn.created_at.isoformat(),
+            }
+            for txn in recent
+        ],
+    }
+
+
+def get_dashboard_snapshot(user):
+    """Cached snapshot for ``user``; rebuilt on the first read after a change."""
+    version = cache.get(_version_key(user.id), 0)
+    key = _snapshot_key(user.id, version)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot(user.id)
+        cache.set(key, snapshot, _ttl())
+    return snapshot
+
+
+def _bump(user_ids):
+    bump_versions(*[_version_key(user_id) for user_id in set(user_ids)])
+
+
+def invalidate_dashboards(user_ids):
+    """
+    Mark the users' snapshots stale once the current transaction commits,
+    so a concurrent read can't cache figures from before the write.
+    """
+    user_ids = [uid for uid in user_ids if uid]
+    if user_ids:
+        transaction.on_commit(lambda: _bump(user_ids))
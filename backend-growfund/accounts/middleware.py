@@ -1,13 +1,15 @@
 from django.shortcuts import redirect
 from django.http import JsonResponse
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
+from .authentication import CachedJWTAuthentication
+
 
 class AdminSecurityMiddleware:
     """
     Middleware to secure admin routes and ensure proper authentication.
-    Uses JWT authentication directly since DRF auth hasn't run yet at middleware level.
+    Uses JWT authentication directly since DRF auth hasn't run yet at middleware level;
+    the result is kept on the request and reused by DRF's CachedJWTAuthentication.
     """
 
     def __init__(self, get_response):
@@ -16,7 +18,7 @@ class AdminSecurityMiddleware:
     def _get_jwt_user(self, request):
         """Attempt to authenticate the request via JWT. Returns user or None."""
         try:
-            jwt_auth = JWTAuthentication()
+            jwt_auth = CachedJWTAuthentication()
             result = jwt_auth.authenticate(request)
             if result is not None:
                 return result[0]  # (user, token) tuple
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_auto_verify_users'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkCredit',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('note', models.CharField(blank=True, default='', max_length=255)),
+                ('user_ids', models.JSONField(default=list)),
+                ('credited_ids', models.JSONField(blank=True, default=list)),
+                ('failed_ids', models.JSONField(blank=True, default=list)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('processed', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bulk_credits_created', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Bulk credit',
+                'verbose_name_plural': 'Bulk credits',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
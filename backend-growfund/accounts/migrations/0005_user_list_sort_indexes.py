@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_bulkcredit'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-date_joined', '-id'], name='accounts_us_date_jo_d23fc9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['balance', 'id'], name='accounts_us_balance_9e8239_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_list_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkcredit',
+            name='run_token',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -71,6 +71,11 @@ class User(AbstractUser):
         verbose_name = _('user')
         verbose_name_plural = _('users')
         ordering = ['-created_at']
+        indexes = [
+            # Sort keys of the admin user list's cursor pagination
+            models.Index(fields=['-date_joined', '-id']),
+            models.Index(fields=['balance', 'id']),
+        ]
     
     def __str__(self):
         return self.email
@@ -168,3 +173,53 @@ class UserSettings(models.Model):
     
     def __str__(self):
         return f"Settings for {self.user.email}"
+
+
+class BulkCredit(models.Model):
+    """An admin bulk credit run, processed in chunks by a background job"""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='bulk_credits_created')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    note = models.CharField(max_length=255, blank=True, default='')
+    
+    # Input and per-user outcome
+    user_ids = models.JSONField(default=list)
+    credited_ids = models.JSONField(default=list, blank=True)
+    failed_ids = models.JSONField(default=list, blank=True)
+    
+    # Progress: how many entries of user_ids have been processed
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    processed = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    # The job run currently crediting; a later run takes over and the older one stops
+    run_token = models.CharField(max_length=32, blank=True, default='')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Bulk credit'
+        verbose_name_plural = 'Bulk credits'
+    
+    def __str__(self):
+        return f"Bulk credit ${self.amount} x {self.total} ({self.status})"
+    
+    @property
+    def total(self):
+        return len(self.user_ids)
+    
+    @property
+    def progress_percent(self):
+        if not self.user_ids:
+            return 100
+        return round(self.processed * 100 / len(self.user_ids), 1)
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from investments.models import CapitalInvestmentPlan, Trade
+from transactions.models import Transaction
+from .authentication import invalidate_cached_users
+from .models import Referral, User
+from .dashboard_service import invalidate_dashboards
+
+
+@receiver([post_save, post_delete], sender=Transaction)
+@receiver([post_save, post_delete], sender=Trade)
+@receiver([post_save, post_delete], sender=CapitalInvestmentPlan)
+def dashboard_rows_changed(sender, instance, **kwargs):
+    """Keep dashboard snapshots current when the rows behind them change."""
+    invalidate_dashboards([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=Referral)
+def referral_changed(sender, instance, **kwargs):
+    invalidate_dashboards([instance.referrer_id])
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Saving or deleting a user drops their cached authentication row."""
+    invalidate_cached_users([instance.pk])
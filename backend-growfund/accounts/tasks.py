@@ -2,10 +2,12 @@ from django.core.mail import send_mail, EmailMultiAlternatives
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.template.loader import render_to_string
+from core.jobs import job
 
 User = get_user_model()
 
 
+@job(queue='emails', max_attempts=5)
 def send_verification_email(user_id):
     """Send email verification link"""
     try:
@@ -90,6 +92,7 @@ The {settings.PLATFORM_NAME} Team
         raise
 
 
+@job(queue='emails', max_attempts=5)
 def send_password_reset_email(user_id):
     """Send password reset link"""
     try:
@@ -175,6 +178,7 @@ The {settings.PLATFORM_NAME} Team
         raise
 
 
+@job(queue='emails')
 def send_welcome_email(user_id):
     """Send welcome email after verification"""
     try:
@@ -276,3 +280,139 @@ The {settings.PLATFORM_NAME} Team
         print(f"Error sending welcome email: {e}")
         # Don't raise exception for welcome email
         return f"Failed to send welcome email: {e}"
+
+
+@job(queue='admin', max_attempts=3)
+def process_bulk_credit(bulk_credit_id):
+    """
+    Credit every user in a BulkCredit run.
+    
+    Works in chunks: each chunk is one atomic transaction made of a single
+    ``UPDATE ... SET balance = balance + amount WHERE id IN (...)`` plus
+    bulk inserts for the transactions and notifications. The run's
+    ``processed`` offset is saved in the same transaction, so a retried job
+    resumes after the last committed chunk instead of crediting twice.
+    
+    Each chunk locks the BulkCredit row and re-reads the offset under the
+    lock. A run claims the credit with a fresh ``run_token``; if a later run
+    (say, a requeued copy of a slow job) has claimed it since, this one
+    stops at its next chunk and leaves the rest to the newer run.
+    """
+    import uuid
+    from decimal import Decimal
+    from django.db import transaction as db_transaction
+    from django.db.models import F
+    from django.utils import timezone
+    from transactions.models import Transaction, history_tag
+    from notifications.models import Notification
+    from notifications.realtime import notify_bulk_created
+    from core.cache import invalidate_tags
+    from .dashboard_service import invalidate_dashboards
+    from .authentication import invalidate_cached_users
+    from core.rollups import rollups
+    from .models import BulkCredit
+    
+    chunk_size = getattr(settings, 'BULK_CREDIT_CHUNK_SIZE', 1000)
+    
+    bulk = BulkCredit.objects.select_related('created_by').get(id=bulk_credit_id)
+    if bulk.status == 'completed':
+        return f"Bulk credit {bulk.id} already completed"
+    
+    run_token = uuid.uuid4().hex
+    claimed = BulkCredit.objects.filter(id=bulk.id).exclude(status='completed').update(
+        status='running', run_token=run_token,
+    )
+    if not claimed:
+        return f"Bulk credit {bulk.id} already completed"
+    
+    amount = bulk.amount
+    note = bulk.note
+    admin_email = bulk.created_by.email if bulk.created_by else ''
+    
+    def invalidate(found):
+        invalidate_dashboards(found)
+        invalidate_cached_users(found)
+        invalidate_tags(*[history_tag(uid) for uid in found])
+    
+    try:
+        while True:
+            now = timezone.now()
+            stamp = now.strftime("%Y%m%d%H%M%S")
+            
+            with db_transaction.atomic():
+                bulk = BulkCredit.objects.select_for_update().get(id=bulk.id)
+                if bulk.run_token != run_token:
+                    return f"Bulk credit {bulk.id} taken over by another run at {bulk.processed}/{bulk.total}"
+                if bulk.processed >= len(bulk.user_ids):
+                    bulk.status = 'completed'
+                    bulk.error = ''
+                    bulk.finished_at = now
+                    bulk.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+                    break
+                
+                chunk = bulk.user_ids[bulk.processed:bulk.processed + chunk_size]
+                users = list(
+                    User.objects.filter(id__in=chunk)
+                    .values_list('id', 'email', 'first_name', 'last_name')
+                )
+                found = {u[0] for u in users}
+                
+                User.objects.filter(id__in=found).update(balance=F('balance') + amount)
+                
+                transactions = []
+                notifications = []
+                for uid, email, first_name, last_name in users:
+                    full_name = f"{first_name} {last_name}".strip() or email
+                    transactions.append(Transaction(
+                        user_id=uid,
+                        transaction_type='admin_credit',
+                        amount=amount,
+                        net_amount=amount,
+                        status='completed',
+                        reference=str(uuid.uuid4()),
+                        description=note,
+                        completed_at=now,
+                    ))
+                    # Deposit transaction for admin tracking
+                    transactions.append(Transaction(
+                        user_id=uid,
+                        transaction_type='deposit',
+                        payment_method='admin_transfer',
+                        amount=amount,
+                        fee=Decimal('0.00'),
+                        net_amount=amount,
+                        status='completed',
+                        reference=f'ADMIN-BULK-DEPOSIT-{uid}-{int(amount)}-{stamp}-{bulk.id.hex[:8]}',
+                        description=f'Admin bulk deposit for {full_name} - {note}',
+                        completed_at=now,
+                        metadata={
+                            'admin_credited_by': admin_email,
+                            'admin_credit_note': note,
+                            'is_admin_deposit': True,
+                            'is_bulk_credit': True,
+                            'bulk_credit_id': str(bulk.id),
+                        }
+                    ))
+                    notifications.append(Notification(
+                        user_id=uid,
+                        title='Balance Credited',
+                        message=f'${amount} has been added to your account. {note}',
+                        type='success',
+                    ))
+                
+                Transaction.objects.bulk_create(transactions, batch_size=500)
+                rollups.record_created(transactions)
+                created = Notification.objects.bulk_create(notifications, batch_size=500)
+                db_transaction.on_commit(lambda created=created: notify_bulk_created(created))
+                db_transaction.on_commit(lambda found=found: invalidate(found))
+                
+                bulk.credited_ids.extend(uid for uid in chunk if uid in found)
+                bulk.failed_ids.extend(uid for uid in chunk if uid not in found)
+                bulk.processed += len(chunk)
+                bulk.save(update_fields=['credited_ids', 'failed_ids', 'processed', 'updated_at'])
+    except Exception as e:
+        BulkCredit.objects.filter(id=bulk.id, run_token=run_token).update(status='failed', error=str(e))
+        raise
+    
+    print(f'[AUDIT] {admin_email} bulk credited ${amount} to {len(bulk.credited_ids)} users. Note: {note}')
+    return f"Credited {len(bulk.credited_ids)} users, {len(bulk.failed_ids)} not found"
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.rollups import rollups
+from transactions.models import Transaction
+
+from .models import BulkCredit
+from .tasks import process_bulk_credit
+
+User = get_user_model()
+
+
+def make_users(count):
+    return [
+        User.objects.create_user(email=f'bulk{i}@example.com', password='pw-12345')
+        for i in range(count)
+    ]
+
+
+def make_bulk(users, amount='25.00'):
+    return BulkCredit.objects.create(amount=Decimal(amount), note='promo', user_ids=[u.id for u in users])
+
+
+@override_settings(BULK_CREDIT_CHUNK_SIZE=2)
+class BulkCreditResumeTests(TestCase):
+    """A failed run resumes after its last committed chunk."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users = make_users(5)
+
+    def test_retry_after_failure_credits_each_user_once(self):
+        bulk = make_bulk(self.users)
+        record_created = rollups.record_created
+        calls = []
+
+        def fail_second_chunk(transactions):
+            calls.append(len(transactions))
+            if len(calls) == 2:
+                raise RuntimeError('database went away')
+            record_created(transactions)
+
+        with mock.patch.object(rollups, 'record_created', side_effect=fail_second_chunk):
+            with self.assertRaises(RuntimeError):
+                process_bulk_credit(str(bulk.id))
+
+        bulk.refresh_from_db()
+        self.assertEqual(bulk.status, 'failed')
+        self.assertEqual(bulk.processed, 2)
+
+        process_bulk_credit(str(bulk.id))
+
+        bulk.refresh_from_db()
+        self.assertEqual(bulk.status, 'completed')
+        self.assertEqual(bulk.processed, 5)
+        self.assertEqual(sorted(bulk.credited_ids), sorted(u.id for u in self.users))
+        for user in User.objects.filter(id__in=bulk.user_ids):
+            self.assertEqual(user.balance, Decimal('25.00'))
+        self.assertEqual(Transaction.objects.filter(transaction_type='admin_credit').count(), 5)
+
+
+@override_settings(BULK_CREDIT_CHUNK_SIZE=2)
+class BulkCreditConcurrentRunTests(TransactionTestCase):
+    """Two runs of one credit (e.g. a requeued slow job) never pay twice."""
+
+    def test_older_run_stops_when_a_newer_run_takes_over(self):
+        users = make_users(5)
+        bulk = make_bulk(users)
+        results = []
+
+        def second_worker(created):
+            # Runs after the first run's first chunk commits, before its second
+            if not results:
+                results.append(process_bulk_credit(str(bulk.id)))
+
+        with mock.patch('notifications.realtime.notify_bulk_created', side_effect=second_worker):
+            first = process_bulk_credit(str(bulk.id))
+
+        self.assertIn('taken over', first)
+        self.assertTrue(results[0].startswith('Credited 5 users'))
+
+        bulk.refresh_from_db()
+        self.assertEqual(bulk.status, 'completed')
+        self.assertEqual(bulk.processed, 5)
+        self.assertEqual(len(bulk.credited_ids), 5)
+        for user in User.objects.filter(id__in=bulk.user_ids):
+            self.assertEqual(user.balance, Decimal('25.00'))
+        self.assertEqual(Transaction.objects.filter(transaction_type='admin_credit').count(), 5)
+
+
+class DashboardRecentActivityTests(TestCase):
+    """Recent activity keeps its 2-decimal amounts and isoformat dates."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(email='dash@example.com', password='pw-12345')
+            self.txn = Transaction.objects.create(
+                user=self.user, transaction_type='deposit', status='completed',
+                amount=Decimal('12.5'), net_amount=Decimal('12.5'), reference='DASH-1',
+                description='Top up',
+            )
+        self.txn.refresh_from_db()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_dashboard_stats(self):
+        activity = self.client.get('/api/auth/dashboard-stats/').json()['data']['recent_activity']
+
+        self.assertEqual(activity, [{
+            'id': self.txn.id, 'type': 'deposit', 'amount': '12.50',
+            'status': 'completed', 'date': self.txn.created_at.isoformat(),
+        }])
+
+    def test_live_dashboard_stats(self):
+        recent = self.client.get('/api/investments/dashboard-stats/').json()['data']['recent_transactions']
+
+        self.assertEqual(recent, [{
+            'type': 'deposit', 'amount': '12.50', 'description': 'Top up',
+            'status': 'completed', 'date': self.txn.created_at.isoformat(),
+        }])
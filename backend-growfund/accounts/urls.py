@@ -9,7 +9,8 @@ from .views import (
     generate_referral_code, dashboard_stats, admin_suspended_users,
     admin_user_stats, create_test_notification, admin_dashboard_overview,
     debug_admin_delete, debug_admin_suspend,
-    admin_credit_balance, admin_bulk_credit, auth_ping
+    admin_credit_balance, admin_bulk_credit, admin_bulk_credit_status, auth_ping,
+    admin_stats_series, admin_export_users
 )
 
 app_name = 'accounts'
@@ -42,7 +43,9 @@ urlpatterns = [
     
     # Admin
     path('admin/dashboard/', admin_dashboard_overview, name='admin-dashboard'),
+    path('admin/stats/series/', admin_stats_series, name='admin-stats-series'),
     path('admin/users/', AdminUsersListView.as_view(), name='admin-users-list'),
+    path('admin/users/export/', admin_export_users, name='admin-export-users'),
     path('admin/users/suspended/', admin_suspended_users, name='admin-suspended-users'),
     path('admin/users/stats/', admin_user_stats, name='admin-user-stats'),
     path('admin/users/<int:user_id>/', AdminUserDetailView.as_view(), name='admin-user-detail'),
@@ -51,6 +54,7 @@ urlpatterns = [
     path('admin/users/<int:user_id>/reset-password/', AdminUserResetPasswordView.as_view(), name='admin-user-reset-password'),
     path('admin/users/<int:user_id>/balance/', admin_credit_balance, name='admin-user-balance'),
     path('admin/users/bulk-credit/', admin_bulk_credit, name='admin-bulk-credit'),
+    path('admin/users/bulk-credit/<uuid:bulk_id>/', admin_bulk_credit_status, name='admin-bulk-credit-status'),
     
     # Debug endpoints (remove in production)
     path('debug/admin/users/<int:user_id>/delete/', debug_admin_delete, name='debug-admin-delete'),
@@ -133,7 +133,7 @@ class UserFinancialDataAdmin(admin.ModelAdmin):
     def binary_trades_count(self, obj):
         """Display binary trades count (real + demo)"""
         real_count = obj.binary_trades.filter(is_demo=False).count()
-        demo_count = obj.binary_trades.filter(is_demo=True).count()
+        demo_count = obj.demo_binary_trades.count()
         
         if real_count > 0 or demo_count > 0:
             return format_html(
@@ -182,10 +182,15 @@ class UserFinancialDataAdmin(admin.ModelAdmin):
     actions = ['export_financial_summary', 'send_balance_notification']
     
     def export_financial_summary(self, request, queryset):
-        """Export financial summary for selected users"""
-        # This could be implemented to generate CSV/Excel reports
-        count = queryset.count()
-        self.message_user(request, f'Financial summary export initiated for {count} users.')
+        """Export financial summary for selected users as a streamed CSV"""
+        from core.exports import export_response
+        from .views import USER_EXPORT_COLUMNS, _open_trade_invested, _completed_deposits
+        
+        rows = queryset.annotate(
+            invested=_open_trade_invested(),
+            total_deposits=_completed_deposits(),
+        ).order_by('-date_joined', '-id').values(*[key for key, _ in USER_EXPORT_COLUMNS])
+        return export_response(rows, USER_EXPORT_COLUMNS, fmt='csv', filename='financial-summary')
     export_financial_summary.short_description = 'Export financial summary'
     
     def send_balance_notification(self, request, queryset):
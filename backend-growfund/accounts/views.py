@@ -1,4 +1,5 @@
-from rest_framework import status, generics, permissions
+from rest_framework import status, generics, permissions, filters
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -11,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from datetime import timedelta
 import uuid
 from decimal import Decimal
+from core.money import money
 
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserSerializer,
@@ -119,9 +121,9 @@ class VerifyEmailView(APIView):
                 user.is_verified = True
                 user.save(update_fields=['is_verified'])
                 
-                # Send welcome email
+                # Queue welcome email
                 from .tasks import send_welcome_email
-                send_welcome_email(user.id)
+                send_welcome_email.enqueue(user.id)
                 
                 return Response({
                     'success': True,
@@ -154,9 +156,9 @@ class VerifyEmailView(APIView):
                     user.is_verified = True
                     user.save(update_fields=['is_verified'])
                     
-                    # Send welcome email
+                    # Queue welcome email
                     from .tasks import send_welcome_email
-                    send_welcome_email(user.id)
+                    send_welcome_email.enqueue(user.id)
                     
                     return Response({
                         'success': True,
@@ -397,27 +399,91 @@ class UserBalanceView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+def _open_trade_invested():
+    """Per-user total invested in open trades, as a correlated subquery annotation."""
+    from investments.models import Trade
+    from django.db.models import OuterRef, Subquery, Sum, F, Value
+    from django.db.models.functions import Coalesce
+    
+    money = models.DecimalField(max_digits=24, decimal_places=8)
+    open_invested = Trade.objects.filter(
+        user=OuterRef('pk'), status='open'
+    ).order_by().values('user').annotate(
+        total=Sum(F('entry_price') * F('quantity'), output_field=money)
+    ).values('total')
+    return Coalesce(Subquery(open_invested, output_field=money), Value(Decimal('0')), output_field=money)
+
+
+def _completed_deposits():
+    """Per-user completed deposits and admin credits, as a correlated subquery annotation."""
+    from transactions.models import Transaction
+    from django.db.models import OuterRef, Subquery, Sum, Value
+    from django.db.models.functions import Coalesce
+    
+    money = models.DecimalField(max_digits=24, decimal_places=8)
+    deposits = Transaction.objects.filter(
+        user=OuterRef('pk'), status='completed', transaction_type__in=['deposit', 'admin_credit']
+    ).order_by().values('user').annotate(total=Sum('amount')).values('total')
+    return Coalesce(Subquery(deposits, output_field=money), Value(Decimal('0')), output_field=money)
+
+
+class AdminUsersCursorPagination(CursorPagination):
+    """
+    Keyset pagination: each page costs the same however deep it is.
+    
+    The cursor holds the first sort key plus an offset into rows that tie
+    on it (many users share a balance or a bulk-import date_joined), so
+    ``id`` is always appended in the same direction: ties come back in the
+    same order on every page and none are skipped or repeated.
+    """
+    
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-date_joined'
+    
+    def get_ordering(self, request, queryset, view):
+        ordering = [field for field in super().get_ordering(request, queryset, view) if field.lstrip('-') != 'id']
+        ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return tuple(ordering)
+
+
 class AdminUsersListView(generics.ListAPIView):
-    """List all users (admin only) - Memory optimized"""
+    """
+    List all users (admin only)
+    
+    Query params:
+        search    - matches email, first and last name
+        ordering  - date_joined, email or balance (prefix "-" for desc)
+        page_size - up to 500, default 50
+        cursor    - opaque cursor from the previous response
+    """
     
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = None  # Use default pagination
+    pagination_class = AdminUsersCursorPagination
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['email', 'first_name', 'last_name']
+    # Not ``invested``: it is a per-row subquery, so sorting on it would
+    # compute it for every user on every page
+    ordering_fields = ['date_joined', 'email', 'balance']
+    ordering = '-date_joined'
     
     def get_queryset(self):
         # Check if user is admin or superuser
         if not (self.request.user.is_staff or self.request.user.is_superuser):
             return User.objects.none()
         
-        # Optimize query to reduce memory usage - exclude soft-deleted users
-        return User.objects.select_related().filter(
+        return User.objects.filter(
             is_active=True  # Only show active users (exclude soft-deleted)
         ).exclude(
             email__startswith='deleted_'  # Extra safety: exclude emails marked as deleted
         ).only(
             'id', 'email', 'first_name', 'last_name', 'is_active', 
             'is_verified', 'is_staff', 'is_superuser', 'balance', 'date_joined', 'last_login'
-        ).order_by('-date_joined')[:100]  # Limit to 100 users
+        ).annotate(
+            invested=_open_trade_invested()
+        )
     
     def list(self, request, *args, **kwargs):
         # Check if user is admin or superuser
@@ -427,19 +493,11 @@ class AdminUsersListView(generics.ListAPIView):
                 'success': False
             }, status=status.HTTP_403_FORBIDDEN)
         
-        queryset = self.get_queryset()
-        
-        # Calculate invested amount for each user
-        from investments.models import Trade
-        from django.db.models import Sum
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
         
-        data = []
-        for user in queryset:
-            # Calculate total invested (entry_price * quantity for all open trades)
-            open_trades = Trade.objects.filter(user=user, status='open').only('entry_price', 'quantity')
-            invested = sum(float(trade.entry_price) * float(trade.quantity) for trade in open_trades)
-            
-            data.append({
+        data = [
+            {
                 'id': user.id,
                 'email': user.email,
                 'first_name': user.first_name or '',
@@ -448,17 +506,85 @@ class AdminUsersListView(generics.ListAPIView):
                 'is_staff': user.is_staff,
                 'is_superuser': user.is_superuser,
                 'balance': str(user.balance),
-                'invested': f"{invested:.2f}",
+                'invested': money(user.invested),
                 'date_joined': user.date_joined.isoformat(),
                 'last_login_at': user.last_login.isoformat() if user.last_login else None
-            })
+            }
+            for user in page
+        ]
         
         return Response({
             'data': data,
-            'success': True
+            'success': True,
+            'pagination': {
+                'next': self.paginator.get_next_link(),
+                'previous': self.paginator.get_previous_link(),
+                'page_size': self.paginator.page_size,
+            }
         }, status=status.HTTP_200_OK)
 
 
+USER_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('email', 'email'),
+    ('first_name', 'first_name'),
+    ('last_name', 'last_name'),
+    ('is_active', 'is_active'),
+    ('is_verified', 'is_verified'),
+    ('balance', 'balance'),
+    ('invested', 'invested'),
+    ('total_deposits', 'total_deposits'),
+    ('date_joined', 'date_joined'),
+    ('last_login', 'last_login'),
+]
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_export_users(request):
+    """
+    Export users with balances and invested totals as CSV or NDJSON (admin only)
+    
+    Query params:
+      fmt        - csv | ndjson (default csv)
+      status     - active | suspended (comma-separated)
+      search     - matches email, first and last name
+      date_from  - joined on/after (YYYY-MM-DD)
+      date_to    - joined on/before (YYYY-MM-DD)
+    """
+    from django.db.models import Q
+    from core.exports import export_response, parse_export_params
+    
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({
+            'success': False,
+            'error': 'Admin access required'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        params = parse_export_params(request.query_params, statuses=['active', 'suspended'])
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    users = params.filter_dates(User.objects.all(), field='date_joined')
+    if len(params.statuses) == 1:
+        users = users.filter(is_active=params.statuses[0] == 'active')
+    search = request.query_params.get('search', '').strip()
+    if search:
+        users = users.filter(
+            Q(email__icontains=search) | Q(first_name__icontains=search) | Q(last_name__icontains=search)
+        )
+    
+    rows = users.annotate(
+        invested=_open_trade_invested(),
+        total_deposits=_completed_deposits(),
+    ).order_by('-date_joined', '-id').values(*[key for key, _ in USER_EXPORT_COLUMNS])
+    return export_response(rows, USER_EXPORT_COLUMNS, fmt=params.fmt, filename='users')
+
+
 class AdminUserDetailView(APIView):
     """Get, update, or delete a specific user (admin only)"""
     
@@ -803,99 +929,51 @@ def generate_referral_code(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
-    """Get comprehensive dashboard statistics for user including crypto portfolio"""
-    user = request.user
-    from decimal import Decimal
-    
-    # Investment stats
-    from investments.models import CapitalInvestmentPlan, Trade
-    active_investments = CapitalInvestmentPlan.objects.filter(user=user, status='active').count()
-    total_invested = CapitalInvestmentPlan.objects.filter(user=user).aggregate(
-        total=models.Sum('initial_amount')
-    )['total'] or 0
-    
-    # Crypto portfolio stats
-    crypto_investments = Trade.objects.filter(user=user, status='open')
-    crypto_total_value = Decimal('0')
-    crypto_total_invested = Decimal('0')
-    crypto_count = 0
-    
-    for investment in crypto_investments:
-        invested_amount = investment.entry_price * investment.quantity
-        current_value = investment.quantity * investment.current_price if investment.current_price else invested_amount
-        crypto_total_value += current_value
-        crypto_total_invested += invested_amount
-        crypto_count += 1
-    
-    crypto_profit_loss = crypto_total_value - crypto_total_invested
-    crypto_profit_loss_percentage = (crypto_profit_loss / crypto_total_invested * 100) if crypto_total_invested > 0 else 0
-    
-    # Trading stats
-    open_trades = Trade.objects.filter(user=user, status='open').count()
-    total_trades = Trade.objects.filter(user=user).count()
-    
-    # Transaction stats
-    from transactions.models import Transaction
-    total_deposits = Transaction.objects.filter(
-        user=user, transaction_type='deposit', status='completed'
-    ).aggregate(total=models.Sum('amount'))['total'] or 0
-    
-    total_withdrawals = Transaction.objects.filter(
-        user=user, transaction_type='withdrawal', status='completed'
-    ).aggregate(total=models.Sum('amount'))['total'] or 0
+    """
+    Get comprehensive dashboard statistics for user including crypto portfolio
     
-    # Referral stats
-    total_referrals = Referral.objects.filter(referrer=user).count()
-    referral_earnings = Referral.objects.filter(
-        referrer=user, reward_claimed=True
-    ).aggregate(total=models.Sum('reward_amount'))['total'] or 0
+    Served from the per-user dashboard snapshot (see dashboard_service).
+    """
+    from .dashboard_service import get_dashboard_snapshot
+    from notifications.realtime import get_unread_count
     
-    # Notification stats
-    from notifications.models import Notification
-    unread_notifications = Notification.objects.filter(user=user, read=False).count()
-    
-    # Recent activity (last 5 transactions)
-    recent_transactions = Transaction.objects.filter(user=user).order_by('-created_at')[:5]
-    recent_activity = []
-    for txn in recent_transactions:
-        recent_activity.append({
-            'id': txn.id,
-            'type': txn.transaction_type,
-            'amount': str(txn.amount),
-            'status': txn.status,
-            'date': txn.created_at.isoformat()
-        })
+    user = request.user
+    snapshot = get_dashboard_snapshot(user)
+    crypto = snapshot['crypto']
     
     return Response({
         'data': {
             'balance': str(user.balance),
             'investments': {
-                'active_count': active_investments,
-                'total_invested': str(total_invested)
+                'active_count': snapshot['investments']['active_count'],
+                'total_invested': snapshot['investments']['total_invested']
             },
             'crypto': {
-                'total_value': str(crypto_total_value),
-                'total_invested': str(crypto_total_invested),
-                'profit_loss': str(crypto_profit_loss),
-                'profit_loss_percentage': float(crypto_profit_loss_percentage),
-                'holdings_count': crypto_count
-            },
-            'trading': {
-                'open_trades': open_trades,
-                'total_trades': total_trades
+                'total_value': crypto['total_value'],
+                'total_invested': crypto['total_invested'],
+                'profit_loss': crypto['profit_loss'],
+                'profit_loss_percentage': crypto['profit_loss_percentage'],
+                'holdings_count': crypto['holdings_count']
             },
+            'trading': snapshot['trading'],
             'transactions': {
-                'total_deposits': str(total_deposits),
-                'total_withdrawals': str(total_withdrawals)
-            },
-            'referrals': {
-                'total_count': total_referrals,
-                'total_earnings': str(referral_earnings)
+                'total_deposits': snapshot['transactions']['total_deposits'],
+                'total_withdrawals': snapshot['transactions']['total_withdrawals']
             },
+            'referrals': snapshot['referrals'],
             'notifications': {
-                'unread_count': unread_notifications
+                'unread_count': get_unread_count(user)
             },
-            'recent_activity': recent_activity
+            'recent_activity': [
+                {
+                    'id': txn['id'],
+                    'type': txn['type'],
+                    'amount': txn['amount'],
+                    'status': txn['status'],
+                    'date': txn['date']
+                }
+                for txn in snapshot['recent_activity']
+            ]
         }
     }, status=status.HTTP_200_OK)
 
@@ -926,32 +1004,102 @@ def admin_user_stats(request):
     if not (request.user.is_staff or request.user.is_superuser):
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
-    from django.db.models import Count, Sum
-    from datetime import datetime, timedelta
+    from core.rollups import rollups, bucket_sum
     
-    # Basic user counts
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
-    suspended_users = User.objects.filter(is_active=False).count()
-    verified_users = User.objects.filter(is_verified=True).count()
-    unverified_users = User.objects.filter(is_verified=False).count()
+    users = _user_counts()
     
-    # Recent registrations (last 30 days)
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    recent_registrations = User.objects.filter(date_joined__gte=thirty_days_ago).count()
+    # Recent registrations (last 30 days), from the daily rollups
+    thirty_days_ago = timezone.localdate() - timedelta(days=30)
+    recent = rollups.totals(['registrations'], since=thirty_days_ago)
     
-    # Total balance across all users
-    total_balance = User.objects.aggregate(total=Sum('balance'))['total'] or 0
+    return Response({
+        'data': {
+            'total_users': users['total'],
+            'active_users': users['active'],
+            'suspended_users': users['suspended'],
+            'verified_users': users['verified'],
+            'unverified_users': users['total'] - users['verified'],
+            'recent_registrations': bucket_sum(recent['registrations'], ''),
+            'total_platform_balance': str(users['total_balance'] or 0)
+        }
+    }, status=status.HTTP_200_OK)
+
+
+def _user_counts():
+    """Current user counts and platform balance in one aggregate query."""
+    from django.db.models import Count, Q, Sum
+    
+    return User.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        suspended=Count('id', filter=Q(is_active=False)),
+        verified=Count('id', filter=Q(is_verified=True)),
+        total_balance=Sum('balance'),
+    )
+
+
+# Named daily series: metric and the dimensions summed into it (None = all).
+# Deposits and withdrawals match the dashboard totals: admin credits are
+# booked as deposits with payment_method='admin_transfer' already.
+STATS_SERIES = {
+    'deposits': ('transactions', ['deposit:completed']),
+    'withdrawals': ('transactions', ['withdrawal:completed']),
+    'registrations': ('registrations', None),
+    'trade_volume': ('trades', None),
+    'capital_plans': ('capital_plans', None),
+}
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_stats_series(request):
+    """
+    Daily time series for admin charts, read from the rollups
+    
+    Query params:
+        series - one of deposits, withdrawals, registrations, trade_volume, capital_plans
+        days   - 1 to 365 (default 90)
+    """
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+    
+    from core.rollups import rollups
+    
+    name = request.GET.get('series', 'deposits')
+    if name not in STATS_SERIES:
+        return Response({
+            'success': False,
+            'error': f"series must be one of: {', '.join(STATS_SERIES)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        days = int(request.GET.get('days', 90))
+    except ValueError:
+        days = 0
+    if not 1 <= days <= 365:
+        return Response({
+            'success': False,
+            'error': 'days must be between 1 and 365'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    metric, dimensions = STATS_SERIES[name]
+    points = rollups.series(metric, days=days, dimensions=dimensions)
     
     return Response({
+        'success': True,
         'data': {
-            'total_users': total_users,
-            'active_users': active_users,
-            'suspended_users': suspended_users,
-            'verified_users': verified_users,
-            'unverified_users': unverified_users,
-            'recent_registrations': recent_registrations,
-            'total_platform_balance': str(total_balance)
+            'series': name,
+            'days': days,
+            'points': [
+                {
+                    'date': point['date'].isoformat(),
+                    'count': point['count'],
+                    'amount': str(point['amount'])
+                }
+                for point in points
+            ],
+            'total_count': sum(point['count'] for point in points),
+            'total_amount': str(sum((point['amount'] for point in points), Decimal('0')))
         }
     }, status=status.HTTP_200_OK)
 
@@ -988,81 +1136,50 @@ def admin_dashboard_overview(request):
     if not (request.user.is_staff or request.user.is_superuser):
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
-    from django.db.models import Count, Sum
-    from datetime import datetime, timedelta
-    from transactions.models import Transaction
-    from investments.models import CapitalInvestmentPlan, Trade
+    from core.rollups import rollups, bucket_sum
     
     # User statistics
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
-    suspended_users = User.objects.filter(is_active=False).count()
-    verified_users = User.objects.filter(is_verified=True).count()
-    
-    # Financial statistics
-    total_balance = User.objects.aggregate(total=Sum('balance'))['total'] or 0
-    
-    # Transaction statistics
-    total_deposits = Transaction.objects.filter(
-        transaction_type='deposit', status='completed'
-    ).aggregate(total=Sum('amount'))['total'] or 0
-    
-    total_withdrawals = Transaction.objects.filter(
-        transaction_type='withdrawal', status='completed'
-    ).aggregate(total=Sum('amount'))['total'] or 0
-    
-    pending_deposits = Transaction.objects.filter(
-        transaction_type='deposit', status__in=['pending', 'processing']
-    ).count()
-    
-    pending_withdrawals = Transaction.objects.filter(
-        transaction_type='withdrawal', status__in=['pending', 'processing']
-    ).count()
-    
-    # Investment statistics
-    total_investments = CapitalInvestmentPlan.objects.count()
-    active_investments = CapitalInvestmentPlan.objects.filter(status='active').count()
-    total_invested = CapitalInvestmentPlan.objects.aggregate(
-        total=Sum('initial_amount')
-    )['total'] or 0
-    
-    # Trading statistics
-    total_trades = Trade.objects.count()
-    open_trades = Trade.objects.filter(status='open').count()
+    users = _user_counts()
+    
+    # Transaction, investment and trading totals from the daily rollups
+    totals = rollups.totals(['transactions', 'capital_plans', 'trades'])
+    txns = totals['transactions']
+    plans = totals['capital_plans']
+    trades = totals['trades']
     
     # Recent activity (last 7 days)
-    seven_days_ago = datetime.now() - timedelta(days=7)
-    recent_users = User.objects.filter(date_joined__gte=seven_days_ago).count()
-    recent_transactions = Transaction.objects.filter(created_at__gte=seven_days_ago).count()
+    seven_days_ago = timezone.localdate() - timedelta(days=7)
+    recent = rollups.totals(['registrations', 'transactions'], since=seven_days_ago)
+    recent_users = bucket_sum(recent['registrations'], '')
     
     return Response({
         'data': {
             'users': {
-                'total': total_users,
-                'active': active_users,
-                'suspended': suspended_users,
-                'verified': verified_users,
+                'total': users['total'],
+                'active': users['active'],
+                'suspended': users['suspended'],
+                'verified': users['verified'],
                 'recent_registrations': recent_users
             },
             'finances': {
-                'total_platform_balance': str(total_balance),
-                'total_deposits': str(total_deposits),
-                'total_withdrawals': str(total_withdrawals),
-                'pending_deposits': pending_deposits,
-                'pending_withdrawals': pending_withdrawals
+                'total_platform_balance': str(users['total_balance'] or 0),
+                'total_deposits': str(bucket_sum(txns, 'deposit:completed', field='amount')),
+                'total_withdrawals': str(bucket_sum(txns, 'withdrawal:completed', field='amount')),
+                'pending_deposits': bucket_sum(txns, 'deposit:pending', 'deposit:processing'),
+                'pending_withdrawals': bucket_sum(txns, 'withdrawal:pending', 'withdrawal:processing')
             },
             'investments': {
-                'total_plans': total_investments,
-                'active_plans': active_investments,
-                'total_invested': str(total_invested)
+                'total_plans': bucket_sum(plans, '*'),
+                'active_plans': bucket_sum(plans, 'active'),
+                'total_invested': str(bucket_sum(plans, '*', field='amount'))
             },
             'trading': {
-                'total_trades': total_trades,
-                'open_trades': open_trades
+                'total_trades': bucket_sum(trades, '*'),
+                'open_trades': bucket_sum(trades, 'open')
             },
             'activity': {
                 'recent_users': recent_users,
-                'recent_transactions': recent_transactions
+                'recent_transactions': bucket_sum(recent['transactions'], '*:*')
             }
         }
     }, status=status.HTTP_200_OK)
@@ -1311,13 +1428,15 @@ def admin_credit_balance(request, user_id):
     })
 
 
-@api_view(['POST'])
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def admin_bulk_credit(request):
     """
     Credit multiple users at once.
     Body: { user_ids: [1,2,3], amount: 100, note: "promo bonus" }
+
+    Small batches are credited before responding. Larger ones run as a
+    background job; poll admin/users/bulk-credit/<id>/ for progress.
     """
     if not (request.user.is_staff or request.user.is_superuser):
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
@@ -1335,75 +1454,117 @@ def admin_bulk_credit(request):
     if not user_ids:
         return Response({'error': 'user_ids is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    from transactions.models import Transaction
-    from django.db import transaction as db_transaction
-    import uuid
-
-    credited = []
-    failed = []
+    from .models import BulkCredit
+    from .tasks import process_bulk_credit
 
+    # Normalise ids, drop duplicates, keep order
+    valid_ids = []
+    invalid_ids = []
+    seen = set()
     for uid in user_ids:
         try:
-            user = User.objects.get(id=uid)
-            with db_transaction.atomic():
-                user.balance += amount
-                user.save(update_fields=['balance'])
-                
-                # Create admin credit transaction
-                Transaction.objects.create(
-                    user=user,
-                    transaction_type='admin_credit',
-                    amount=amount,
-                    net_amount=amount,
-                    status='completed',
-                    reference=str(uuid.uuid4()),
-                    description=note,
-                    completed_at=timezone.now(),
-                )
-                
-                # ALSO create a deposit transaction for admin tracking
-                deposit_reference = f'ADMIN-BULK-DEPOSIT-{user.id}-{int(amount)}-{timezone.now().strftime("%Y%m%d%H%M%S")}'
-                Transaction.objects.create(
-                    user=user,
-                    transaction_type='deposit',
-                    payment_method='admin_transfer',
-                    amount=amount,
-                    fee=Decimal('0.00'),
-                    net_amount=amount,
-                    status='completed',
-                    reference=deposit_reference,
-                    description=f'Admin bulk deposit for {user.get_full_name() or user.email} - {note}',
-                    completed_at=timezone.now(),
-                    metadata={
-                        'admin_credited_by': request.user.email,
-                        'admin_credit_note': note,
-                        'is_admin_deposit': True,
-                        'is_bulk_credit': True
-                    }
-                )
-                try:
-                    from notifications.models import Notification
-                    Notification.create_notification(
-                        user=user,
-                        title='Balance Credited',
-                        message=f'${amount} has been added to your account. {note}',
-                        notification_type='success',
-                    )
-                except Exception:
-                    pass
-            credited.append(user.email)
-        except User.DoesNotExist:
-            failed.append(uid)
+            uid = int(uid)
+        except (TypeError, ValueError):
+            invalid_ids.append(uid)
+            continue
+        if uid not in seen:
+            seen.add(uid)
+            valid_ids.append(uid)
+
+    bulk = BulkCredit.objects.create(
+        created_by=request.user,
+        amount=amount,
+        note=note,
+        user_ids=valid_ids,
+    )
+
+    if len(valid_ids) > getattr(settings, 'BULK_CREDIT_INLINE_LIMIT', 50):
+        process_bulk_credit.enqueue(str(bulk.id))
+        return Response({
+            'success': True,
+            'bulk_credit_id': str(bulk.id),
+            'status': bulk.status,
+            'total': bulk.total,
+            'amount': str(amount),
+            'invalid_ids': invalid_ids,
+            'progress_url': f'/api/auth/admin/users/bulk-credit/{bulk.id}/',
+        }, status=status.HTTP_202_ACCEPTED)
+
+    process_bulk_credit(str(bulk.id))
+    bulk.refresh_from_db()
+
+    credited = list(User.objects.filter(id__in=bulk.credited_ids).values_list('email', flat=True))
 
     return Response({
         'success': True,
+        'bulk_credit_id': str(bulk.id),
         'credited': credited,
-        'failed': failed,
+        'failed': bulk.failed_ids + invalid_ids,
         'amount': str(amount),
         'total_credited': len(credited),
     })
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def admin_bulk_credit_status(request, bulk_id):
+    """
+    Progress and per-user report for a bulk credit run.
+    Query params: page (default 1), page_size (default 100, max 1000)
+    """
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+
+    from .models import BulkCredit
+
+    try:
+        bulk = BulkCredit.objects.get(id=bulk_id)
+    except BulkCredit.DoesNotExist:
+        return Response({'error': 'Bulk credit not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+        page_size = min(max(int(request.GET.get('page_size', 100)), 1), 1000)
+    except ValueError:
+        page, page_size = 1, 100
+
+    # Per-user report over the processed part of the run
+    credited = set(bulk.credited_ids)
+    processed_ids = bulk.user_ids[:bulk.processed]
+    page_ids = processed_ids[(page - 1) * page_size:page * page_size]
+    emails = dict(User.objects.filter(id__in=page_ids).values_list('id', 'email'))
+
+    return Response({
+        'success': True,
+        'bulk_credit': {
+            'id': str(bulk.id),
+            'status': bulk.status,
+            'amount': str(bulk.amount),
+            'note': bulk.note,
+            'total': bulk.total,
+            'processed': bulk.processed,
+            'progress_percent': bulk.progress_percent,
+            'credited_count': len(bulk.credited_ids),
+            'failed_count': len(bulk.failed_ids),
+            'error': bulk.error,
+            'created_by': bulk.created_by.email if bulk.created_by else None,
+            'created_at': bulk.created_at.isoformat(),
+            'finished_at': bulk.finished_at.isoformat() if bulk.finished_at else None,
+        },
+        'results': [
+            {
+                'user_id': uid,
+                'email': emails.get(uid),
+                'status': 'credited' if uid in credited else 'not_found',
+            }
+            for uid in page_ids
+        ],
+        'page': page,
+        'page_size': page_size,
+        'total_results': len(processed_ids),
+    })
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def auth_ping(request):
@@ -0,0 +1,46 @@
+"""
+JWT authentication for WebSocket connections.
+
+Browsers can't set an Authorization header on a WebSocket handshake, so
+the access token is passed in the query string instead:
+
+    wss://.../ws/notifications/?token=<access token>
+
+Connections without a valid token fall through to the session user set by
+Channels' AuthMiddlewareStack (useful for the Django admin).
+"""
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+
+
+@database_sync_to_async
+def get_user_for_token(raw_token):
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed, TokenError
+
+    auth = JWTAuthentication()
+    try:
+        validated = auth.get_validated_token(raw_token)
+        return auth.get_user(validated)
+    except (InvalidToken, AuthenticationFailed, TokenError):
+        return None
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Sets ``scope['user']`` from a ``?token=`` access token."""
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get('query_string', b'').decode())
+        token = (query.get('token') or [None])[0]
+        if token:
+            user = await get_user_for_token(token)
+            if user is not None and user.is_active:
+                scope = dict(scope, user=user)
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    return AuthMiddlewareStack(JWTAuthMiddleware(inner))
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import TradingAsset, BinaryTrade, UserTradingStats, AssetPrice, HouseEdgeConfig, DemoTradingStats
+from demo.admin import DemoDatabaseAdmin
+from .models import (
+    TradingAsset, BinaryTrade, DemoBinaryTrade, UserTradingStats, AssetPrice, HouseEdgeConfig, DemoTradingStats
+)
 
 
 @admin.register(TradingAsset)
@@ -27,6 +30,26 @@ class BinaryTradeAdmin(admin.ModelAdmin):
     asset_symbol.short_description = 'Asset'
 
 
+@admin.register(DemoBinaryTrade)
+class DemoBinaryTradeAdmin(DemoDatabaseAdmin):
+    list_display = ['id', 'user_email', 'asset_symbol', 'direction', 'amount', 'status', 'profit_loss', 'opened_at']
+    list_filter = ['status', 'direction']
+    search_fields = ['user__email']
+    readonly_fields = ['id', 'opened_at', 'closed_at']
+    ordering = ['-opened_at']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('user', 'asset')
+    
+    def user_email(self, obj):
+        return obj.user.email
+    user_email.short_description = 'User'
+    
+    def asset_symbol(self, obj):
+        return obj.asset.symbol
+    asset_symbol.short_description = 'Asset'
+
+
 @admin.register(UserTradingStats)
 class UserTradingStatsAdmin(admin.ModelAdmin):
     list_display = ['user_email', 'total_trades', 'total_wins', 'total_losses', 'win_rate_display', 'net_profit', 'is_flagged']
@@ -88,7 +111,7 @@ class HouseEdgeConfigAdmin(admin.ModelAdmin):
 
 
 @admin.register(DemoTradingStats)
-class DemoTradingStatsAdmin(admin.ModelAdmin):
+class DemoTradingStatsAdmin(DemoDatabaseAdmin):
     list_display = ['user_email', 'total_trades', 'total_wins', 'total_losses', 'net_profit']
     search_fields = ['user__email']
     readonly_fields = ['created_at', 'updated_at']
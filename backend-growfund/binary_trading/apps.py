@@ -3,3 +3,26 @@ from django.apps import AppConfig
 
 class BinaryTradingConfig(AppConfig):
     name = 'binary_trading'
+
+    def ready(self):
+        # Trade expiry and price refresh run on the scheduler leader only
+        from django.conf import settings
+        from core.scheduler import scheduler
+        from .trade_service import TradeExecutionService
+        from .price_feed import PriceFeedService
+        from .models import TradingAsset, HouseEdgeConfig, trading_assets_cache, house_edge_cache
+
+        # Config read on every trade is cached per process, versioned on save
+        trading_assets_cache.watch(TradingAsset)
+        house_edge_cache.watch(HouseEdgeConfig)
+
+        scheduler.register(
+            'close-expired-trades',
+            TradeExecutionService.close_expired_trades,
+            interval=getattr(settings, 'TRADE_EXPIRY_INTERVAL', 5),
+        )
+        scheduler.register(
+            'price-refresh',
+            PriceFeedService.update_all_prices,
+            interval=getattr(settings, 'PRICE_REFRESH_INTERVAL', 30),
+        )
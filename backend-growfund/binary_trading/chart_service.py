@@ -3,7 +3,7 @@ Chart Data Service for Binary Trading
 Provides real OHLC candlestick data for all trading assets.
 
 Sources:
-  Crypto (BTC, ETH, BNB, SOL …) → CoinGecko OHLC API
+  Crypto (BTC, ETH, BNB, SOL …) → CoinGecko OHLC (cached by the quote service)
   Gold (GOLD)                    → Yahoo Finance (GC=F)
   Oil  (OIL)                     → Yahoo Finance (CL=F)
   Forex (EURUSD, GBPUSD …)       → Yahoo Finance (EURUSD=X …)
@@ -13,25 +13,9 @@ import requests
 from decimal import Decimal
 from django.utils import timezone
 from datetime import timedelta, datetime, timezone as dt_timezone
+from core.quote_service import quote_service, SYMBOLS as MARKET_SYMBOLS
 
 
-# ── CoinGecko IDs ──────────────────────────────────────────────────────────────
-COINGECKO_IDS = {
-    'BTC':  'bitcoin',
-    'ETH':  'ethereum',
-    'BNB':  'binancecoin',
-    'SOL':  'solana',
-    'ADA':  'cardano',
-    'XRP':  'ripple',
-    'DOGE': 'dogecoin',
-    'USDT': 'tether',
-    'MATIC':'matic-network',
-    'LTC':  'litecoin',
-    'AVAX': 'avalanche-2',
-    'LINK': 'chainlink',
-    'DOT':  'polkadot',
-}
-
 # ── Yahoo Finance tickers ──────────────────────────────────────────────────────
 YAHOO_TICKERS = {
     'GOLD':   'GC=F',
@@ -45,17 +29,6 @@ YAHOO_TICKERS = {
     'SP500':  '^GSPC',
 }
 
-# Interval → CoinGecko "days" param
-COINGECKO_DAYS = {
-    '1m':  1,
-    '5m':  1,
-    '15m': 1,
-    '30m': 2,
-    '1h':  7,
-    '4h':  30,
-    '1d':  90,
-}
-
 # Interval → Yahoo Finance interval string
 YAHOO_INTERVAL = {
     '1m':  '1m',
@@ -91,7 +64,7 @@ class ChartService:
         symbol = symbol.upper()
 
         # 1. Crypto via CoinGecko
-        if symbol in COINGECKO_IDS:
+        if symbol in MARKET_SYMBOLS:
             candles = cls._coingecko_ohlc(symbol, interval, limit)
             if candles:
                 return candles
@@ -109,39 +82,12 @@ class ChartService:
     @classmethod
     def _coingecko_ohlc(cls, symbol, interval, limit):
         """
-        CoinGecko /coins/{id}/ohlc returns [timestamp_ms, open, high, low, close].
-        Granularity is determined by `days`:
-          days=1  → 30-min candles
-          days≤30 → 4-hour candles
-          days≤90 → daily candles
-        We request the appropriate days and trim to `limit`.
+        CoinGecko candles from the quote service cache. The first read of a
+        series schedules it for the background poller and returns None, so
+        the caller falls through to the next source until it is cached.
         """
-        gecko_id = COINGECKO_IDS[symbol]
-        days = COINGECKO_DAYS.get(interval, 1)
-        try:
-            resp = requests.get(
-                f'https://api.coingecko.com/api/v3/coins/{gecko_id}/ohlc',
-                params={'vs_currency': 'usd', 'days': days},
-                timeout=8
-            )
-            if resp.status_code != 200:
-                return None
-            raw = resp.json()  # [[ts_ms, o, h, l, c], ...]
-            candles = [
-                {
-                    'time':   c[0] // 1000,
-                    'open':   float(c[1]),
-                    'high':   float(c[2]),
-                    'low':    float(c[3]),
-                    'close':  float(c[4]),
-                    'volume': 0,
-                }
-                for c in raw
-            ]
-            return candles[-limit:]
-        except Exception as e:
-            print(f"⚠️ CoinGecko OHLC failed for {symbol}: {e}")
-            return None
+        candles = quote_service.get_ohlc(symbol, interval)
+        return candles[-limit:] if candles else None
 
     # ── Yahoo Finance ──────────────────────────────────────────────────────────
     @classmethod
@@ -231,7 +177,7 @@ class ChartService:
         since = timezone.now() - timedelta(seconds=lookback_seconds)
 
         try:
-            asset = TradingAsset.objects.get(symbol=symbol)
+            asset = TradingAsset.get_by_symbol(symbol)
         except TradingAsset.DoesNotExist:
             return []
 
@@ -195,7 +195,7 @@ class PriceStreamConsumer(AsyncWebsocketConsumer):
         from .models import TradingAsset, AssetPrice
         
         try:
-            asset = TradingAsset.objects.get(symbol=symbol)
+            asset = TradingAsset.get_by_symbol(symbol)
             AssetPrice.objects.create(asset=asset, price=price)
         except Exception as e:
             print(f"⚠️ Failed to store price for {symbol}: {e}")
@@ -282,13 +282,14 @@ class TradeUpdatesConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def get_active_trades(self):
         """Get active trades for user"""
-        from .models import BinaryTrade
+        from .models import BinaryTrade, DemoBinaryTrade
         from .serializers import BinaryTradeSerializer
         
-        trades = BinaryTrade.objects.filter(
-            user=self.user,
-            status='active'
-        ).select_related('asset')
+        trades = [
+            trade
+            for model in (BinaryTrade, DemoBinaryTrade)
+            for trade in model.objects.filter(user=self.user, status='active').with_asset()
+        ]
         
         serializer = BinaryTradeSerializer(trades, many=True)
         return serializer.data
@@ -17,7 +17,7 @@ class HouseEdgeCalculator:
         self.stats = self._get_user_stats()
 
     def _get_config(self):
-        config = HouseEdgeConfig.objects.filter(is_active=True).first()
+        config = HouseEdgeConfig.get_active()
         if not config:
             config = HouseEdgeConfig.objects.create(name='Default', is_active=True)
         return config
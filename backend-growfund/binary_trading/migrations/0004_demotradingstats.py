@@ -11,26 +11,58 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.CreateModel(
-            name='DemoTradingStats',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('total_trades', models.IntegerField(default=0)),
-                ('total_wins', models.IntegerField(default=0)),
-                ('total_losses', models.IntegerField(default=0)),
-                ('current_win_streak', models.IntegerField(default=0)),
-                ('max_win_streak', models.IntegerField(default=0)),
-                ('total_profit', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
-                ('total_loss', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
-                ('net_profit', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
-                ('total_volume', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
-                ('created_at', models.DateTimeField(auto_now_add=True)),
-                ('updated_at', models.DateTimeField(auto_now=True)),
-                ('user', models.OneToOneField(
-                    on_delete=django.db.models.deletion.CASCADE,
-                    related_name='demo_trading_stats',
-                    to=settings.AUTH_USER_MODEL
-                )),
+        # DemoTradingStats may live in the demo database (demo/routers.py), which has no
+        # accounts_user table to reference, so the user column is created without a
+        # foreign key constraint; 0005 drops the constraint from the model as well.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='DemoTradingStats',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('total_trades', models.IntegerField(default=0)),
+                        ('total_wins', models.IntegerField(default=0)),
+                        ('total_losses', models.IntegerField(default=0)),
+                        ('current_win_streak', models.IntegerField(default=0)),
+                        ('max_win_streak', models.IntegerField(default=0)),
+                        ('total_profit', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                        ('total_loss', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                        ('net_profit', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                        ('total_volume', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                        ('created_at', models.DateTimeField(auto_now_add=True)),
+                        ('updated_at', models.DateTimeField(auto_now=True)),
+                        ('user', models.OneToOneField(
+                            on_delete=django.db.models.deletion.CASCADE,
+                            related_name='demo_trading_stats',
+                            to=settings.AUTH_USER_MODEL
+                        )),
+                    ],
+                ),
+            ],
+            database_operations=[
+                migrations.CreateModel(
+                    name='DemoTradingStats',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('total_trades', models.IntegerField(default=0)),
+                        ('total_wins', models.IntegerField(default=0)),
+                        ('total_losses', models.IntegerField(default=0)),
+                        ('current_win_streak', models.IntegerField(default=0)),
+                        ('max_win_streak', models.IntegerField(default=0)),
+                        ('total_profit', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                        ('total_loss', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                        ('net_profit', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                        ('total_volume', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                        ('created_at', models.DateTimeField(auto_now_add=True)),
+                        ('updated_at', models.DateTimeField(auto_now=True)),
+                        ('user', models.OneToOneField(
+                            db_constraint=False,
+                            on_delete=django.db.models.deletion.CASCADE,
+                            related_name='demo_trading_stats',
+                            to=settings.AUTH_USER_MODEL
+                        )),
+                    ],
+                ),
             ],
         ),
     ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('binary_trading', '0004_demotradingstats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='demotradingstats',
+            name='user',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='demo_trading_stats', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='DemoBinaryTrade',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('direction', models.CharField(choices=[('buy', 'Buy/Call'), ('sell', 'Sell/Put')], max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('strike_price', models.DecimalField(decimal_places=8, max_digits=20)),
+                ('final_price', models.DecimalField(blank=True, decimal_places=8, max_digits=20, null=True)),
+                ('base_payout_percentage', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('adjusted_payout_percentage', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('house_edge_applied', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('expiry_seconds', models.IntegerField()),
+                ('opened_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField()),
+                ('closed_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('active', 'Active'), ('won', 'Won'), ('lost', 'Lost'), ('cancelled', 'Cancelled')], default='pending', max_length=20)),
+                ('profit_loss', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('execution_delay_ms', models.IntegerField(default=0)),
+                ('user_win_streak', models.IntegerField(default=0)),
+                ('user_total_profit', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('asset', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='binary_trading.tradingasset')),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='demo_binary_trades', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-opened_at'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['user', 'status'], name='binary_trad_user_id_dc9b4c_idx'), models.Index(fields=['expires_at'], name='binary_trad_expires_e0d263_idx')],
+            },
+        ),
+    ]
@@ -2,8 +2,11 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from decimal import Decimal
+from copy import copy
 import uuid
 
+from core.config_cache import VersionedConfig
+
 User = get_user_model()
 
 
@@ -33,6 +36,19 @@ class TradingAsset(models.Model):
     
     def __str__(self):
         return f"{self.symbol} - {self.name}"
+    
+    @classmethod
+    def get_by_symbol(cls, symbol, active_only=False):
+        """Cached lookup by symbol; raises DoesNotExist like objects.get()"""
+        asset = trading_assets_cache.get().get(symbol)
+        if asset is None or (active_only and not asset.is_active):
+            raise cls.DoesNotExist(f'No trading asset {symbol}')
+        return copy(asset)
+    
+    @classmethod
+    def active_assets(cls):
+        """Cached active assets, ordered by symbol"""
+        return [copy(a) for _, a in sorted(trading_assets_cache.get().items()) if a.is_active]
 
 
 class HouseEdgeConfig(models.Model):
@@ -71,11 +87,37 @@ class HouseEdgeConfig(models.Model):
     
     def __str__(self):
         return self.name
+    
+    @classmethod
+    def get_active(cls):
+        """The active config (cached per process), or None"""
+        return copy(house_edge_cache.get())
 
 
+def _load_trading_assets():
+    return {asset.symbol: asset for asset in TradingAsset.objects.all()}
 
-class BinaryTrade(models.Model):
-    """Binary options trade"""
+
+def _load_house_edge_config():
+    return HouseEdgeConfig.objects.filter(is_active=True).first()
+
+
+trading_assets_cache = VersionedConfig('trading-assets', _load_trading_assets)
+house_edge_cache = VersionedConfig('house-edge', _load_house_edge_config)
+
+
+class BinaryTradeQuerySet(models.QuerySet):
+
+    def with_asset(self):
+        """Load each trade's asset: a join when both tables share a database, else one extra query."""
+        from django.db import router
+        if router.db_for_read(TradingAsset) == self.db:
+            return self.select_related('asset')
+        return self.prefetch_related('asset')
+
+
+class BinaryTradeBase(models.Model):
+    """Fields shared by real (``BinaryTrade``) and demo (``DemoBinaryTrade``) trades"""
     DIRECTION_CHOICES = [
         ('buy', 'Buy/Call'),
         ('sell', 'Sell/Put'),
@@ -90,11 +132,6 @@ class BinaryTrade(models.Model):
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='binary_trades')
-    asset = models.ForeignKey(TradingAsset, on_delete=models.PROTECT)
-    
-    # Demo mode flag
-    is_demo = models.BooleanField(default=False)
     
     # Trade details
     direction = models.CharField(max_length=10, choices=DIRECTION_CHOICES)
@@ -122,17 +159,52 @@ class BinaryTrade(models.Model):
     user_win_streak = models.IntegerField(default=0)
     user_total_profit = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
     
+    objects = BinaryTradeQuerySet.as_manager()
+    
     class Meta:
+        abstract = True
         ordering = ['-opened_at']
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.asset.symbol} {self.direction.upper()} ${self.amount}"
+
+
+class BinaryTrade(BinaryTradeBase):
+    """Binary options trade"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='binary_trades')
+    asset = models.ForeignKey(TradingAsset, on_delete=models.PROTECT)
+    
+    # Demo mode flag. New demo trades go to DemoBinaryTrade; rows flagged
+    # here predate it and are moved by ``manage.py move_demo_data``.
+    is_demo = models.BooleanField(default=False)
+    
+    class Meta(BinaryTradeBase.Meta):
         indexes = [
             models.Index(fields=['user', 'status']),
             models.Index(fields=['expires_at']),
         ]
-    
-    def __str__(self):
-        return f"{self.user.email} - {self.asset.symbol} {self.direction.upper()} ${self.amount}"
 
 
+class DemoBinaryTrade(BinaryTradeBase):
+    """
+    Demo binary options trade. Routed to the demo database (see
+    ``demo.routers``), so user and asset are unconstrained id columns.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name='demo_binary_trades'
+    )
+    asset = models.ForeignKey(
+        TradingAsset, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+'
+    )
+    
+    is_demo = True
+    
+    class Meta(BinaryTradeBase.Meta):
+        indexes = [
+            models.Index(fields=['user', 'status']),
+            models.Index(fields=['expires_at']),
+        ]
+
 
 class UserTradingStats(models.Model):
     """Track user trading statistics for house edge calculation"""
@@ -173,7 +245,10 @@ class UserTradingStats(models.Model):
 
 class DemoTradingStats(models.Model):
     """Track demo trading statistics — completely separate from real stats."""
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='demo_trading_stats')
+    # Lives in the demo database (see demo.routers): no cross-database constraint
+    user = models.OneToOneField(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name='demo_trading_stats'
+    )
 
     total_trades = models.IntegerField(default=0)
     total_wins = models.IntegerField(default=0)
@@ -1,7 +1,7 @@
 """
 Price Feed Service for Binary Trading
 Provides real-time price updates for assets.
-- Crypto assets (BTC, ETH) use CoinGecko API
+- Crypto assets (BTC, ETH) use the shared CoinGecko quote snapshot
 - Commodities (GOLD, OIL) use a public metals/commodities API with fallback
 - Forex (EURUSD, GBPUSD) use exchangerate API with fallback
 - All assets fall back to a seeded random walk if external APIs are unavailable
@@ -11,19 +11,10 @@ import random
 import requests
 from .models import TradingAsset, AssetPrice
 from django.utils import timezone
+from core.quote_service import quote_service, SYMBOLS as MARKET_SYMBOLS
 
-
-# CoinGecko IDs for crypto assets
-COINGECKO_IDS = {
-    'BTC': 'bitcoin',
-    'ETH': 'ethereum',
-    'BNB': 'binancecoin',
-    'SOL': 'solana',
-    'ADA': 'cardano',
-    'XRP': 'ripple',
-    'DOGE': 'dogecoin',
-    'USDT': 'tether',
-}
+# Quotes older than this are not used for trading; the random walk takes over
+MAX_QUOTE_AGE = 300
 
 # Fallback base prices (used only when all APIs fail)
 FALLBACK_PRICES = {
@@ -71,7 +62,7 @@ class PriceFeedService:
             return None
 
         try:
-            asset = TradingAsset.objects.get(symbol=asset_symbol)
+            asset = TradingAsset.get_by_symbol(asset_symbol)
             AssetPrice.objects.create(asset=asset, price=price)
         except TradingAsset.DoesNotExist:
             pass
@@ -84,22 +75,9 @@ class PriceFeedService:
         Fetch a real market price.
         Returns Decimal or None on failure.
         """
-        # --- Crypto via CoinGecko ---
-        if symbol in COINGECKO_IDS:
-            try:
-                resp = requests.get(
-                    'https://api.coingecko.com/api/v3/simple/price',
-                    params={'ids': COINGECKO_IDS[symbol], 'vs_currencies': 'usd'},
-                    timeout=5
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    usd = data.get(COINGECKO_IDS[symbol], {}).get('usd')
-                    if usd:
-                        return Decimal(str(usd))
-            except Exception as e:
-                print(f"⚠️ CoinGecko fetch failed for {symbol}: {e}")
-            return None
+        # --- Crypto via the quote snapshot (refreshed in the background) ---
+        if symbol in MARKET_SYMBOLS:
+            return quote_service.get_market_price(symbol, max_age=MAX_QUOTE_AGE)
 
         # --- Gold via metals-api (free tier) or fallback ---
         if symbol == 'GOLD':
@@ -154,7 +132,7 @@ class PriceFeedService:
         Used as a last-resort fallback for assets with no live feed (OIL, etc.)
         """
         try:
-            asset = TradingAsset.objects.get(symbol=asset_symbol)
+            asset = TradingAsset.get_by_symbol(asset_symbol)
         except TradingAsset.DoesNotExist:
             return None
 
@@ -168,7 +146,7 @@ class PriceFeedService:
     @classmethod
     def update_all_prices(cls):
         """Fetch and return current prices for all active assets."""
-        assets = TradingAsset.objects.filter(is_active=True)
+        assets = TradingAsset.active_assets()
         prices = {}
         for asset in assets:
             price = cls.get_current_price(asset.symbol)
@@ -186,7 +164,7 @@ class PriceFeedService:
         """Seed initial prices for all assets that have none stored."""
         for symbol, base_price in FALLBACK_PRICES.items():
             try:
-                asset = TradingAsset.objects.get(symbol=symbol)
+                asset = TradingAsset.get_by_symbol(symbol)
                 if not AssetPrice.objects.filter(asset=asset).exists():
                     AssetPrice.objects.create(asset=asset, price=base_price)
             except TradingAsset.DoesNotExist:
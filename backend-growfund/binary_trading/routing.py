@@ -2,22 +2,23 @@
 WebSocket URL routing for binary trading
 """
 from django.urls import path
+from core.metrics import track_websockets
 from . import consumers
 from .price_consumers import PriceStreamConsumer, MultiAssetPriceConsumer
 
 websocket_urlpatterns = [
     # Synthetic price streaming WebSocket (single asset)
-    path('ws/binary-trading/price/<str:asset_symbol>/', PriceStreamConsumer.as_asgi()),
+    path('ws/binary-trading/price/<str:asset_symbol>/', track_websockets(PriceStreamConsumer)),
     
     # Multi-asset price streaming WebSocket
-    path('ws/binary-trading/prices/multi/', MultiAssetPriceConsumer.as_asgi()),
+    path('ws/binary-trading/prices/multi/', track_websockets(MultiAssetPriceConsumer)),
     
     # Legacy price streaming WebSocket
-    path('ws/binary-trading/prices/', consumers.PriceStreamConsumer.as_asgi()),
+    path('ws/binary-trading/prices/', track_websockets(consumers.PriceStreamConsumer)),
     
     # Trade updates WebSocket
-    path('ws/binary-trading/trades/', consumers.TradeUpdatesConsumer.as_asgi()),
+    path('ws/binary-trading/trades/', track_websockets(consumers.TradeUpdatesConsumer)),
     
     # Admin monitoring WebSocket
-    path('ws/binary-trading/admin/monitor/', consumers.AdminMonitorConsumer.as_asgi()),
+    path('ws/binary-trading/admin/monitor/', track_websockets(consumers.AdminMonitorConsumer)),
 ]
@@ -29,7 +29,7 @@ class OpenTradeSerializer(serializers.Serializer):
     
     def validate_asset_symbol(self, value):
         try:
-            asset = TradingAsset.objects.get(symbol=value.upper(), is_active=True)
+            asset = TradingAsset.get_by_symbol(value.upper(), active_only=True)
         except TradingAsset.DoesNotExist:
             raise serializers.ValidationError("Asset not found or inactive")
         return value.upper()
@@ -5,20 +5,36 @@ Handles opening and closing of binary trades.
 from decimal import Decimal
 from django.utils import timezone
 from datetime import timedelta
-from django.db import transaction, models
-from .models import BinaryTrade, TradingAsset, UserTradingStats
+from django.db import DEFAULT_DB_ALIAS, transaction, models
+from core.metrics import observe_settlement
+from demo.routers import demo_db
+from .models import BinaryTrade, DemoBinaryTrade, TradingAsset, UserTradingStats
 from .house_edge import HouseEdgeCalculator
 from .price_feed import PriceFeedService
 
 
 class TradeExecutionService:
 
+    @staticmethod
+    def trade_model(is_demo=False):
+        """Real trades live in BinaryTrade, demo trades in DemoBinaryTrade (demo database)."""
+        return DemoBinaryTrade if is_demo else BinaryTrade
+
+    @staticmethod
+    def find_trade(trade_id, **filters):
+        """Look a trade up by id in the real table, then the demo one. Returns None if absent."""
+        for model in (BinaryTrade, DemoBinaryTrade):
+            trade = model.objects.filter(id=trade_id, **filters).first()
+            if trade:
+                return trade
+        return None
+
     @staticmethod
     def validate_trade_limits(user, asset, amount):
         """Validate trade against platform risk limits (real trades only)."""
         from .models import HouseEdgeConfig
 
-        config = HouseEdgeConfig.objects.filter(is_active=True).first()
+        config = HouseEdgeConfig.get_active()
         if not config:
             return True, None
 
@@ -60,7 +76,7 @@ class TradeExecutionService:
         """
         # --- Validate asset ---
         try:
-            asset = TradingAsset.objects.get(symbol=asset_symbol, is_active=True)
+            asset = TradingAsset.get_by_symbol(asset_symbol, active_only=True)
         except TradingAsset.DoesNotExist:
             return None, "Asset not found or inactive"
 
@@ -98,9 +114,9 @@ class TradeExecutionService:
         adjusted_strike = params['adjusted_strike_price']
         expires_at = timezone.now() + timedelta(seconds=expiry_seconds)
 
-        # --- Persist atomically ---
+        # --- Persist atomically (demo trades only touch the demo database) ---
         try:
-            with transaction.atomic():
+            with transaction.atomic(using=demo_db() if is_demo else DEFAULT_DB_ALIAS):
                 if is_demo:
                     from demo.models import DemoAccount
                     demo_account = DemoAccount.objects.select_for_update().get(user=user)
@@ -120,7 +136,7 @@ class TradeExecutionService:
                     # Sync the in-memory user object
                     user.balance = locked_user.balance
 
-                trade = BinaryTrade.objects.create(
+                trade = TradeExecutionService.trade_model(is_demo).objects.create(
                     user=user,
                     asset=asset,
                     direction=direction,
@@ -135,16 +151,14 @@ class TradeExecutionService:
                     execution_delay_ms=params['execution_delay_ms'],
                     user_win_streak=params['user_win_streak'],
                     user_total_profit=params['user_total_profit'],
-                    is_demo=is_demo,
                 )
 
                 # Record demo trade open in DemoTransaction history
                 if is_demo:
                     try:
                         from demo.models import DemoAccount, DemoTransaction
-                        demo_acc = DemoAccount.objects.get(user=user)
                         DemoTransaction.objects.create(
-                            demo_account=demo_acc,
+                            demo_account=demo_account,
                             transaction_type='binary_trade_open',
                             amount=amount,
                             asset=asset.symbol,
@@ -161,17 +175,22 @@ class TradeExecutionService:
         return trade, None
 
     @staticmethod
-    def close_trade(trade_id):
+    def close_trade(trade_id, is_demo=None):
         """
         Close a single trade and settle profit/loss.
-        Each close runs in its own atomic transaction.
+        Each close runs in its own atomic transaction, on the demo database
+        for demo trades. ``is_demo=None`` looks the trade up in both tables.
         Returns: (trade_object, error_message)
         """
+        if is_demo is None:
+            is_demo = not BinaryTrade.objects.filter(id=trade_id).exists()
+        model = TradeExecutionService.trade_model(is_demo)
+
         try:
-            with transaction.atomic():
+            with transaction.atomic(using=demo_db() if is_demo else DEFAULT_DB_ALIAS):
                 try:
-                    trade = BinaryTrade.objects.select_for_update().get(id=trade_id)
-                except BinaryTrade.DoesNotExist:
+                    trade = model.objects.select_for_update().get(id=trade_id)
+                except model.DoesNotExist:
                     return None, "Trade not found"
 
                 if trade.status != 'active':
@@ -193,7 +212,7 @@ class TradeExecutionService:
                 is_atm = (final_price == trade.strike_price)
                 if is_atm:
                     from .models import HouseEdgeConfig
-                    cfg = HouseEdgeConfig.objects.filter(is_active=True).first()
+                    cfg = HouseEdgeConfig.get_active()
                     atm_is_loss = cfg.atm_is_loss if cfg else True
                     if not atm_is_loss:
                         # Refund stake — neither win nor loss
@@ -202,7 +221,7 @@ class TradeExecutionService:
                         payout = trade.amount  # just return stake
                         if trade.is_demo:
                             from demo.models import DemoAccount
-                            demo_account = DemoAccount.objects.select_for_update().get(user=trade.user)
+                            demo_account = DemoAccount.objects.select_for_update().get(user_id=trade.user_id)
                             demo_account.balance += payout
                             demo_account.save(update_fields=['balance'])
                         else:
@@ -225,7 +244,7 @@ class TradeExecutionService:
 
                     if trade.is_demo:
                         from demo.models import DemoAccount
-                        demo_account = DemoAccount.objects.select_for_update().get(user=trade.user)
+                        demo_account = DemoAccount.objects.select_for_update().get(user_id=trade.user_id)
                         demo_account.balance += payout
                         demo_account.save(update_fields=['balance'])
                     else:
@@ -247,6 +266,8 @@ class TradeExecutionService:
         except Exception as e:
             return None, f"Error closing trade: {str(e)}"
 
+        observe_settlement(trade, 'binary_demo' if trade.is_demo else 'binary')
+
         # Update stats outside the transaction (non-critical, demo trades skipped)
         if not trade.is_demo:
             try:
@@ -257,7 +278,7 @@ class TradeExecutionService:
             # Record demo binary trade result in DemoTransaction history
             try:
                 from demo.models import DemoAccount, DemoTransaction
-                demo_acc = DemoAccount.objects.get(user=trade.user)
+                demo_acc = DemoAccount.objects.get(user_id=trade.user_id)
                 tx_type = 'binary_trade_win' if trade.status == 'won' else 'binary_trade_loss'
                 pnl = trade.profit_loss if trade.profit_loss else Decimal('0')
                 DemoTransaction.objects.create(
@@ -328,8 +349,8 @@ class TradeExecutionService:
         from django.db import transaction as _tx
         from .models import DemoTradingStats
 
-        with _tx.atomic():
-            stats, _ = DemoTradingStats.objects.select_for_update().get_or_create(user=trade.user)
+        with _tx.atomic(using=demo_db()):
+            stats, _ = DemoTradingStats.objects.select_for_update().get_or_create(user_id=trade.user_id)
 
             stats.total_trades = F('total_trades') + 1
             stats.total_volume = F('total_volume') + trade.amount
@@ -356,15 +377,20 @@ class TradeExecutionService:
         Each trade is closed in its own transaction so one failure
         does not roll back the others.
         """
-        expired = BinaryTrade.objects.filter(
-            status='active',
-            expires_at__lte=timezone.now()
-        ).values_list('id', flat=True)
+        now = timezone.now()
+        expired = [
+            (trade_id, model is DemoBinaryTrade)
+            for model in (BinaryTrade, DemoBinaryTrade)
+            for trade_id in model.objects.filter(
+                status='active',
+                expires_at__lte=now
+            ).values_list('id', flat=True)
+        ]
 
         results = {'closed': 0, 'errors': 0, 'error_details': []}
 
-        for trade_id in expired:
-            _, error = TradeExecutionService.close_trade(trade_id)
+        for trade_id, is_demo in expired:
+            _, error = TradeExecutionService.close_trade(trade_id, is_demo=is_demo)
             if error:
                 results['errors'] += 1
                 results['error_details'].append({'trade_id': str(trade_id), 'error': error})
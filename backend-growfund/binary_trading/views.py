@@ -4,20 +4,23 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.utils import timezone
 from decimal import Decimal
-from .models import TradingAsset, BinaryTrade, UserTradingStats, AssetPrice
+from .models import TradingAsset, BinaryTrade, UserTradingStats, AssetPrice, trading_assets_cache
 from .serializers import (
     TradingAssetSerializer, OpenTradeSerializer, BinaryTradeSerializer,
     UserTradingStatsSerializer, DemoTradingStatsSerializer, AssetPriceSerializer
 )
 from .trade_service import TradeExecutionService
 from .price_feed import PriceFeedService
+from core.cache import cache_response
+from core.conditional import conditional
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(keys=[trading_assets_cache.version_key], per_user=False)
 def get_assets(request):
     """Get all available trading assets"""
-    assets = TradingAsset.objects.filter(is_active=True)
+    assets = TradingAsset.active_assets()
     serializer = TradingAssetSerializer(assets, many=True)
     return Response({
         'success': True,
@@ -121,11 +124,10 @@ def get_active_trades(request):
     """Get all active trades for the user (real and demo separated)"""
     is_demo = request.GET.get('is_demo', 'false').lower() == 'true'
     
-    trades = BinaryTrade.objects.filter(
+    trades = TradeExecutionService.trade_model(is_demo).objects.filter(
         user=request.user,
-        status='active',
-        is_demo=is_demo
-    ).select_related('asset')
+        status='active'
+    ).with_asset()
     
     serializer = BinaryTradeSerializer(trades, many=True)
     
@@ -149,11 +151,10 @@ def get_trade_history(request):
     offset = int(request.GET.get('offset', 0))
     is_demo = request.GET.get('is_demo', 'false').lower() == 'true'
 
-    base_qs = BinaryTrade.objects.filter(
+    base_qs = TradeExecutionService.trade_model(is_demo).objects.filter(
         user=request.user,
-        status__in=['won', 'lost', 'cancelled'],
-        is_demo=is_demo
-    ).select_related('asset').order_by('-closed_at', '-opened_at')
+        status__in=['won', 'lost', 'cancelled']
+    ).with_asset().order_by('-closed_at', '-opened_at')
 
     trades = base_qs[offset:offset + limit]
     serializer = BinaryTradeSerializer(trades, many=True)
@@ -241,9 +242,8 @@ def close_trade(request, trade_id):
     Called by the frontend when the countdown timer reaches zero.
     Users can only close their own trades.
     """
-    try:
-        trade = BinaryTrade.objects.get(id=trade_id, user=request.user)
-    except BinaryTrade.DoesNotExist:
+    trade = TradeExecutionService.find_trade(trade_id, user=request.user)
+    if trade is None:
         return Response({'success': False, 'error': 'Trade not found'}, status=status.HTTP_404_NOT_FOUND)
 
     if trade.status != 'active':
@@ -259,7 +259,7 @@ def close_trade(request, trade_id):
             'error': f'Trade expires in {int(seconds_remaining)}s'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    closed_trade, error = TradeExecutionService.close_trade(trade_id)
+    closed_trade, error = TradeExecutionService.close_trade(trade_id, is_demo=trade.is_demo)
     if error:
         return Response({'success': False, 'error': error}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -346,6 +346,7 @@ def get_balances(request):
 
 
 @api_view(['GET'])
+@cache_response(ttl=5, per_user=False)
 def get_recent_winners(request):
     """
     Get recent winning trades for display (public endpoint).
@@ -367,6 +368,7 @@ def get_recent_winners(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response(ttl=5, per_user=False)
 def get_live_feed(request):
     """
     Get live trading activity feed.
@@ -0,0 +1,33 @@
+from django.contrib import admin
+from .models import SchedulerLease, Job, DailyRollup
+
+
+@admin.register(SchedulerLease)
+class SchedulerLeaseAdmin(admin.ModelAdmin):
+    list_display = ['name', 'holder', 'acquired_at', 'renewed_at', 'expires_at']
+    readonly_fields = ['name', 'holder', 'acquired_at', 'renewed_at', 'expires_at']
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task', 'queue', 'status', 'priority', 'attempts', 'run_at', 'finished_at']
+    list_filter = ['status', 'queue']
+    search_fields = ['task', 'last_error']
+    readonly_fields = ['created_at', 'updated_at', 'finished_at', 'locked_by', 'locked_at']
+    actions = ['requeue']
+
+    def requeue(self, request, queryset):
+        from django.utils import timezone
+        updated = queryset.exclude(status='running').update(
+            status='queued', run_at=timezone.now(), attempts=0, last_error=''
+        )
+        self.message_user(request, f'{updated} job(s) requeued')
+    requeue.short_description = 'Requeue selected jobs'
+
+
+@admin.register(DailyRollup)
+class DailyRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'metric', 'dimension', 'count', 'amount', 'updated_at']
+    list_filter = ['metric']
+    date_hierarchy = 'date'
+    readonly_fields = ['metric', 'date', 'dimension', 'count', 'amount', 'updated_at']
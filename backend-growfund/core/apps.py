@@ -0,0 +1,59 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+    verbose_name = 'Platform Infrastructure'
+
+    def ready(self):
+        from django.conf import settings
+        from django.utils.module_loading import autodiscover_modules
+        from .scheduler import should_autostart, scheduler
+        from .jobs import requeue_stale_jobs, purge_finished_jobs
+        from .quote_service import quote_service
+        from .rollups import rollups
+
+        # Register @job functions declared in each app's tasks.py
+        autodiscover_modules('tasks')
+
+        rollups.connect()
+
+        scheduler.register('requeue-stale-jobs', requeue_stale_jobs, interval=60)
+        scheduler.register('purge-finished-jobs', purge_finished_jobs, interval=3600)
+        scheduler.register(
+            'market-quotes', quote_service.refresh,
+            interval=getattr(settings, 'MARKET_DATA_INTERVAL', 30),
+        )
+        scheduler.register(
+            'market-ohlc', quote_service.refresh_ohlc,
+            interval=getattr(settings, 'MARKET_OHLC_TICK', 60),
+        )
+        scheduler.register(
+            'rollup-reconcile', rollups.reconcile_recent,
+            interval=getattr(settings, 'ROLLUP_RECONCILE_INTERVAL', 3600),
+        )
+
+        if should_autostart():
+            start_background_threads()
+
+
+def start_background_threads():
+    """
+    Start the leader-elected background scheduler and the embedded job
+    workers in this process. Every process gets a scheduler thread, but only
+    the lease holder actually runs jobs. Called from ``ready()``, or from
+    gunicorn's ``post_worker_init`` hook when the app is preloaded.
+    """
+    from django.conf import settings
+    from .jobs import start_embedded_workers
+    from .scheduler import scheduler
+
+    try:
+        scheduler.start()
+        start_embedded_workers(getattr(settings, 'JOB_WORKER_THREADS', 1))
+    except Exception as e:
+        # Silently fail if database isn't ready yet
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.debug(f'Background scheduler not started: {e}')
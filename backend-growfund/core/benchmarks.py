@@ -0,0 +1,210 @@
+"""
+Endpoint benchmark scenarios and measurement, used by ``run_benchmarks``.
+
+Each ``Scenario`` is one request against a hot endpoint, sent in-process
+through the Django test client (the full middleware stack, no network).
+``prepare`` runs before every iteration outside the timed region, e.g. to
+give ``binary_close`` an open trade to close. For every scenario we record
+latency percentiles, the number of queries per request (all databases)
+and the peak Python memory allocated while serving it (one extra run under
+``tracemalloc``, which is too slow to leave on for the timed runs).
+
+Query counts and status codes are the same on every machine, so ``compare``
+gates on them anywhere (CI included). Latency and memory depend on the host:
+``compare_timing`` is only meaningful against baselines recorded on the same
+host, and only gates p95 when both sides have ``MIN_P95_SAMPLES`` timings.
+"""
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Optional
+
+from django.db import connections
+from django.utils import timezone
+
+from .instrumentation import QueryRecorder
+
+# Below this many timings the "p95" is just one of the slowest two or three
+# requests, i.e. noise
+MIN_P95_SAMPLES = 40
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: object  # str, or callable(ctx) -> str
+    as_admin: bool = False
+    data: Optional[Callable] = None
+    prepare: Optional[Callable] = None
+    iterations: Optional[int] = None  # overrides the run's default (login hashes a password)
+    authenticated: bool = True
+
+
+@dataclass
+class Result:
+    name: str
+    timings: list = field(default_factory=list)
+    queries: int = 0
+    peak_kb: int = 0
+    status: int = 0
+
+    def percentile(self, p):
+        ordered = sorted(self.timings)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self):
+        return {
+            'p50_ms': round(self.percentile(50), 2),
+            'p95_ms': round(self.percentile(95), 2),
+            'p99_ms': round(self.percentile(99), 2),
+            'mean_ms': round(sum(self.timings) / len(self.timings), 2) if self.timings else 0.0,
+            'samples': len(self.timings),
+            'queries': self.queries,
+            'peak_kb': self.peak_kb,
+            'status': self.status,
+        }
+
+
+# ----------------------------------------------------------------------
+# Scenario hooks; ``ctx`` holds the bench users, clients and fresh prices
+# ----------------------------------------------------------------------
+
+def _fresh_price(ctx):
+    """Binary trades need a price tick younger than PriceFeedService.PRICE_TTL."""
+    from binary_trading.models import AssetPrice
+    AssetPrice.objects.create(asset=ctx['asset'], price=ctx['price'])
+
+
+def _prepare_open(ctx):
+    from binary_trading.models import BinaryTrade
+    _fresh_price(ctx)
+    # Stay under max_open_trades_per_user
+    BinaryTrade.objects.filter(user=ctx['user'], status='active').update(status='cancelled')
+
+
+def _prepare_close(ctx):
+    from binary_trading.models import BinaryTrade
+    from binary_trading.trade_service import TradeExecutionService
+    _prepare_open(ctx)
+    trade, error = TradeExecutionService.open_trade(
+        ctx['user'], ctx['asset'].symbol, 'buy', Decimal('10.00'), 60
+    )
+    if error:
+        raise RuntimeError(f'Could not open a trade to close: {error}')
+    # The view only settles trades at (or just before) expiry
+    BinaryTrade.objects.filter(id=trade.id).update(expires_at=timezone.now())
+    ctx['trade_id'] = trade.id
+
+
+def _open_payload(ctx):
+    return {'asset_symbol': ctx['asset'].symbol, 'direction': 'buy', 'amount': '10.00', 'expiry_seconds': 60}
+
+
+SCENARIOS = [
+    Scenario(
+        'login', 'post', '/api/auth/login/', authenticated=False, iterations=10,
+        data=lambda ctx: {'email': ctx['user'].email, 'password': ctx['password']},
+    ),
+    Scenario('me', 'get', '/api/auth/me/'),
+    Scenario('dashboard_stats', 'get', '/api/auth/dashboard-stats/'),
+    Scenario('transactions', 'get', '/api/transactions/'),
+    Scenario('notifications', 'get', '/api/notifications/'),
+    Scenario('portfolio', 'get', '/api/investments/portfolio/'),
+    Scenario('binary_history', 'get', '/api/binary/trades/history/'),
+    Scenario('binary_open', 'post', '/api/binary/trades/open/', data=_open_payload, prepare=_prepare_open),
+    Scenario(
+        'binary_close', 'post', lambda ctx: f'/api/binary/trades/{ctx["trade_id"]}/close/',
+        prepare=_prepare_close,
+    ),
+    Scenario('admin_dashboard', 'get', '/api/auth/admin/dashboard/', as_admin=True),
+    Scenario('admin_users', 'get', '/api/auth/admin/users/', as_admin=True),
+    Scenario('admin_investments', 'get', '/api/admin/investments/', as_admin=True),
+    Scenario('admin_transactions', 'get', '/api/admin/transactions/', as_admin=True),
+]
+
+
+def _send(scenario, ctx):
+    client = ctx['admin_client'] if scenario.as_admin else ctx['client'] if scenario.authenticated else ctx['anon_client']
+    path = scenario.path(ctx) if callable(scenario.path) else scenario.path
+    kwargs = {}
+    if scenario.data:
+        kwargs = {'data': scenario.data(ctx), 'content_type': 'application/json'}
+    response = getattr(client, scenario.method)(path, **kwargs)
+    if response.streaming:
+        # Streamed exports do their work while being consumed
+        b''.join(response.streaming_content)
+    else:
+        response.content
+    return response
+
+
+def run_scenario(scenario, ctx, iterations, warmup=2):
+    """Warm up, time ``iterations`` requests, then one counted and one traced request."""
+    result = Result(scenario.name)
+    iterations = scenario.iterations or iterations
+
+    for _ in range(warmup):
+        if scenario.prepare:
+            scenario.prepare(ctx)
+        _send(scenario, ctx)
+
+    for _ in range(iterations):
+        if scenario.prepare:
+            scenario.prepare(ctx)
+        started = time.perf_counter()
+        response = _send(scenario, ctx)
+        result.timings.append((time.perf_counter() - started) * 1000)
+        result.status = response.status_code
+
+    if scenario.prepare:
+        scenario.prepare(ctx)
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        _send(scenario, ctx)
+    result.queries = recorder.count
+
+    if scenario.prepare:
+        scenario.prepare(ctx)
+    tracemalloc.start()
+    try:
+        _send(scenario, ctx)
+        result.peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def compare(current, baseline, query_slack=0):
+    """Regressions of ``current`` (a summary dict) against ``baseline`` that hold on any host: queries and status."""
+    problems = []
+    if current['queries'] > baseline['queries'] + query_slack:
+        problems.append(f"queries {baseline['queries']} -> {current['queries']}")
+    if current['status'] != baseline.get('status', current['status']):
+        problems.append(f"status {baseline['status']} -> {current['status']}")
+    return problems
+
+
+def compare_timing(current, baseline, latency_threshold, memory_threshold, latency_floor_ms=2.0):
+    """
+    p95 and peak memory regressions, for baselines recorded on the same host.
+    p95 is skipped when either side has fewer than ``MIN_P95_SAMPLES`` timings;
+    ``latency_floor_ms`` keeps timer noise on sub-millisecond endpoints from
+    failing a run.
+    """
+    problems = []
+    if min(current.get('samples', 0), baseline.get('samples', 0)) >= MIN_P95_SAMPLES:
+        limit = max(baseline['p95_ms'] * (1 + latency_threshold), baseline['p95_ms'] + latency_floor_ms)
+        if current['p95_ms'] > limit:
+            problems.append(f"p95 {baseline['p95_ms']}ms -> {current['p95_ms']}ms (limit {limit:.1f}ms)")
+    limit = baseline['peak_kb'] * (1 + memory_threshold)
+    if baseline['peak_kb'] and current['peak_kb'] > limit:
+        problems.append(f"peak memory {baseline['peak_kb']}KB -> {current['peak_kb']}KB (limit {limit:.0f}KB)")
+    return problems
@@ -0,0 +1,315 @@
+"""
+Two-level cache: an in-process LRU in front of Django's shared cache.
+
+The shared tier is whatever ``CACHES['default']`` is (Redis in production, the
+file cache under ``CACHE_DIR`` locally). Each process also keeps the most
+recently used entries in memory for at most ``CACHE_LOCAL_TTL`` seconds, so a
+hot key costs no I/O at all; after that the entry is read again from the
+shared tier.
+
+Entries can carry tags. ``invalidate_tags`` bumps a shared version per tag
+(``bump_versions``, also used by the other versioned caches) once the
+transaction commits; an entry stored under an older tag version is
+treated as missing. The invalidating process drops its local copies at
+once, other workers within ``CACHE_LOCAL_TTL``.
+
+``get_or_compute`` is single-flight: threads of one process wait on a lock
+for the key, and processes coordinate through a short shared lock, so an
+expired hot key is computed once instead of by every concurrent request.
+
+    from core.cache import cache_response, cached, invalidate_tags, tiered_cache
+
+    stats = tiered_cache.get_or_compute('admin:stats', build_stats, ttl=60, tags=['transactions'])
+
+    @cached(ttl=300, tags=['assets'])
+    def asset_summary(symbol): ...
+
+    @api_view(['GET'])
+    @cache_response(ttl=5, per_user=False)
+    def get_live_feed(request): ...
+
+    invalidate_tags('transactions')                # after a write
+    invalidate_on_change(Transaction, lambda t: [f'transactions:user:{t.user_id}'])
+
+Cached values are shared by every thread in the process; don't mutate them.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+_MISSING = object()
+
+KEY_PREFIX = 'tc'
+LOCK_STRIPES = 64
+
+
+def _tag_key(tag):
+    return f'{KEY_PREFIX}:tag:{tag}'
+
+
+def _entry_key(key):
+    return f'{KEY_PREFIX}:{key}'
+
+
+class LocalLRU:
+    """Thread-safe in-memory LRU whose entries expire after their own TTL."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            value, expires, tags = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, tags=()):
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl, frozenset(tags))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def drop_tags(self, tags):
+        tags = set(tags)
+        with self._lock:
+            for key in [k for k, item in self._data.items() if item[2] & tags]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache:
+    """Local LRU + shared cache with tag versions and single-flight fills."""
+
+    def __init__(self, max_entries=None):
+        if max_entries is None:
+            max_entries = getattr(settings, 'CACHE_LOCAL_MAX_ENTRIES', 1024)
+        self.local = LocalLRU(max_entries)
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    @property
+    def local_ttl(self):
+        return getattr(settings, 'CACHE_LOCAL_TTL', 5)
+
+    @property
+    def lock_timeout(self):
+        return getattr(settings, 'CACHE_FILL_LOCK_TIMEOUT', 10)
+
+    def _read(self, key, tags=()):
+        """(value or _MISSING, current tag versions)."""
+        value = self.local.get(key)
+        if value is not _MISSING:
+            return value, None
+
+        tag_keys = [_tag_key(tag) for tag in tags]
+        found = cache.get_many([_entry_key(key), *tag_keys])
+        versions = {tag: found.get(_tag_key(tag), 0) for tag in tags}
+        entry = found.get(_entry_key(key))
+        if entry is None:
+            return _MISSING, versions
+
+        stored = entry['tags']
+        unknown = [tag for tag in stored if tag not in versions]
+        if unknown:
+            # Tags the caller didn't name (a plain ``get``)
+            more = cache.get_many([_tag_key(tag) for tag in unknown])
+            versions.update({tag: more.get(_tag_key(tag), 0) for tag in unknown})
+        if any(versions[tag] != version for tag, version in stored.items()):
+            return _MISSING, versions
+
+        self.local.set(key, entry['value'], min(self.local_ttl, entry['ttl'] or self.local_ttl), stored)
+        return entry['value'], versions
+
+    def get(self, key, default=None):
+        value, _ = self._read(key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value, ttl=300, tags=(), versions=None):
+        """
+        Store ``value`` for ``ttl`` seconds (``None``: no expiry). ``versions``
+        are the tag versions read before ``value`` was computed; by default
+        the current ones.
+        """
+        tags = list(tags)
+        if versions is None:
+            found = cache.get_many([_tag_key(tag) for tag in tags])
+            versions = {tag: found.get(_tag_key(tag), 0) for tag in tags}
+        entry = {'value': value, 'ttl': ttl, 'tags': {tag: versions.get(tag, 0) for tag in tags}}
+        cache.set(_entry_key(key), entry, ttl)
+        self.local.set(key, value, min(self.local_ttl, ttl or self.local_ttl), tags)
+
+    def delete(self, key):
+        self.local.delete(key)
+        cache.delete(_entry_key(key))
+
+    def get_or_compute(self, key, compute, ttl=300, tags=()):
+        """Cached value of ``key``, calling ``compute()`` once across concurrent misses."""
+        tags = list(tags)
+        value, versions = self._read(key, tags)
+        if value is not _MISSING:
+            return value
+
+        with self._locks[hash(key) % LOCK_STRIPES]:
+            # Another thread may have filled it while this one waited
+            value, versions = self._read(key, tags)
+            if value is not _MISSING:
+                return value
+
+            lock_key = f'{KEY_PREFIX}:lock:{key}'
+            if not cache.add(lock_key, 1, self.lock_timeout):
+                # Another process is computing it; use its result if it lands in time
+                deadline = time.monotonic() + self.lock_timeout
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    value, versions = self._read(key, tags)
+                    if value is not _MISSING:
+                        return value
+                lock_key = None
+
+            try:
+                value = compute()
+                self.set(key, value, ttl, tags, versions)
+            finally:
+                if lock_key:
+                    cache.delete(lock_key)
+            return value
+
+    def invalidate_tags(self, *tags):
+        """Expire every entry carrying one of ``tags`` once the transaction commits."""
+        tags = [tag for tag in tags if tag]
+        if not tags:
+            return
+        self.local.drop_tags(tags)
+
+        def bump():
+            bump_versions(*[_tag_key(tag) for tag in tags])
+            self.local.drop_tags(tags)
+
+        transaction.on_commit(bump)
+
+
+def bump_versions(*keys):
+    """
+    Increment shared version counters, which never expire. ``add`` creates a
+    missing counter so ``incr`` has something to increment; a counter evicted
+    in between is recreated at 1.
+    """
+    for key in keys:
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+tiered_cache = TieredCache()
+
+
+def invalidate_tags(*tags):
+    tiered_cache.invalidate_tags(*tags)
+
+
+def invalidate_on_change(model, tags):
+    """
+    Invalidate ``tags`` whenever a row of ``model`` is saved or deleted;
+    ``tags`` may be a callable taking the instance. Call from
+    ``AppConfig.ready()``. ``update()``/``bulk_*`` writes send no signals.
+    """
+    from django.db.models.signals import post_delete, post_save
+
+    def changed(sender, instance, **kwargs):
+        invalidate_tags(*(tags(instance) if callable(tags) else tags))
+
+    uid = f'{KEY_PREFIX}:watch:{model._meta.label}:{getattr(tags, "__qualname__", tags)}'
+    post_save.connect(changed, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(changed, sender=model, weak=False, dispatch_uid=uid)
+
+
+def _digest(*parts):
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def cached(ttl=300, tags=(), key=None):
+    """
+    Cache a service function's result by its arguments, which need a stable
+    ``repr`` (ids, strings, numbers). ``key`` and ``tags`` may be callables
+    taking the same arguments. ``func.invalidate(*args)`` drops one entry.
+    """
+    def decorator(func):
+        name = f'fn:{func.__module__}.{func.__qualname__}'
+
+        def make_key(args, kwargs):
+            if callable(key):
+                return f'{name}:{key(*args, **kwargs)}'
+            return f'{name}:{_digest(args, sorted(kwargs.items()))}'
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            entry_tags = tags(*args, **kwargs) if callable(tags) else tags
+            return tiered_cache.get_or_compute(
+                make_key(args, kwargs), lambda: func(*args, **kwargs), ttl=ttl, tags=entry_tags
+            )
+
+        wrapper.invalidate = lambda *args, **kwargs: tiered_cache.delete(make_key(args, kwargs))
+        return wrapper
+    return decorator
+
+
+def cache_response(ttl=60, tags=(), per_user=True):
+    """
+    Cache successful GET responses of a DRF view (below ``@api_view``, or on
+    an ``APIView`` method). The key is the path and query string, plus the
+    user id when ``per_user``. ``tags`` may be a callable taking the request.
+    """
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+
+    def decorator(view):
+        name = f'view:{view.__module__}.{view.__qualname__}'
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, Request))
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            user_id = getattr(request.user, 'pk', None) if per_user else None
+            key = f'{name}:{_digest(request.path, sorted(request.query_params.lists()), user_id)}'
+            entry_tags = tags(request) if callable(tags) else tags
+
+            value, versions = tiered_cache._read(key, entry_tags)
+            if value is not _MISSING:
+                return Response(value)
+
+            response = view(*args, **kwargs)
+            if response.status_code == 200 and not response.exception:
+                tiered_cache.set(key, response.data, ttl, entry_tags, versions)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,104 @@
+"""
+Conditional GET (ETag / Last-Modified) for read-heavy DRF views.
+
+``@conditional`` (below ``@api_view``, or on an ``APIView`` method) derives
+the ETag from version counters that writers already bump: ``core.cache``
+tags, ``VersionedConfig`` stamps or any other counter key in the shared
+cache, all read with one ``get_many``. When the client's ``If-None-Match``
+(or ``If-Modified-Since``) still matches, the view body never runs: the
+client gets an empty 304 after authentication and permission checks but
+before any query or serializer. Otherwise the view runs and its 200
+response carries the validators.
+
+    @api_view(['GET'])
+    @conditional(keys=[trading_assets_cache.version_key], per_user=False)
+    def get_assets(request): ...
+
+    @conditional(tags=lambda request: [history_tag(request.user.pk)])
+    def get(self, request): ...
+
+The ETag also covers the path and query string, the negotiated format and,
+with ``per_user``, the user, so pages and users never share a validator.
+``extra`` adds cheap request-time state (e.g. a snapshot timestamp) and
+``last_modified`` returns a datetime for ``Last-Modified``. Responses get
+``Cache-Control: no-cache`` (``private`` for authenticated users), so
+browsers revalidate instead of reusing them blindly.
+
+A counter missing from the cache (never bumped, or evicted) is seeded with
+a fresh value rather than read as 0, so an eviction can't bring back a
+version that an old ETag was built from.
+"""
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .cache import _digest, _tag_key
+
+
+def read_versions(keys):
+    """Current value of each counter in ``keys``, seeding absent ones."""
+    keys = list(keys)
+    if not keys:
+        return []
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        seed = time.time_ns() // 1000
+        for key in missing:
+            cache.add(key, seed, None)
+        found.update(cache.get_many(missing))
+    return [found.get(key) for key in keys]
+
+
+def conditional(tags=(), keys=(), extra=None, last_modified=None, per_user=True):
+    """
+    Answer unchanged GETs with 304 (see module docstring). ``tags`` and
+    ``keys`` may be callables taking the view's arguments; ``extra`` and
+    ``last_modified`` must be.
+    """
+    from rest_framework.request import Request
+
+    def decorator(view):
+        name = f'{view.__module__}.{view.__qualname__}'
+
+        def resolve(value, args, kwargs):
+            return value(*args, **kwargs) if callable(value) else value
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, Request))
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            view_args = args[args.index(request):]
+            counter_keys = [_tag_key(tag) for tag in resolve(tags, view_args, kwargs)]
+            counter_keys += list(resolve(keys, view_args, kwargs))
+            etag = quote_etag(_digest(
+                name,
+                request.get_full_path(),
+                request.accepted_renderer.format,
+                getattr(request.user, 'pk', None) if per_user else None,
+                read_versions(counter_keys),
+                extra(*view_args, **kwargs) if extra else None,
+            ))
+            modified = last_modified(*view_args, **kwargs) if last_modified else None
+            timestamp = int(modified.timestamp()) if modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(*args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True, no_cache=True)
+            else:
+                patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,87 @@
+"""
+Process-local cache for slowly changing configuration rows.
+
+Platform settings, the active house-edge config and the trading asset list
+are read on every trade and settlement but change a few times a day. Each
+``VersionedConfig`` keeps the loaded value in process memory and trusts it
+for ``CONFIG_CACHE_CHECK_INTERVAL`` seconds; after that one shared-cache read
+of the config's version stamp says whether it is still current. Saving or
+deleting a watched model bumps the stamp once the transaction commits, so
+the writing process sees the change at once and every other worker within
+the check interval.
+
+    platform_settings = VersionedConfig('platform-settings', load_settings)
+    platform_settings.watch(PlatformSettings)      # from AppConfig.ready()
+
+    platform_settings.get()                        # no I/O on a warm hit
+
+Values are shared by every thread in the process; accessors hand out
+copies (see ``PlatformSettings.get_settings``) so callers can't mutate the
+cached instance.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import bump_versions
+
+_MISSING = object()
+
+
+class VersionedConfig:
+    """One cached config value, reloaded when its shared version changes."""
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self._value = _MISSING
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version_key(self):
+        return f'config:{self.name}:version'
+
+    @property
+    def check_interval(self):
+        return getattr(settings, 'CONFIG_CACHE_CHECK_INTERVAL', 2)
+
+    def get(self):
+        now = time.monotonic()
+        value = self._value
+        if value is not _MISSING and now - self._checked_at < self.check_interval:
+            return value
+
+        # Read the version before loading: a bump during the load makes the
+        # next check reload instead of keeping what may be the old row
+        version = cache.get(self.version_key, 0)
+        if value is _MISSING or version != self._version:
+            with self._lock:
+                value = self.loader()
+                self._value, self._version = value, version
+        self._checked_at = now
+        return value
+
+    def invalidate(self):
+        """Drop the local copy and bump the shared version after commit."""
+        self._value = _MISSING
+        transaction.on_commit(self._bump)
+
+    def _bump(self):
+        self._value = _MISSING
+        bump_versions(self.version_key)
+
+    def watch(self, *models):
+        """Invalidate whenever a row of ``models`` is saved or deleted."""
+        def changed(sender, **kwargs):
+            self.invalidate()
+
+        for model in models:
+            uid = f'config:{self.name}:{model._meta.label}'
+            post_save.connect(changed, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(changed, sender=model, weak=False, dispatch_uid=uid)
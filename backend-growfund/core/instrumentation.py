@@ -0,0 +1,244 @@
+"""
+Per-request query count and timing.
+
+``RequestTimingMiddleware`` wraps every database connection for the length
+of a request and records the number of queries, the time spent in them,
+the rest of the time (Python) and the response size (0 for streamed
+responses). It adds a ``Server-Timing`` header, which browser dev tools
+show next to the request:
+
+    Server-Timing: db;dur=12.4;desc="7 queries", app;dur=30.1, total;dur=42.5
+
+Requests slower than ``SLOW_REQUEST_MS`` or running more than
+``SLOW_REQUEST_QUERIES`` queries are logged with their most frequent query
+fingerprints (SQL with the literals replaced by ``?``), which shows N+1
+loops at a glance.
+
+Every request is also counted per endpoint (method and URL pattern) in
+one-minute buckets. Each process flushes its buckets to the shared cache
+every ``REQUEST_STATS_FLUSH_INTERVAL`` seconds under its own slot, and
+``request_stats.worst()`` merges the slots of every worker over the last
+``REQUEST_STATS_WINDOW`` minutes (served at ``/api/admin/request-stats/``).
+"""
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .metrics import REQUEST_LATENCY
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """``sql`` with literals replaced, so repeats of one query compare equal."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _SPACE.sub(' ', sql).strip()[:300]
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that counts and times queries by fingerprint."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.by_fingerprint = defaultdict(lambda: [0, 0.0])
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            entry = self.by_fingerprint[sql]
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def top(self, limit=5):
+        """Most repeated query shapes as (count, ms, fingerprint)."""
+        merged = defaultdict(lambda: [0, 0.0])
+        for sql, (count, duration) in self.by_fingerprint.items():
+            entry = merged[fingerprint(sql)]
+            entry[0] += count
+            entry[1] += duration
+        ranked = sorted(merged.items(), key=lambda item: (item[1][0], item[1][1]), reverse=True)
+        return [(count, round(duration * 1000, 1), sql) for sql, (count, duration) in ranked[:limit]]
+
+
+# Per endpoint and minute: requests, total ms, max ms, db ms, queries, max queries, bytes, slow
+FIELDS = ['requests', 'total_ms', 'max_ms', 'db_ms', 'queries', 'max_queries', 'bytes', 'slow']
+
+
+class RequestStats:
+    """Per-endpoint request totals in one-minute buckets, shared through the cache."""
+
+    def __init__(self):
+        self._buckets = defaultdict(dict)
+        self._slots = {}
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def window(self):
+        return getattr(settings, 'REQUEST_STATS_WINDOW', 60)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'REQUEST_STATS_FLUSH_INTERVAL', 10)
+
+    def record(self, endpoint, total_ms, db_ms, queries, size, slow):
+        minute = int(time.time() // 60)
+        with self._lock:
+            row = self._buckets[minute].get(endpoint)
+            if row is None:
+                row = self._buckets[minute][endpoint] = [0] * len(FIELDS)
+            row[0] += 1
+            row[1] += total_ms
+            row[2] = max(row[2], total_ms)
+            row[3] += db_ms
+            row[4] += queries
+            row[5] = max(row[5], queries)
+            row[6] += size
+            row[7] += int(slow)
+
+        if time.monotonic() - self._flushed_at > self.flush_interval:
+            self.flush()
+
+    def _slot(self, minute):
+        """This process's slot number in ``minute``, allocated from a shared counter."""
+        slot = self._slots.get(minute)
+        if slot is None:
+            key = f'reqstats:{minute}:slots'
+            cache.add(key, 0, self.window * 60 + 120)
+            try:
+                slot = cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, self.window * 60 + 120)
+                slot = 1
+            self._slots[minute] = slot
+        return slot
+
+    def flush(self):
+        """Write this process's buckets to its shared slots and drop expired ones."""
+        self._flushed_at = time.monotonic()
+        oldest = int(time.time() // 60) - self.window
+        with self._lock:
+            for minute in [m for m in self._buckets if m < oldest]:
+                del self._buckets[minute]
+            for minute in [m for m in self._slots if m < oldest]:
+                del self._slots[minute]
+            try:
+                cache.set_many(
+                    {
+                        f'reqstats:{minute}:{self._slot(minute)}': {k: list(v) for k, v in rows.items()}
+                        for minute, rows in self._buckets.items()
+                    },
+                    self.window * 60 + 120,
+                )
+            except Exception as e:
+                logger.warning(f'Request stats flush failed: {e}')
+
+    def worst(self, minutes=None, order_by='total_ms', limit=20):
+        """Endpoints of every worker over the last ``minutes``, worst first."""
+        self.flush()
+        minutes = min(minutes or self.window, self.window)
+        now = int(time.time() // 60)
+        window = range(now - minutes + 1, now + 1)
+
+        counts = cache.get_many([f'reqstats:{minute}:slots' for minute in window])
+        keys = [
+            f'reqstats:{minute}:{slot}'
+            for minute in window
+            for slot in range(1, counts.get(f'reqstats:{minute}:slots', 0) + 1)
+        ]
+        totals = defaultdict(lambda: [0] * len(FIELDS))
+        for rows in cache.get_many(keys).values():
+            for endpoint, row in rows.items():
+                total = totals[endpoint]
+                for i, value in enumerate(row):
+                    total[i] = max(total[i], value) if FIELDS[i].startswith('max_') else total[i] + value
+
+        results = []
+        for endpoint, row in totals.items():
+            entry = dict(zip(FIELDS, row))
+            requests = entry['requests'] or 1
+            entry.update({
+                'endpoint': endpoint,
+                'avg_ms': round(entry['total_ms'] / requests, 1),
+                'avg_db_ms': round(entry['db_ms'] / requests, 1),
+                'avg_queries': round(entry['queries'] / requests, 1),
+                'avg_bytes': int(entry['bytes'] / requests),
+                'total_ms': round(entry['total_ms'], 1),
+                'max_ms': round(entry['max_ms'], 1),
+                'db_ms': round(entry['db_ms'], 1),
+            })
+            results.append(entry)
+        results.sort(key=lambda entry: entry.get(order_by, 0), reverse=True)
+        return results[:limit]
+
+
+request_stats = RequestStats()
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    route = f'/{match.route}' if match and match.route else 'unmatched'
+    return f'{request.method} {route}'
+
+
+class RequestTimingMiddleware:
+    """Query count, DB/app time and size for every request (see module docstring)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+        app_ms = total_ms - db_ms
+        size = 0 if response.streaming else len(response.content)
+
+        if getattr(settings, 'SERVER_TIMING_HEADER', True):
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f};desc="{recorder.count} queries", '
+                f'app;dur={app_ms:.1f}, total;dur={total_ms:.1f}'
+            )
+
+        endpoint = endpoint_name(request)
+        slow = (
+            total_ms > getattr(settings, 'SLOW_REQUEST_MS', 1000)
+            or recorder.count > getattr(settings, 'SLOW_REQUEST_QUERIES', 50)
+        )
+        if slow:
+            top = '\n'.join(f'    {count}x {ms}ms  {sql}' for count, ms, sql in recorder.top())
+            logger.warning(
+                f'Slow request {endpoint} ({request.get_full_path()}): {total_ms:.0f}ms total, '
+                f'{recorder.count} queries in {db_ms:.0f}ms, {size} bytes\n{top}'
+            )
+
+        request_stats.record(endpoint, total_ms, db_ms, recorder.count, size, slow)
+        method, route = endpoint.split(' ', 1)
+        REQUEST_LATENCY.observe(total_ms / 1000, method=method, route=route)
+        return response
@@ -0,0 +1,301 @@
+"""
+Database-backed job queue.
+
+Slow side effects (emails, webhook processing, bulk updates) are enqueued
+as ``Job`` rows and executed by workers, either ``python manage.py
+run_workers`` or the embedded worker threads started in each server
+process (``JOB_WORKER_THREADS``). No broker is needed: workers claim rows
+with ``SELECT ... FOR UPDATE SKIP LOCKED`` on Postgres and a conditional
+UPDATE that also keeps SQLite safe.
+
+Declare a job in an app's ``tasks.py`` (discovered automatically):
+
+    from core.jobs import job
+
+    @job(queue='emails', max_attempts=5)
+    def send_welcome_email(user_id):
+        ...
+
+    send_welcome_email.enqueue(user.id)               # run ASAP
+    send_welcome_email.enqueue(user.id, delay=60)     # run in a minute
+
+A job enqueued inside ``transaction.atomic()`` is only visible to workers
+once the surrounding transaction commits.
+"""
+import logging
+import os
+import socket
+import threading
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+class Task:
+    """A function that can be run inline or enqueued as a ``Job``."""
+
+    def __init__(self, func, name=None, queue='default', priority=0, max_attempts=3):
+        self.func = func
+        self.name = name or f'{func.__module__}.{func.__qualname__}'
+        self.queue = queue
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+        self.__name__ = func.__name__
+        self.__module__ = func.__module__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, run_at=None, delay=None, priority=None, queue=None, **kwargs):
+        """Queue the task. ``delay`` is in seconds; ``run_at`` is a datetime."""
+        return enqueue(
+            self.name, *args,
+            run_at=run_at, delay=delay,
+            priority=self.priority if priority is None else priority,
+            queue=queue or self.queue,
+            max_attempts=self.max_attempts,
+            **kwargs
+        )
+
+
+def job(func=None, **options):
+    """Decorator registering a function as a queueable ``Task``."""
+    def decorator(f):
+        task = Task(f, **options)
+        _registry[task.name] = task
+        return task
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def get_task(name):
+    if name not in _registry:
+        # Importing the module runs its @job decorators
+        import_string(name)
+    return _registry[name]
+
+
+def enqueue(task_name, *args, run_at=None, delay=None, priority=0,
+            queue='default', max_attempts=3, **kwargs):
+    """Create a queued ``Job`` row. Runs inline when ``JOBS_RUN_INLINE`` is set."""
+    from .models import Job
+
+    if run_at is None:
+        run_at = timezone.now()
+    if delay:
+        run_at += timedelta(seconds=delay)
+
+    inline = getattr(settings, 'JOBS_RUN_INLINE', False)
+
+    job_row = Job.objects.create(
+        task=task_name,
+        queue=queue,
+        args=list(args),
+        kwargs=kwargs,
+        priority=priority,
+        run_at=run_at,
+        max_attempts=max_attempts,
+        # Inline jobs are claimed up front so no worker picks them up too
+        status='running' if inline else 'queued',
+        locked_by='inline' if inline else '',
+        locked_at=timezone.now() if inline else None,
+    )
+
+    if inline:
+        transaction.on_commit(lambda: JobWorker(name='inline').execute(job_row))
+
+    return job_row
+
+
+def retry_delay(attempts):
+    """Exponential backoff: 10s, 20s, 40s, ... capped at an hour."""
+    base = getattr(settings, 'JOB_RETRY_BASE_SECONDS', 10)
+    return min(base * (2 ** max(attempts - 1, 0)), 3600)
+
+
+class Heartbeat:
+    """
+    Renews a running job's ``locked_at`` from a side thread, so
+    ``requeue_stale_jobs`` only picks up jobs whose worker stopped renewing
+    it (the process died), however long the job itself takes.
+    """
+
+    def __init__(self, job_id, identity, interval=None):
+        self.job_id = job_id
+        self.identity = identity
+        self.interval = interval or getattr(settings, 'JOB_HEARTBEAT_INTERVAL', 60)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f'job-heartbeat-{job_id}')
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def beat(self):
+        from .models import Job
+
+        return Job.objects.filter(
+            id=self.job_id, status='running', locked_by=self.identity,
+        ).update(locked_at=timezone.now())
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    self.beat()
+                except Exception as e:
+                    logger.warning(f'Job {self.job_id} heartbeat failed: {e}')
+        finally:
+            connection.close()
+
+
+class JobWorker:
+    """Claims and executes jobs. One instance per worker thread."""
+
+    def __init__(self, queues=None, name=None):
+        self.queues = queues
+        self.identity = name or f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._stop = threading.Event()
+
+    def claim(self, limit=1):
+        """Atomically mark up to ``limit`` due jobs as running and return them."""
+        from .models import Job
+
+        now = timezone.now()
+        with transaction.atomic():
+            qs = Job.objects.filter(status='queued', run_at__lte=now)
+            if self.queues:
+                qs = qs.filter(queue__in=self.queues)
+            if connection.features.has_select_for_update_skip_locked:
+                qs = qs.select_for_update(skip_locked=True)
+            ids = list(qs.order_by('-priority', 'run_at', 'id').values_list('id', flat=True)[:limit])
+
+            claimed = []
+            for job_id in ids:
+                # Conditional update: a no-op if another worker got there first
+                if Job.objects.filter(id=job_id, status='queued').update(
+                    status='running', locked_by=self.identity, locked_at=now,
+                ):
+                    claimed.append(job_id)
+
+        return list(Job.objects.filter(id__in=claimed).order_by('-priority', 'run_at', 'id'))
+
+    def execute(self, job_row):
+        """Run one claimed job, recording its result or scheduling a retry."""
+        from .models import Job
+
+        job_row.attempts += 1
+        try:
+            task = get_task(job_row.task)
+            with Heartbeat(job_row.id, job_row.locked_by or self.identity):
+                result = task.func(*job_row.args, **job_row.kwargs)
+        except Exception as e:
+            error = f'{e}\n{traceback.format_exc()}'
+            if job_row.attempts < job_row.max_attempts:
+                status = 'queued'
+                run_at = timezone.now() + timedelta(seconds=retry_delay(job_row.attempts))
+                logger.warning(f'Job {job_row.id} ({job_row.task}) failed, retrying: {e}')
+            else:
+                status = 'failed'
+                run_at = job_row.run_at
+                logger.error(f'Job {job_row.id} ({job_row.task}) failed permanently: {e}')
+            Job.objects.filter(id=job_row.id).update(
+                status=status, attempts=job_row.attempts, run_at=run_at,
+                last_error=error[:5000], locked_by='', locked_at=None,
+                finished_at=timezone.now() if status == 'failed' else None,
+                updated_at=timezone.now(),
+            )
+            return False
+
+        Job.objects.filter(id=job_row.id).update(
+            status='done', attempts=job_row.attempts, result=_jsonable(result),
+            locked_by='', locked_at=None, finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return True
+
+    def run_once(self, limit=1):
+        """Claim and run up to ``limit`` jobs. Returns how many ran."""
+        jobs = self.claim(limit)
+        for job_row in jobs:
+            self.execute(job_row)
+            close_old_connections()
+        return len(jobs)
+
+    def run_forever(self, poll_interval=None):
+        poll_interval = poll_interval or getattr(settings, 'JOB_POLL_INTERVAL', 1)
+        logger.info(f'Job worker started ({self.identity})')
+        while not self._stop.is_set():
+            try:
+                close_old_connections()
+                ran = self.run_once()
+            except Exception as e:
+                logger.error(f'Job worker error: {e}')
+                ran = 0
+            if not ran:
+                self._stop.wait(poll_interval)
+        close_old_connections()
+
+    def stop(self):
+        self._stop.set()
+
+
+def requeue_stale_jobs():
+    """
+    Put jobs whose worker died mid-run back in the queue.
+
+    A running job's worker renews ``locked_at`` every
+    ``JOB_HEARTBEAT_INTERVAL`` seconds, so a job is stale once its lock has
+    gone ``JOB_TIMEOUT`` seconds without renewal, not once it has simply
+    run that long. Registered as a leader-only periodic job.
+    """
+    from .models import Job
+
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'JOB_TIMEOUT', 600))
+    return Job.objects.filter(status='running', locked_at__lt=cutoff).update(
+        status='queued', locked_by='', locked_at=None, run_at=timezone.now(),
+    )
+
+
+def purge_finished_jobs():
+    """Delete done jobs older than ``JOB_RETENTION_DAYS``."""
+    from .models import Job
+
+    cutoff = timezone.now() - timedelta(days=getattr(settings, 'JOB_RETENTION_DAYS', 7))
+    deleted, _ = Job.objects.filter(status='done', finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def start_embedded_workers(count):
+    """Start ``count`` daemon worker threads in this process."""
+    workers = []
+    for i in range(count):
+        worker = JobWorker()
+        thread = threading.Thread(
+            target=worker.run_forever, daemon=True, name=f'job-worker-{i}'
+        )
+        thread.start()
+        workers.append(worker)
+    return workers
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (str, int, float, bool, list, dict)):
+        return value
+    return str(value)
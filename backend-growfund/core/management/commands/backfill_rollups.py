@@ -0,0 +1,60 @@
+"""
+Management command to rebuild the admin statistics rollups from source rows.
+
+Usage:
+    python manage.py backfill_rollups                       # every metric, all time
+    python manage.py backfill_rollups --metric transactions
+    python manage.py backfill_rollups --days 7              # only the last week
+    python manage.py backfill_rollups --since 2025-01-01
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.rollups import rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily rollups for admin statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metric',
+            action='append',
+            default=[],
+            help=f'Metric to rebuild, repeatable (default: all of {", ".join(rollups.sources)})'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Only rebuild the last N days'
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Only rebuild from this date (YYYY-MM-DD)'
+        )
+
+    def handle(self, *args, **options):
+        metrics = options['metric'] or list(rollups.sources)
+        unknown = [m for m in metrics if m not in rollups.sources]
+        if unknown:
+            raise CommandError(f'Unknown metric(s): {", ".join(unknown)}')
+
+        start = None
+        if options['since']:
+            try:
+                start = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be YYYY-MM-DD')
+        elif options['days']:
+            start = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        for metric in metrics:
+            rows = rollups.recompute(metric, start)
+            self.stdout.write(f'  {metric}: {rows} rollup rows')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(metrics)} metric(s) from {start.isoformat() if start else "the beginning"}'
+        ))
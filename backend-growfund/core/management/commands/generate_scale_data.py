@@ -0,0 +1,398 @@
+"""
+Management command to generate production-scale data for load testing.
+
+Creates users with linked transactions, binary trades, demo accounts,
+demo trades and transactions, and notifications, plus price ticks per
+trading asset. Per-user activity follows a Pareto distribution (a few
+heavy traders, many light ones) and amounts are log-normal, so queries see
+realistic skew. Rows are written with ``bulk_create`` in chunks, a chunk
+of users at a time, with progress output. The same ``--seed`` and
+options always produce the same rows (timestamps relative to the run).
+
+Generated users have emails ``<prefix>_<n>@scale.test`` and share the
+password ``scale-pass``. Signals don't fire for bulk writes, so rebuild
+derived data afterwards:
+
+    python manage.py init_binary_trading                 # assets, if missing
+    python manage.py generate_scale_data --users 100000 --seed 7
+    python manage.py backfill_rollups
+
+Usage:
+    python manage.py generate_scale_data --users 1000
+    python manage.py generate_scale_data --users 50000 --transactions 40 --binary-trades 120 --skew 1.3
+    python manage.py generate_scale_data --clear         # remove the generated users and their rows
+"""
+import math
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from binary_trading.models import AssetPrice, BinaryTrade, DemoBinaryTrade, DemoTradingStats, TradingAsset
+from demo.management.commands.move_demo_data import keep_timestamps
+from demo.models import DemoAccount, DemoTransaction
+from notifications.models import Notification
+from transactions.models import Transaction
+
+User = get_user_model()
+
+CENT = Decimal('0.01')
+
+TRANSACTION_TYPES = [
+    ('deposit', 40), ('withdrawal', 15), ('investment', 25), ('profit', 14),
+    ('referral_bonus', 3), ('admin_credit', 2), ('admin_debit', 1),
+]
+TRANSACTION_STATUSES = [('completed', 85), ('pending', 6), ('processing', 2), ('failed', 5), ('cancelled', 2)]
+PAYMENT_METHODS = [('momo', 60), ('bank', 25), ('card', 15)]
+CRYPTO = [('BTC', 60000), ('ETH', 3000), ('BNB', 550), ('SOL', 140), ('XRP', 0.55), ('DOGE', 0.12), ('ADA', 0.45)]
+EXPIRIES = [(60, 30), (300, 35), (900, 20), (3600, 15)]
+NOTIFICATION_TYPES = [('info', 55), ('success', 30), ('warning', 10), ('error', 5)]
+NOTIFICATION_TITLES = {
+    'info': ['Market update', 'New feature', 'Weekly summary'],
+    'success': ['Deposit Confirmed', 'Trade won', 'Withdrawal completed'],
+    'warning': ['Low balance', 'Price alert', 'Verify your account'],
+    'error': ['Payment failed', 'Withdrawal rejected'],
+}
+FIRST_NAMES = ['Ama', 'Kofi', 'Yaw', 'Akosua', 'Kwame', 'Efua', 'John', 'Jane', 'Grace', 'Samuel', 'Fatima', 'David']
+LAST_NAMES = ['Mensah', 'Owusu', 'Boateng', 'Asante', 'Smith', 'Okafor', 'Adeyemi', 'Darko', 'Appiah', 'Johnson']
+
+
+class Generator:
+    """Seeded row factory; every random choice goes through ``self.rng``."""
+
+    def __init__(self, seed, days, skew):
+        self.rng = random.Random(seed)
+        self.now = timezone.now().replace(microsecond=0)
+        self.start = self.now - timedelta(days=days)
+        self.skew = skew
+        # Mean of a Pareto(alpha) draw, so per-user counts average out to the requested mean
+        self.pareto_mean = skew / (skew - 1)
+
+    def pick(self, weighted):
+        values, weights = zip(*weighted)
+        return self.rng.choices(values, weights)[0]
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def count(self, activity, mean):
+        """Rows for a user with the given activity multiplier, averaging ``mean``."""
+        expected = mean * activity / self.pareto_mean
+        return int(expected) + (self.rng.random() < expected - int(expected))
+
+    def activity(self):
+        return min(self.rng.paretovariate(self.skew), 50 * self.pareto_mean)
+
+    def money(self, median, sigma=1.0, low=Decimal('1'), high=Decimal('1000000')):
+        value = Decimal(str(self.rng.lognormvariate(math.log(median), sigma))).quantize(CENT)
+        return min(max(value, low), high)
+
+    def moment(self, after=None):
+        start = max(after or self.start, self.start)
+        span = (self.now - start).total_seconds()
+        return start + timedelta(seconds=self.rng.random() * span)
+
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+
+    def user(self, prefix, n, password):
+        joined = self.moment()
+        return User(
+            email=f'{prefix}_{n}@scale.test',
+            password=password,
+            first_name=self.rng.choice(FIRST_NAMES),
+            last_name=self.rng.choice(LAST_NAMES),
+            is_verified=self.rng.random() < 0.8,
+            date_joined=joined,
+            created_at=joined,
+            updated_at=joined,
+            last_login_at=self.moment(joined),
+            verification_token=self.uuid(),
+        )
+
+    def transaction(self, user):
+        kind = self.pick(TRANSACTION_TYPES)
+        status = self.pick(TRANSACTION_STATUSES)
+        created = self.moment(user.date_joined)
+        amount = self.money(250 if kind in ('deposit', 'investment', 'withdrawal') else 40)
+        fee = (amount * Decimal('0.015')).quantize(CENT) if kind == 'withdrawal' else Decimal('0')
+        metadata = {}
+        if kind == 'investment':
+            if self.rng.random() < 0.8:
+                asset, price = self.rng.choice(CRYPTO)
+                price = Decimal(str(price * self.rng.uniform(0.7, 1.3))).quantize(Decimal('0.00000001'))
+                metadata = {
+                    'investment_type': 'crypto',
+                    'asset': asset,
+                    'price_at_purchase': str(price),
+                    'quantity': str((amount / price).quantize(Decimal('0.00000001'))),
+                }
+            else:
+                metadata = {'investment_type': 'real_estate', 'asset': 'Real Estate'}
+        return Transaction(
+            user=user,
+            transaction_type=kind,
+            payment_method=self.pick(PAYMENT_METHODS) if kind in ('deposit', 'withdrawal') else None,
+            amount=amount,
+            fee=fee,
+            net_amount=amount - fee,
+            status=status,
+            reference=f'SCALE-{self.uuid().hex}',
+            description=f'{kind.replace("_", " ").capitalize()} of ${amount}',
+            metadata=metadata,
+            created_at=created,
+            updated_at=created,
+            completed_at=created + timedelta(seconds=self.rng.randint(5, 900)) if status == 'completed' else None,
+        )
+
+    def binary_trade(self, model, user, asset, prices):
+        opened = self.moment(user.date_joined)
+        expiry = self.pick(EXPIRIES)
+        expires = opened + timedelta(seconds=expiry)
+        strike = prices[asset.symbol]
+        amount = self.money(50, 0.9, asset.min_trade_amount, asset.max_trade_amount)
+        payout = asset.base_payout
+        house_edge = Decimal(str(round(self.rng.uniform(0, 5), 2)))
+        trade = model(
+            id=self.uuid(),
+            user=user,
+            asset=asset,
+            direction=self.rng.choice(['buy', 'sell']),
+            amount=amount,
+            strike_price=strike,
+            base_payout_percentage=payout,
+            adjusted_payout_percentage=payout - house_edge,
+            house_edge_applied=house_edge,
+            expiry_seconds=expiry,
+            opened_at=opened,
+            expires_at=expires,
+            execution_delay_ms=self.rng.randint(0, 400),
+        )
+        if expires > self.now:
+            trade.status = 'active'
+            return trade
+
+        won = self.rng.random() < 0.45
+        move = strike * Decimal(str(self.rng.uniform(0.0001, float(asset.volatility) * 2)))
+        up = won == (trade.direction == 'buy')
+        trade.final_price = (strike + move if up else strike - move).quantize(Decimal('0.00000001'))
+        trade.status = 'won' if won else 'lost'
+        trade.profit_loss = (amount * trade.adjusted_payout_percentage / 100).quantize(CENT) if won else -amount
+        trade.closed_at = expires + timedelta(milliseconds=self.rng.randint(50, 3000))
+        return trade
+
+    def demo_transactions(self, account, trade):
+        rows = [DemoTransaction(
+            demo_account=account,
+            transaction_type='binary_trade_open',
+            amount=trade.amount,
+            asset=trade.asset.symbol,
+            description=f'Demo binary {trade.direction.upper()} {trade.asset.symbol}',
+            created_at=trade.opened_at,
+        )]
+        if trade.status in ('won', 'lost'):
+            rows.append(DemoTransaction(
+                demo_account=account,
+                transaction_type=f'binary_trade_{"win" if trade.status == "won" else "loss"}',
+                amount=abs(trade.profit_loss),
+                asset=trade.asset.symbol,
+                description=f'Demo binary {trade.direction.upper()} {trade.asset.symbol} - {trade.status.upper()}',
+                created_at=trade.closed_at,
+            ))
+        return rows
+
+    def notification(self, user):
+        kind = self.pick(NOTIFICATION_TYPES)
+        created = self.moment(user.date_joined)
+        return Notification(
+            user=user,
+            title=self.rng.choice(NOTIFICATION_TITLES[kind]),
+            message=f'Generated {kind} notification for load testing.',
+            type=kind,
+            read=created < self.now - timedelta(days=2) and self.rng.random() < 0.85,
+            created_at=created,
+        )
+
+    def price_ticks(self, asset, price, count, interval):
+        """A random walk ending ``now``; returns the ticks and the last price."""
+        volatility = float(asset.volatility) / 10
+        price = float(price)
+        ticks = []
+        first = self.now - timedelta(seconds=interval * count)
+        for i in range(count):
+            price = max(price * (1 + self.rng.gauss(0, volatility)), 1e-6)
+            ticks.append(AssetPrice(
+                asset=asset,
+                price=Decimal(str(price)).quantize(Decimal('0.00000001')),
+                timestamp=first + timedelta(seconds=interval * (i + 1)),
+            ))
+        return ticks, Decimal(str(price)).quantize(Decimal('0.00000001'))
+
+
+class Command(BaseCommand):
+    help = 'Generate seeded, production-scale data for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Users to create (default: 1000)')
+        parser.add_argument('--transactions', type=float, default=25, help='Mean transactions per user (default: 25)')
+        parser.add_argument('--binary-trades', type=float, default=40, help='Mean real binary trades per user (default: 40)')
+        parser.add_argument('--demo-trades', type=float, default=60, help='Mean demo binary trades per user (default: 60)')
+        parser.add_argument('--notifications', type=float, default=30, help='Mean notifications per user (default: 30)')
+        parser.add_argument('--price-ticks', type=int, default=20000, help='Price ticks per trading asset (default: 20000)')
+        parser.add_argument('--tick-interval', type=int, default=5, help='Seconds between price ticks (default: 5)')
+        parser.add_argument('--days', type=int, default=180, help='Days of history to spread rows over (default: 180)')
+        parser.add_argument(
+            '--skew', type=float, default=1.6,
+            help='Pareto shape of per-user activity, > 1; lower is more skewed (default: 1.6)'
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument('--prefix', default='scale', help='Email prefix of generated users (default: scale)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert (default: 5000)')
+        parser.add_argument('--users-per-chunk', type=int, default=500, help='Users generated per chunk (default: 500)')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated users and their rows, then stop')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        generated = User.objects.filter(email__startswith=f'{prefix}_', email__endswith='@scale.test')
+
+        if options['clear']:
+            self.clear(generated)
+            return
+        if options['skew'] <= 1:
+            raise CommandError('--skew must be greater than 1')
+        if generated.exists():
+            raise CommandError(f'Users with prefix "{prefix}" already exist; use --clear first or another --prefix')
+
+        assets = list(TradingAsset.objects.filter(is_active=True).order_by('symbol'))
+        if not assets:
+            raise CommandError('No active trading assets; run init_binary_trading first')
+
+        self.batch_size = options['batch_size']
+        self.counts = {}
+        self.started = time.monotonic()
+        gen = Generator(options['seed'], options['days'], options['skew'])
+
+        with keep_timestamps(User), keep_timestamps(Transaction), keep_timestamps(AssetPrice), \
+                keep_timestamps(BinaryTrade), keep_timestamps(DemoBinaryTrade), keep_timestamps(DemoAccount), \
+                keep_timestamps(DemoTransaction), keep_timestamps(Notification):
+            prices = self.generate_prices(gen, assets, options['price_ticks'], options['tick_interval'])
+            self.generate_users(gen, assets, prices, options)
+
+        elapsed = time.monotonic() - self.started
+        total = sum(self.counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {total:,} rows in {elapsed:.0f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)'
+        ))
+        for label, count in self.counts.items():
+            self.stdout.write(f'  {label}: {count:,}')
+        self.stdout.write('Run "python manage.py backfill_rollups" to rebuild admin statistics.')
+
+    def insert(self, model, rows):
+        if rows:
+            model.objects.bulk_create(rows, batch_size=self.batch_size)
+            self.counts[model._meta.label] = self.counts.get(model._meta.label, 0) + len(rows)
+        return rows
+
+    def progress(self, message):
+        elapsed = time.monotonic() - self.started
+        total = sum(self.counts.values())
+        self.stdout.write(f'  {message} - {total:,} rows, {total / max(elapsed, 1e-9):,.0f} rows/s')
+
+    def generate_prices(self, gen, assets, per_asset, interval):
+        """Price history per asset; returns the latest price of each, the strike base for trades."""
+        prices = {}
+        for asset in assets:
+            latest = AssetPrice.objects.filter(asset=asset).order_by('-timestamp').values_list('price', flat=True).first()
+            price = latest or Decimal('100')
+            for start in range(0, per_asset, self.batch_size):
+                ticks, price = gen.price_ticks(asset, price, min(self.batch_size, per_asset - start), interval)
+                self.insert(AssetPrice, ticks)
+            prices[asset.symbol] = price
+            self.progress(f'{asset.symbol}: {per_asset:,} price ticks')
+        return prices
+
+    def generate_users(self, gen, assets, prices, options):
+        password = make_password('scale-pass')
+        total = options['users']
+        chunk_size = options['users_per_chunk']
+        referrers = []
+
+        for first in range(0, total, chunk_size):
+            users = [gen.user(options['prefix'], n, password) for n in range(first, min(first + chunk_size, total))]
+            activity = {user.email: gen.activity() for user in users}
+            for user in users:
+                if referrers and gen.rng.random() < 0.1:
+                    user.referred_by_id = gen.rng.choice(referrers)
+
+            transactions = {user.email: [gen.transaction(user) for _ in range(gen.count(activity[user.email], options['transactions']))] for user in users}
+            for user in users:
+                user.balance = self.balance(transactions[user.email])
+            self.insert(User, users)
+            referrers.extend(user.pk for user in users[:50])
+
+            self.insert(Transaction, [row for rows in transactions.values() for row in rows])
+            self.insert(BinaryTrade, [
+                gen.binary_trade(BinaryTrade, user, gen.rng.choice(assets), prices)
+                for user in users for _ in range(gen.count(activity[user.email], options['binary_trades']))
+            ])
+
+            accounts = self.insert(DemoAccount, [
+                DemoAccount(user=user, balance=Decimal('10000.00'), created_at=user.date_joined, updated_at=user.date_joined)
+                for user in users
+            ])
+            demo_trades, demo_transactions = [], []
+            for account, user in zip(accounts, users):
+                for _ in range(gen.count(activity[user.email], options['demo_trades'])):
+                    trade = gen.binary_trade(DemoBinaryTrade, user, gen.rng.choice(assets), prices)
+                    demo_trades.append(trade)
+                    demo_transactions.extend(gen.demo_transactions(account, trade))
+                    # Open trades still hold their stake
+                    account.balance += trade.profit_loss if trade.status != 'active' else -trade.amount
+            self.insert(DemoBinaryTrade, demo_trades)
+            self.insert(DemoTransaction, demo_transactions)
+            DemoAccount.objects.bulk_update(accounts, ['balance'], batch_size=self.batch_size)
+
+            self.insert(Notification, [
+                gen.notification(user)
+                for user in users for _ in range(gen.count(activity[user.email], options['notifications']))
+            ])
+            self.progress(f'users {first + len(users):,}/{total:,}')
+
+    @staticmethod
+    def balance(transactions):
+        """Balance implied by a user's completed transactions, never negative."""
+        credits = {'deposit', 'profit', 'referral_bonus', 'admin_credit'}
+        balance = Decimal('0')
+        for tx in sorted(transactions, key=lambda tx: tx.created_at):
+            if tx.status != 'completed':
+                continue
+            if tx.transaction_type in credits:
+                balance += tx.net_amount
+            elif tx.amount <= balance:
+                balance -= tx.amount
+            else:
+                # Would have been refused: record it as failed instead
+                tx.status, tx.completed_at = 'failed', None
+        return balance
+
+    def clear(self, users):
+        ids = list(users.values_list('id', flat=True))
+        if not ids:
+            self.stdout.write('Nothing to clear')
+            return
+        # Demo rows live in the demo database and aren't cascaded
+        for start in range(0, len(ids), 1000):
+            part = ids[start:start + 1000]
+            DemoTransaction.objects.filter(demo_account__user_id__in=part).delete()
+            DemoBinaryTrade.objects.filter(user_id__in=part).delete()
+            DemoTradingStats.objects.filter(user_id__in=part).delete()
+            DemoAccount.objects.filter(user_id__in=part).delete()
+            User.objects.filter(id__in=part).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {len(ids):,} generated users and their rows'))
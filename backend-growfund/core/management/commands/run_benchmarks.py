@@ -0,0 +1,310 @@
+"""
+Management command to benchmark the hot endpoints against a seeded dataset.
+
+Creates throwaway test databases (like ``manage.py test``), fills them with
+``generate_scale_data``, then runs each scenario in ``core.benchmarks``
+in-process and reports latency percentiles, queries per request and peak
+memory. The benchmark user is the generated user with the most
+transactions. Results are compared with ``benchmarks/baselines.json``: the
+command fails when a scenario runs more queries than its baseline or
+answers with a different status, on any machine. p95 latency and peak
+memory are reported against the baselines, and only fail the run when the
+baselines were recorded on this host (same hostname, CPU count, Python and
+database); p95 additionally needs at least ``MIN_P95_SAMPLES`` timed
+requests on both sides. ``--save`` refuses runs too short for a real p95.
+
+Serving throughput (``--url``) is measured against a running server, e.g.
+one started with ``gunicorn -c gunicorn.conf.py``, with concurrent GET
+requests; ``--save`` records it in the same file under ``serving``.
+
+Usage:
+    python manage.py run_benchmarks                          # compare with the baselines
+    python manage.py run_benchmarks --save                   # record new baselines
+    python manage.py run_benchmarks --only me --only portfolio --iterations 100
+    python manage.py run_benchmarks --iterations 5                 # quick: queries and status only
+    python manage.py run_benchmarks --url http://127.0.0.1:8000 --email a@b.c --password x \\
+        --concurrency 16 --duration 30 --label "4 workers" --save
+"""
+import json
+import os
+import platform
+import threading
+import time
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+
+from core.benchmarks import MIN_P95_SAMPLES, SCENARIOS, Result, compare, compare_timing, run_scenario
+
+BASELINES = os.path.join(settings.BASE_DIR, 'benchmarks', 'baselines.json')
+
+BENCH_PASSWORD = 'scale-pass'
+
+# Read-only endpoints hit by the serving throughput run
+SERVING_PATHS = [
+    '/api/auth/me/',
+    '/api/auth/dashboard-stats/',
+    '/api/transactions/',
+    '/api/notifications/',
+    '/api/investments/portfolio/',
+    '/api/binary/trades/history/',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark hot endpoints in-process and compare with recorded baselines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', action='append', default=[], help='Scenario to run, repeatable')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per scenario (default: 50)')
+        parser.add_argument('--users', type=int, default=300, help='Generated users in the dataset (default: 300)')
+        parser.add_argument('--seed', type=int, default=42, help='Dataset seed (default: 42)')
+        parser.add_argument('--save', action='store_true', help='Write the results as the new baselines')
+        parser.add_argument(
+            '--latency-threshold', type=float, default=0.5,
+            help='Allowed p95 growth over the baseline, as a fraction (default: 0.5)'
+        )
+        parser.add_argument(
+            '--memory-threshold', type=float, default=0.5,
+            help='Allowed peak memory growth over the baseline, as a fraction (default: 0.5)'
+        )
+        parser.add_argument('--baselines', default=BASELINES, help='Baseline file (default: benchmarks/baselines.json)')
+        parser.add_argument('--url', help='Measure serving throughput against a running server instead')
+        parser.add_argument('--email', help='Login for --url')
+        parser.add_argument('--password', help='Password for --url')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients for --url (default: 8)')
+        parser.add_argument('--duration', type=int, default=20, help='Seconds to run for --url (default: 20)')
+        parser.add_argument('--label', default='default', help='Name the --url result is saved under')
+
+    def handle(self, *args, **options):
+        baselines = self.load(options['baselines'])
+        if options['url']:
+            self.serving(options, baselines)
+            return
+
+        if options['save'] and options['iterations'] < MIN_P95_SAMPLES:
+            raise CommandError(f'--save needs --iterations {MIN_P95_SAMPLES} or more to record a meaningful p95')
+
+        names = {scenario.name for scenario in SCENARIOS}
+        unknown = set(options['only']) - names
+        if unknown:
+            raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}; choose from {", ".join(sorted(names))}')
+        scenarios = [s for s in SCENARIOS if not options['only'] or s.name in options['only']]
+        dataset = {'users': options['users'], 'seed': options['seed']}
+
+        results = self.run_in_process(scenarios, dataset, options['iterations'])
+        recorded = baselines.get('scenarios', {})
+
+        self.stdout.write(
+            f'\n{"scenario":<20}{"p50":>9}{"p95":>9}{"p99":>9}{"base p95":>10}'
+            f'{"queries":>9}{"peak KB":>9}{"status":>8}'
+        )
+        for result in results:
+            s = result.summary()
+            base = recorded.get(result.name, {}).get('p95_ms')
+            self.stdout.write(
+                f'{result.name:<20}{s["p50_ms"]:>9.1f}{s["p95_ms"]:>9.1f}{s["p99_ms"]:>9.1f}'
+                f'{base if base is not None else "-":>10}{s["queries"]:>9}{s["peak_kb"]:>9}{s["status"]:>8}'
+            )
+
+        if options['save']:
+            baselines['dataset'] = dataset
+            baselines['environment'] = self.environment()
+            baselines.setdefault('scenarios', {}).update({r.name: r.summary() for r in results})
+            self.write(options['baselines'], baselines)
+            self.stdout.write(self.style.SUCCESS(f'Baselines saved to {options["baselines"]}'))
+            return
+
+        if baselines.get('dataset') not in (None, dataset):
+            self.stdout.write(self.style.WARNING(
+                f'Baselines were recorded with dataset {baselines["dataset"]}; query counts may differ'
+            ))
+        same_host = baselines.get('environment') == self.environment()
+        if not same_host:
+            self.stdout.write(self.style.WARNING(
+                f'Baselines were recorded on {baselines.get("environment")}, this is {self.environment()}: '
+                f'latency and memory are reported, not gated'
+            ))
+        failures, ungated = [], []
+        for result in results:
+            baseline = recorded.get(result.name)
+            if baseline is None:
+                self.stdout.write(self.style.WARNING(f'{result.name}: no baseline'))
+                continue
+            summary = result.summary()
+            problems = compare(summary, baseline)
+            if same_host:
+                problems += compare_timing(
+                    summary, baseline, options['latency_threshold'], options['memory_threshold']
+                )
+                if min(summary['samples'], baseline.get('samples', 0)) < MIN_P95_SAMPLES:
+                    ungated.append(result.name)
+            failures += [f'{result.name}: {problem}' for problem in problems]
+        if ungated:
+            self.stdout.write(self.style.WARNING(
+                f'p95 not gated (fewer than {MIN_P95_SAMPLES} timed requests): {", ".join(ungated)}'
+            ))
+
+        if failures:
+            for failure in failures:
+                self.stdout.write(self.style.ERROR(failure))
+            raise CommandError(f'{len(failures)} benchmark regressions')
+        self.stdout.write(self.style.SUCCESS('No regressions against the baselines'))
+
+    # ------------------------------------------------------------------
+    # In-process run
+    # ------------------------------------------------------------------
+
+    def run_in_process(self, scenarios, dataset, iterations):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases=set(settings.DATABASES))
+        try:
+            # Keep the run's cache away from the development cache
+            with override_settings(
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench'}},
+                SLOW_REQUEST_MS=10 ** 9, SLOW_REQUEST_QUERIES=10 ** 9,
+            ):
+                self.stdout.write(f'Seeding {dataset["users"]} users (seed {dataset["seed"]})...')
+                ctx = self.seed(dataset)
+                results = []
+                for scenario in scenarios:
+                    self.stdout.write(f'  {scenario.name}...')
+                    results.append(run_scenario(scenario, ctx, iterations))
+                return results
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def seed(self, dataset):
+        from django.contrib.auth import get_user_model
+        from django.db.models import Count
+        from django.test import Client
+        from rest_framework_simplejwt.tokens import AccessToken
+        from binary_trading.models import AssetPrice, HouseEdgeConfig, TradingAsset
+
+        quiet = StringIO()
+        call_command('init_binary_trading', stdout=quiet)
+        call_command(
+            'generate_scale_data', users=dataset['users'], seed=dataset['seed'],
+            price_ticks=500, stdout=quiet,
+        )
+        call_command('backfill_rollups', stdout=quiet)
+        HouseEdgeConfig.objects.update(max_open_trades_per_user=1000)
+
+        User = get_user_model()
+        user = User.objects.filter(email__endswith='@scale.test').annotate(
+            n=Count('transactions')
+        ).order_by('-n', 'id').first()
+        admin = User.objects.create_superuser(email='bench-admin@scale.test', password=BENCH_PASSWORD)
+        asset = TradingAsset.objects.filter(is_active=True).order_by('symbol').first()
+
+        return {
+            'user': user,
+            'password': BENCH_PASSWORD,
+            'asset': asset,
+            'price': AssetPrice.objects.filter(asset=asset).order_by('-timestamp').first().price,
+            'client': Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'),
+            'admin_client': Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}'),
+            'anon_client': Client(),
+        }
+
+    # ------------------------------------------------------------------
+    # Serving throughput against a live server
+    # ------------------------------------------------------------------
+
+    def serving(self, options, baselines):
+        import requests
+
+        if not (options['email'] and options['password']):
+            raise CommandError('--url needs --email and --password')
+        base = options['url'].rstrip('/')
+        login = requests.post(
+            f'{base}/api/auth/login/', json={'email': options['email'], 'password': options['password']}, timeout=30
+        )
+        try:
+            token = login.json()['tokens']['access']
+        except (ValueError, KeyError):
+            raise CommandError(f'Login failed ({login.status_code}): {login.text[:200]}')
+
+        timings, errors = [], []
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['duration']
+
+        def client(offset):
+            session = requests.Session()
+            session.headers['Authorization'] = f'Bearer {token}'
+            i = offset
+            while time.monotonic() < deadline:
+                path = SERVING_PATHS[i % len(SERVING_PATHS)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    ok = session.get(f'{base}{path}', timeout=30).status_code < 400
+                except requests.RequestException:
+                    ok = False
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    (timings if ok else errors).append(elapsed)
+
+        self.stdout.write(f'{options["concurrency"]} clients for {options["duration"]}s against {base}...')
+        started = time.monotonic()
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        result = Result('serving', timings=timings).summary()
+        summary = {
+            'requests_per_second': round(len(timings) / elapsed, 1),
+            'requests': len(timings),
+            'errors': len(errors),
+            'concurrency': options['concurrency'],
+            'duration_s': options['duration'],
+            'p50_ms': result['p50_ms'],
+            'p95_ms': result['p95_ms'],
+            'p99_ms': result['p99_ms'],
+            'environment': self.environment(),
+        }
+        for key, value in summary.items():
+            if key != 'environment':
+                self.stdout.write(f'  {key}: {value}')
+
+        if options['save']:
+            baselines.setdefault('serving', {})[options['label']] = summary
+            self.write(options['baselines'], baselines)
+            self.stdout.write(self.style.SUCCESS(f'Serving results saved under "{options["label"]}"'))
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def environment():
+        return {
+            'host': platform.node(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'database': settings.DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+        }
+
+    @staticmethod
+    def load(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def write(path, baselines):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
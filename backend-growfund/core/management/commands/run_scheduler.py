@@ -0,0 +1,28 @@
+"""
+Management command to run the leader-elected background scheduler in the
+foreground, e.g. as a dedicated worker process. Several copies can run at
+once; only the lease holder executes jobs.
+
+Usage:
+    python manage.py run_scheduler
+"""
+from django.core.management.base import BaseCommand
+from core.scheduler import scheduler
+
+
+class Command(BaseCommand):
+    help = 'Run periodic background jobs (USDT polling, trade expiry, price refresh)'
+
+    def handle(self, *args, **options):
+        jobs = ', '.join(
+            f'{job.name} every {job.interval}s' for job in scheduler.jobs.values()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Starting scheduler {scheduler.identity} ({jobs or "no jobs registered"})'
+        ))
+
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('\nStopping scheduler...'))
+            scheduler.release()
@@ -0,0 +1,87 @@
+"""
+Management command to run job queue workers.
+
+Usage:
+    python manage.py run_workers
+    python manage.py run_workers --concurrency 4 --queues default,emails
+    python manage.py run_workers --burst   # drain the queue, then exit
+"""
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from core.jobs import JobWorker
+
+
+class Command(BaseCommand):
+    help = 'Run background job queue workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=2,
+            help='Number of worker threads (default: 2)'
+        )
+        parser.add_argument(
+            '--queues',
+            type=str,
+            default='',
+            help='Comma-separated queues to consume (default: all)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait when the queue is empty (default: 1)'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Run until the queue is empty, then exit'
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        queues = [q.strip() for q in options['queues'].split(',') if q.strip()] or None
+        poll_interval = options['poll_interval']
+
+        if options['burst']:
+            worker = JobWorker(queues=queues)
+            total = 0
+            while True:
+                ran = worker.run_once(limit=concurrency)
+                if not ran:
+                    break
+                total += ran
+            self.stdout.write(self.style.SUCCESS(f'Burst complete: {total} jobs run'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Starting {concurrency} job workers '
+            f'(queues: {", ".join(queues) if queues else "all"})'
+        ))
+
+        workers = []
+        threads = []
+        for i in range(concurrency):
+            worker = JobWorker(queues=queues)
+            thread = threading.Thread(
+                target=worker.run_forever,
+                kwargs={'poll_interval': poll_interval},
+                daemon=True,
+                name=f'job-worker-{i}',
+            )
+            thread.start()
+            workers.append(worker)
+            threads.append(thread)
+
+        try:
+            while any(t.is_alive() for t in threads):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('\nStopping workers...'))
+            for worker in workers:
+                worker.stop()
+            for thread in threads:
+                thread.join(timeout=30)
@@ -0,0 +1,414 @@
+"""
+Operational metrics in the Prometheus text format, summed across workers.
+
+Counters, gauges and histograms are recorded in process memory without
+locks: every thread writes to its own dict of samples. A background thread
+writes the process's totals to ``METRICS_DIR/<pid>.json`` every
+``METRICS_FLUSH_INTERVAL`` seconds, and ``/api/metrics/`` adds up the files of
+every process on the host (web workers, job workers, one-off commands), so a
+scrape sees the whole server whichever worker answers it. Counters and
+histograms of processes that have exited are folded into ``archive.json``
+so totals never go backwards; their gauges are dropped.
+
+    from core.metrics import PROVIDER_LATENCY
+
+    with PROVIDER_LATENCY.time(provider='coingecko'):
+        ...
+
+Outbound HTTP goes through a ``ProviderSession``, which records latency and
+errors per provider. Database connection usage is read from the database
+itself when the endpoint is scraped.
+"""
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE = 'archive.json'
+
+
+def metrics_dir():
+    path = getattr(settings, 'METRICS_DIR', '') or os.path.join(
+        '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'growfund-metrics'
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class _Samples:
+    """Per-thread sample dicts of this process, summed on demand."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+        self._flusher_pid = None
+
+    def local(self):
+        values = getattr(self._local, 'values', None)
+        if values is None:
+            values = self._local.values = {}
+            with self._lock:
+                self._all.append(values)
+                if self._flusher_pid != os.getpid():
+                    self._flusher_pid = os.getpid()
+                    threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+        return values
+
+    def totals(self):
+        merged = defaultdict(float)
+        with self._lock:
+            shards = list(self._all)
+        for values in shards:
+            for key, value in list(values.items()):
+                merged[key] += value
+        return merged
+
+    def reset(self):
+        """Forget samples inherited from a parent process."""
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+        self._flusher_pid = None
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(getattr(settings, 'METRICS_FLUSH_INTERVAL', 5))
+            flush()
+
+
+_samples = _Samples()
+_registry = {}
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_samples.reset)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _registry[name] = self
+
+    def _labels(self, labels, extra=()):
+        return tuple((name, str(labels.get(name, ''))) for name in self.labelnames) + extra
+
+    def _add(self, sample, labels, amount):
+        values = _samples.local()
+        key = (sample, labels)
+        values[key] = values.get(key, 0) + amount
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        self._add(self.name, self._labels(labels), amount)
+
+
+class Gauge(Metric):
+    """Summed over live processes only."""
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        self._add(self.name, self._labels(labels), amount)
+
+    def dec(self, amount=1, **labels):
+        self._add(self.name, self._labels(labels), -amount)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        base = self._labels(labels)
+        # Non-cumulative here; rendering accumulates
+        bound = next(b for b in self.buckets if value <= b)
+        self._add(f'{self.name}_bucket', base + (('le', _format(bound)),), 1)
+        self._add(f'{self.name}_sum', base, value)
+        self._add(f'{self.name}_count', base, 1)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+
+def _format(bound):
+    return '+Inf' if bound == float('inf') else format(bound, 'g')
+
+
+# ----------------------------------------------------------------------
+# Metrics
+# ----------------------------------------------------------------------
+
+REQUEST_LATENCY = Histogram(
+    'growfund_http_request_duration_seconds', 'HTTP request latency by route', ['method', 'route'],
+)
+SETTLEMENT_LAG = Histogram(
+    'growfund_trade_settlement_lag_seconds', 'Seconds between a trade expiring and being settled', ['book'],
+    buckets=(.5, 1, 2, 5, 10, 30, 60, 120, 300, 900),
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    'growfund_websocket_connections', 'Open websocket connections per consumer', ['consumer'],
+)
+PROVIDER_LATENCY = Histogram(
+    'growfund_provider_request_duration_seconds', 'Outbound provider request latency', ['provider'],
+)
+PROVIDER_ERRORS = Counter(
+    'growfund_provider_errors_total', 'Outbound provider requests that failed', ['provider', 'reason'],
+)
+USDT_POLL_DURATION = Histogram(
+    'growfund_usdt_poll_duration_seconds', 'Duration of one USDT deposit poll',
+    buckets=(.1, .25, .5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+
+
+# ----------------------------------------------------------------------
+# Sharing across processes
+# ----------------------------------------------------------------------
+
+def _serialize(totals):
+    return [[sample, [list(pair) for pair in labels], value] for (sample, labels), value in totals.items()]
+
+
+def _deserialize(rows):
+    return {(sample, tuple(tuple(pair) for pair in labels)): value for sample, labels, value in rows}
+
+
+def _write(path, payload):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+def flush():
+    """Write this process's totals to its file."""
+    totals = _samples.totals()
+    if not totals:
+        return
+    try:
+        _write(os.path.join(metrics_dir(), f'{os.getpid()}.json'), _serialize(totals))
+    except OSError as e:
+        logger.warning(f'Metrics flush failed: {e}')
+
+
+atexit.register(flush)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _is_gauge(sample):
+    metric = _registry.get(sample)
+    return metric is not None and metric.kind == 'gauge'
+
+
+def collect():
+    """Samples of every process on this host, with exited processes archived."""
+    import fcntl
+
+    flush()
+    path = metrics_dir()
+    totals = defaultdict(float)
+    with open(os.path.join(path, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(path, ARCHIVE)
+        try:
+            with open(archive_path) as f:
+                archive = _deserialize(json.load(f))
+        except (OSError, ValueError):
+            archive = {}
+
+        archived = False
+        for name in os.listdir(path):
+            if not name.endswith('.json') or name == ARCHIVE:
+                continue
+            try:
+                pid = int(name[:-5])
+                with open(os.path.join(path, name)) as f:
+                    samples = _deserialize(json.load(f))
+            except (OSError, ValueError):
+                continue
+            if pid == os.getpid() or _alive(pid):
+                for key, value in samples.items():
+                    totals[key] += value
+                continue
+            for key, value in samples.items():
+                if not _is_gauge(key[0]):
+                    archive[key] = archive.get(key, 0) + value
+            os.remove(os.path.join(path, name))
+            archived = True
+
+        if archived:
+            _write(archive_path, _serialize(archive))
+    for key, value in archive.items():
+        totals[key] += value
+    return totals
+
+
+def _db_pool_lines():
+    """Connections held per database and state, read from the server."""
+    from django.db import connections
+
+    lines = []
+    for alias in settings.DATABASES:
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            continue
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT COALESCE(state, %s), count(*) FROM pg_stat_activity '
+                    'WHERE datname = current_database() GROUP BY 1',
+                    ['unknown'],
+                )
+                for state, count in cursor.fetchall():
+                    lines.append(f'growfund_db_connections{{database="{alias}",state="{state}"}} {count}')
+                cursor.execute('SHOW max_connections')
+                lines.append(f'growfund_db_max_connections{{database="{alias}"}} {cursor.fetchone()[0]}')
+        except Exception as e:
+            logger.warning(f'Metrics: connection count for {alias} failed: {e}')
+    if lines:
+        lines = [
+            '# HELP growfund_db_connections Server connections by state',
+            '# TYPE growfund_db_connections gauge',
+            '# HELP growfund_db_max_connections Server connection limit',
+            '# TYPE growfund_db_max_connections gauge',
+        ] + lines
+    return lines
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _sample_line(sample, labels, value):
+    label_text = ','.join(f'{name}="{_escape(v)}"' for name, v in labels)
+    value = int(value) if float(value).is_integer() else value
+    return f'{sample}{{{label_text}}} {value}' if label_text else f'{sample} {value}'
+
+
+def render():
+    """Every metric in the text exposition format."""
+    totals = collect()
+    by_metric = defaultdict(dict)
+    for (sample, labels), value in totals.items():
+        for name in (sample, sample.rsplit('_', 1)[0]):
+            if name in _registry:
+                by_metric[name][(sample, labels)] = value
+                break
+
+    lines = []
+    for name, metric in sorted(_registry.items()):
+        lines.append(f'# HELP {name} {metric.help}')
+        lines.append(f'# TYPE {name} {metric.kind}')
+        samples = by_metric.get(name, {})
+        if metric.kind != 'histogram':
+            for (sample, labels), value in sorted(samples.items()):
+                lines.append(_sample_line(sample, labels, value))
+            continue
+
+        series = {labels for (sample, labels) in samples if sample != f'{name}_bucket'}
+        for labels in sorted(series):
+            running = 0
+            for bound in metric.buckets:
+                running += samples.get((f'{name}_bucket', labels + (('le', _format(bound)),)), 0)
+                lines.append(_sample_line(f'{name}_bucket', labels + (('le', _format(bound)),), running))
+            lines.append(_sample_line(f'{name}_sum', labels, samples.get((f'{name}_sum', labels), 0)))
+            lines.append(_sample_line(f'{name}_count', labels, samples.get((f'{name}_count', labels), 0)))
+
+    lines.extend(_db_pool_lines())
+    return '\n'.join(lines) + '\n'
+
+
+# ----------------------------------------------------------------------
+# Instrumentation helpers
+# ----------------------------------------------------------------------
+
+class ProviderSession(requests.Session):
+    """
+    ``requests.Session`` for one upstream provider: records latency and
+    errors (exceptions and 4xx/5xx answers) and keeps connections alive
+    between calls. Cookies are never stored, so one user's call can't leak
+    state into the next.
+    """
+
+    def __init__(self, provider):
+        super().__init__()
+        self.provider = provider
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def request(self, method, url, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException as e:
+            PROVIDER_ERRORS.inc(provider=self.provider, reason=type(e).__name__)
+            raise
+        finally:
+            PROVIDER_LATENCY.observe(time.perf_counter() - started, provider=self.provider)
+        if response.status_code >= 400:
+            PROVIDER_ERRORS.inc(provider=self.provider, reason=f'http_{response.status_code // 100}xx')
+        return response
+
+
+def observe_settlement(trade, book):
+    """Record how long after its expiry ``trade`` was settled."""
+    if trade.closed_at and trade.expires_at and trade.closed_at >= trade.expires_at:
+        SETTLEMENT_LAG.observe((trade.closed_at - trade.expires_at).total_seconds(), book=book)
+
+
+def track_websockets(consumer):
+    """ASGI app for ``consumer`` that counts its accepted, still open connections."""
+    app = consumer.as_asgi()
+    # Module too: binary_trading has two PriceStreamConsumer classes
+    name = f"{consumer.__module__.rsplit('.', 1)[-1]}.{consumer.__name__}"
+
+    async def tracked(scope, receive, send):
+        accepted = False
+
+        async def counting_send(message):
+            nonlocal accepted
+            if message.get('type') == 'websocket.accept' and not accepted:
+                accepted = True
+                WEBSOCKET_CONNECTIONS.inc(consumer=name)
+            await send(message)
+
+        try:
+            return await app(scope, receive, counting_send)
+        finally:
+            if accepted:
+                WEBSOCKET_CONNECTIONS.dec(consumer=name)
+
+    tracked.consumer_class = consumer
+    return tracked
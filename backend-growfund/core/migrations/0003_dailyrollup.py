@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50)),
+                ('date', models.DateField()),
+                ('dimension', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.BigIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=8, default=0, max_digits=24)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Daily rollup',
+                'verbose_name_plural': 'Daily rollups',
+                'ordering': ['-date', 'metric', 'dimension'],
+                'indexes': [models.Index(fields=['metric', 'dimension', 'date'], name='core_dailyr_metric_a01cf0_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrollup',
+            constraint=models.UniqueConstraint(fields=('metric', 'date', 'dimension'), name='unique_daily_rollup'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def backfill_rollups(apps, schema_editor):
+    # Existing rows predate the rollup signals; count them once
+    from core.rollups import rollups
+
+    for metric in rollups.sources:
+        rollups.recompute(metric, app_registry=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_dailyrollup'),
+        ('accounts', '0005_user_list_sort_indexes'),
+        ('investments', '0005_trade_updated_at_index'),
+        ('transactions', '0003_alter_transaction_transaction_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class SchedulerLease(models.Model):
+    """
+    Leadership lease for the background scheduler.
+
+    One row per lease name. The process whose identity is stored in
+    ``holder`` is the leader until ``expires_at``; it renews the lease on
+    every scheduler tick. If the leader dies the lease simply expires and
+    the next process to tick takes over.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    holder = models.CharField(max_length=200, blank=True, default='')
+    acquired_at = models.DateTimeField(null=True, blank=True)
+    renewed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Scheduler lease'
+        verbose_name_plural = 'Scheduler leases'
+
+    def __str__(self):
+        return f"{self.name} - {self.holder or 'unheld'}"
+
+
+class Job(models.Model):
+    """
+    A unit of background work in the database-backed job queue.
+
+    Workers claim queued rows with ``SELECT ... FOR UPDATE SKIP LOCKED`` so
+    several workers can share one table without a broker. See core/jobs.py.
+    """
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    task = models.CharField(max_length=200)
+    queue = models.CharField(max_length=50, default='default')
+    args = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    priority = models.IntegerField(default=0, help_text='Higher runs first')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+
+    # Scheduling and retries
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+
+    # Execution
+    locked_by = models.CharField(max_length=200, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    last_error = models.TextField(blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'queue', '-priority', 'run_at']),
+            models.Index(fields=['status', 'locked_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.task} [{self.status}]"
+
+
+class DailyRollup(models.Model):
+    """
+    Per-day aggregate of one metric, split by a dimension.
+
+    ``metric`` names a rollup source (see core/rollups.py) and
+    ``dimension`` the value of its grouping fields, e.g. ``deposit:completed``
+    for transactions. Rows are adjusted in place as source rows are written
+    and can be rebuilt with ``python manage.py backfill_rollups``.
+    """
+
+    metric = models.CharField(max_length=50)
+    date = models.DateField()
+    dimension = models.CharField(max_length=100, blank=True, default='')
+    count = models.BigIntegerField(default=0)
+    amount = models.DecimalField(max_digits=24, decimal_places=8, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Daily rollup'
+        verbose_name_plural = 'Daily rollups'
+        ordering = ['-date', 'metric', 'dimension']
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'date', 'dimension'], name='unique_daily_rollup'),
+        ]
+        indexes = [
+            models.Index(fields=['metric', 'dimension', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.dimension}] {self.date}: {self.count} / {self.amount}"
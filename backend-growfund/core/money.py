@@ -0,0 +1,72 @@
+"""
+Money formatting shared by views and serializers.
+
+``money`` replaces hand-written ``f"{x:.2f}"`` / ``str(x)`` formatting of
+amounts, ``rounded`` replaces ``float(f"{x:.2f}")`` for percentages and
+rates, and ``MoneyField`` is a read-only ``DecimalField`` that formats the
+same way without DRF's per-value precision checks. Places and rounding
+come from ``MONEY_DECIMAL_PLACES`` / ``MONEY_ROUNDING``; the defaults (2,
+half-even) give the same output as the f-strings they replace.
+
+    from core.money import MoneyField, money, rounded
+
+    'balance': money(user.balance),                  # '1250.00'
+    'change24h': rounded(coin.change_24h),           # 3.14
+"""
+import decimal
+from decimal import Decimal
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+_EXPONENTS = {}
+
+
+def _quantize(value, places):
+    exponent = _EXPONENTS.get(places)
+    if exponent is None:
+        exponent = _EXPONENTS[places] = Decimal(1).scaleb(-places)
+    if not isinstance(value, Decimal):
+        value = Decimal(value)
+    return value.quantize(exponent, rounding=settings.MONEY_ROUNDING)
+
+
+def _format(value, places):
+    if places is None:
+        places = settings.MONEY_DECIMAL_PLACES
+    if settings.MONEY_ROUNDING == decimal.ROUND_HALF_EVEN:
+        # format() rounds half-even itself and is several times faster than quantize()
+        return format(value, f'.{places}f')
+    return '{:f}'.format(_quantize(value, places))
+
+
+def money(value, places=None):
+    """``value`` (Decimal, int or float) as a fixed-point string, e.g. ``'1250.00'``; None stays None."""
+    if value is None:
+        return None
+    return _format(value, places)
+
+
+def rounded(value, places=None):
+    """``value`` rounded to ``places`` as a float, for JSON numbers; None stays None."""
+    if value is None:
+        return None
+    return float(_format(value, places))
+
+
+class MoneyField(serializers.DecimalField):
+    """Read-only amount rendered with ``money``."""
+
+    def __init__(self, max_digits=None, decimal_places=None, **kwargs):
+        kwargs['read_only'] = True
+        if decimal_places is None:
+            decimal_places = settings.MONEY_DECIMAL_PLACES
+        super().__init__(max_digits, decimal_places, **kwargs)
+
+    def to_representation(self, value):
+        if not isinstance(value, Decimal) or self.localize or not getattr(
+            self, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING
+        ):
+            return super().to_representation(value)
+        return money(value, self.decimal_places)
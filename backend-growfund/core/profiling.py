@@ -0,0 +1,188 @@
+"""
+On-demand sampling profiler for live requests.
+
+An admin gets a signed token from ``POST /api/admin/profiles/token/`` and
+sends it with the request to profile, as the ``X-Profile`` header or the
+``_profile`` query parameter. ``ProfilingMiddleware`` then samples the
+request thread's stack every ``PROFILE_SAMPLE_INTERVAL_MS`` and stores the
+samples as folded stacks (``frame;frame;frame count`` per line), which
+flamegraph.pl, speedscope and similar tools read directly. The response
+carries ``X-Profile-Id``; the profile is served at
+``/api/admin/profiles/<id>/`` (``<id>/folded/`` for the raw stacks).
+
+    curl -X POST -H "Authorization: Bearer $JWT" .../api/admin/profiles/token/
+    curl -H "Authorization: Bearer $JWT" -H "X-Profile: $TOKEN" .../api/auth/dashboard-stats/
+
+Limits: sampling stops after ``PROFILE_MAX_SECONDS``; a process profiles
+one request at a time and the whole site at most one every
+``PROFILE_MIN_INTERVAL`` seconds; profiles expire after ``PROFILE_TTL``.
+Untriggered requests cost one header lookup, and nothing at all with
+``PROFILING_ENABLED`` off (the middleware unloads itself).
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+HEADER = 'X-Profile'
+PARAM = '_profile'
+SALT = 'growfund.profile'
+INDEX_KEY = 'profile:index'
+INDEX_SIZE = 50
+
+
+def make_token(user):
+    return signing.TimestampSigner(salt=SALT).sign_object({'user': user.pk})
+
+
+def check_token(token):
+    """Id of the admin who issued ``token``, or None when invalid or expired."""
+    try:
+        data = signing.TimestampSigner(salt=SALT).unsign_object(
+            token, max_age=getattr(settings, 'PROFILE_TOKEN_MAX_AGE', 900)
+        )
+    except signing.BadSignature:
+        return None
+    return data.get('user')
+
+
+def _frame_name(code):
+    filename = code.co_filename
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        filename = os.path.relpath(filename, base)
+    else:
+        filename = '/'.join(filename.split(os.sep)[-2:])
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread."""
+
+    def __init__(self, thread_id, interval, max_seconds):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks = Counter()
+        self.samples = 0
+        self.truncated = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def _run(self):
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval):
+            if time.monotonic() > deadline:
+                self.truncated = True
+                return
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self):
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common())
+
+
+def save_profile(profile):
+    ttl = getattr(settings, 'PROFILE_TTL', 86400)
+    cache.set(f'profile:{profile["id"]}', profile, ttl)
+    index = [entry for entry in cache.get(INDEX_KEY, []) if entry['id'] != profile['id']]
+    summary = {key: value for key, value in profile.items() if key != 'folded'}
+    cache.set(INDEX_KEY, [summary] + index[:INDEX_SIZE - 1], ttl)
+
+
+def get_profile(profile_id):
+    return cache.get(f'profile:{profile_id}')
+
+
+def list_profiles():
+    return cache.get(INDEX_KEY, [])
+
+
+class ProfilingMiddleware:
+    """Profiles requests that carry a valid token (see module docstring)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self._busy = threading.Lock()
+
+    def __call__(self, request):
+        token = request.headers.get(HEADER)
+        if token is None and PARAM in request.META.get('QUERY_STRING', ''):
+            token = request.GET.get(PARAM)
+        if not token:
+            return self.get_response(request)
+        return self.profile(request, token)
+
+    def profile(self, request, token):
+        user_id = check_token(token)
+        if user_id is None:
+            response = self.get_response(request)
+            response[HEADER] = 'invalid-token'
+            return response
+
+        if not self._busy.acquire(blocking=False):
+            response = self.get_response(request)
+            response[HEADER] = 'busy'
+            return response
+        if not cache.add('profile:slot', 1, getattr(settings, 'PROFILE_MIN_INTERVAL', 10)):
+            self._busy.release()
+            response = self.get_response(request)
+            response[HEADER] = 'rate-limited'
+            return response
+
+        try:
+            interval_ms = max(getattr(settings, 'PROFILE_SAMPLE_INTERVAL_MS', 5), 1)
+            sampler = StackSampler(
+                threading.get_ident(), interval_ms / 1000, getattr(settings, 'PROFILE_MAX_SECONDS', 30)
+            )
+            started_at = timezone.now()
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+        finally:
+            self._busy.release()
+
+        profile = {
+            'id': uuid.uuid4().hex,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'requested_by': user_id,
+            'started_at': started_at.isoformat(),
+            'duration_ms': round(duration_ms, 1),
+            'interval_ms': interval_ms,
+            'samples': sampler.samples,
+            'truncated': sampler.truncated,
+            'folded': sampler.folded(),
+        }
+        save_profile(profile)
+        response[HEADER] = 'stored'
+        response['X-Profile-Id'] = profile['id']
+        return response
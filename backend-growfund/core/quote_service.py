@@ -0,0 +1,348 @@
+"""
+Market-data quote service.
+
+Every market price the platform shows (crypto price board, live and demo
+portfolios, binary-trading price feed, charts) is read from a snapshot kept
+in the shared cache. A leader-only periodic job refreshes the whole symbol
+registry with one batched CoinGecko call per ``MARKET_DATA_INTERVAL``, so
+user requests never wait on the upstream API and upstream call volume is
+constant no matter how much traffic we get. Reads never trigger a refresh
+or write anything: a snapshot the scheduler hasn't refreshed in time is
+served as is, flagged ``stale`` in ``meta()``.
+
+    from core.quote_service import quote_service
+
+    snapshot = quote_service.get_snapshot()
+    snapshot.price('BTC')        # Decimal or None
+    snapshot.meta()              # {'as_of': ..., 'age_seconds': ..., 'stale': ...}
+
+    prices, names = quote_service.get_prices({'BTC', 'EXACOIN'})
+
+Admin-controlled coins (EXACOIN, OPTCOIN, ...) are not market data; they
+come from ``AdminCryptoPrice`` and are merged in by ``get_prices``.
+"""
+import logging
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .metrics import ProviderSession
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_URL = 'https://api.coingecko.com/api/v3'
+
+http = ProviderSession('coingecko')
+
+# The one symbol registry: our symbol -> (CoinGecko id, display name)
+SYMBOLS = {
+    'BTC':   ('bitcoin',       'Bitcoin'),
+    'ETH':   ('ethereum',      'Ethereum'),
+    'BNB':   ('binancecoin',   'BNB'),
+    'ADA':   ('cardano',       'Cardano'),
+    'SOL':   ('solana',        'Solana'),
+    'DOT':   ('polkadot',      'Polkadot'),
+    'USDT':  ('tether',        'Tether'),
+    'XRP':   ('ripple',        'XRP'),
+    'DOGE':  ('dogecoin',      'Dogecoin'),
+    'MATIC': ('matic-network', 'Polygon'),
+    'LTC':   ('litecoin',      'Litecoin'),
+    'AVAX':  ('avalanche-2',   'Avalanche'),
+    'LINK':  ('chainlink',     'Chainlink'),
+    'UNI':   ('uniswap',       'Uniswap'),
+    'ATOM':  ('cosmos',        'Cosmos'),
+}
+
+# Chart interval -> CoinGecko OHLC "days" param
+OHLC_DAYS = {
+    '1m':  1,
+    '5m':  1,
+    '15m': 1,
+    '30m': 2,
+    '1h':  7,
+    '4h':  30,
+    '1d':  90,
+}
+
+QUOTES_KEY = 'market:quotes'
+
+
+def _ohlc_key(symbol, days):
+    return f'market:ohlc:{symbol}:{days}'
+
+
+def _ohlc_wanted_key(symbol, days):
+    return f'market:ohlc:wanted:{symbol}:{days}'
+
+
+def _decimal(value):
+    return Decimal(str(value if value is not None else 0))
+
+
+class QuoteSnapshot:
+    """An immutable view of the last successful upstream refresh."""
+
+    def __init__(self, quotes=None, fetched_at=None):
+        self.quotes = quotes or {}
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self):
+        """Seconds since the refresh, or None if there never was one."""
+        if self.fetched_at is None:
+            return None
+        return (timezone.now() - self.fetched_at).total_seconds()
+
+    @property
+    def is_stale(self):
+        age = self.age
+        return age is None or age > quote_service.stale_after
+
+    def get(self, symbol):
+        return self.quotes.get(symbol)
+
+    def price(self, symbol):
+        quote = self.quotes.get(symbol)
+        return quote['price'] if quote else None
+
+    def meta(self):
+        """Staleness metadata for API responses."""
+        age = self.age
+        return {
+            'as_of': self.fetched_at.isoformat() if self.fetched_at else None,
+            'age_seconds': round(age, 1) if age is not None else None,
+            'stale': self.is_stale,
+            'source': 'coingecko',
+        }
+
+
+class QuoteService:
+    """Reads quote snapshots from the cache and refreshes them upstream."""
+
+    def __init__(self):
+        self._listeners = []
+
+    def on_refresh(self, callback):
+        """
+        Call ``callback(snapshot)`` after each successful refresh made by
+        this process (the scheduler leader).
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    @property
+    def interval(self):
+        return getattr(settings, 'MARKET_DATA_INTERVAL', 30)
+
+    @property
+    def stale_after(self):
+        return getattr(settings, 'MARKET_DATA_STALE_AFTER', self.interval * 3)
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'MARKET_DATA_TIMEOUT', 10)
+
+    # ------------------------------------------------------------------
+    # Readers (never call upstream)
+    # ------------------------------------------------------------------
+
+    def get_snapshot(self):
+        data = cache.get(QUOTES_KEY)
+        if not data:
+            return QuoteSnapshot()
+        return QuoteSnapshot(data['quotes'], data['fetched_at'])
+
+    def get_market_price(self, symbol, max_age=None):
+        """
+        Market price for ``symbol`` or None. With ``max_age`` (seconds), a
+        quote older than that counts as unavailable.
+        """
+        snapshot = self.get_snapshot()
+        if max_age is not None and (snapshot.age is None or snapshot.age > max_age):
+            return None
+        return snapshot.price(symbol)
+
+    def get_prices(self, symbols):
+        """
+        Prices and display names for ``symbols``, admin-controlled coins
+        first (from the database), market coins from the snapshot.
+
+        Returns ``(prices, names)`` keyed by symbol; symbols with no price
+        are left out of ``prices``.
+        """
+        from investments.admin_models import AdminCryptoPrice
+
+        symbols = set(symbols)
+        prices = {}
+        names = {}
+
+        for coin in AdminCryptoPrice.objects.filter(coin__in=symbols, is_active=True):
+            prices[coin.coin] = coin.buy_price
+            names[coin.coin] = coin.name if coin.name else coin.coin
+
+        market = [s for s in symbols if s not in prices and s in SYMBOLS]
+        if market:
+            snapshot = self.get_snapshot()
+            for symbol in market:
+                names[symbol] = SYMBOLS[symbol][1]
+                price = snapshot.price(symbol)
+                if price:
+                    prices[symbol] = price
+
+        return prices, names
+
+    def get_price(self, symbol):
+        return self.get_prices([symbol])[0].get(symbol)
+
+    def get_price_book(self):
+        """
+        ``(prices, names)`` for every symbol we can price: all active admin
+        coins plus the whole market snapshot. One query, for callers that
+        would otherwise have to look up which symbols they need first.
+        """
+        from investments.admin_models import AdminCryptoPrice
+
+        snapshot = self.get_snapshot()
+        prices = {symbol: quote['price'] for symbol, quote in snapshot.quotes.items()}
+        names = {symbol: name for symbol, (_, name) in SYMBOLS.items()}
+        for coin in AdminCryptoPrice.objects.filter(is_active=True):
+            prices[coin.coin] = coin.buy_price
+            names[coin.coin] = coin.name if coin.name else coin.coin
+        return prices, names
+
+    def get_ohlc(self, symbol, interval):
+        """
+        Cached CoinGecko candles for ``symbol``/``interval`` or None.
+
+        Reading marks the series as wanted; the poller fetches it on its
+        next run and keeps it fresh while it is still being read.
+        """
+        if symbol not in SYMBOLS:
+            return None
+        days = OHLC_DAYS.get(interval, 1)
+        cache.add(
+            _ohlc_wanted_key(symbol, days), True,
+            getattr(settings, 'MARKET_OHLC_INTEREST_TTL', 3600),
+        )
+        data = cache.get(_ohlc_key(symbol, days))
+        return data['candles'] if data else None
+
+    # ------------------------------------------------------------------
+    # Upstream refresh (scheduler only)
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        """
+        Fetch every registered symbol in one request and store the snapshot.
+        On failure the previous snapshot is kept and simply ages.
+        """
+        ids = {gecko_id: symbol for symbol, (gecko_id, _) in SYMBOLS.items()}
+        started = time.monotonic()
+        try:
+            response = http.get(
+                f'{COINGECKO_URL}/simple/price',
+                params={
+                    'ids': ','.join(ids),
+                    'vs_currencies': 'usd',
+                    'include_24hr_change': 'true',
+                    'include_7d_change': 'true',
+                    'include_30d_change': 'true',
+                },
+                headers=self._headers(),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            logger.warning(f'CoinGecko quote refresh failed: {e}')
+            return 0
+
+        quotes = {}
+        for gecko_id, values in data.items():
+            symbol = ids.get(gecko_id)
+            if symbol and values.get('usd'):
+                quotes[symbol] = {
+                    'price': _decimal(values['usd']),
+                    'change_24h': _decimal(values.get('usd_24h_change')),
+                    'change_7d': _decimal(values.get('usd_7d_change')),
+                    'change_30d': _decimal(values.get('usd_30d_change')),
+                }
+
+        if quotes:
+            fetched_at = timezone.now()
+            # No expiry: an old snapshot beats none when upstream is down
+            cache.set(QUOTES_KEY, {'quotes': quotes, 'fetched_at': fetched_at}, None)
+            snapshot = QuoteSnapshot(quotes, fetched_at)
+            for callback in self._listeners:
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    logger.error(f'Quote refresh listener {callback} failed: {e}')
+        logger.debug(f'Refreshed {len(quotes)} quotes in {time.monotonic() - started:.2f}s')
+        return len(quotes)
+
+    def refresh_ohlc(self):
+        """Refresh wanted candle series that are missing or out of date."""
+        max_age = getattr(settings, 'MARKET_OHLC_INTERVAL', 300)
+        per_run = getattr(settings, 'MARKET_OHLC_MAX_PER_RUN', 5)
+
+        series = [(s, d) for s in SYMBOLS for d in set(OHLC_DAYS.values())]
+        wanted = cache.get_many([_ohlc_wanted_key(s, d) for s, d in series])
+        current = cache.get_many([_ohlc_key(s, d) for s, d in series])
+
+        due = []
+        for symbol, days in series:
+            if _ohlc_wanted_key(symbol, days) not in wanted:
+                continue
+            data = current.get(_ohlc_key(symbol, days))
+            age = (timezone.now() - data['fetched_at']).total_seconds() if data else None
+            if age is None or age > max_age:
+                due.append((age is not None, -(age or 0), symbol, days))
+
+        # Missing series first, then the oldest; bounded per run
+        refreshed = 0
+        for _, _, symbol, days in sorted(due)[:per_run]:
+            candles = self._fetch_ohlc(symbol, days)
+            if candles:
+                cache.set(
+                    _ohlc_key(symbol, days),
+                    {'candles': candles, 'fetched_at': timezone.now()},
+                    86400,
+                )
+                refreshed += 1
+        return refreshed
+
+    def _fetch_ohlc(self, symbol, days):
+        """CoinGecko /coins/{id}/ohlc returns [timestamp_ms, open, high, low, close]."""
+        try:
+            response = http.get(
+                f'{COINGECKO_URL}/coins/{SYMBOLS[symbol][0]}/ohlc',
+                params={'vs_currency': 'usd', 'days': days},
+                headers=self._headers(),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return [
+                {
+                    'time':   c[0] // 1000,
+                    'open':   float(c[1]),
+                    'high':   float(c[2]),
+                    'low':    float(c[3]),
+                    'close':  float(c[4]),
+                    'volume': 0,
+                }
+                for c in response.json()
+            ]
+        except Exception as e:
+            logger.warning(f'CoinGecko OHLC failed for {symbol}: {e}')
+            return None
+
+    def _headers(self):
+        api_key = getattr(settings, 'COINGECKO_API_KEY', '')
+        return {'x-cg-demo-api-key': api_key} if api_key else {}
+
+
+quote_service = QuoteService()
@@ -0,0 +1,70 @@
+"""
+orjson-backed JSON renderer and parser for DRF.
+
+Drop-in replacements for ``rest_framework.renderers.JSONRenderer`` and
+``rest_framework.parsers.JSONParser`` (configured as the defaults in
+``REST_FRAMEWORK``). orjson encodes dicts, lists, strings, numbers, UUIDs
+and dates/datetimes natively, several times faster than ``json.dumps``
+with DRF's encoder and without building an intermediate ``str``. The
+output matches DRF's: UTC datetimes end in ``Z``, Decimals become numbers
+(serializer fields already turn them into strings), non-string keys are
+stringified and U+2028/U+2029 are escaped. Anything else (lazy strings,
+querysets, generators, ...) goes through DRF's encoder.
+
+Indented output (``; indent=4`` or the browsable API), non-UTF-8 requests
+and values orjson cannot represent, such as integers over 64 bits, fall
+back to the stdlib implementations.
+"""
+from decimal import Decimal
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return _encoder.default(obj)
+
+
+def dumps(data):
+    """Serialize ``data`` to JSON bytes the way ``FastJSONRenderer`` does."""
+    ret = orjson.dumps(data, default=_default, option=OPTIONS)
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return ret
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
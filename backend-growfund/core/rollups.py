@@ -0,0 +1,445 @@
+"""
+Daily rollups for admin statistics.
+
+Admin dashboards used to run a dozen full-table COUNT/SUM queries per page
+view. Instead, each source below keeps ``DailyRollup`` rows (one per day and
+dimension) that are adjusted as rows change, so totals and time series are
+a scan over a few rollup rows.
+
+    from core.rollups import rollups
+
+    rollups.totals(['transactions', 'trades'])
+    # {'transactions': {'deposit:completed': {'count': 12, 'amount': Decimal(...)}, ...}, ...}
+
+    rollups.series('transactions', days=90, dimensions=['deposit:completed'])
+    # [{'date': date(...), 'count': 3, 'amount': Decimal(...)}, ...]
+
+When an existing row is saved, ``pre_save`` reads the bucket it is stored
+in (one query by primary key, skipped when ``update_fields`` leaves the
+dimension and amount fields alone); the old bucket is decremented and the
+new one incremented when they differ. Deletes decrement the bucket the row
+is stored in: rows the deletion collector loaded itself (queryset and
+cascade deletes) are current as they are, only an instance deleted
+directly is read again. ``bulk_create``/``bulk_update`` skip signals, so bulk
+writers call ``rollups.record_created(objs)``, or ``rollups.remember(objs)``
+before changing the objects and ``rollups.record_updated(objs)`` after.
+
+Changes made inside a transaction are summed and written once it commits,
+each rollup row in its own short statement, so writers don't hold the
+shared rollup rows locked for the rest of their transaction. Anything that
+slips past all of this (``QuerySet.update()``, raw SQL, a rolled-back
+savepoint inside a committed transaction) is corrected by the periodic
+reconcile of recent days, or by ``python manage.py backfill_rollups``.
+Migration ``core.0004`` fills the rollups once for existing rows.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from functools import reduce
+
+from django.apps import apps
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+
+MONEY = models.DecimalField(max_digits=24, decimal_places=8)
+CENTS = Decimal('0.01')
+
+# Bucket of an instance with deferred fields; its day is recomputed instead.
+UNKNOWN = object()
+# Bucket of a save that can't have moved the row (see ``RollupSource.can_move``).
+UNCHANGED = object()
+
+
+class RollupSource:
+    """
+    One metric: a model, the datetime field that picks the day, the fields
+    whose values form the dimension and the fields multiplied into the
+    amount (empty for count-only metrics).
+    """
+
+    def __init__(self, metric, model, date_field, dimensions=(), amount=()):
+        self.metric = metric
+        self.model_label = model
+        self.date_field = date_field
+        self.dimensions = tuple(dimensions)
+        self.amount = tuple(amount)
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def fields(self):
+        return {self.date_field, *self.dimensions, *self.amount}
+
+    def can_move(self, update_fields=None):
+        """
+        Whether a save can move a row to another bucket. A row's date never
+        changes, so only the dimension and amount fields matter.
+        """
+        moving = {*self.dimensions, *self.amount}
+        if update_fields is not None:
+            moving &= set(update_fields)
+        return bool(moving)
+
+    def bucket(self, instance):
+        """``(day, dimension, amount)`` for ``instance`` or None before it is saved."""
+        if self.fields & instance.get_deferred_fields():
+            return UNKNOWN
+        return self.bucket_of(instance.__dict__)
+
+    def bucket_of(self, values):
+        """``(day, dimension, amount)`` from a mapping of field names to values."""
+        day = self._day(values[self.date_field])
+        if day is None:
+            return None
+        dimension = ':'.join(str(values[f]) for f in self.dimensions)
+        amount = Decimal('0')
+        if self.amount:
+            amount = reduce(lambda a, b: a * b, (Decimal(values[f] or 0) for f in self.amount))
+        return day, dimension, amount
+
+    def stored_bucket(self, pk):
+        """The bucket row ``pk`` is in as currently stored, None if it doesn't exist."""
+        values = self.model._base_manager.filter(pk=pk).values(*self.fields).first()
+        return self.bucket_of(values) if values else None
+
+    def day_of(self, pk):
+        moment = self.model._base_manager.filter(pk=pk).values_list(self.date_field, flat=True).first()
+        return self._day(moment)
+
+    @staticmethod
+    def _day(moment):
+        if moment is None:
+            return None
+        return timezone.localdate(moment) if timezone.is_aware(moment) else moment.date()
+
+    def amount_expression(self):
+        if not self.amount:
+            return Value(Decimal('0'), output_field=MONEY)
+        product = reduce(lambda a, b: a * b, (F(f) for f in self.amount))
+        return Coalesce(Sum(product, output_field=MONEY), Value(Decimal('0')), output_field=MONEY)
+
+    def aggregate(self, start=None, end=None, model=None):
+        """
+        Rollup rows computed from the source table for ``start``..``end``
+        (dates, inclusive). ``model`` overrides the source model, e.g. with
+        a migration's historical one.
+        """
+        qs = (model or self.model)._base_manager.annotate(rollup_day=TruncDate(self.date_field))
+        if start:
+            qs = qs.filter(rollup_day__gte=start)
+        if end:
+            qs = qs.filter(rollup_day__lte=end)
+        rows = qs.order_by().values('rollup_day', *self.dimensions).annotate(
+            rollup_count=Count('pk'), rollup_amount=self.amount_expression(),
+        )
+        for row in rows:
+            yield {
+                'date': row['rollup_day'],
+                'dimension': ':'.join(str(row[f]) for f in self.dimensions),
+                'count': row['rollup_count'],
+                'amount': row['rollup_amount'] or Decimal('0'),
+            }
+
+
+class PendingRollups:
+    """Rollup changes made in one transaction, summed per rollup row until it commits."""
+
+    def __init__(self, registry, queued=False):
+        self.registry = registry
+        self.queued = queued
+        self.flushed = False
+        self.deltas = defaultdict(lambda: [0, Decimal('0')])
+        self.rebuild = set()
+
+    def add(self, metric, day, dimension, count, amount):
+        entry = self.deltas[(metric, day, dimension)]
+        entry[0] += count
+        entry[1] += amount
+
+    def settle(self):
+        """Write the changes now unless they are waiting for a commit."""
+        if not self.queued:
+            self.flush()
+
+    def flush(self):
+        self.flushed = True
+        deltas, rebuild = self.deltas, self.rebuild
+        self.deltas, self.rebuild = defaultdict(lambda: [0, Decimal('0')]), set()
+        # Sorted, so concurrent flushes lock rollup rows in the same order
+        for metric, day in sorted(rebuild):
+            self.registry.recompute(metric, day, day)
+        for (metric, day, dimension), (count, amount) in sorted(deltas.items()):
+            if (metric, day) in rebuild or not (count or amount):
+                continue
+            self.registry._apply(metric, day, dimension, count, amount)
+
+
+class RollupRegistry:
+    """Keeps the registered sources' rollups current and answers queries on them."""
+
+    def __init__(self):
+        self.sources = {}
+        self._connected = set()
+
+    def register(self, source):
+        self.sources[source.metric] = source
+
+    def connect(self):
+        """Hook the model signals of every registered source. Called from ``CoreConfig.ready()``."""
+        for source in self.sources.values():
+            if source.metric in self._connected:
+                continue
+            uid = f'rollups:{source.metric}'
+            pre_save.connect(self._make_pre_save(source), sender=source.model, weak=False, dispatch_uid=uid)
+            post_save.connect(self._make_save(source), sender=source.model, weak=False, dispatch_uid=uid)
+            pre_delete.connect(self._make_pre_delete(source), sender=source.model, weak=False, dispatch_uid=uid)
+            post_delete.connect(self._make_delete(source), sender=source.model, weak=False, dispatch_uid=uid)
+            self._connected.add(source.metric)
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _make_pre_save(self, source):
+        def remember_bucket(sender, instance, raw=False, update_fields=None, **kwargs):
+            if raw or instance._state.adding:
+                return
+            if not source.can_move(update_fields):
+                instance._rollup_bucket = UNCHANGED
+            else:
+                instance._rollup_bucket = source.stored_bucket(instance.pk)
+        return remember_bucket
+
+    def _make_save(self, source):
+        def update_rollup(sender, instance, created, raw=False, **kwargs):
+            old = instance.__dict__.pop('_rollup_bucket', UNKNOWN)
+            if raw or old is UNCHANGED:
+                return
+            pending = self._pending()
+            self._move(source, instance, None if created else old, pending)
+            pending.settle()
+        return update_rollup
+
+    def _move(self, source, instance, old, pending):
+        """Record the move of ``instance`` from bucket ``old`` to the one it is in now."""
+        new = source.bucket(instance)
+        if old is UNKNOWN or new is UNKNOWN:
+            # A row's date never changes, so rebuilding its day is exact
+            day = new[0] if new and new is not UNKNOWN else source.day_of(instance.pk)
+            if day:
+                pending.rebuild.add((source.metric, day))
+        elif old != new:
+            if old:
+                pending.add(source.metric, old[0], old[1], -1, -old[2])
+            if new:
+                pending.add(source.metric, new[0], new[1], 1, new[2])
+
+    def _make_pre_delete(self, source):
+        def remember_bucket(sender, instance, origin=None, **kwargs):
+            # A directly deleted instance may be stale and a deferred one
+            # incomplete; their stored row is what was counted. Rows the
+            # collector loaded for a queryset or cascade delete are current.
+            if source.fields & instance.get_deferred_fields() or (
+                origin is instance and source.can_move()
+            ):
+                instance._rollup_bucket = source.stored_bucket(instance.pk)
+        return remember_bucket
+
+    def _make_delete(self, source):
+        def update_rollup(sender, instance, **kwargs):
+            old = instance.__dict__.pop('_rollup_bucket', None) or source.bucket(instance)
+            if old and old is not UNKNOWN:
+                pending = self._pending()
+                pending.add(source.metric, old[0], old[1], -1, -old[2])
+                pending.settle()
+        return update_rollup
+
+    def _pending(self):
+        """
+        Where to record rollup changes: inside a transaction, the changes
+        queued on this thread's connection for an ``on_commit`` flush;
+        otherwise a fresh set the caller settles straight away.
+        """
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            return PendingRollups(self)
+        pending = getattr(connection, 'rollups_pending', None)
+        if pending is None or pending.flushed or not any(
+            callback[1] == pending.flush for callback in connection.run_on_commit
+        ):
+            # First change since the last commit, or a rollback dropped the callback
+            pending = connection.rollups_pending = PendingRollups(self, queued=True)
+            transaction.on_commit(pending.flush, robust=True)
+        return pending
+
+    def _apply(self, metric, day, dimension, count, amount):
+        """Add ``count``/``amount`` to one rollup row, creating it if needed."""
+        from .models import DailyRollup
+
+        lookup = {'metric': metric, 'date': day, 'dimension': dimension}
+        delta = {'count': F('count') + count, 'amount': F('amount') + amount}
+        if DailyRollup.objects.filter(**lookup).update(**delta):
+            return
+        try:
+            with transaction.atomic():
+                DailyRollup.objects.create(count=count, amount=amount, **lookup)
+        except IntegrityError:
+            # Created concurrently; add to theirs
+            DailyRollup.objects.filter(**lookup).update(**delta)
+
+    def remember(self, instances):
+        """Note the current buckets of rows about to be changed and saved with ``bulk_update``."""
+        for instance in instances:
+            source = self._source_for(instance)
+            if source:
+                instance._rollup_bucket = source.bucket(instance)
+
+    def record_created(self, instances):
+        """Count rows written with ``bulk_create`` (which sends no signals)."""
+        pending = self._pending()
+        for instance in instances:
+            source = self._source_for(instance)
+            bucket = source.bucket(instance) if source else None
+            if bucket and bucket is not UNKNOWN:
+                pending.add(source.metric, bucket[0], bucket[1], 1, bucket[2])
+        pending.settle()
+
+    def record_updated(self, instances):
+        """Apply bucket changes for rows saved with ``bulk_update`` (no signals), see ``remember``."""
+        pending = self._pending()
+        for instance in instances:
+            source = self._source_for(instance)
+            if source:
+                self._move(source, instance, instance.__dict__.pop('_rollup_bucket', UNKNOWN), pending)
+        pending.settle()
+
+    def _source_for(self, instance):
+        label = instance._meta.label
+        for source in self.sources.values():
+            if source.model_label == label:
+                return source
+        return None
+
+    # ------------------------------------------------------------------
+    # Rebuilds
+    # ------------------------------------------------------------------
+
+    def recompute(self, metric, start=None, end=None, app_registry=None):
+        """
+        Replace ``metric``'s rollups for ``start``..``end`` (inclusive, either
+        open-ended) with values aggregated from the source table.
+        ``app_registry`` is a migration's historical apps, when run from one.
+        """
+        app_registry = app_registry or apps
+        DailyRollup = app_registry.get_model('core', 'DailyRollup')
+
+        source = self.sources[metric]
+        model = app_registry.get_model(source.model_label)
+        rows = [DailyRollup(metric=metric, **row) for row in source.aggregate(start, end, model)]
+        existing = DailyRollup.objects.filter(metric=metric)
+        if start:
+            existing = existing.filter(date__gte=start)
+        if end:
+            existing = existing.filter(date__lte=end)
+        with transaction.atomic():
+            existing.delete()
+            DailyRollup.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    def reconcile_recent(self, days=2):
+        """Rebuild the last ``days`` days of every metric. Leader-only periodic job."""
+        start = timezone.localdate() - timedelta(days=days - 1)
+        return sum(self.recompute(metric, start) for metric in self.sources)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def totals(self, metrics, since=None):
+        """
+        ``{metric: {dimension: {'count', 'amount'}}}`` summed over all days
+        (or from ``since``), in one query. Amounts are rounded to cents.
+        """
+        from .models import DailyRollup
+
+        qs = DailyRollup.objects.filter(metric__in=metrics)
+        if since:
+            qs = qs.filter(date__gte=since)
+        result = {metric: {} for metric in metrics}
+        rows = qs.order_by().values('metric', 'dimension').annotate(
+            total_count=Sum('count'), total_amount=Sum('amount'),
+        )
+        for row in rows:
+            result[row['metric']][row['dimension']] = {
+                'count': row['total_count'] or 0,
+                'amount': (row['total_amount'] or Decimal('0')).quantize(CENTS),
+            }
+        return result
+
+    def series(self, metric, days=30, dimensions=None):
+        """
+        Daily ``count``/``amount`` for the last ``days`` days (today included),
+        summed over ``dimensions`` (all when None). Days without activity are
+        filled with zeros.
+        """
+        from .models import DailyRollup
+
+        end = timezone.localdate()
+        start = end - timedelta(days=days - 1)
+        qs = DailyRollup.objects.filter(metric=metric, date__gte=start, date__lte=end)
+        if dimensions is not None:
+            qs = qs.filter(dimension__in=dimensions)
+        by_day = {
+            row['date']: row
+            for row in qs.order_by().values('date').annotate(
+                total_count=Sum('count'), total_amount=Sum('amount'),
+            )
+        }
+        series = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            row = by_day.get(day)
+            series.append({
+                'date': day,
+                'count': row['total_count'] if row else 0,
+                'amount': (row['total_amount'] if row else Decimal('0')).quantize(CENTS),
+            })
+        return series
+
+
+def bucket_sum(buckets, *dimensions, field='count'):
+    """Sum ``field`` over the named dimensions of a ``totals()`` entry; ``*`` matches a segment."""
+    total = Decimal('0.00') if field == 'amount' else 0
+    for dimension, values in buckets.items():
+        if any(_matches(dimension, pattern) for pattern in dimensions):
+            total += values[field]
+    return total
+
+
+def _matches(dimension, pattern):
+    parts = dimension.split(':')
+    wanted = pattern.split(':')
+    return len(parts) == len(wanted) and all(w in ('*', p) for w, p in zip(wanted, parts))
+
+
+rollups = RollupRegistry()
+rollups.register(RollupSource(
+    'transactions', 'transactions.Transaction', 'created_at',
+    dimensions=('transaction_type', 'status'), amount=('amount',),
+))
+rollups.register(RollupSource(
+    'trades', 'investments.Trade', 'created_at',
+    dimensions=('status',), amount=('entry_price', 'quantity'),
+))
+rollups.register(RollupSource(
+    'capital_plans', 'investments.CapitalInvestmentPlan', 'created_at',
+    dimensions=('status',), amount=('initial_amount',),
+))
+rollups.register(RollupSource(
+    'registrations', 'accounts.User', 'date_joined',
+))
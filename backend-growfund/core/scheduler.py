@@ -0,0 +1,258 @@
+"""
+Leader-elected background scheduler.
+
+Every serving process (gunicorn worker, or any server started with
+``SCHEDULER_AUTOSTART=1``) starts one scheduler thread, but periodic jobs
+only run in the process that holds the ``SchedulerLease`` row. The row is
+created once; after that leadership is taken with a single conditional
+UPDATE, so it works the same on SQLite and Postgres without advisory locks.
+If the leader dies its lease expires after ``SCHEDULER_LEASE_SECONDS`` and
+another process picks the jobs up on its next tick.
+
+Apps register their jobs from ``AppConfig.ready()``:
+
+    from core.scheduler import scheduler
+    scheduler.register('usdt-deposits', process_usdt_deposits, interval=60)
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = 'background-scheduler'
+
+
+class PeriodicJob:
+    """A function run every ``interval`` seconds on the leader."""
+
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.next_run = 0.0
+
+    def is_due(self, now):
+        return now >= self.next_run
+
+    def run(self):
+        started = time.monotonic()
+        try:
+            self.func()
+        except Exception as e:
+            logger.error(f'Scheduled job {self.name} failed: {e}')
+        finally:
+            self.next_run = time.monotonic() + self.interval
+        return time.monotonic() - started
+
+
+class LeaderScheduler:
+    """Runs registered periodic jobs only while holding the scheduler lease."""
+
+    def __init__(self, lease_name=LEASE_NAME):
+        self.lease_name = lease_name
+        self._set_identity()
+        self.jobs = {}
+        self.is_leader = False
+        self._lease_ready = False
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def lease_seconds(self):
+        return getattr(settings, 'SCHEDULER_LEASE_SECONDS', 30)
+
+    @property
+    def tick_seconds(self):
+        return getattr(settings, 'SCHEDULER_TICK_SECONDS', 1)
+
+    def _set_identity(self):
+        self.pid = os.getpid()
+        self.identity = f'{socket.gethostname()}:{self.pid}:{uuid.uuid4().hex[:8]}'
+
+    def register(self, name, func, interval):
+        """Register (or replace) a periodic job. ``interval`` is in seconds."""
+        self.jobs[name] = PeriodicJob(name, func, interval)
+
+    # ------------------------------------------------------------------
+    # Leadership
+    # ------------------------------------------------------------------
+
+    def ensure_lease(self):
+        """
+        Create the lease row, expired and unheld, if it doesn't exist yet.
+
+        Runs once per process. ON CONFLICT DO NOTHING (INSERT OR IGNORE on
+        SQLite) means racing processes never raise an IntegrityError, which
+        Postgres would log as an ERROR.
+        """
+        from .models import SchedulerLease
+
+        SchedulerLease.objects.bulk_create(
+            [SchedulerLease(name=self.lease_name, expires_at=timezone.now())],
+            ignore_conflicts=True,
+        )
+        self._lease_ready = True
+
+    def try_acquire(self):
+        """
+        Acquire or renew the lease. Returns True if this process is leader.
+
+        The UPDATE only matches when we already hold the lease or the
+        current one has expired, so at most one process wins.
+        """
+        from .models import SchedulerLease
+
+        if not self._lease_ready:
+            self.ensure_lease()
+
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+
+        updated = SchedulerLease.objects.filter(name=self.lease_name).filter(
+            Q(holder=self.identity) | Q(expires_at__lt=now)
+        ).update(holder=self.identity, renewed_at=now, expires_at=expires_at)
+
+        was_leader = self.is_leader
+        self.is_leader = bool(updated)
+
+        if self.is_leader and not was_leader:
+            SchedulerLease.objects.filter(
+                name=self.lease_name, holder=self.identity
+            ).update(acquired_at=now)
+            # Run every job right away on takeover; the previous leader's
+            # schedule is not carried over.
+            for job in self.jobs.values():
+                job.next_run = 0.0
+            logger.info(f'Scheduler leadership acquired by {self.identity}')
+        elif was_leader and not self.is_leader:
+            logger.warning(f'Scheduler leadership lost by {self.identity}')
+
+        return self.is_leader
+
+    def release(self):
+        """Give the lease up so another process can take over immediately."""
+        from .models import SchedulerLease
+
+        if not self.is_leader:
+            return
+        try:
+            SchedulerLease.objects.filter(
+                name=self.lease_name, holder=self.identity
+            ).update(holder='', expires_at=timezone.now())
+        except Exception as e:
+            logger.debug(f'Scheduler lease release failed: {e}')
+        self.is_leader = False
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    def run_pending(self):
+        """Run every due job, renewing the lease before each one."""
+        for job in list(self.jobs.values()):
+            if self._stop.is_set():
+                return
+            if not job.is_due(time.monotonic()):
+                continue
+            # A slow job must not let the lease lapse under the next one
+            if not self.try_acquire():
+                return
+            duration = job.run()
+            if duration > self.lease_seconds:
+                logger.warning(
+                    f'Scheduled job {job.name} took {duration:.1f}s, '
+                    f'longer than the {self.lease_seconds}s lease'
+                )
+            close_old_connections()
+
+    def tick(self):
+        close_old_connections()
+        try:
+            if self.try_acquire():
+                self.run_pending()
+        except Exception as e:
+            self.is_leader = False
+            logger.error(f'Scheduler tick failed: {e}')
+        finally:
+            close_old_connections()
+
+    def run_forever(self):
+        logger.info(f'Background scheduler started ({self.identity})')
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(self.tick_seconds)
+        self.release()
+        close_old_connections()
+
+    def start(self):
+        """Start the scheduler loop in a daemon thread."""
+        if self.pid != os.getpid():
+            # Forked after import (gunicorn preload_app): the parent's
+            # identity and thread don't belong to this process
+            self._set_identity()
+            self._thread = None
+            self.is_leader = False
+            self._lease_ready = False
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run_forever, daemon=True, name='leader-scheduler'
+        )
+        self._thread.start()
+
+        import atexit
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.release()
+
+
+def should_autostart():
+    """
+    Whether ``ready()`` should start the scheduler and job worker threads.
+
+    Opt-in: only processes started with ``SCHEDULER_AUTOSTART=1`` do, so
+    tests, shell sessions, scripts and management commands never run
+    background jobs by accident. Set it where a long-running server is
+    launched without ``gunicorn.conf.py``, e.g.
+
+        SCHEDULER_AUTOSTART=1 uvicorn growfund.asgi:application
+        SCHEDULER_AUTOSTART=1 python manage.py runserver
+
+    ``gunicorn.conf.py`` starts the threads itself in each worker after the
+    fork (``post_worker_init``) and sets ``SCHEDULER_DEFERRED_START`` so the
+    preloading master never does. ``run_scheduler`` runs the loop in the
+    foreground instead.
+    """
+    if not getattr(settings, 'SCHEDULER_ENABLED', True):
+        return False
+
+    if os.environ.get('SCHEDULER_AUTOSTART') != '1':
+        return False
+
+    if os.environ.get('SCHEDULER_DEFERRED_START') == '1':
+        return False
+
+    # runserver's autoreloader: only start in the long-lived parent process,
+    # not in the child that is replaced on every code change
+    if os.environ.get('RUN_MAIN') == 'true':
+        return False
+
+    return True
+
+
+scheduler = LeaderScheduler()
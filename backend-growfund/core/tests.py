@@ -0,0 +1,345 @@
+import time
+import warnings
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from investments.admin import CapitalInvestmentPlanAdmin
+from investments.models import CapitalInvestmentPlan
+from transactions.models import Transaction
+
+from .cache import bump_versions, invalidate_tags, tiered_cache
+from .exports import export_response
+from .jobs import Heartbeat, JobWorker, job, requeue_stale_jobs
+from .models import DailyRollup, Job
+from .quote_service import QUOTES_KEY, quote_service
+from .rollups import CENTS, rollups
+
+User = get_user_model()
+
+calls = []
+
+
+@job(queue='tests')
+def record_call(value):
+    calls.append(value)
+    return value * 2
+
+
+@job(queue='tests', max_attempts=2)
+def always_fail():
+    raise RuntimeError('boom')
+
+
+@job(queue='tests')
+def sleep_then_requeue(seconds):
+    time.sleep(seconds)
+    # What the leader's periodic sweep would see at this point
+    return requeue_stale_jobs()
+
+
+class JobQueueTests(TestCase):
+    """Claiming, running and retrying queued jobs."""
+
+    def setUp(self):
+        calls.clear()
+        self.worker = JobWorker(queues=['tests'])
+
+    def test_enqueued_job_runs_once_and_records_result(self):
+        row = record_call.enqueue(21)
+
+        self.assertEqual(self.worker.run_once(), 1)
+        self.assertEqual(self.worker.run_once(), 0)
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'done')
+        self.assertEqual(row.result, 42)
+        self.assertEqual(row.attempts, 1)
+        self.assertEqual(row.locked_by, '')
+        self.assertEqual(calls, [21])
+
+    def test_delayed_job_waits_for_run_at(self):
+        record_call.enqueue(1, delay=60)
+
+        self.assertEqual(self.worker.run_once(), 0)
+        self.assertEqual(calls, [])
+
+    def test_claimed_job_is_not_claimed_again(self):
+        record_call.enqueue(1)
+
+        self.assertEqual(len(self.worker.claim()), 1)
+        self.assertEqual(JobWorker(queues=['tests']).claim(), [])
+
+    def test_failing_job_retries_with_backoff_then_fails(self):
+        row = always_fail.enqueue()
+
+        self.worker.run_once()
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'queued')
+        self.assertGreater(row.run_at, timezone.now())
+        self.assertIn('boom', row.last_error)
+
+        Job.objects.filter(id=row.id).update(run_at=timezone.now())
+        self.worker.run_once()
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'failed')
+        self.assertEqual(row.attempts, 2)
+        self.assertIsNotNone(row.finished_at)
+
+    @override_settings(JOB_TIMEOUT=600)
+    def test_only_jobs_without_a_recent_heartbeat_are_requeued(self):
+        dead = record_call.enqueue(1)
+        alive = record_call.enqueue(2)
+        Job.objects.filter(id=dead.id).update(
+            status='running', locked_by='gone', locked_at=timezone.now() - timedelta(seconds=900),
+        )
+        # Started long ago, but its worker renewed the lock a moment ago
+        Job.objects.filter(id=alive.id).update(
+            status='running', locked_by='busy', created_at=timezone.now() - timedelta(hours=2),
+            locked_at=timezone.now() - timedelta(seconds=30),
+        )
+
+        self.assertEqual(requeue_stale_jobs(), 1)
+
+        dead.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual((dead.status, dead.locked_by), ('queued', ''))
+        self.assertEqual((alive.status, alive.locked_by), ('running', 'busy'))
+
+    def test_heartbeat_renews_only_its_own_lock(self):
+        row = record_call.enqueue(1)
+        stale = timezone.now() - timedelta(seconds=900)
+        Job.objects.filter(id=row.id).update(status='running', locked_by='me', locked_at=stale)
+
+        self.assertEqual(Heartbeat(row.id, 'someone-else').beat(), 0)
+        self.assertEqual(Heartbeat(row.id, 'me').beat(), 1)
+
+        row.refresh_from_db()
+        self.assertGreater(row.locked_at, stale)
+
+
+@override_settings(JOB_HEARTBEAT_INTERVAL=0.05)
+class JobHeartbeatTests(TransactionTestCase):
+    """A job running past JOB_TIMEOUT keeps its lock while its worker is alive."""
+
+    def test_long_job_is_not_requeued_while_running(self):
+        row = sleep_then_requeue.enqueue(0.3)
+        worker = JobWorker(queues=['tests'])
+        [claimed] = worker.claim()
+        # Pretend the claim happened long ago
+        Job.objects.filter(id=row.id).update(locked_at=timezone.now() - timedelta(hours=1))
+
+        worker.execute(claimed)
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'done')
+        self.assertEqual(row.result, 0)
+        self.assertEqual(row.attempts, 1)
+
+    def test_heartbeat_moves_locked_at_forward(self):
+        row = record_call.enqueue(1)
+        stale = timezone.now() - timedelta(hours=1)
+        Job.objects.filter(id=row.id).update(status='running', locked_by='me', locked_at=stale)
+
+        with Heartbeat(row.id, 'me'):
+            time.sleep(0.3)
+
+        row.refresh_from_db()
+        self.assertGreater(row.locked_at, stale)
+        self.assertEqual(requeue_stale_jobs(), 0)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=10)
+class ExportStreamingTests(TestCase):
+    """Exports stream under ASGI instead of being read whole first."""
+
+    def setUp(self):
+        self.fetched = 0
+
+    def rows(self, count):
+        for i in range(count):
+            self.fetched += 1
+            yield {'id': i, 'email': f'user{i}@example.com'}
+
+    def test_asgi_body_is_sent_in_chunks_as_rows_are_fetched(self):
+        response = export_response(self.rows(100), [('id', 'ID'), ('email', 'Email')], fmt='ndjson')
+
+        async def first_two_parts():
+            # ASGIHandler sends a streaming body with ``async for part in response``
+            parts = []
+            async for part in response:
+                parts.append((part, self.fetched))
+                if len(parts) == 2:
+                    break
+            return parts
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            parts = async_to_sync(first_two_parts)()
+
+        self.assertEqual(parts[0][0].count(b'\n'), 10)
+        self.assertLessEqual(parts[0][1], 11)
+        self.assertLessEqual(parts[1][1], 21)
+
+    def test_wsgi_body_is_complete(self):
+        response = export_response(self.rows(25), [('id', 'ID'), ('email', 'Email')], fmt='csv')
+
+        body = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(body.splitlines()[0], 'ID,Email')
+        self.assertEqual(len(body.splitlines()), 26)
+
+
+class RollupTests(TestCase):
+    """Rollups stay equal to the source tables through every kind of write."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(email='rollups@example.com', password='pw-12345')
+
+    def add_transactions(self, user, count, transaction_type='deposit', amount='10.00'):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                Transaction.objects.create(
+                    user=user, transaction_type=transaction_type, status='completed',
+                    amount=Decimal(amount), net_amount=Decimal(amount),
+                    reference=f'{user.id}-{transaction_type}-{i}',
+                )
+
+    def assert_matches_source(self):
+        expected = {}
+        for metric, source in rollups.sources.items():
+            expected[metric] = {}
+            for row in source.aggregate():
+                entry = expected[metric].setdefault(row['dimension'], {'count': 0, 'amount': Decimal('0')})
+                entry['count'] += row['count']
+                entry['amount'] += row['amount']
+        actual = rollups.totals(list(rollups.sources))
+        for metric, dimensions in expected.items():
+            for dimension, entry in dimensions.items():
+                self.assertEqual(actual[metric][dimension]['count'], entry['count'], (metric, dimension))
+                self.assertEqual(actual[metric][dimension]['amount'], entry['amount'].quantize(CENTS))
+            # Nothing left over in buckets the source no longer has
+            for dimension, entry in actual[metric].items():
+                if dimension not in dimensions:
+                    self.assertEqual(entry['count'], 0, (metric, dimension))
+
+    def test_backfill_migration_counts_existing_rows(self):
+        self.add_transactions(self.user, 3)
+        DailyRollup.objects.all().delete()
+
+        backfill = import_module('core.migrations.0004_backfill_dailyrollup').backfill_rollups
+        backfill(django_apps, None)
+
+        totals = rollups.totals(['transactions', 'registrations'])
+        self.assertEqual(totals['transactions']['deposit:completed']['count'], 3)
+        self.assertEqual(totals['transactions']['deposit:completed']['amount'], Decimal('30.00'))
+        self.assertEqual(totals['registrations']['']['count'], 1)
+
+    def test_admin_mark_completed_moves_plan_rollups(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(2):
+                CapitalInvestmentPlan.objects.create(
+                    user=self.user, plan_type='basic', initial_amount=Decimal('100.00'),
+                    period_months=3, growth_rate=Decimal('10.00'),
+                )
+        model_admin = CapitalInvestmentPlanAdmin(CapitalInvestmentPlan, admin.site)
+
+        with self.captureOnCommitCallbacks(execute=True), \
+                mock.patch.object(model_admin, 'message_user'):
+            model_admin.mark_completed(None, CapitalInvestmentPlan.objects.all())
+
+        totals = rollups.totals(['capital_plans'])['capital_plans']
+        self.assertEqual(totals['completed']['count'], 2)
+        self.assertEqual(totals['active']['count'], 0)
+        self.assert_matches_source()
+
+    def test_cascade_delete_costs_no_query_per_row(self):
+        def delete_user_with(count):
+            with self.captureOnCommitCallbacks(execute=True):
+                user = User.objects.create_user(email=f'cascade{count}@example.com', password='pw-12345')
+            self.add_transactions(user, count)
+            with CaptureQueriesContext(connection) as queries:
+                with self.captureOnCommitCallbacks(execute=True):
+                    user.delete()
+            return len(queries)
+
+        few = delete_user_with(2)
+        many = delete_user_with(20)
+
+        self.assertEqual(few, many)
+        self.assert_matches_source()
+
+    def test_direct_delete_of_a_stale_instance_uses_the_stored_row(self):
+        self.add_transactions(self.user, 1)
+        stale = Transaction.objects.get(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            fresh = Transaction.objects.get(pk=stale.pk)
+            fresh.status = 'failed'
+            fresh.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stale.delete()
+
+        self.assert_matches_source()
+
+    def test_deposit_series_matches_dashboard_total(self):
+        self.add_transactions(self.user, 2, 'deposit', '40.00')
+        self.add_transactions(self.user, 1, 'admin_credit', '40.00')
+        with self.captureOnCommitCallbacks(execute=True):
+            admin_user = User.objects.create_superuser(email='boss@example.com', password='pw-12345')
+        client = APIClient()
+        client.force_authenticate(admin_user)
+
+        overview = client.get('/api/auth/admin/dashboard/').json()['data']
+        series = client.get('/api/auth/admin/stats/series/', {'series': 'deposits', 'days': 7}).json()['data']
+
+        self.assertEqual(overview['finances']['total_deposits'], '80.00')
+        self.assertEqual(series['total_amount'], overview['finances']['total_deposits'])
+
+
+class BumpVersionsTests(TestCase):
+    """The shared version counter idiom used by every versioned cache."""
+
+    def test_creates_missing_counters_and_increments_existing_ones(self):
+        cache.delete_many(['tests:v:a', 'tests:v:b'])
+        cache.set('tests:v:b', 4, None)
+
+        bump_versions('tests:v:a', 'tests:v:b')
+
+        self.assertEqual(cache.get_many(['tests:v:a', 'tests:v:b']), {'tests:v:a': 1, 'tests:v:b': 5})
+
+    def test_invalidated_tag_hides_entries_stored_under_it(self):
+        tiered_cache.set('tests:entry', 'old', ttl=60, tags=['tests:tag'])
+        tiered_cache.local.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags('tests:tag')
+
+        self.assertIsNone(tiered_cache.get('tests:entry'))
+
+
+class QuoteSnapshotTests(TestCase):
+    """Reads serve the cached snapshot and leave refreshes to the scheduler."""
+
+    def test_stale_snapshot_is_flagged_without_queueing_work(self):
+        fetched_at = timezone.now() - timedelta(seconds=quote_service.stale_after + 60)
+        cache.set(QUOTES_KEY, {'quotes': {'BTC': {'price': Decimal('100')}}, 'fetched_at': fetched_at})
+
+        snapshot = quote_service.get_snapshot()
+
+        self.assertEqual(snapshot.price('BTC'), Decimal('100'))
+        self.assertTrue(snapshot.meta()['stale'])
+        self.assertFalse(Job.objects.exists())
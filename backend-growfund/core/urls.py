@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    path('', views.profile_list, name='profile-list'),
+    path('token/', views.create_profile_token, name='profile-token'),
+    path('<str:profile_id>/', views.profile_detail, name='profile-detail'),
+    path('<str:profile_id>/folded/', views.profile_detail, {'folded': True}, name='profile-folded'),
+]
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .profiling import HEADER, PARAM, get_profile, list_profiles, make_token
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_profile_token(request):
+    """Admin-only: a signed token that profiles the requests it is sent with"""
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({'success': False, 'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+    if not getattr(settings, 'PROFILING_ENABLED', True):
+        return Response({'success': False, 'error': 'Profiling is disabled'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'success': True,
+        'data': {
+            'token': make_token(request.user),
+            'expires_in': getattr(settings, 'PROFILE_TOKEN_MAX_AGE', 900),
+            'header': HEADER,
+            'query_param': PARAM,
+        }
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profile_list(request):
+    """Admin-only: recent profiles, newest first (without their stacks)"""
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({'success': False, 'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+
+    return Response({'success': True, 'data': list_profiles()})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profile_detail(request, profile_id, folded=False):
+    """
+    Admin-only: one profile. The ``folded/`` variant returns just the folded
+    stacks as plain text for flamegraph.pl or speedscope.
+    """
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({'success': False, 'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+
+    profile = get_profile(profile_id)
+    if profile is None:
+        return Response({'success': False, 'error': 'Profile not found or expired'}, status=status.HTTP_404_NOT_FOUND)
+
+    if folded:
+        response = HttpResponse(profile['folded'] + '\n', content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="profile-{profile_id}.folded"'
+        return response
+    return Response({'success': True, 'data': profile})
@@ -1,10 +1,40 @@
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db.models import Q
 from django.utils.html import format_html
 from .models import DemoAccount, DemoInvestment, DemoTransaction
 
 
+class DemoDatabaseAdmin(admin.ModelAdmin):
+    """
+    Admin for models routed to the demo database, which can't join the users
+    table. Search fields under ``user_path`` are matched against users in the
+    primary database and applied as an id filter.
+    """
+    user_path = 'user'
+    # Not False: that makes the changelist select_related() its FK columns
+    list_select_related = ()
+    
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        
+        prefix = f'{self.user_path}__'
+        query, user_query = Q(), Q()
+        for field in self.get_search_fields(request):
+            if field.startswith(prefix):
+                user_query |= Q(**{f'{field[len(prefix):]}__icontains': search_term})
+            else:
+                query |= Q(**{f'{field}__icontains': search_term})
+        if user_query:
+            user_ids = get_user_model().objects.filter(user_query).values_list('id', flat=True)[:1000]
+            query |= Q(**{f'{self.user_path}_id__in': list(user_ids)})
+        return queryset.filter(query), False
+
+
 @admin.register(DemoAccount)
-class DemoAccountAdmin(admin.ModelAdmin):
+class DemoAccountAdmin(DemoDatabaseAdmin):
     """Admin interface for Demo Accounts"""
     list_display = ('user', 'balance', 'is_active', 'investment_count', 'transaction_count', 'created_at')
     list_filter = ('is_active', 'created_at')
@@ -37,17 +67,18 @@ class DemoAccountAdmin(admin.ModelAdmin):
     transaction_count.short_description = 'Transactions'
     
     def get_queryset(self, request):
-        """Optimize queryset with select_related"""
+        """Users are prefetched: they live in the primary database"""
         qs = super().get_queryset(request)
-        return qs.select_related('user')
+        return qs.prefetch_related('user')
 
 
 @admin.register(DemoInvestment)
-class DemoInvestmentAdmin(admin.ModelAdmin):
+class DemoInvestmentAdmin(DemoDatabaseAdmin):
     """Admin interface for Demo Investments"""
     list_display = ('demo_account', 'investment_type', 'asset_name', 'amount', 'quantity', 'status', 'created_at')
     list_filter = ('investment_type', 'status', 'created_at')
     search_fields = ('demo_account__user__email', 'asset_name')
+    user_path = 'demo_account__user'
     readonly_fields = ('created_at', 'updated_at')
     date_hierarchy = 'created_at'
     
@@ -68,17 +99,18 @@ class DemoInvestmentAdmin(admin.ModelAdmin):
     )
     
     def get_queryset(self, request):
-        """Optimize queryset with select_related"""
+        """Optimize queryset with select_related; users live in the primary database"""
         qs = super().get_queryset(request)
-        return qs.select_related('demo_account', 'demo_account__user')
+        return qs.select_related('demo_account').prefetch_related('demo_account__user')
 
 
 @admin.register(DemoTransaction)
-class DemoTransactionAdmin(admin.ModelAdmin):
+class DemoTransactionAdmin(DemoDatabaseAdmin):
     """Admin interface for Demo Transactions"""
     list_display = ('demo_account', 'transaction_type', 'amount', 'asset', 'status', 'created_at')
     list_filter = ('transaction_type', 'status', 'created_at')
     search_fields = ('demo_account__user__email', 'asset', 'description')
+    user_path = 'demo_account__user'
     readonly_fields = ('created_at',)
     date_hierarchy = 'created_at'
     
@@ -98,6 +130,6 @@ class DemoTransactionAdmin(admin.ModelAdmin):
     )
     
     def get_queryset(self, request):
-        """Optimize queryset with select_related"""
+        """Optimize queryset with select_related; users live in the primary database"""
         qs = super().get_queryset(request)
-        return qs.select_related('demo_account', 'demo_account__user')
+        return qs.select_related('demo_account').prefetch_related('demo_account__user')
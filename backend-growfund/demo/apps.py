@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class DemoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'demo'
-    verbose_name = 'Demo Trading System'
\ No newline at end of file
+    verbose_name = 'Demo Trading System'
+
+    def ready(self):
+        from . import signals  # noqa: F401
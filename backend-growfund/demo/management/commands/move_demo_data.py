@@ -0,0 +1,114 @@
+"""
+Management command to move demo data to where ``demo.routers`` expects it.
+
+Run once after setting DEMO_DATABASE_URL (and ``migrate --database=demo``):
+copies demo accounts, investments, transactions and stats from the primary
+database into the demo one. In every setup it also moves demo binary trades
+still flagged ``is_demo`` in the real trades table into ``DemoBinaryTrade``.
+Safe to re-run: rows already copied are skipped.
+
+Usage:
+    python manage.py move_demo_data
+    python manage.py move_demo_data --batch-size 5000
+"""
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+
+from binary_trading.models import BinaryTrade, DemoBinaryTrade, DemoTradingStats
+from demo.models import DemoAccount, DemoInvestment, DemoTransaction
+from demo.routers import demo_db
+
+# Parents before children so every copied row's account already exists
+COPIED_MODELS = [DemoAccount, DemoInvestment, DemoTransaction, DemoTradingStats]
+
+
+@contextmanager
+def keep_timestamps(model):
+    """Let bulk_create write the rows' own created_at/updated_at values."""
+    fields = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Copy demo data into the demo database and move legacy demo binary trades'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk insert (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        target = demo_db()
+
+        if target == DEFAULT_DB_ALIAS:
+            self.stdout.write('No separate demo database configured; only moving legacy demo trades')
+        else:
+            for model in COPIED_MODELS:
+                copied = self.copy_model(model, DEFAULT_DB_ALIAS, target, batch_size)
+                self.stdout.write(f'  {model._meta.label}: {copied} rows copied')
+            self.reset_sequences(target, COPIED_MODELS)
+
+        moved = self.move_legacy_trades(batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} demo binary trades to {DemoBinaryTrade._meta.db_table}'))
+
+    def copy_model(self, model, source, target, batch_size):
+        try:
+            rows = model.objects.using(source).order_by('pk').iterator(chunk_size=batch_size)
+            copied = 0
+            batch = []
+            with keep_timestamps(model):
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        model.objects.using(target).bulk_create(batch, ignore_conflicts=True)
+                        copied += len(batch)
+                        batch = []
+                if batch:
+                    model.objects.using(target).bulk_create(batch, ignore_conflicts=True)
+                    copied += len(batch)
+        except DatabaseError as e:
+            # Fresh install: the demo tables were never created on the primary database
+            self.stdout.write(self.style.WARNING(f'  {model._meta.label}: skipped ({e})'))
+            return 0
+        return copied
+
+    def reset_sequences(self, alias, models):
+        """Move autoincrement sequences past the copied ids (no-op on SQLite)."""
+        connection = connections[alias]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def move_legacy_trades(self, batch_size):
+        fields = [f.attname for f in DemoBinaryTrade._meta.concrete_fields]
+        legacy = BinaryTrade.objects.filter(is_demo=True).order_by('pk')
+        moved = 0
+        with keep_timestamps(DemoBinaryTrade):
+            while True:
+                rows = list(legacy.values(*fields)[:batch_size])
+                if not rows:
+                    break
+                DemoBinaryTrade.objects.bulk_create(
+                    [DemoBinaryTrade(**row) for row in rows], ignore_conflicts=True
+                )
+                # Copied rows are committed before the originals go
+                with transaction.atomic():
+                    BinaryTrade.objects.filter(id__in=[row['id'] for row in rows]).delete()
+                moved += len(rows)
+        return moved
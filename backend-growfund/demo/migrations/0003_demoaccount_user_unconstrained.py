@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('demo', '0002_demoinvestment_current_price_demotransaction_types'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='demoaccount',
+            name='user',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='demo_account', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -6,7 +6,11 @@ User = get_user_model()
 
 class DemoAccount(models.Model):
     """Demo account for users to practice trading"""
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='demo_account')
+    # Demo models may live in their own database (see demo.routers), so the
+    # user is an unconstrained id; demo.signals deletes the rows with the user
+    user = models.OneToOneField(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name='demo_account'
+    )
     balance = models.DecimalField(max_digits=15, decimal_places=2, default=10000.00)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,69 @@
+"""
+Database router that keeps demo (practice) trading off the primary database.
+
+Demo traffic is far heavier than real-money traffic. When a ``demo``
+database is configured (``DEMO_DATABASE_URL``), every model of the demo app
+plus ``DemoTradingStats`` and ``DemoBinaryTrade`` is read, written and
+migrated there, so demo activity never takes connections, row locks or WAL
+from the tables that hold real balances. Without it everything stays on
+``default``, as before.
+
+Demo rows reference users and trading assets by id only (``db_constraint=False``,
+``on_delete=DO_NOTHING``): the database can't enforce a key across
+connections, so ``demo.signals`` removes a user's demo rows when the user is
+deleted. Demo querysets can't join to ``User`` or ``TradingAsset`` either;
+use ``prefetch_related`` (which follows the router) instead of
+``select_related``, and ``transaction.atomic(using=demo_db())`` around demo
+balance updates.
+
+    python manage.py migrate --database=demo       # create the demo tables
+    python manage.py move_demo_data                # copy existing demo rows over
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+DEMO_DB = 'demo'
+
+DEMO_APPS = {'demo'}
+DEMO_MODELS = {'binary_trading.demotradingstats', 'binary_trading.demobinarytrade'}
+
+
+def demo_db():
+    """Alias of the database demo models live in."""
+    return DEMO_DB if DEMO_DB in settings.DATABASES else DEFAULT_DB_ALIAS
+
+
+def is_demo_model(model):
+    return model._meta.app_label in DEMO_APPS or model._meta.label_lower in DEMO_MODELS
+
+
+class DemoRouter:
+
+    def _route(self, model, hints):
+        if is_demo_model(model):
+            return demo_db()
+        instance = hints.get('instance')
+        if instance is not None and is_demo_model(type(instance)):
+            # A demo row's user or asset: without this Django would look for
+            # it in the database the demo row came from
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._route(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._route(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Demo rows point at users and assets in the primary database
+        if is_demo_model(type(obj1)) or is_demo_model(type(obj2)):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if DEMO_DB not in settings.DATABASES:
+            return None
+        if app_label in DEMO_APPS or f'{app_label}.{model_name}' in DEMO_MODELS:
+            return db == DEMO_DB
+        return db != DEMO_DB
@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from core.money import MoneyField
 from .models import DemoAccount, DemoInvestment, DemoTransaction
 
 
 class DemoAccountSerializer(serializers.ModelSerializer):
     user_email = serializers.CharField(source='user.email', read_only=True)
-    balance = serializers.DecimalField(max_digits=15, decimal_places=2, read_only=True)
+    balance = MoneyField()
 
     class Meta:
         model = DemoAccount
@@ -12,9 +13,9 @@ class DemoAccountSerializer(serializers.ModelSerializer):
 
 
 class DemoInvestmentSerializer(serializers.ModelSerializer):
-    amount = serializers.DecimalField(max_digits=15, decimal_places=2, read_only=True)
+    amount = MoneyField()
     quantity = serializers.DecimalField(max_digits=20, decimal_places=8, read_only=True)
-    price_at_purchase = serializers.DecimalField(max_digits=15, decimal_places=2, read_only=True)
+    price_at_purchase = MoneyField()
     monthly_rate = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
     current_price = serializers.SerializerMethodField()
 
@@ -39,9 +40,9 @@ class DemoInvestmentSerializer(serializers.ModelSerializer):
 
 
 class DemoTransactionSerializer(serializers.ModelSerializer):
-    amount = serializers.DecimalField(max_digits=15, decimal_places=2, read_only=True)
+    amount = MoneyField()
     quantity = serializers.DecimalField(max_digits=20, decimal_places=8, read_only=True)
-    price = serializers.DecimalField(max_digits=15, decimal_places=2, read_only=True)
+    price = MoneyField()
 
     class Meta:
         model = DemoTransaction
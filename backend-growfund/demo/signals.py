@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from binary_trading.models import DemoBinaryTrade, DemoTradingStats
+from .models import DemoAccount
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=User)
+def delete_demo_rows(sender, instance, using, **kwargs):
+    """
+    Demo rows reference users without a database constraint (they may live in
+    another database), so remove them here once the user's delete commits.
+    """
+    user_id = instance.pk
+
+    def delete_rows():
+        # Investments and transactions cascade from the account in the demo database
+        DemoAccount.objects.filter(user_id=user_id).delete()
+        DemoTradingStats.objects.filter(user_id=user_id).delete()
+        DemoBinaryTrade.objects.filter(user_id=user_id).delete()
+
+    transaction.on_commit(delete_rows, using=using)
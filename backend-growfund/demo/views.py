@@ -4,7 +4,9 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.db import transaction
 from decimal import Decimal, InvalidOperation
+from core.cache import invalidate_tags, tiered_cache
 from .models import DemoAccount, DemoInvestment, DemoTransaction
+from .routers import demo_db
 from .serializers import DemoAccountSerializer, DemoInvestmentSerializer, DemoTransactionSerializer
 
 
@@ -36,25 +38,30 @@ def _to_decimal(value, default=Decimal('0')):
 
 
 # ---------------------------------------------------------------------------
-# DB column existence checks (cached per process lifetime)
+# DB column existence checks (cached in core.cache until the next migration)
 # ---------------------------------------------------------------------------
 
-_COL_CACHE = {}
+SCHEMA_TAG = 'demo:schema'
+
+
+def _column_key(table, column):
+    return f'demo:column:{table}.{column}'
 
 
 def _column_exists(table, column):
     """Return True if `column` exists in `table`. Result is cached."""
-    key = f'{table}.{column}'
-    if key in _COL_CACHE:
-        return _COL_CACHE[key]
-    try:
-        from django.db import connection
+    def check():
+        from django.db import connections
+        connection = connections[demo_db()]
         with connection.cursor() as cursor:
             cols = [c.name for c in connection.introspection.get_table_description(cursor, table)]
-        _COL_CACHE[key] = column in cols
+        return column in cols
+    
+    try:
+        return tiered_cache.get_or_compute(_column_key(table, column), check, ttl=None, tags=[SCHEMA_TAG])
     except Exception:
-        _COL_CACHE[key] = False
-    return _COL_CACHE[key]
+        # Not cached, so the next call checks again
+        return False
 
 
 def _has_current_price_col():
@@ -63,7 +70,7 @@ def _has_current_price_col():
 
 def _invalidate_col_cache():
     """Call this after running migrations so the cache refreshes."""
-    _COL_CACHE.clear()
+    invalidate_tags(SCHEMA_TAG)
 
 
 # ---------------------------------------------------------------------------
@@ -93,7 +100,7 @@ def _create_investment(**kwargs):
         return DemoInvestment.objects.create(**kwargs)
     except Exception as exc:
         if 'current_price' in str(exc).lower():
-            _COL_CACHE.pop('demo_demoinvestment.current_price', None)
+            tiered_cache.delete(_column_key('demo_demoinvestment', 'current_price'))
             kwargs.pop('current_price', None)
             return DemoInvestment.objects.create(**kwargs)
         raise
@@ -119,53 +126,19 @@ def _update_current_price(inv, price):
 
 def _get_live_crypto_price(coin: str):
     """
-    Fetch live USD price for a coin.
+    Live USD price for a coin.
     Admin-controlled coins (EXACOIN, OPTCOIN) come from AdminCryptoPrice.
-    All others come from CoinGecko.
+    All others come from the shared quote snapshot.
     Returns Decimal or None.
     """
-    import requests
+    from core.quote_service import quote_service
+    return quote_service.get_price(coin)
 
-    # Admin-controlled coins first
-    try:
-        from investments.admin_models import AdminCryptoPrice
-        admin_price = AdminCryptoPrice.objects.get(coin=coin, is_active=True)
-        return Decimal(str(admin_price.buy_price))
-    except Exception:
-        pass
 
-    COINGECKO_IDS = {
-        'BTC': 'bitcoin',
-        'ETH': 'ethereum',
-        'BNB': 'binancecoin',
-        'ADA': 'cardano',
-        'SOL': 'solana',
-        'DOT': 'polkadot',
-        'USDT': 'tether',
-        'XRP': 'ripple',
-        'DOGE': 'dogecoin',
-        'MATIC': 'matic-network',
-        'AVAX': 'avalanche-2',
-        'LINK': 'chainlink',
-        'LTC': 'litecoin',
-        'UNI': 'uniswap',
-        'ATOM': 'cosmos',
-    }
-    gecko_id = COINGECKO_IDS.get(coin)
-    if gecko_id:
-        try:
-            resp = requests.get(
-                'https://api.coingecko.com/api/v3/simple/price',
-                params={'ids': gecko_id, 'vs_currencies': 'usd'},
-                timeout=8,
-            )
-            if resp.status_code == 200:
-                price = resp.json().get(gecko_id, {}).get('usd')
-                if price:
-                    return Decimal(str(price))
-        except Exception:
-            pass
-    return None
+def _get_live_crypto_prices(coins):
+    """Batched ``_get_live_crypto_price``: {coin: Decimal} for coins with a price."""
+    from core.quote_service import quote_service
+    return quote_service.get_prices(coins)[0]
 
 
 # ---------------------------------------------------------------------------
@@ -185,7 +158,7 @@ def demo_account(request):
         return Response({'success': True, 'data': DemoAccountSerializer(demo_acc).data})
 
     # POST: reset
-    with transaction.atomic():
+    with transaction.atomic(using=demo_db()):
         demo_acc = DemoAccount.objects.select_for_update().get(user=request.user)
         demo_acc.balance = Decimal('10000.00')
         demo_acc.save(update_fields=['balance'])
@@ -243,7 +216,7 @@ def demo_buy_crypto(request):
     quantity = amount / price
 
     try:
-        with transaction.atomic():
+        with transaction.atomic(using=demo_db()):
             demo_acc = DemoAccount.objects.select_for_update().get(user=request.user)
 
             if demo_acc.balance < amount:
@@ -316,7 +289,7 @@ def demo_sell_crypto(request):
     sell_amount = quantity * price
 
     try:
-        with transaction.atomic():
+        with transaction.atomic(using=demo_db()):
             demo_acc = DemoAccount.objects.select_for_update().get(user=request.user)
 
             # Fetch holdings — defer current_price if column missing
@@ -415,7 +388,7 @@ def demo_invest_capital_plan(request):
     plan = PLAN_RATES[plan_type]
 
     try:
-        with transaction.atomic():
+        with transaction.atomic(using=demo_db()):
             demo_acc = DemoAccount.objects.select_for_update().get(user=request.user)
 
             if demo_acc.balance < amount:
@@ -490,7 +463,7 @@ def demo_invest_real_estate(request):
     prop = PROPERTY_TYPES[property_type]
 
     try:
-        with transaction.atomic():
+        with transaction.atomic(using=demo_db()):
             demo_acc = DemoAccount.objects.select_for_update().get(user=request.user)
 
             if demo_acc.balance < amount:
@@ -561,7 +534,7 @@ def demo_invest(request):
         return Response({'success': False, 'error': 'amount must be greater than 0'}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        with transaction.atomic():
+        with transaction.atomic(using=demo_db()):
             demo_acc = DemoAccount.objects.select_for_update().get(user=request.user)
 
             if demo_acc.balance < amount:
@@ -627,11 +600,7 @@ def demo_investments(request):
 
     # Refresh live prices for crypto holdings
     coins = {inv.asset_name for inv in investments if inv.investment_type == 'crypto'}
-    live_prices = {}
-    for coin in coins:
-        p = _get_live_crypto_price(coin)
-        if p:
-            live_prices[coin] = p
+    live_prices = _get_live_crypto_prices(coins) if coins else {}
 
     for inv in investments:
         if inv.investment_type == 'crypto' and inv.asset_name in live_prices:
@@ -656,11 +625,7 @@ def demo_portfolio(request):
 
     # Fetch live prices for all crypto holdings
     coins = {inv.asset_name for inv in investments if inv.investment_type == 'crypto'}
-    live_prices = {}
-    for coin in coins:
-        p = _get_live_crypto_price(coin)
-        if p:
-            live_prices[coin] = p
+    live_prices = _get_live_crypto_prices(coins) if coins else {}
 
     crypto_value = Decimal('0')
     plan_value = Decimal('0')
@@ -745,7 +710,7 @@ def demo_deposit(request):
         return Response({'success': False, 'error': 'amount must be greater than 0'}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        with transaction.atomic():
+        with transaction.atomic(using=demo_db()):
             demo_acc = DemoAccount.objects.select_for_update().get(user=request.user)
             demo_acc.balance += amount
             demo_acc.save(update_fields=['balance'])
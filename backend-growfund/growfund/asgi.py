@@ -7,21 +7,27 @@ from django.core.asgi import get_asgi_application
 
 # Set Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'growfund.settings')
+# Sync views run in a fresh thread per request under ASGI; a persistent
+# connection per thread would exhaust the database's connection limit
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 # Initialize Django ASGI application early to ensure AppRegistry is populated
 django_asgi_app = get_asgi_application()
 
 # Import after Django setup
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
-from binary_trading.routing import websocket_urlpatterns
+from accounts.ws_auth import JWTAuthMiddlewareStack
+from binary_trading.routing import websocket_urlpatterns as trading_websocket_urlpatterns
+from notifications.routing import websocket_urlpatterns as notification_websocket_urlpatterns
+
+websocket_urlpatterns = trading_websocket_urlpatterns + notification_websocket_urlpatterns
 
 application = ProtocolTypeRouter({
     # HTTP requests
     "http": django_asgi_app,
     
-    # WebSocket requests
-    "websocket": AuthMiddlewareStack(
+    # WebSocket requests (JWT via ?token=, falling back to the session)
+    "websocket": JWTAuthMiddlewareStack(
         URLRouter(
             websocket_urlpatterns
         )
@@ -1,21 +0,0 @@
-"""
-Celery configuration for growfund project.
-"""
-import os
-from celery import Celery
-
-# Set the default Django settings module
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'growfund.settings')
-
-app = Celery('growfund')
-
-# Load config from Django settings with CELERY namespace
-app.config_from_object('django.conf:settings', namespace='CELERY')
-
-# Auto-discover tasks in all installed apps
-app.autodiscover_tasks()
-
-
-@app.task(bind=True)
-def debug_task(self):
-    print(f'Request: {self.request!r}')
@@ -38,7 +38,6 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
-    # 'django_celery_beat',  # Optional - uncomment when Celery is installed
     
     # Local apps
     'accounts',
@@ -49,13 +48,17 @@ INSTALLED_APPS = [
     'settings_app',
     'demo',
     'binary_trading',
+    'core',
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.RequestTimingMiddleware',  # Query count / timing, outermost
+    'core.profiling.ProfilingMiddleware',  # Profiles requests sent with an admin's signed token
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',  # Body-hash ETags / 304s for GETs without their own validators
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -86,17 +89,31 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'growfund.wsgi.application'
+ASGI_APPLICATION = 'growfund.asgi.application'
 
 # Database
 import dj_database_url
 
+# Seconds to keep a connection open between requests. growfund/asgi.py sets 0:
+# under ASGI every request runs in a new thread, so persistent connections
+# would pile up until the database refuses clients (pool with PgBouncer instead).
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+
 DATABASES = {
     'default': dj_database_url.config(
         default=config('DATABASE_URL', default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
-        conn_max_age=600
+        conn_max_age=DB_CONN_MAX_AGE
     )
 }
 
+# Demo (practice) trading gets its own database when DEMO_DATABASE_URL is set,
+# e.g. a second Postgres or sqlite:////var/data/demo.sqlite3. See demo/routers.py.
+DEMO_DATABASE_URL = config('DEMO_DATABASE_URL', default='')
+if DEMO_DATABASE_URL:
+    DATABASES['demo'] = dj_database_url.parse(DEMO_DATABASE_URL, conn_max_age=DB_CONN_MAX_AGE)
+
+DATABASE_ROUTERS = ['demo.routers.DemoRouter']
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -143,11 +160,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': (
@@ -245,17 +271,119 @@ FRONTEND_URL = config('FRONTEND_URL', default='https://growfundapp.us')
 # Backend URL (used for webhooks and callbacks)
 BACKEND_URL = config('BACKEND_URL', default='https://growfun-backend.onrender.com')
 
-# Celery Configuration
-CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
-CELERY_ACCEPT_CONTENT = ['json']
-CELERY_TASK_SERIALIZER = 'json'
-CELERY_RESULT_SERIALIZER = 'json'
-CELERY_TIMEZONE = TIME_ZONE
+# Background Scheduler (leader-elected, see core/scheduler.py). Threads start under
+# gunicorn.conf.py, or in any server process launched with SCHEDULER_AUTOSTART=1.
+SCHEDULER_ENABLED = config('SCHEDULER_ENABLED', default=True, cast=bool)
+SCHEDULER_LEASE_SECONDS = config('SCHEDULER_LEASE_SECONDS', default=30, cast=int)
+SCHEDULER_TICK_SECONDS = config('SCHEDULER_TICK_SECONDS', default=1, cast=int)
+USDT_POLL_INTERVAL = config('USDT_POLL_INTERVAL', default=60, cast=int)
+TRADE_EXPIRY_INTERVAL = config('TRADE_EXPIRY_INTERVAL', default=5, cast=int)
+PRICE_REFRESH_INTERVAL = config('PRICE_REFRESH_INTERVAL', default=30, cast=int)
+
+# Job Queue (database-backed, see core/jobs.py)
+# Embedded worker threads per server process; set to 0 when running
+# `python manage.py run_workers` as a separate service.
+JOB_WORKER_THREADS = config('JOB_WORKER_THREADS', default=1, cast=int)
+JOBS_RUN_INLINE = config('JOBS_RUN_INLINE', default=False, cast=bool)
+JOB_POLL_INTERVAL = config('JOB_POLL_INTERVAL', default=1, cast=int)
+# Running jobs renew their lock every JOB_HEARTBEAT_INTERVAL seconds; a lock
+# not renewed for JOB_TIMEOUT seconds means the worker died and the job is requeued.
+JOB_HEARTBEAT_INTERVAL = config('JOB_HEARTBEAT_INTERVAL', default=60, cast=int)
+JOB_TIMEOUT = config('JOB_TIMEOUT', default=600, cast=int)
+JOB_RETENTION_DAYS = config('JOB_RETENTION_DAYS', default=7, cast=int)
+
+# Admin bulk credit: batches above the inline limit run as a background job
+BULK_CREDIT_INLINE_LIMIT = config('BULK_CREDIT_INLINE_LIMIT', default=50, cast=int)
+BULK_CREDIT_CHUNK_SIZE = config('BULK_CREDIT_CHUNK_SIZE', default=1000, cast=int)
+
+# Cache and channel layer
+# With REDIS_URL both are shared across hosts. Without it the cache is kept
+# on local disk (shared by every process on the machine, unlike locmem) and
+# websocket pushes only reach sockets held by the same process, so
+# gunicorn.conf.py refuses to start more than one worker without it.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [REDIS_URL]},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_DIR', default=str(BASE_DIR / '.cache')),
+        }
+    }
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        }
+    }
 
 # CoinGecko API
 COINGECKO_API_KEY = config('COINGECKO_API_KEY', default='')
 
+# Market data (see core/quote_service.py): one batched upstream refresh per
+# interval; quotes older than MARKET_DATA_STALE_AFTER are flagged stale.
+MARKET_DATA_INTERVAL = config('MARKET_DATA_INTERVAL', default=30, cast=int)
+MARKET_DATA_STALE_AFTER = config('MARKET_DATA_STALE_AFTER', default=90, cast=int)
+MARKET_OHLC_INTERVAL = config('MARKET_OHLC_INTERVAL', default=300, cast=int)
+# How often open trades' stored current_price is synced from the quotes
+TRADE_PRICE_SYNC_INTERVAL = config('TRADE_PRICE_SYNC_INTERVAL', default=300, cast=int)
+# Stop-loss/take-profit engine: check tick, and full index reload period
+TRADE_TRIGGER_INTERVAL = config('TRADE_TRIGGER_INTERVAL', default=15, cast=int)
+TRADE_TRIGGER_RESYNC = config('TRADE_TRIGGER_RESYNC', default=600, cast=int)
+# Upper bound on how long a cached user dashboard can lag writes that skip signals
+DASHBOARD_SNAPSHOT_TTL = config('DASHBOARD_SNAPSHOT_TTL', default=300, cast=int)
+# How often the last two days of admin stats rollups are rebuilt from source rows
+ROLLUP_RECONCILE_INTERVAL = config('ROLLUP_RECONCILE_INTERVAL', default=3600, cast=int)
+# Rows fetched per database round trip by streaming admin exports
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+# Seconds a worker trusts its cached platform settings / trading config before re-checking the version
+CONFIG_CACHE_CHECK_INTERVAL = config('CONFIG_CACHE_CHECK_INTERVAL', default=2, cast=int)
+# Seconds an authenticated user row is cached for GET requests (0 disables)
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=30, cast=int)
+# Entries each process keeps in front of the shared cache (core.cache)
+CACHE_LOCAL_MAX_ENTRIES = config('CACHE_LOCAL_MAX_ENTRIES', default=1024, cast=int)
+# Seconds a process trusts its local copy before re-reading the shared cache
+CACHE_LOCAL_TTL = config('CACHE_LOCAL_TTL', default=5, cast=int)
+# Requests over these limits are logged with their query fingerprints (core.instrumentation)
+SLOW_REQUEST_MS = config('SLOW_REQUEST_MS', default=1000, cast=int)
+SLOW_REQUEST_QUERIES = config('SLOW_REQUEST_QUERIES', default=50, cast=int)
+# Add the Server-Timing header (db / app / total) to every response
+SERVER_TIMING_HEADER = config('SERVER_TIMING_HEADER', default=True, cast=bool)
+# Minutes of per-endpoint request stats kept, and seconds between flushes to the shared cache
+REQUEST_STATS_WINDOW = config('REQUEST_STATS_WINDOW', default=60, cast=int)
+REQUEST_STATS_FLUSH_INTERVAL = config('REQUEST_STATS_FLUSH_INTERVAL', default=10, cast=int)
+# Directory the processes of one host share metrics through (default: /dev/shm/growfund-metrics)
+METRICS_DIR = config('METRICS_DIR', default='')
+# Seconds between each process writing its metrics file
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=int)
+# Bearer token a scraper can use for /api/metrics/ (admins can always read it)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+# On-demand request profiler (core.profiling); off unloads the middleware
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=True, cast=bool)
+# Seconds a profiling token stays valid
+PROFILE_TOKEN_MAX_AGE = config('PROFILE_TOKEN_MAX_AGE', default=900, cast=int)
+# Stack sampling period, the longest a request is sampled, and the minimum gap between profiles site-wide
+PROFILE_SAMPLE_INTERVAL_MS = config('PROFILE_SAMPLE_INTERVAL_MS', default=5, cast=int)
+PROFILE_MAX_SECONDS = config('PROFILE_MAX_SECONDS', default=30, cast=int)
+PROFILE_MIN_INTERVAL = config('PROFILE_MIN_INTERVAL', default=10, cast=int)
+# Seconds stored profiles are kept
+PROFILE_TTL = config('PROFILE_TTL', default=86400, cast=int)
+# Decimal places and rounding mode of formatted amounts (core.money)
+MONEY_DECIMAL_PLACES = config('MONEY_DECIMAL_PLACES', default=2, cast=int)
+MONEY_ROUNDING = config('MONEY_ROUNDING', default='ROUND_HALF_EVEN')
+
 # USDT TRC20 Configuration
 USDT_WALLET_ADDRESS = config('USDT_WALLET_ADDRESS', default='TNGbuN1FPWJDsxd9wtoyoAqeRvCVuPuDXm')
 TRONGRID_API_KEY = config('TRONGRID_API_KEY', default='')
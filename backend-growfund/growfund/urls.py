@@ -5,10 +5,12 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.http import HttpResponse
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+import hmac
 import traceback
 
 
@@ -50,8 +52,8 @@ def run_migrations(request):
         call_command('migrate', '--noinput', stdout=out, stderr=out)
         # Invalidate demo column cache so views re-check after migration
         try:
-            from demo.views import _COL_CACHE
-            _COL_CACHE.clear()
+            from demo.views import _invalidate_col_cache
+            _invalidate_col_cache()
         except Exception:
             pass
         return Response({'success': True, 'output': out.getvalue()})
@@ -99,6 +101,61 @@ def db_check(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def request_stats(request):
+    """
+    Admin-only: worst endpoints across all workers over a rolling window
+
+    Query params:
+        minutes  - window length (default and max REQUEST_STATS_WINDOW)
+        order_by - total_ms (default), avg_ms, max_ms, avg_queries, max_queries, db_ms, slow
+        limit    - endpoints returned (default 20)
+    """
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({'success': False, 'error': 'Admin only'}, status=403)
+    from core.instrumentation import request_stats as stats
+
+    order_by = request.GET.get('order_by', 'total_ms')
+    if order_by not in ('total_ms', 'avg_ms', 'max_ms', 'avg_queries', 'max_queries', 'db_ms', 'slow'):
+        return Response({'success': False, 'error': 'Invalid order_by'}, status=400)
+    try:
+        minutes = int(request.GET.get('minutes', 0)) or None
+        limit = min(int(request.GET.get('limit', 20)), 200)
+    except ValueError:
+        return Response({'success': False, 'error': 'minutes and limit must be integers'}, status=400)
+
+    return Response({
+        'success': True,
+        'data': {
+            'window_minutes': min(minutes or stats.window, stats.window),
+            'order_by': order_by,
+            'endpoints': stats.worst(minutes=minutes, order_by=order_by, limit=limit),
+        }
+    })
+
+
+def metrics(request):
+    """
+    Prometheus text metrics for every process on this host. Plain Django view
+    so scrapes skip DRF; authorized by METRICS_TOKEN or an admin JWT.
+    """
+    from accounts.authentication import CachedJWTAuthentication
+    from core.metrics import render
+
+    token = settings.METRICS_TOKEN
+    header = request.headers.get('Authorization', '')
+    if not (token and hmac.compare_digest(header, f'Bearer {token}')):
+        try:
+            result = CachedJWTAuthentication().authenticate(request)
+        except Exception:
+            result = None
+        if result is None or not (result[0].is_staff or result[0].is_superuser):
+            return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 urlpatterns = [
     path('', root_view, name='root'),  # Root endpoint
     path('admin/', admin.site.urls),
@@ -114,8 +171,11 @@ urlpatterns = [
     path('api/binary/', include('binary_trading.urls')),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/health/', health_check, name='health-check'),
+    path('api/metrics/', metrics, name='metrics'),
     path('api/admin/run-migrations/', run_migrations, name='run-migrations'),
     path('api/admin/db-check/', db_check, name='db-check'),
+    path('api/admin/request-stats/', request_stats, name='request-stats'),
+    path('api/admin/profiles/', include('core.urls')),
 ]
 
 if settings.DEBUG:
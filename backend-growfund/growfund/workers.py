@@ -0,0 +1,18 @@
+"""
+Uvicorn worker class for gunicorn (see gunicorn.conf.py).
+
+Django's ASGI handler and Channels' ProtocolTypeRouter don't implement the
+ASGI lifespan protocol, so it is switched off instead of logging an error on
+every worker boot. Websocket pings keep idle trading and notification
+sockets alive through proxies.
+"""
+from uvicorn.workers import UvicornWorker
+
+
+class GrowfundUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        'lifespan': 'off',
+        'ws_ping_interval': 20.0,
+        'ws_ping_timeout': 20.0,
+    }
@@ -1,23 +1,82 @@
-# Gunicorn configuration optimized for Render - SIMPLIFIED
+# Gunicorn serving profile: HTTP and websockets from one ASGI deployment
+#
+#   gunicorn -c gunicorn.conf.py
+#
+# growfund.asgi:application routes HTTP to Django and websockets to the
+# Channels consumers, so both run on uvicorn workers. Every setting below can
+# be overridden from the environment without editing this file.
+#
+# Sizing: under ASGI Django runs each request's sync view in a thread of its
+# own (one thread-sensitive context per request), so a worker serves several
+# views at once, up to its thread pool, while websockets idle on its event
+# loop. Those threads share one process and its GIL, so workers are still
+# sized like sync workers, 2 x cores + 1, capped so small instances don't run
+# out of memory. Set WEB_CONCURRENCY to pin the count. Each in-flight view
+# holds its own database connection (DB_CONN_MAX_AGE is 0 under ASGI).
+#
+# With more than one worker, websocket group messages must cross processes,
+# which only the Redis channel layer does: startup fails unless REDIS_URL is
+# set (or WEB_CONCURRENCY=1).
+#
+# Throughput: measure with the benchmark harness against this profile before
+# changing worker counts (run_benchmarks --url ... --save); results are
+# recorded under "serving" in benchmarks/baselines.json.
+import multiprocessing
 import os
 
+import decouple
+
+# The app is imported once in the master (preload_app) and forked; background
+# threads and database connections must not be created before the fork.
+os.environ.setdefault('SCHEDULER_DEFERRED_START', '1')
+
+wsgi_app = 'growfund.asgi:application'
+
 # Server socket
 bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+backlog = 2048
+
+# Worker processes
+cores = multiprocessing.cpu_count()
+workers = int(os.environ.get('WEB_CONCURRENCY', min(cores * 2 + 1, int(os.environ.get('WEB_CONCURRENCY_MAX', 8)))))
+worker_class = 'growfund.workers.GrowfundUvicornWorker'
+if workers > 1 and not decouple.config('REDIS_URL', default=''):
+    # The in-memory channel layer would silently drop pushes between workers
+    raise RuntimeError(
+        f'{workers} workers need a shared channel layer: set REDIS_URL, or WEB_CONCURRENCY=1'
+    )
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+# Heartbeat file on tmpfs: a slow container disk can't stall workers into timeouts
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
 
-# Worker processes - simplified for stability
-workers = 1
-worker_class = "sync"
-timeout = 120  # Increased timeout
-keepalive = 2
+# Idle keep-alive longer than the load balancer's (60s), so the balancer
+# closes idle connections rather than reusing one we just dropped (502s)
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 75))
 
-# Memory management - less aggressive
-max_requests = 0  # Disable worker recycling temporarily
-preload_app = False  # Disable preloading to avoid issues
+# Memory: preload shares the imported app copy-on-write between workers, and
+# each worker is replaced after a jittered number of requests to cap growth
+preload_app = True
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
 
 # Logging
 accesslog = "-"
 errorlog = "-"
-loglevel = "info"  # More verbose logging to debug issues
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
 
 # Process naming
-proc_name = 'growfund_backend'
\ No newline at end of file
+proc_name = 'growfund_backend'
+
+
+def pre_fork(server, worker):
+    # Connections opened while preloading would be shared by every child
+    if server.cfg.preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    # Scheduler and job worker threads don't survive fork; start them per worker
+    from core.apps import start_background_threads
+    start_background_threads()
@@ -107,12 +107,22 @@ class CapitalInvestmentPlanAdmin(admin.ModelAdmin):
     
     def mark_completed(self, request, queryset):
         """Mark selected plans as completed"""
+        from django.db import transaction
         from django.utils import timezone
-        count = queryset.filter(status='active').update(
-            status='completed',
-            completed_at=timezone.now()
-        )
-        self.message_user(request, f'Marked {count} plans as completed.')
+        from core.rollups import rollups
+        
+        # bulk_update + record_updated, so the status rollups move with the plans
+        with transaction.atomic():
+            plans = list(queryset.filter(status='active').select_for_update())
+            rollups.remember(plans)
+            now = timezone.now()
+            for plan in plans:
+                plan.status = 'completed'
+                plan.completed_at = now
+                plan.updated_at = now
+            CapitalInvestmentPlan.objects.bulk_update(plans, ['status', 'completed_at', 'updated_at'])
+            rollups.record_updated(plans)
+        self.message_user(request, f'Marked {len(plans)} plans as completed.')
     mark_completed.short_description = 'Mark selected plans as completed'
 
 
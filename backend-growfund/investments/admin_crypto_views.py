@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.db import transaction as db_transaction
 from decimal import Decimal
+from core.money import rounded
 
 from .admin_models import AdminCryptoPrice, CryptoPriceHistory
 from .serializers import (
@@ -11,13 +12,14 @@ from .serializers import (
     PublicCryptoPriceSerializer, CryptoPriceHistorySerializer
 )
 
+# Market coins the admin price list tracks; names come from the quote registry
+MARKET_SYNCED_COINS = ('BTC', 'ETH', 'BNB', 'ADA', 'SOL', 'DOT')
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def admin_get_crypto_prices(request):
     """Get all crypto prices for admin management"""
-    from decimal import Decimal
-    import requests
     
     # Get all admin-controlled prices from database
     admin_prices = AdminCryptoPrice.objects.all()
@@ -42,89 +44,66 @@ def admin_get_crypto_prices(request):
             'is_admin_controlled': True
         }
     
-    # Fetch other coins from CoinGecko API and create/update them
+    # Sync market coins from the shared quote snapshot and create/update them
+    from core.quote_service import SYMBOLS, quote_service
     try:
-        coingecko_url = "https://api.coingecko.com/api/v3/simple/price"
-        params = {
-            'ids': 'bitcoin,ethereum,binancecoin,cardano,solana,polkadot',
-            'vs_currencies': 'usd',
-            'include_24hr_change': 'true',
-            'include_7d_change': 'true',
-            'include_30d_change': 'true'
-        }
+        snapshot = quote_service.get_snapshot()
         
-        response = requests.get(coingecko_url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Map CoinGecko IDs to our symbols
-            coin_mapping = {
-                'bitcoin': {'symbol': 'BTC', 'name': 'Bitcoin'},
-                'ethereum': {'symbol': 'ETH', 'name': 'Ethereum'},
-                'binancecoin': {'symbol': 'BNB', 'name': 'Binance Coin'},
-                'cardano': {'symbol': 'ADA', 'name': 'Cardano'},
-                'solana': {'symbol': 'SOL', 'name': 'Solana'},
-                'polkadot': {'symbol': 'DOT', 'name': 'Polkadot'}
-            }
-            
-            for gecko_id, coin_info in coin_mapping.items():
-                if gecko_id in data:
-                    coin_data = data[gecko_id]
-                    symbol = coin_info['symbol']
-                    name = coin_info['name']
-                    
-                    # Get current market price as buy price
-                    buy_price = Decimal(str(coin_data.get('usd', 0)))
-                    
-                    # Calculate sell price (3% lower than buy price for spread)
-                    sell_price = buy_price * Decimal('0.97')
-                    
-                    # Get or create the coin price record
-                    admin_price, created = AdminCryptoPrice.objects.get_or_create(
-                        coin=symbol,
-                        defaults={
-                            'name': name,
-                            'buy_price': buy_price,
-                            'sell_price': sell_price,
-                            'change_24h': Decimal(str(coin_data.get('usd_24h_change', 0))),
-                            'change_7d': Decimal(str(coin_data.get('usd_7d_change', 0))),
-                            'change_30d': Decimal(str(coin_data.get('usd_30d_change', 0))),
-                            'is_active': True,
-                            'updated_by': request.user
-                        }
-                    )
-                    
-                    # If not created, update buy price from API but keep admin-set sell price
-                    if not created:
-                        admin_price.buy_price = buy_price
-                        admin_price.change_24h = Decimal(str(coin_data.get('usd_24h_change', 0)))
-                        admin_price.change_7d = Decimal(str(coin_data.get('usd_7d_change', 0)))
-                        admin_price.change_30d = Decimal(str(coin_data.get('usd_30d_change', 0)))
-                        admin_price.updated_by = request.user
-                        admin_price.save()
-                    
-                    # Add to response dict
-                    prices_dict[symbol] = {
-                        'id': admin_price.id,
-                        'coin': admin_price.coin,
-                        'name': admin_price.name,
-                        'buy_price': str(admin_price.buy_price),
-                        'sell_price': str(admin_price.sell_price),
-                        'spread': str(admin_price.spread),
-                        'spread_percentage': float(admin_price.spread_percentage),
-                        'change_24h': float(admin_price.change_24h),
-                        'change_7d': float(admin_price.change_7d),
-                        'change_30d': float(admin_price.change_30d),
-                        'is_active': admin_price.is_active,
-                        'last_updated': admin_price.last_updated.isoformat(),
-                        'updated_by': admin_price.updated_by.email if admin_price.updated_by else None,
-                        'is_admin_controlled': symbol == 'EXACOIN'  # Only EXACOIN is fully admin controlled
+        for symbol in MARKET_SYNCED_COINS:
+            name = SYMBOLS[symbol][1]
+            coin_data = snapshot.get(symbol)
+            if coin_data:
+                # Get current market price as buy price
+                buy_price = coin_data['price']
+                
+                # Calculate sell price (3% lower than buy price for spread)
+                sell_price = buy_price * Decimal('0.97')
+                
+                # Get or create the coin price record
+                admin_price, created = AdminCryptoPrice.objects.get_or_create(
+                    coin=symbol,
+                    defaults={
+                        'name': name,
+                        'buy_price': buy_price,
+                        'sell_price': sell_price,
+                        'change_24h': coin_data['change_24h'],
+                        'change_7d': coin_data['change_7d'],
+                        'change_30d': coin_data['change_30d'],
+                        'is_active': True,
+                        'updated_by': request.user
                     }
-    
+                )
+                
+                # If not created, update buy price from the market but keep admin-set sell price
+                if not created:
+                    admin_price.buy_price = buy_price
+                    admin_price.change_24h = coin_data['change_24h']
+                    admin_price.change_7d = coin_data['change_7d']
+                    admin_price.change_30d = coin_data['change_30d']
+                    admin_price.updated_by = request.user
+                    admin_price.save()
+                
+                # Add to response dict
+                prices_dict[symbol] = {
+                    'id': admin_price.id,
+                    'coin': admin_price.coin,
+                    'name': admin_price.name,
+                    'buy_price': str(admin_price.buy_price),
+                    'sell_price': str(admin_price.sell_price),
+                    'spread': str(admin_price.spread),
+                    'spread_percentage': float(admin_price.spread_percentage),
+                    'change_24h': float(admin_price.change_24h),
+                    'change_7d': float(admin_price.change_7d),
+                    'change_30d': float(admin_price.change_30d),
+                    'is_active': admin_price.is_active,
+                    'last_updated': admin_price.last_updated.isoformat(),
+                    'updated_by': admin_price.updated_by.email if admin_price.updated_by else None,
+                    'is_admin_controlled': symbol == 'EXACOIN'  # Only EXACOIN is fully admin controlled
+                }
+
     except Exception as e:
-        print(f"⚠️ CoinGecko API error: {e}")
-        # Continue with existing data if API fails
+        print(f"⚠️ Market price sync error: {e}")
+        # Continue with existing data if the sync fails
     
     return Response({
         'success': True,
@@ -247,11 +226,11 @@ def admin_update_crypto_price(request):
     return Response({
         'data': {
             'coin': crypto_price.coin,
-            'buy_price': float(f"{crypto_price.buy_price:.2f}"),
-            'sell_price': float(f"{crypto_price.sell_price:.2f}"),
-            'change24h': float(f"{crypto_price.change_24h:.2f}"),
-            'change7d': float(f"{crypto_price.change_7d:.2f}"),
-            'change30d': float(f"{crypto_price.change_30d:.2f}"),
+            'buy_price': rounded(crypto_price.buy_price),
+            'sell_price': rounded(crypto_price.sell_price),
+            'change24h': rounded(crypto_price.change_24h),
+            'change7d': rounded(crypto_price.change_7d),
+            'change30d': rounded(crypto_price.change_30d),
             'updated_at': crypto_price.last_updated.isoformat()
         },
         'success': True
@@ -5,6 +5,9 @@ from decimal import Decimal
 
 User = get_user_model()
 
+# core.cache tag bumped whenever an AdminCryptoPrice row changes (see InvestmentsConfig.ready)
+CRYPTO_PRICES_TAG = 'crypto-prices'
+
 
 class AdminCryptoPrice(models.Model):
     """Admin-controlled cryptocurrency prices with buy/sell spread"""
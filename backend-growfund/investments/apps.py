@@ -5,3 +5,29 @@ class InvestmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'investments'
     verbose_name = 'Investments & Trading'
+
+    def ready(self):
+        from django.conf import settings
+        from core.cache import invalidate_on_change
+        from core.quote_service import quote_service
+        from core.scheduler import scheduler
+        from .admin_models import CRYPTO_PRICES_TAG, AdminCryptoPrice
+        from .trigger_engine import check_trade_triggers
+        from .valuation_service import refresh_open_trade_prices
+
+        # Validators of the price board's conditional GET
+        invalidate_on_change(AdminCryptoPrice, [CRYPTO_PRICES_TAG])
+
+        # Portfolio reads don't write; stored current_price is synced here
+        scheduler.register(
+            'open-trade-prices', refresh_open_trade_prices,
+            interval=getattr(settings, 'TRADE_PRICE_SYNC_INTERVAL', 300),
+        )
+
+        # Stop-loss/take-profit/expiry fire server-side on each quote refresh,
+        # and on a short tick for admin-priced coins and expiries
+        quote_service.on_refresh(check_trade_triggers)
+        scheduler.register(
+            'trade-triggers', check_trade_triggers,
+            interval=getattr(settings, 'TRADE_TRIGGER_INTERVAL', 15),
+        )
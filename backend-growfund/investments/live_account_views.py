@@ -8,6 +8,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.db import transaction as db_transaction
 from django.utils import timezone
 from decimal import Decimal
+from core.money import money, rounded
 
 from .models import Trade, CapitalInvestmentPlan
 from .admin_models import AdminCryptoPrice
@@ -24,41 +25,29 @@ def live_portfolio(request):
     """
     user = request.user
     
+    from .valuation_service import PortfolioValuation
+    
     # Get all active investments
-    crypto_trades = Trade.objects.filter(user=user, status='open').exclude(asset__in=['gold'])
     capital_plans = CapitalInvestmentPlan.objects.filter(user=user, status='active')
     
-    # Calculate crypto values with live prices
-    crypto_value = Decimal('0')
-    crypto_investments = []
-    
-    if crypto_trades.exists():
-        # Get live prices
-        held_coins = set(trade.asset for trade in crypto_trades)
-        from .views import _fetch_live_prices
-        live_prices, coin_names = _fetch_live_prices(held_coins)
-        
-        for trade in crypto_trades:
-            coin = trade.asset
-            invested_amount = trade.entry_price * trade.quantity
-            current_price = live_prices.get(coin) or trade.current_price or trade.entry_price
-            current_value = trade.quantity * current_price
-            profit_loss = current_value - invested_amount
-            
-            crypto_investments.append({
-                'id': str(trade.id),
-                'asset': coin,
-                'name': coin_names.get(coin, coin),
-                'quantity': f"{trade.quantity:.8f}",
-                'invested_amount': f"{invested_amount:.2f}",
-                'current_price': f"{current_price:.2f}",
-                'current_value': f"{current_value:.2f}",
-                'profit_loss': f"{profit_loss:.2f}",
-                'profit_loss_percentage': float(f"{(profit_loss / invested_amount * 100):.2f}") if invested_amount > 0 else 0.0,
-                'date': trade.created_at.isoformat()
-            })
-            
-            crypto_value += current_value
+    # Calculate crypto values with live prices (read-only, one query)
+    positions = PortfolioValuation.crypto_positions(user)
+    crypto_value = PortfolioValuation.summarize(positions)['value']
+    crypto_investments = [
+        {
+            'id': str(p['trade'].id),
+            'asset': p['coin'],
+            'name': p['name'],
+            'quantity': f"{p['quantity']:.8f}",
+            'invested_amount': money(p['invested']),
+            'current_price': money(p['current_price']),
+            'current_value': money(p['current_value']),
+            'profit_loss': money(p['profit_loss']),
+            'profit_loss_percentage': rounded(p['profit_loss_percentage']),
+            'date': p['trade'].created_at.isoformat()
+        }
+        for p in positions
+    ]
     
     # Calculate capital plan values
     plan_value = Decimal('0')
@@ -69,9 +58,9 @@ def live_portfolio(request):
             'id': str(plan.id),
             'type': plan.plan_type,
             'name': f'{plan.plan_type.title()} Plan',
-            'invested_amount': f"{plan.initial_amount:.2f}",
-            'current_value': f"{plan.total_return:.2f}",
-            'profit_loss': f"{plan.total_return - plan.initial_amount:.2f}",
+            'invested_amount': money(plan.initial_amount),
+            'current_value': money(plan.total_return),
+            'profit_loss': money(plan.total_return - plan.initial_amount),
             'growth_rate': f"{plan.growth_rate:.2f}%",
             'period_months': plan.period_months,
             'date': plan.created_at.isoformat()
@@ -85,18 +74,18 @@ def live_portfolio(request):
     return Response({
         'success': True,
         'data': {
-            'balance': f"{user.balance:.2f}",
-            'total_invested': f"{total_invested:.2f}",
-            'total_value': f"{total_value:.2f}",
-            'total_profit_loss': f"{total_profit_loss:.2f}",
-            'total_profit_loss_percentage': float(f"{(total_profit_loss / total_invested * 100):.2f}") if total_invested > 0 else 0.0,
+            'balance': money(user.balance),
+            'total_invested': money(total_invested),
+            'total_value': money(total_value),
+            'total_profit_loss': money(total_profit_loss),
+            'total_profit_loss_percentage': rounded(total_profit_loss / total_invested * 100) if total_invested > 0 else 0.0,
             'crypto': {
-                'value': f"{crypto_value:.2f}",
+                'value': money(crypto_value),
                 'count': len(crypto_investments),
                 'investments': crypto_investments
             },
             'capital_plans': {
-                'value': f"{plan_value:.2f}",
+                'value': money(plan_value),
                 'count': len(plan_investments),
                 'investments': plan_investments
             }
@@ -201,13 +190,13 @@ def live_invest_capital_plan(request):
                 'id': str(plan.id),
                 'type': 'capital_plan',
                 'plan_type': plan_type,
-                'amount': f"{amount:.2f}",
+                'amount': money(amount),
                 'period_months': period_months,
                 'growth_rate': f"{growth_rates[plan_type]:.2f}%",
                 'status': 'active',
                 'date': plan.created_at.isoformat()
             },
-            'new_balance': f"{user.balance:.2f}",
+            'new_balance': money(user.balance),
             'message': f'Successfully invested in {plan_type.title()} capital plan'
         }
     }, status=status.HTTP_201_CREATED)
@@ -219,37 +208,32 @@ def live_dashboard_stats(request):
     """
     Dashboard statistics for live account
     """
-    user = request.user
+    from accounts.dashboard_service import get_dashboard_snapshot
     
-    # Get investment counts and values
-    crypto_trades = Trade.objects.filter(user=user, status='open').exclude(asset__in=['gold'])
-    capital_plans = CapitalInvestmentPlan.objects.filter(user=user, status='active')
-    
-    # Recent transactions
-    recent_transactions = Transaction.objects.filter(user=user).order_by('-created_at')[:5]
+    user = request.user
+    snapshot = get_dashboard_snapshot(user)
     
-    # Calculate totals
-    total_crypto_invested = sum(trade.entry_price * trade.quantity for trade in crypto_trades)
-    total_plan_invested = sum(plan.initial_amount for plan in capital_plans)
-    total_invested = total_crypto_invested + total_plan_invested
+    crypto_count = snapshot['crypto']['live_count']
+    plan_count = snapshot['investments']['active_count']
+    total_invested = Decimal(snapshot['crypto']['live_invested']) + Decimal(snapshot['investments']['active_invested'])
     
     return Response({
         'success': True,
         'data': {
-            'balance': f"{user.balance:.2f}",
-            'total_invested': f"{total_invested:.2f}",
-            'investment_count': crypto_trades.count() + capital_plans.count(),
-            'crypto_investments': crypto_trades.count(),
-            'capital_plans': capital_plans.count(),
+            'balance': money(user.balance),
+            'total_invested': money(total_invested),
+            'investment_count': crypto_count + plan_count,
+            'crypto_investments': crypto_count,
+            'capital_plans': plan_count,
             'recent_transactions': [
                 {
-                    'type': txn.transaction_type,
-                    'amount': f"{txn.amount:.2f}",
-                    'description': txn.description,
-                    'status': txn.status,
-                    'date': txn.created_at.isoformat()
+                    'type': txn['type'],
+                    'amount': txn['amount'],
+                    'description': txn['description'],
+                    'status': txn['status'],
+                    'date': txn['date']
                 }
-                for txn in recent_transactions
+                for txn in snapshot['recent_activity']
             ]
         }
     }, status=status.HTTP_200_OK)
@@ -270,7 +254,7 @@ def live_balance(request):
     return Response({
         'success': True,
         'data': {
-            'balance': f"{user.balance:.2f}",
+            'balance': money(user.balance),
             'email': user.email,
             'name': user.get_full_name(),
             'crypto_investments': crypto_count,
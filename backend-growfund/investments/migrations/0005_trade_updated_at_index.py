@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0004_rename_investments_coin_idx_investments_coin_551743_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['updated_at'], name='investments_updated_7038da_idx'),
+        ),
+    ]
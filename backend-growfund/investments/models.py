@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from decimal import Decimal
 import uuid
 
 User = get_user_model()
@@ -193,6 +194,10 @@ class Trade(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Trade'
         verbose_name_plural = 'Trades'
+        indexes = [
+            # Incremental sync of the trigger engine's index
+            models.Index(fields=['updated_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.asset.upper()} {self.trade_type.upper()} @ {self.entry_price}"
@@ -213,6 +218,61 @@ class Trade(models.Model):
         if self.expires_at and timezone.now() >= self.expires_at:
             return True
         return False
+    
+    def trigger_for(self, price):
+        """
+        The stop-loss/take-profit ``price`` crosses, as ``(status,
+        close_reason, exit_price)``, or None. Triggered trades exit at the
+        trigger level, not at ``price``.
+        """
+        if self.stop_loss:
+            if (self.trade_type == 'buy' and price <= self.stop_loss) or \
+                    (self.trade_type == 'sell' and price >= self.stop_loss):
+                return 'stop_loss_hit', 'stop_loss', self.stop_loss
+        if self.take_profit:
+            if (self.trade_type == 'buy' and price >= self.take_profit) or \
+                    (self.trade_type == 'sell' and price <= self.take_profit):
+                return 'take_profit_hit', 'take_profit', self.take_profit
+        return None
+    
+    def apply_close(self, exit_price, status='closed', close_reason='manual', closed_at=None):
+        """
+        Mark the trade closed at ``exit_price`` in memory and return the
+        unsaved ``TradeHistory`` row for it. Callers save both, one at a
+        time (``close``) or in bulk (the trigger engine).
+        """
+        exit_price = Decimal(str(exit_price))
+        pnl, pnl_percentage = self.calculate_pnl(exit_price)
+        
+        self.exit_price = exit_price
+        self.current_price = exit_price
+        self.profit_loss = Decimal(pnl).quantize(Decimal('0.01'))
+        self.profit_loss_percentage = Decimal(pnl_percentage).quantize(Decimal('0.01'))
+        self.status = status
+        self.closed_at = closed_at or timezone.now()
+        
+        return TradeHistory(
+            user_id=self.user_id,
+            asset=self.asset,
+            trade_type=self.trade_type,
+            entry_price=self.entry_price,
+            exit_price=exit_price,
+            quantity=self.quantity,
+            profit_loss=self.profit_loss,
+            profit_loss_percentage=self.profit_loss_percentage,
+            close_reason=close_reason,
+            opened_at=self.created_at
+        )
+    
+    def close(self, exit_price, status='closed', close_reason='manual'):
+        """Close the trade and write its history record"""
+        from django.db import transaction
+        
+        history = self.apply_close(exit_price, status, close_reason)
+        with transaction.atomic():
+            self.save()
+            history.save()
+        return history
 
 
 class TradeHistory(models.Model):
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from core.rollups import rollups
+
+from .models import Trade, TradeHistory
+from .trigger_engine import TriggerEngine
+
+User = get_user_model()
+
+
+class TriggerEngineTests(TestCase):
+    """Server-side stop-loss / take-profit / expiry closes."""
+
+    def setUp(self):
+        # Run the rollup flush queued by this write, so the tests below see
+        # their own commits' callbacks
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(email='trigger@example.com', password='pw-12345')
+        self.engine = TriggerEngine()
+
+    def open_trade(self, **kwargs):
+        fields = {
+            'user': self.user, 'asset': 'usdt', 'trade_type': 'buy',
+            'entry_price': Decimal('1.00'), 'quantity': Decimal('100'),
+        }
+        fields.update(kwargs)
+        return Trade.objects.create(**fields)
+
+    def test_lowercase_asset_matches_price_book_symbol(self):
+        trade = self.open_trade(stop_loss=Decimal('0.90'))
+
+        self.assertEqual(self.engine.check({'USDT': Decimal('0.50')}), 1)
+
+        trade.refresh_from_db()
+        self.assertEqual(trade.status, 'stop_loss_hit')
+        self.assertEqual(trade.exit_price, Decimal('0.90'))
+        self.assertTrue(TradeHistory.objects.filter(close_reason='stop_loss').exists())
+
+    def test_take_profit_on_coin_code_asset(self):
+        trade = self.open_trade(asset='BTC', entry_price=Decimal('100.00'), take_profit=Decimal('120.00'))
+
+        self.assertEqual(self.engine.check({'BTC': Decimal('125.00')}), 1)
+
+        trade.refresh_from_db()
+        self.assertEqual(trade.status, 'take_profit_hit')
+
+    def test_unpriced_expired_trade_closes_at_last_mark_and_leaves_index(self):
+        trade = self.open_trade(
+            asset='gold', entry_price=Decimal('2000.00'), current_price=Decimal('2050.00'),
+            expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        self.assertEqual(self.engine.check({'USDT': Decimal('1.00')}), 1)
+
+        trade.refresh_from_db()
+        self.assertEqual(trade.status, 'expired')
+        self.assertEqual(trade.exit_price, Decimal('2050.00'))
+        self.assertEqual(len(self.engine.expiries), 0)
+        # Later ticks only run the incremental sync; nothing is locked again
+        with self.assertNumQueries(1):
+            self.assertEqual(self.engine.check({}), 0)
+
+    def test_close_moves_rollup_bucket_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            trade = self.open_trade(stop_loss=Decimal('0.90'))
+        self.assertEqual(rollups.totals(['trades'])['trades']['open']['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.engine.check({'USDT': Decimal('0.50')})
+            # Nothing touches the shared rollup rows until the commit
+            self.assertEqual(rollups.totals(['trades'])['trades']['open']['count'], 1)
+
+        totals = rollups.totals(['trades'])['trades']
+        self.assertEqual(totals['open']['count'], 0)
+        self.assertEqual(totals['stop_loss_hit'], {'count': 1, 'amount': Decimal('100.00')})
+        with self.captureOnCommitCallbacks(execute=True):
+            trade.delete()
+        self.assertEqual(rollups.totals(['trades'])['trades']['stop_loss_hit']['count'], 0)
@@ -0,0 +1,263 @@
+"""
+Server-side stop-loss / take-profit / expiry engine for ``Trade``.
+
+Open trades with a stop-loss, take-profit or expiry are kept in per-asset
+sorted price-level indexes. When a new quote arrives, the trades whose
+levels the price crossed are a contiguous slice of an index, found with
+one bisect (O(log n + k) for k triggered trades) instead of a scan over
+every open position. Crossed trades are closed in one database
+transaction with ``Trade.apply_close`` (the same logic as the close and
+update_price endpoints), one ``bulk_update`` and one ``TradeHistory``
+``bulk_create``.
+
+Two indexes per asset, by the direction the price moves to cross a level:
+
+    rising   fires when price >= level   buy take-profit, sell stop-loss
+    falling  fires when price <= level   buy stop-loss, sell take-profit
+
+Indexes are keyed on price-book symbols (``price_symbol``), not the raw
+``Trade.asset`` values. An expired trade closes at the live price when
+there is one, else at its last marked price (``current_price``, then
+``entry_price``, as in valuation), so it never stays in the index.
+
+The engine runs on every quote refresh (``quote_service.on_refresh``) and on
+a short scheduler tick, which also picks up admin-priced coins and expiries.
+Each process keeps its own index: it is loaded once, then brought up to date
+from trades whose ``updated_at`` moved since the last sync, and fully
+reloaded every ``TRADE_TRIGGER_RESYNC`` seconds.
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.metrics import observe_settlement
+
+from .valuation_service import price_symbol
+
+logger = logging.getLogger(__name__)
+
+# Rows changed this close to a sync are read again by the next one, so
+# clock skew between app servers and the database can't hide an update.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+CLOSE_FIELDS = [
+    'exit_price', 'current_price', 'profit_loss', 'profit_loss_percentage',
+    'status', 'closed_at', 'updated_at',
+]
+
+INDEX_FIELDS = [
+    'id', 'asset', 'trade_type', 'status', 'stop_loss', 'take_profit', 'expires_at',
+]
+
+
+class LevelIndex:
+    """Trade ids kept sorted by a level (price or expiry time)."""
+
+    def __init__(self):
+        self.levels = []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, level, trade_id):
+        i = bisect.bisect_right(self.levels, level)
+        self.levels.insert(i, level)
+        self.ids.insert(i, trade_id)
+
+    def remove(self, level, trade_id):
+        lo = bisect.bisect_left(self.levels, level)
+        hi = bisect.bisect_right(self.levels, level)
+        for i in range(lo, hi):
+            if self.ids[i] == trade_id:
+                del self.levels[i]
+                del self.ids[i]
+                return
+
+    def at_or_below(self, value):
+        """Ids whose level is <= ``value``."""
+        return self.ids[:bisect.bisect_right(self.levels, value)]
+
+    def at_or_above(self, value):
+        """Ids whose level is >= ``value``."""
+        return self.ids[bisect.bisect_left(self.levels, value):]
+
+
+class TriggerEngine:
+    """In-process trigger indexes plus the bulk close of crossed trades."""
+
+    def __init__(self):
+        self.rising = defaultdict(LevelIndex)
+        self.falling = defaultdict(LevelIndex)
+        self.expiries = LevelIndex()
+        self._entries = {}
+        self._watermark = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def resync_seconds(self):
+        return getattr(settings, 'TRADE_TRIGGER_RESYNC', 600)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _forget(self, trade_id):
+        for index, level in self._entries.pop(trade_id, ()):
+            index.remove(level, trade_id)
+
+    def _index(self, row):
+        """(Re)index one trade from a dict of ``INDEX_FIELDS``."""
+        trade_id = row['id']
+        self._forget(trade_id)
+        if row['status'] != 'open':
+            return
+
+        entries = []
+        asset = price_symbol(row['asset'])
+        if row['stop_loss']:
+            index = self.falling[asset] if row['trade_type'] == 'buy' else self.rising[asset]
+            entries.append((index, row['stop_loss']))
+        if row['take_profit']:
+            index = self.rising[asset] if row['trade_type'] == 'buy' else self.falling[asset]
+            entries.append((index, row['take_profit']))
+        if row['expires_at']:
+            entries.append((self.expiries, row['expires_at']))
+
+        for index, level in entries:
+            index.add(level, trade_id)
+        if entries:
+            self._entries[trade_id] = entries
+
+    def load(self):
+        """Rebuild every index from the open trades."""
+        from django.db.models import Q
+        from .models import Trade
+
+        started = timezone.now()
+        self.rising.clear()
+        self.falling.clear()
+        self.expiries = LevelIndex()
+        self._entries = {}
+
+        rows = Trade.objects.filter(status='open').filter(
+            Q(stop_loss__isnull=False) | Q(take_profit__isnull=False) | Q(expires_at__isnull=False)
+        ).values(*INDEX_FIELDS).iterator(chunk_size=2000)
+        for row in rows:
+            self._index(row)
+
+        self._watermark = started - SYNC_OVERLAP
+        self._loaded_at = time.monotonic()
+        logger.debug(f'Trade trigger index loaded: {len(self._entries)} trades')
+
+    def sync(self):
+        """Load on first use or when due; otherwise apply trades changed since the last sync."""
+        from .models import Trade
+
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.resync_seconds:
+            self.load()
+            return
+
+        started = timezone.now()
+        for row in Trade.objects.filter(updated_at__gte=self._watermark).values(*INDEX_FIELDS):
+            self._index(row)
+        self._watermark = started - SYNC_OVERLAP
+
+    # ------------------------------------------------------------------
+    # Triggering
+    # ------------------------------------------------------------------
+
+    def crossed(self, prices, now):
+        """Ids of trades whose levels ``prices`` crossed, or that expired by ``now``."""
+        ids = set()
+        for asset, price in prices.items():
+            if asset in self.rising:
+                ids.update(self.rising[asset].at_or_below(price))
+            if asset in self.falling:
+                ids.update(self.falling[asset].at_or_above(price))
+        ids.update(self.expiries.at_or_below(now))
+        return ids
+
+    def check(self, prices):
+        """Close every open trade ``prices`` (symbol -> Decimal) triggers. Returns how many closed."""
+        with self._lock:
+            self.sync()
+            now = timezone.now()
+            ids = self.crossed(prices, now)
+            if not ids:
+                return 0
+            return self._close(ids, prices, now)
+
+    def _close(self, ids, prices, now):
+        from accounts.dashboard_service import invalidate_dashboards
+        from core.rollups import rollups
+        from .models import Trade, TradeHistory
+
+        closed = []
+        with transaction.atomic():
+            # Row locks make a concurrent close (user or another process) wait,
+            # and the status filter is re-checked once they are released
+            trades = list(Trade.objects.select_for_update().filter(id__in=ids, status='open'))
+            rollups.remember(trades)
+            histories = []
+            for trade in trades:
+                price = prices.get(price_symbol(trade.asset))
+                trigger = trade.trigger_for(price) if price is not None else None
+                if trigger:
+                    trade_status, close_reason, exit_price = trigger
+                elif trade.expires_at and trade.expires_at <= now:
+                    if price is None:
+                        # No live price (unpriced asset or stale quotes): last mark
+                        price = trade.current_price or trade.entry_price
+                    trade_status, close_reason, exit_price = 'expired', 'expired', price
+                else:
+                    continue
+                histories.append(trade.apply_close(exit_price, trade_status, close_reason, closed_at=now))
+                trade.updated_at = now
+                closed.append(trade)
+
+            if closed:
+                Trade.objects.bulk_update(closed, CLOSE_FIELDS, batch_size=500)
+                TradeHistory.objects.bulk_create(histories, batch_size=500)
+                # bulk writes skip the signals these listen to
+                rollups.record_updated(closed)
+                invalidate_dashboards({trade.user_id for trade in closed})
+
+        for trade in trades:
+            self._index({field: getattr(trade, field) for field in INDEX_FIELDS})
+        for trade_id in ids - {trade.id for trade in trades}:
+            # Closed or deleted elsewhere
+            self._forget(trade_id)
+
+        if closed:
+            for trade in closed:
+                if trade.status == 'expired':
+                    observe_settlement(trade, 'trade')
+            logger.info(f'Trade triggers closed {len(closed)} trades')
+        return len(closed)
+
+
+trigger_engine = TriggerEngine()
+
+
+def check_trade_triggers(snapshot=None):
+    """
+    Run the engine against the current price book. Registered as a quote
+    refresh listener and as a leader-only periodic job.
+    """
+    from core.quote_service import quote_service, SYMBOLS
+
+    snapshot = snapshot or quote_service.get_snapshot()
+    prices, _ = quote_service.get_price_book()
+    if snapshot.is_stale:
+        # Never trigger on old market quotes; admin-priced coins are always current
+        prices = {symbol: price for symbol, price in prices.items() if symbol not in SYMBOLS}
+    return trigger_engine.check(prices)
@@ -0,0 +1,410 @@
+"""
+Read-only portfolio valuation.
+
+Values a user's open crypto trades against the current price book (admin
+coins from the database, market coins from the quote snapshot) without
+writing anything. The per-row arithmetic (invested, mark price, value,
+P&L) is done by the database as annotations on a single query; the stored
+``Trade.current_price`` is only a fallback and is kept roughly current by
+``refresh_open_trade_prices``, a periodic bulk UPDATE.
+
+    positions = PortfolioValuation.crypto_positions(user)
+    summary = PortfolioValuation.summarize(positions)
+"""
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Trade
+
+MONEY = DecimalField(max_digits=24, decimal_places=8)
+
+# Trade assets that are not crypto holdings
+NON_CRYPTO_ASSETS = ['gold']
+
+
+def price_symbol(asset):
+    """
+    Price-book symbol for a ``Trade.asset`` value. ``create_trade`` stores
+    the lowercase ``ASSET_CHOICES`` keys ('usdt'); crypto buys store the
+    coin code ('BTC'); the price book is keyed on upper-case symbols.
+    """
+    return asset.upper()
+
+
+def trade_assets(symbol):
+    """The ``Trade.asset`` values ``price_symbol`` maps to ``symbol``."""
+    return [symbol, symbol.lower()]
+
+
+def _pct(part, whole):
+    return (part / whole) * 100 if whole > 0 else Decimal('0')
+
+
+class PortfolioValuation:
+    """Shared valuation for the portfolio endpoints."""
+
+    @classmethod
+    def mark_price_expression(cls, prices):
+        """Live price per asset, falling back to stored current_price, then entry_price."""
+        fallback = Coalesce('current_price', 'entry_price')
+        if not prices:
+            return fallback
+        return Case(
+            *[When(asset__in=trade_assets(coin), then=Value(price, output_field=MONEY)) for coin, price in prices.items()],
+            default=fallback,
+            output_field=MONEY,
+        )
+
+    @classmethod
+    def annotate(cls, queryset, prices):
+        """Add invested, mark_price, current_value and pnl annotations."""
+        return queryset.annotate(
+            invested=ExpressionWrapper(F('entry_price') * F('quantity'), output_field=MONEY),
+            mark_price=cls.mark_price_expression(prices),
+        ).annotate(
+            current_value=ExpressionWrapper(F('mark_price') * F('quantity'), output_field=MONEY),
+        ).annotate(
+            pnl=ExpressionWrapper(F('current_value') - F('invested'), output_field=MONEY),
+        )
+
+    @classmethod
+    def crypto_positions(cls, user, price_book=None):
+        """
+        Open crypto trades for ``user`` with their valuation, in two queries
+        (price book and trades) however many holdings there are.
+        
+        Each position is a dict of Decimals plus the trade and display name.
+        """
+        from core.quote_service import quote_service
+
+        prices, names = price_book or quote_service.get_price_book()
+        trades = cls.annotate(
+            Trade.objects.filter(user=user, status='open').exclude(asset__in=NON_CRYPTO_ASSETS),
+            prices,
+        ).order_by('-created_at')
+
+        positions = []
+        for trade in trades:
+            invested = Decimal(trade.invested)
+            profit_loss = Decimal(trade.pnl)
+            positions.append({
+                'trade': trade,
+                'coin': trade.asset,
+                'name': names.get(price_symbol(trade.asset), trade.asset),
+                'quantity': trade.quantity,
+                'entry_price': trade.entry_price,
+                'invested': invested,
+                'current_price': Decimal(trade.mark_price),
+                'current_value': Decimal(trade.current_value),
+                'profit_loss': profit_loss,
+                'profit_loss_percentage': _pct(profit_loss, invested),
+            })
+        return positions
+
+    @staticmethod
+    def summarize(positions):
+        invested = sum((p['invested'] for p in positions), Decimal('0'))
+        value = sum((p['current_value'] for p in positions), Decimal('0'))
+        profit_loss = value - invested
+        return {
+            'invested': invested,
+            'value': value,
+            'profit_loss': profit_loss,
+            'profit_loss_percentage': _pct(profit_loss, invested),
+            'count': len(positions),
+        }
+
+
+def refresh_open_trade_prices():
+    """
+    Copy the price book onto ``Trade.current_price`` for open trades, one
+    UPDATE per priced asset. Registered as a leader-only periodic job so
+    portfolio reads never have to write.
+    """
+    from accounts.dashboard_service import invalidate_dashboards
+    from core.quote_service import quote_service
+
+    prices, _ = quote_service.get_price_book()
+    updated = 0
+    for coin, price in prices.items():
+        price = Decimal(price).quantize(Decimal('0.01'))
+        stale = Trade.objects.filter(status='open', asset__in=trade_assets(coin)).exclude(current_price=price)
+        # update() skips signals; the dashboards' open trade values move too
+        invalidate_dashboards(list(stale.values_list('user_id', flat=True).distinct()))
+        updated += stale.update(current_price=price)
+    return updated
+
+
+class InvestmentLedger:
+    """
+    Platform-wide investments for the admin listing, as one SQL UNION over
+    open trades, crypto and real-estate investment transactions and active
+    capital plans. Value and P&L are computed in SQL so filtering, sorting,
+    counting and paging all happen in the database.
+    
+    Every branch selects the same columns, in ``COLUMNS`` order.
+    """
+
+    TYPES = ('crypto', 'capital_plan', 'real_estate')
+    SORT_FIELDS = ('created_at', 'amount', 'current_value', 'profit_loss', 'profit_loss_percentage')
+
+    # Real estate grows 20% per month
+    REAL_ESTATE_MONTHLY_RATE = 0.20
+
+    COLUMNS = (
+        'source', 'row_id', 'row_user_id', 'user_email', 'row_type', 'row_asset',
+        'row_amount', 'row_quantity', 'row_price_at_purchase', 'row_current_price',
+        'row_current_value', 'row_profit_loss', 'row_profit_loss_percentage',
+        'row_status', 'row_created_at', 'row_growth_rate', 'row_period_months',
+        'row_months_elapsed',
+    )
+
+    def __init__(self, price_book=None, now=None):
+        from django.utils import timezone
+        from core.quote_service import quote_service
+
+        self.prices, _ = price_book or quote_service.get_price_book()
+        self.now = now or timezone.now()
+
+    # ------------------------------------------------------------------
+    # Branches
+    # ------------------------------------------------------------------
+
+    def _select(self, queryset, **columns):
+        """Annotate ``columns`` in COLUMNS order and select only those."""
+        assert set(columns) == set(self.COLUMNS)
+        queryset = queryset.order_by()
+        for name in self.COLUMNS:
+            queryset = queryset.annotate(**{name: columns[name]})
+        return queryset.values(*self.COLUMNS)
+
+    def _months_since(self, field):
+        from django.db.models import IntegerField
+        from django.db.models.functions import ExtractMonth, ExtractYear
+
+        return ExpressionWrapper(
+            Value(self.now.year * 12 + self.now.month)
+            - (ExtractYear(field) * 12 + ExtractMonth(field)),
+            output_field=IntegerField(),
+        )
+
+    @staticmethod
+    def _percent(pnl, base, **positive):
+        """``pnl`` as a percentage of ``base``; the float factor avoids
+        integer division on SQLite."""
+        from django.db.models import FloatField
+        from django.db.models.functions import Cast
+
+        return Case(
+            When(**positive, then=Cast(pnl * Value(100.0, output_field=FloatField()) / base, MONEY)),
+            default=Value(Decimal('0'), output_field=MONEY),
+            output_field=MONEY,
+        )
+
+    def _common(self, source, row_type, id_field='id'):
+        from django.db.models import CharField
+        from django.db.models.functions import Cast
+
+        return {
+            'source': Value(source, output_field=CharField()),
+            'row_id': Cast(id_field, CharField()),
+            'row_user_id': F('user_id'),
+            'user_email': F('user__email'),
+            'row_type': Value(row_type, output_field=CharField()),
+            'row_created_at': F('created_at'),
+        }
+
+    def _null(self, field=MONEY):
+        from django.db.models.functions import Cast
+        return Cast(Value(None), field)
+
+    def trades(self):
+        from django.db.models import CharField, IntegerField
+
+        invested = ExpressionWrapper(F('entry_price') * F('quantity'), output_field=MONEY)
+        price = PortfolioValuation.mark_price_expression(self.prices)
+        value = ExpressionWrapper(price * F('quantity'), output_field=MONEY)
+        pnl = ExpressionWrapper(value - invested, output_field=MONEY)
+        return self._select(
+            Trade.objects.filter(status='open'),
+            **self._common('trade', 'crypto'),
+            row_asset=F('asset'),
+            row_amount=invested,
+            row_quantity=ExpressionWrapper(F('quantity') * 1, output_field=MONEY),
+            row_price_at_purchase=ExpressionWrapper(F('entry_price') * 1, output_field=MONEY),
+            row_current_price=ExpressionWrapper(price * 1, output_field=MONEY),
+            row_current_value=value,
+            row_profit_loss=pnl,
+            row_profit_loss_percentage=self._percent(pnl, invested, entry_price__gt=0, quantity__gt=0),
+            row_status=F('status'),
+            row_growth_rate=self._null(),
+            row_period_months=self._null(IntegerField()),
+            row_months_elapsed=self._null(IntegerField()),
+        )
+
+    def crypto_transactions(self):
+        from django.db.models import CharField, IntegerField
+        from django.db.models.fields.json import KeyTextTransform
+        from django.db.models.functions import Cast, NullIf
+        from transactions.models import Transaction
+
+        def meta_decimal(key):
+            return Coalesce(
+                Cast(NullIf(KeyTextTransform(key, 'metadata'), Value('')), MONEY),
+                Value(Decimal('0'), output_field=MONEY),
+            )
+
+        asset = Coalesce(KeyTextTransform('asset', 'metadata'), Value('BTC'), output_field=CharField())
+        quantity = meta_decimal('quantity')
+        bought_at = meta_decimal('price_at_purchase')
+        # Current price from the price book, keyed on the metadata asset
+        if self.prices:
+            price = Case(
+                *[When(metadata__asset=coin, then=Value(p, output_field=MONEY)) for coin, p in self.prices.items()],
+                default=bought_at, output_field=MONEY,
+            )
+        else:
+            price = bought_at
+        value = ExpressionWrapper(quantity * price, output_field=MONEY)
+        pnl = ExpressionWrapper(value - F('amount'), output_field=MONEY)
+        return self._select(
+            Transaction.objects.filter(transaction_type='investment', metadata__investment_type='crypto'),
+            **self._common('transaction', 'crypto'),
+            row_asset=asset,
+            row_amount=ExpressionWrapper(F('amount') * 1, output_field=MONEY),
+            row_quantity=quantity,
+            row_price_at_purchase=bought_at,
+            row_current_price=price,
+            row_current_value=value,
+            row_profit_loss=pnl,
+            row_profit_loss_percentage=self._percent(pnl, F('amount'), amount__gt=0),
+            row_status=Value('active', output_field=CharField()),
+            row_growth_rate=self._null(),
+            row_period_months=self._null(IntegerField()),
+            row_months_elapsed=self._null(IntegerField()),
+        )
+
+    def capital_plans(self):
+        from django.db.models import CharField, FloatField, IntegerField
+        from django.db.models.functions import Cast, Least, Power
+        from .models import CapitalInvestmentPlan
+
+        months = Coalesce(
+            Least(self._months_since('start_date'), F('period_months')),
+            Value(0),
+            output_field=IntegerField(),
+        )
+        # Compound monthly growth: A = P(1 + r)^t
+        rate = F('growth_rate') * Value(0.01, output_field=FloatField()) + Value(1.0, output_field=FloatField())
+        value = Cast(F('initial_amount') * Power(rate, months), MONEY)
+        pnl = ExpressionWrapper(value - F('initial_amount'), output_field=MONEY)
+        return self._select(
+            CapitalInvestmentPlan.objects.filter(status='active'),
+            **self._common('capital_plan', 'capital_plan'),
+            row_asset=F('plan_type'),
+            row_amount=ExpressionWrapper(F('initial_amount') * 1, output_field=MONEY),
+            row_quantity=Value(Decimal('1'), output_field=MONEY),
+            row_price_at_purchase=ExpressionWrapper(F('initial_amount') * 1, output_field=MONEY),
+            row_current_price=value,
+            row_current_value=value,
+            row_profit_loss=pnl,
+            row_profit_loss_percentage=self._percent(pnl, F('initial_amount'), initial_amount__gt=0),
+            row_status=F('status'),
+            row_growth_rate=ExpressionWrapper(F('growth_rate') * 1, output_field=MONEY),
+            row_period_months=F('period_months'),
+            row_months_elapsed=months,
+        )
+
+    def real_estate(self):
+        from django.db.models import CharField, IntegerField
+        from django.db.models import FloatField
+        from django.db.models.fields.json import KeyTextTransform
+        from django.db.models.functions import Cast, Power
+        from transactions.models import Transaction
+
+        months = self._months_since('created_at')
+        rate = Value(self.REAL_ESTATE_MONTHLY_RATE + 1, output_field=FloatField())
+        value = Cast(F('amount') * Power(rate, months), MONEY)
+        pnl = ExpressionWrapper(value - F('amount'), output_field=MONEY)
+        return self._select(
+            Transaction.objects.filter(transaction_type='investment', metadata__investment_type='real_estate'),
+            **self._common('real_estate', 'real_estate'),
+            row_asset=Coalesce(KeyTextTransform('asset', 'metadata'), Value('Real Estate'), output_field=CharField()),
+            row_amount=ExpressionWrapper(F('amount') * 1, output_field=MONEY),
+            row_quantity=Value(Decimal('1'), output_field=MONEY),
+            row_price_at_purchase=ExpressionWrapper(F('amount') * 1, output_field=MONEY),
+            row_current_price=value,
+            row_current_value=value,
+            row_profit_loss=pnl,
+            row_profit_loss_percentage=self._percent(pnl, F('amount'), amount__gt=0),
+            row_status=Value('active', output_field=CharField()),
+            row_growth_rate=self._null(),
+            row_period_months=self._null(IntegerField()),
+            row_months_elapsed=months,
+        )
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def branches(self, types=None, search=None, user_id=None, asset=None,
+                 created_from=None, created_to=None):
+        """Filtered branch querysets (filters can't be applied after a UNION)."""
+        types = set(types or self.TYPES)
+        branches = []
+        if 'crypto' in types:
+            branches += [self.trades(), self.crypto_transactions()]
+        if 'capital_plan' in types:
+            branches.append(self.capital_plans())
+        if 'real_estate' in types:
+            branches.append(self.real_estate())
+
+        filtered = []
+        for qs in branches:
+            if search:
+                qs = qs.filter(user_email__icontains=search)
+            if user_id:
+                qs = qs.filter(row_user_id=user_id)
+            if asset:
+                qs = qs.filter(row_asset__iexact=asset)
+            if created_from:
+                qs = qs.filter(row_created_at__gte=created_from)
+            if created_to:
+                qs = qs.filter(row_created_at__lte=created_to)
+            filtered.append(qs)
+        return filtered
+
+    @staticmethod
+    def union(branches):
+        if not branches:
+            return None
+        first, rest = branches[0], branches[1:]
+        return first.union(*rest, all=True) if rest else first
+
+    @staticmethod
+    def summarize(branches):
+        """Counts and totals per type, one aggregate query per branch."""
+        from django.db.models import Count, Sum
+
+        summary = {
+            'crypto_count': 0, 'capital_plans_count': 0, 'real_estate_count': 0,
+            'total_invested': Decimal('0'), 'total_current_value': Decimal('0'),
+            'total_profit_loss': Decimal('0'),
+        }
+        count_keys = {'crypto': 'crypto_count', 'capital_plan': 'capital_plans_count',
+                      'real_estate': 'real_estate_count'}
+        for qs in branches:
+            row_type = qs.query.annotations['row_type'].value
+            totals = qs.aggregate(
+                n=Count('pk'),
+                invested=Sum('row_amount'),
+                value=Sum('row_current_value'),
+                pnl=Sum('row_profit_loss'),
+            )
+            summary[count_keys[row_type]] += totals['n']
+            summary['total_invested'] += Decimal(totals['invested'] or 0)
+            summary['total_current_value'] += Decimal(totals['value'] or 0)
+            summary['total_profit_loss'] += Decimal(totals['pnl'] or 0)
+        return summary
@@ -4,7 +4,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from datetime import timedelta
+from decimal import Decimal
 from .models import Trade, TradeHistory, CapitalInvestmentPlan
+from .admin_models import CRYPTO_PRICES_TAG
+from core.conditional import conditional
+from core.money import money, rounded
 from .serializers import (
     TradeSerializer, CreateTradeSerializer, CloseTradeSerializer, TradeHistorySerializer,
     CapitalInvestmentPlanSerializer, CreateCapitalInvestmentPlanSerializer,
@@ -180,38 +184,20 @@ class TradeViewSet(viewsets.ModelViewSet):
         exit_price = serializer.validated_data['exit_price']
         close_reason = serializer.validated_data['close_reason']
         
-        # Calculate P&L
-        pnl, pnl_percentage = trade.calculate_pnl(exit_price)
-        
-        # Update trade
-        trade.exit_price = exit_price
-        trade.current_price = exit_price
-        trade.profit_loss = pnl
-        trade.profit_loss_percentage = pnl_percentage
-        trade.status = 'closed'
-        trade.closed_at = timezone.now()
-        trade.save()
-        
-        # Create history record
-        TradeHistory.objects.create(
-            user=request.user,
-            asset=trade.asset,
-            trade_type=trade.trade_type,
-            entry_price=trade.entry_price,
-            exit_price=exit_price,
-            quantity=trade.quantity,
-            profit_loss=pnl,
-            profit_loss_percentage=pnl_percentage,
-            close_reason=close_reason,
-            opened_at=trade.created_at
-        )
+        trade.close(exit_price, status='closed', close_reason=close_reason)
         
         serializer = TradeSerializer(trade)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
     def update_price(self, request, pk=None):
-        """Update current price and check stop loss/take profit"""
+        """
+        Update current price and check stop loss/take profit
+        
+        Triggers also fire server-side on every quote refresh (see
+        trigger_engine); this keeps the client-driven check for assets we
+        have no server price for.
+        """
         trade = self.get_object()
         
         if trade.status != 'open':
@@ -227,148 +213,25 @@ class TradeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        current_price = float(current_price)
+        current_price = Decimal(str(current_price))
         
         # Check expiry
         if trade.check_expiry():
-            trade.exit_price = current_price
-            trade.current_price = current_price
-            pnl, pnl_percentage = trade.calculate_pnl(current_price)
-            trade.profit_loss = pnl
-            trade.profit_loss_percentage = pnl_percentage
-            trade.status = 'expired'
-            trade.closed_at = timezone.now()
-            trade.save()
-            
-            TradeHistory.objects.create(
-                user=request.user,
-                asset=trade.asset,
-                trade_type=trade.trade_type,
-                entry_price=trade.entry_price,
-                exit_price=current_price,
-                quantity=trade.quantity,
-                profit_loss=pnl,
-                profit_loss_percentage=pnl_percentage,
-                close_reason='expired',
-                opened_at=trade.created_at
-            )
-            
-            serializer = TradeSerializer(trade)
-            return Response(serializer.data)
-        
-        # Check stop loss
-        if trade.stop_loss:
-            if trade.trade_type == 'buy' and current_price <= trade.stop_loss:
-                trade.exit_price = trade.stop_loss
-                trade.current_price = trade.stop_loss
-                pnl, pnl_percentage = trade.calculate_pnl(trade.stop_loss)
-                trade.profit_loss = pnl
-                trade.profit_loss_percentage = pnl_percentage
-                trade.status = 'stop_loss_hit'
-                trade.closed_at = timezone.now()
-                trade.save()
-                
-                TradeHistory.objects.create(
-                    user=request.user,
-                    asset=trade.asset,
-                    trade_type=trade.trade_type,
-                    entry_price=trade.entry_price,
-                    exit_price=trade.stop_loss,
-                    quantity=trade.quantity,
-                    profit_loss=pnl,
-                    profit_loss_percentage=pnl_percentage,
-                    close_reason='stop_loss',
-                    opened_at=trade.created_at
-                )
-                
-                serializer = TradeSerializer(trade)
-                return Response(serializer.data)
-            
-            elif trade.trade_type == 'sell' and current_price >= trade.stop_loss:
-                trade.exit_price = trade.stop_loss
-                trade.current_price = trade.stop_loss
-                pnl, pnl_percentage = trade.calculate_pnl(trade.stop_loss)
-                trade.profit_loss = pnl
-                trade.profit_loss_percentage = pnl_percentage
-                trade.status = 'stop_loss_hit'
-                trade.closed_at = timezone.now()
-                trade.save()
-                
-                TradeHistory.objects.create(
-                    user=request.user,
-                    asset=trade.asset,
-                    trade_type=trade.trade_type,
-                    entry_price=trade.entry_price,
-                    exit_price=trade.stop_loss,
-                    quantity=trade.quantity,
-                    profit_loss=pnl,
-                    profit_loss_percentage=pnl_percentage,
-                    close_reason='stop_loss',
-                    opened_at=trade.created_at
-                )
-                
-                serializer = TradeSerializer(trade)
-                return Response(serializer.data)
-        
-        # Check take profit
-        if trade.take_profit:
-            if trade.trade_type == 'buy' and current_price >= trade.take_profit:
-                trade.exit_price = trade.take_profit
-                trade.current_price = trade.take_profit
-                pnl, pnl_percentage = trade.calculate_pnl(trade.take_profit)
-                trade.profit_loss = pnl
-                trade.profit_loss_percentage = pnl_percentage
-                trade.status = 'take_profit_hit'
-                trade.closed_at = timezone.now()
-                trade.save()
-                
-                TradeHistory.objects.create(
-                    user=request.user,
-                    asset=trade.asset,
-                    trade_type=trade.trade_type,
-                    entry_price=trade.entry_price,
-                    exit_price=trade.take_profit,
-                    quantity=trade.quantity,
-                    profit_loss=pnl,
-                    profit_loss_percentage=pnl_percentage,
-                    close_reason='take_profit',
-                    opened_at=trade.created_at
-                )
-                
-                serializer = TradeSerializer(trade)
-                return Response(serializer.data)
-            
-            elif trade.trade_type == 'sell' and current_price <= trade.take_profit:
-                trade.exit_price = trade.take_profit
-                trade.current_price = trade.take_profit
-                pnl, pnl_percentage = trade.calculate_pnl(trade.take_profit)
-                trade.profit_loss = pnl
-                trade.profit_loss_percentage = pnl_percentage
-                trade.status = 'take_profit_hit'
-                trade.closed_at = timezone.now()
-                trade.save()
-                
-                TradeHistory.objects.create(
-                    user=request.user,
-                    asset=trade.asset,
-                    trade_type=trade.trade_type,
-                    entry_price=trade.entry_price,
-                    exit_price=trade.take_profit,
-                    quantity=trade.quantity,
-                    profit_loss=pnl,
-                    profit_loss_percentage=pnl_percentage,
-                    close_reason='take_profit',
-                    opened_at=trade.created_at
-                )
-                
-                serializer = TradeSerializer(trade)
-                return Response(serializer.data)
+            trade.close(current_price, status='expired', close_reason='expired')
+            return Response(TradeSerializer(trade).data)
+        
+        # Check stop loss / take profit
+        trigger = trade.trigger_for(current_price)
+        if trigger:
+            trade_status, close_reason, exit_price = trigger
+            trade.close(exit_price, status=trade_status, close_reason=close_reason)
+            return Response(TradeSerializer(trade).data)
         
         # Just update current price
         trade.current_price = current_price
         pnl, pnl_percentage = trade.calculate_pnl(current_price)
-        trade.profit_loss = pnl
-        trade.profit_loss_percentage = pnl_percentage
+        trade.profit_loss = Decimal(pnl).quantize(Decimal('0.01'))
+        trade.profit_loss_percentage = Decimal(pnl_percentage).quantize(Decimal('0.01'))
         trade.save()
         
         serializer = TradeSerializer(trade)
@@ -493,24 +356,24 @@ def crypto_buy(request):
                 'type': 'crypto',
                 'coin': coin,
                 'name': admin_price.name if admin_price.name else coin,
-                'amount': f"{amount:.2f}",
+                'amount': money(amount),
                 'quantity': f"{quantity:.8f}",
-                'price_at_purchase': f"{price:.2f}",
+                'price_at_purchase': money(price),
                 'status': 'active',
                 'date': crypto_investment.created_at.isoformat()
             },
             'transaction': {
                 'id': str(crypto_investment.id),
                 'type': 'Crypto Purchase',
-                'amount': f"{amount:.2f}",
+                'amount': money(amount),
                 'asset': coin,
                 'asset_name': admin_price.name if admin_price.name else coin,
                 'quantity': f"{quantity:.8f}",
-                'price': f"{price:.2f}",
+                'price': money(price),
                 'status': 'completed',
                 'date': crypto_investment.created_at.isoformat()
             },
-            'new_balance': f"{request.user.balance:.2f}",
+            'new_balance': money(request.user.balance),
             'message': 'Crypto purchase successful'
         },
         'success': True
@@ -638,39 +501,51 @@ def crypto_sell(request):
             'transaction': {
                 'id': str(crypto_investment.id),
                 'type': 'Crypto Sale',
-                'amount': f"{amount:.2f}",
+                'amount': money(amount),
                 'asset': coin,
                 'quantity': f"{quantity:.8f}",
-                'price': f"{price:.2f}",
+                'price': money(price),
                 'status': 'completed',
                 'date': timezone.now().isoformat()
             },
-            'new_balance': f"{request.user.balance:.2f}",
+            'new_balance': money(request.user.balance),
             'updated_investment': {
                 'id': str(crypto_investment.id),
                 'quantity': f"{crypto_investment.quantity:.8f}",
-                'amount': f"{(crypto_investment.entry_price * crypto_investment.quantity):.2f}"
+                'amount': money(crypto_investment.entry_price * crypto_investment.quantity)
             } if crypto_investment.status == 'open' else None,
-            'profit_loss': f"{profit_loss:.2f}",
+            'profit_loss': money(profit_loss),
             'message': 'Crypto sale successful'
         },
         'success': True
     }, status=status.HTTP_200_OK)
 
 
+# Market coins shown on the price board alongside admin-controlled coins
+MARKET_BOARD_COINS = ['BTC', 'ETH', 'BNB', 'ADA', 'SOL', 'DOT', 'USDT']
+
+def _market_snapshot_state(request):
+    """What the price board shows from the quote snapshot changes only with these."""
+    from core.quote_service import quote_service
+    snapshot = quote_service.get_snapshot()
+    return snapshot.fetched_at, snapshot.is_stale
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(tags=[CRYPTO_PRICES_TAG], extra=_market_snapshot_state, per_user=False)
 def crypto_prices(request):
     """
-    Get crypto prices - Admin-controlled coins from DB, others from CoinGecko API
+    Get crypto prices - Admin-controlled coins from DB, others from the quote service
     
     Admin-controlled: EXACOIN, OPTCOIN (stored in database)
-    Market-based: BTC, ETH, BNB, ADA, SOL, DOT, USDT (real-time from CoinGecko API)
+    Market-based: BTC, ETH, BNB, ADA, SOL, DOT, USDT (CoinGecko snapshot)
     
-    All prices formatted with 2 decimals, all percentages with decimals
+    All prices formatted with 2 decimals, all percentages with decimals.
+    ``meta`` reports when the market snapshot was taken and whether it is stale.
     """
     from .admin_models import AdminCryptoPrice
-    import requests
+    from core.quote_service import quote_service
     
     prices = {}
     
@@ -679,10 +554,10 @@ def crypto_prices(request):
         admin_coins = AdminCryptoPrice.objects.filter(is_active=True)
         for coin in admin_coins:
             prices[coin.coin] = {
-                'price': float(f"{coin.buy_price:.2f}"),
-                'change24h': float(f"{coin.change_24h:.2f}"),
-                'change7d': float(f"{coin.change_7d:.2f}"),
-                'change30d': float(f"{coin.change_30d:.2f}")
+                'price': rounded(coin.buy_price),
+                'change24h': rounded(coin.change_24h),
+                'change7d': rounded(coin.change_7d),
+                'change30d': rounded(coin.change_30d)
             }
     except Exception as e:
         print(f"⚠️ Error fetching admin coins: {e}")
@@ -703,138 +578,59 @@ def crypto_prices(request):
         }
         prices.update(admin_defaults)
     
-    # 2. Fetch market-based coins from CoinGecko API (real-time market prices)
-    try:
-        coingecko_url = "https://api.coingecko.com/api/v3/simple/price"
-        params = {
-            'ids': 'bitcoin,ethereum,binancecoin,cardano,solana,polkadot,tether',
-            'vs_currencies': 'usd',
-            'include_24hr_change': 'true',
-            'include_7d_change': 'true',
-            'include_30d_change': 'true'
-        }
-        
-        response = requests.get(coingecko_url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Map CoinGecko IDs to our symbols
-            coin_mapping = {
-                'bitcoin': 'BTC',
-                'ethereum': 'ETH',
-                'binancecoin': 'BNB',
-                'cardano': 'ADA',
-                'solana': 'SOL',
-                'polkadot': 'DOT',
-                'tether': 'USDT'
+    # 2. Market-based coins from the shared quote snapshot (refreshed in
+    #    the background, never fetched inside the request)
+    snapshot = quote_service.get_snapshot()
+    for symbol in MARKET_BOARD_COINS:
+        quote = snapshot.get(symbol)
+        if quote:
+            prices[symbol] = {
+                'price': rounded(quote['price']),
+                'change24h': rounded(quote['change_24h']),
+                'change7d': rounded(quote['change_7d']),
+                'change30d': rounded(quote['change_30d'])
             }
-            
-            for gecko_id, symbol in coin_mapping.items():
-                if gecko_id in data:
-                    coin_data = data[gecko_id]
-                    prices[symbol] = {
-                        'price': float(f"{coin_data.get('usd', 0):.2f}"),
-                        'change24h': float(f"{coin_data.get('usd_24h_change', 0):.2f}"),
-                        'change7d': float(f"{coin_data.get('usd_7d_change', 0):.2f}"),
-                        'change30d': float(f"{coin_data.get('usd_30d_change', 0):.2f}")
-                    }
-        else:
-            print(f"CoinGecko API returned status {response.status_code}")
-            raise Exception("CoinGecko API failed")
-            
-    except Exception as e:
-        print(f"⚠️ CoinGecko API error: {e}")
-        print("📊 Using fallback prices for market-based coins")
-        
-        # Fallback: Use static prices if API fails (only as backup)
-        fallback_prices = {
-            'BTC': {'price': 64444.00, 'change24h': 2.10, 'change7d': -1.50, 'change30d': 8.70},
-            'ETH': {'price': 3200.00, 'change24h': 1.80, 'change7d': 3.20, 'change30d': 15.40},
-            'BNB': {'price': 420.00, 'change24h': 0.50, 'change7d': 2.10, 'change30d': 10.20},
-            'ADA': {'price': 1.25, 'change24h': -0.80, 'change7d': 1.50, 'change30d': 5.30},
-            'SOL': {'price': 120.00, 'change24h': 3.20, 'change7d': 5.80, 'change30d': 20.10},
-            'DOT': {'price': 6.40, 'change24h': -1.20, 'change7d': 0.50, 'change30d': 3.80},
-            'USDT': {'price': 1.00, 'change24h': 0.01, 'change7d': 0.02, 'change30d': 0.05}
-        }
-        
-        for symbol, data in fallback_prices.items():
-            if symbol not in prices:  # Don't override admin-controlled prices
-                prices[symbol] = data
+    
+    # Fallback: static prices for anything the snapshot doesn't have yet
+    # (cold cache after a deploy), without overriding admin-controlled prices
+    fallback_prices = {
+        'BTC': {'price': 64444.00, 'change24h': 2.10, 'change7d': -1.50, 'change30d': 8.70},
+        'ETH': {'price': 3200.00, 'change24h': 1.80, 'change7d': 3.20, 'change30d': 15.40},
+        'BNB': {'price': 420.00, 'change24h': 0.50, 'change7d': 2.10, 'change30d': 10.20},
+        'ADA': {'price': 1.25, 'change24h': -0.80, 'change7d': 1.50, 'change30d': 5.30},
+        'SOL': {'price': 120.00, 'change24h': 3.20, 'change7d': 5.80, 'change30d': 20.10},
+        'DOT': {'price': 6.40, 'change24h': -1.20, 'change7d': 0.50, 'change30d': 3.80},
+        'USDT': {'price': 1.00, 'change24h': 0.01, 'change7d': 0.02, 'change30d': 0.05}
+    }
+    for symbol, data in fallback_prices.items():
+        if symbol not in prices:
+            prices[symbol] = data
     
     return Response({
         'data': prices,
+        'meta': snapshot.meta(),
         'success': True
     }, status=status.HTTP_200_OK)
 
 
-def _fetch_live_prices(coins):
-    """
-    Fetch live market prices and full names for a set of coin symbols.
-    - Admin-controlled coins (EXACOIN, OPTCOIN, etc.) come from AdminCryptoPrice DB.
-    - Standard market coins come from CoinGecko API.
-    Returns:
-        prices: { 'BTC': Decimal('64000.00'), 'EXACOIN': Decimal('62.00'), ... }
-        names:  { 'BTC': 'Bitcoin', 'EXACOIN': 'Exacoin', ... }
-    """
-    from .admin_models import AdminCryptoPrice
-    import requests
-
-    # CoinGecko symbol -> (id, full name) for known market coins
-    COINGECKO_MAP = {
-        'BTC':   ('bitcoin',       'Bitcoin'),
-        'ETH':   ('ethereum',      'Ethereum'),
-        'BNB':   ('binancecoin',   'BNB'),
-        'ADA':   ('cardano',       'Cardano'),
-        'SOL':   ('solana',        'Solana'),
-        'DOT':   ('polkadot',      'Polkadot'),
-        'USDT':  ('tether',        'Tether'),
-        'XRP':   ('ripple',        'XRP'),
-        'DOGE':  ('dogecoin',      'Dogecoin'),
-        'MATIC': ('matic-network', 'Polygon'),
-        'LTC':   ('litecoin',      'Litecoin'),
-        'AVAX':  ('avalanche-2',   'Avalanche'),
-        'LINK':  ('chainlink',     'Chainlink'),
-        'UNI':   ('uniswap',       'Uniswap'),
-        'ATOM':  ('cosmos',        'Cosmos'),
+def _crypto_position_row(position):
+    """API representation of a PortfolioValuation position."""
+    return {
+        'id': str(position['trade'].id),
+        'type': 'crypto',
+        'coin': position['coin'],
+        'name': position['name'],
+        'amount': money(position['invested']),
+        'quantity': f"{position['quantity']:.8f}",
+        'price_at_purchase': money(position['entry_price']),
+        'current_price': money(position['current_price']),
+        'current_value': money(position['current_value']),
+        'profit_loss': money(position['profit_loss']),
+        'profit_loss_percentage': rounded(position['profit_loss_percentage']),
+        'status': 'active',
+        'date': position['trade'].created_at.isoformat()
     }
 
-    live_prices = {}
-    coin_names = {}
-
-    # 1. Admin-controlled coins from DB — use their stored name field
-    admin_coins = AdminCryptoPrice.objects.filter(is_active=True)
-    admin_symbols = set()
-    for coin in admin_coins:
-        live_prices[coin.coin] = coin.buy_price
-        coin_names[coin.coin] = coin.name if coin.name else coin.coin
-        admin_symbols.add(coin.coin)
-
-    # 2. Market coins via CoinGecko — names come from our mapping
-    market_coins = [c for c in coins if c not in admin_symbols and c in COINGECKO_MAP]
-    if market_coins:
-        gecko_ids = [COINGECKO_MAP[c][0] for c in market_coins]
-        # Pre-populate names from our mapping (no extra API call needed)
-        for c in market_coins:
-            coin_names[c] = COINGECKO_MAP[c][1]
-        try:
-            response = requests.get(
-                "https://api.coingecko.com/api/v3/simple/price",
-                params={'ids': ','.join(gecko_ids), 'vs_currencies': 'usd'},
-                timeout=10
-            )
-            if response.status_code == 200:
-                data = response.json()
-                reverse_map = {COINGECKO_MAP[c][0]: c for c in market_coins}
-                for gecko_id, price_data in data.items():
-                    symbol = reverse_map.get(gecko_id)
-                    if symbol:
-                        live_prices[symbol] = Decimal(str(price_data.get('usd', 0)))
-        except Exception as e:
-            print(f"⚠️ CoinGecko price fetch error: {e}")
-
-    return live_prices, coin_names
-
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -842,88 +638,23 @@ def user_crypto_portfolio(request):
     """
     Get user's crypto portfolio with live market prices.
     - EXACOIN, OPTCOIN and other admin-controlled coins use AdminCryptoPrice (buy_price).
-    - BTC, ETH, BNB, SOL, etc. use real-time CoinGecko prices.
+    - BTC, ETH, BNB, SOL, etc. use the CoinGecko quote snapshot.
+    Read-only: stored current_price is refreshed by a periodic job, not here.
     """
-    crypto_investments = Trade.objects.filter(
-        user=request.user,
-        status='open'
-    ).exclude(asset__in=['gold'])
-
-    if not crypto_investments.exists():
-        return Response({
-            'data': {
-                'investments': [],
-                'summary': {
-                    'total_invested': '0.00',
-                    'total_value': '0.00',
-                    'total_profit_loss': '0.00',
-                    'total_profit_loss_percentage': 0.0,
-                    'investment_count': 0
-                }
-            },
-            'success': True
-        }, status=status.HTTP_200_OK)
-
-    # Collect all unique coin symbols held by the user
-    held_coins = set(inv.asset for inv in crypto_investments)
-
-    # Fetch live prices for all held coins in one shot
-    live_prices, coin_names = _fetch_live_prices(held_coins)
-
-    portfolio = []
-    total_value = Decimal('0')
-    total_invested = Decimal('0')
-
-    for investment in crypto_investments:
-        coin = investment.asset
-        invested_amount = investment.entry_price * investment.quantity
+    from .valuation_service import PortfolioValuation
 
-        # Use live price; fall back to stored current_price, then entry_price
-        current_price = live_prices.get(coin) or investment.current_price or investment.entry_price
-
-        # Keep the stored current_price in sync
-        if live_prices.get(coin) and live_prices[coin] != investment.current_price:
-            investment.current_price = live_prices[coin]
-            investment.save(update_fields=['current_price'])
-
-        current_value = investment.quantity * current_price
-        profit_loss = current_value - invested_amount
-        profit_loss_percentage = (profit_loss / invested_amount) * 100 if invested_amount > 0 else Decimal('0')
-
-        # Full coin name: from our lookup, fallback to the symbol itself
-        full_name = coin_names.get(coin, coin)
-
-        portfolio.append({
-            'id': str(investment.id),
-            'type': 'crypto',
-            'coin': coin,
-            'name': full_name,
-            'amount': f"{invested_amount:.2f}",
-            'quantity': f"{investment.quantity:.8f}",
-            'price_at_purchase': f"{investment.entry_price:.2f}",
-            'current_price': f"{current_price:.2f}",
-            'current_value': f"{current_value:.2f}",
-            'profit_loss': f"{profit_loss:.2f}",
-            'profit_loss_percentage': float(f"{profit_loss_percentage:.2f}"),
-            'status': 'active',
-            'date': investment.created_at.isoformat()
-        })
-
-        total_value += current_value
-        total_invested += invested_amount
-
-    total_profit_loss = total_value - total_invested
-    total_profit_loss_percentage = (total_profit_loss / total_invested) * 100 if total_invested > 0 else Decimal('0')
+    positions = PortfolioValuation.crypto_positions(request.user)
+    summary = PortfolioValuation.summarize(positions)
 
     return Response({
         'data': {
-            'investments': portfolio,
+            'investments': [_crypto_position_row(p) for p in positions],
             'summary': {
-                'total_invested': f"{total_invested:.2f}",
-                'total_value': f"{total_value:.2f}",
-                'total_profit_loss': f"{total_profit_loss:.2f}",
-                'total_profit_loss_percentage': float(f"{total_profit_loss_percentage:.2f}"),
-                'investment_count': len(portfolio)
+                'total_invested': money(summary['invested']),
+                'total_value': money(summary['value']),
+                'total_profit_loss': money(summary['profit_loss']),
+                'total_profit_loss_percentage': rounded(summary['profit_loss_percentage']),
+                'investment_count': summary['count']
             }
         },
         'success': True
@@ -936,40 +667,16 @@ def user_all_investments(request):
     """
     Get all user investments (crypto, capital plans, etc.) in one unified response
     """
+    from .valuation_service import PortfolioValuation
+
     user = request.user
     all_investments = []
     
     # 1. Crypto Investments (from Trade model)
-    crypto_trades = Trade.objects.filter(user=user, status='open').exclude(asset__in=['gold'])
-    
-    # Get live prices for crypto
-    if crypto_trades.exists():
-        held_coins = set(trade.asset for trade in crypto_trades)
-        live_prices, coin_names = _fetch_live_prices(held_coins)
-        
-        for trade in crypto_trades:
-            coin = trade.asset
-            invested_amount = trade.entry_price * trade.quantity
-            current_price = live_prices.get(coin) or trade.current_price or trade.entry_price
-            current_value = trade.quantity * current_price
-            profit_loss = current_value - invested_amount
-            profit_loss_percentage = (profit_loss / invested_amount) * 100 if invested_amount > 0 else Decimal('0')
-            
-            all_investments.append({
-                'id': str(trade.id),
-                'type': 'crypto',
-                'name': coin_names.get(coin, coin),
-                'asset': coin,
-                'amount': f"{invested_amount:.2f}",
-                'quantity': f"{trade.quantity:.8f}",
-                'price_at_purchase': f"{trade.entry_price:.2f}",
-                'current_price': f"{current_price:.2f}",
-                'current_value': f"{current_value:.2f}",
-                'profit_loss': f"{profit_loss:.2f}",
-                'profit_loss_percentage': float(f"{profit_loss_percentage:.2f}"),
-                'status': 'active',
-                'date': trade.created_at.isoformat()
-            })
+    for position in PortfolioValuation.crypto_positions(user):
+        row = _crypto_position_row(position)
+        row['asset'] = row.pop('coin')
+        all_investments.append(row)
     
     # 2. Capital Investment Plans
     capital_plans = CapitalInvestmentPlan.objects.filter(user=user, status='active')
@@ -979,13 +686,13 @@ def user_all_investments(request):
             'type': 'capital_plan',
             'name': f'{plan.plan_type.title()} Plan',
             'asset': plan.plan_type,
-            'amount': f"{plan.initial_amount:.2f}",
+            'amount': money(plan.initial_amount),
             'quantity': '1',
-            'price_at_purchase': f"{plan.initial_amount:.2f}",
-            'current_price': f"{plan.total_return:.2f}",
-            'current_value': f"{plan.total_return:.2f}",
-            'profit_loss': f"{plan.total_return - plan.initial_amount:.2f}",
-            'profit_loss_percentage': float(f"{plan.growth_rate:.2f}"),
+            'price_at_purchase': money(plan.initial_amount),
+            'current_price': money(plan.total_return),
+            'current_value': money(plan.total_return),
+            'profit_loss': money(plan.total_return - plan.initial_amount),
+            'profit_loss_percentage': rounded(plan.growth_rate),
             'status': 'active',
             'date': plan.created_at.isoformat(),
             'period_months': plan.period_months,
@@ -1002,10 +709,10 @@ def user_all_investments(request):
         'data': {
             'investments': all_investments,
             'summary': {
-                'total_invested': f"{total_invested:.2f}",
-                'total_value': f"{total_value:.2f}",
-                'total_profit_loss': f"{total_profit_loss:.2f}",
-                'total_profit_loss_percentage': float(f"{total_profit_loss_percentage:.2f}"),
+                'total_invested': money(total_invested),
+                'total_value': money(total_value),
+                'total_profit_loss': money(total_profit_loss),
+                'total_profit_loss_percentage': rounded(total_profit_loss_percentage),
                 'investment_count': len(all_investments),
                 'crypto_count': len([inv for inv in all_investments if inv['type'] == 'crypto']),
                 'capital_plan_count': len([inv for inv in all_investments if inv['type'] == 'capital_plan'])
@@ -0,0 +1,121 @@
+"""
+WebSocket consumer for real-time notifications.
+"""
+import json
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from . import realtime
+
+
+class NotificationConsumer(AsyncWebsocketConsumer):
+    """
+    Pushes new notifications and unread-count changes to the user.
+    
+    Connect with ``ws/notifications/?token=<access token>``.
+    
+    Message format to client:
+        {"type": "connection", "unread_count": 3}
+        {"type": "notification", "notification": {...}, "unread_count": 4}
+        {"type": "unread_count", "unread_count": 0}
+    
+    ``unread_count`` is omitted on broadcast notifications; clients
+    increment their badge instead.
+    
+    Message format from client:
+        {"action": "ping"}
+        {"action": "mark_read", "notification_id": 12}
+        {"action": "get_unread_count"}
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = None
+        self.groups_joined = []
+    
+    async def connect(self):
+        """Handle WebSocket connection"""
+        self.user = self.scope.get('user')
+        
+        if not self.user or not self.user.is_authenticated:
+            await self.close()
+            return
+        
+        self.groups_joined = [
+            realtime.user_group(self.user.id),
+            realtime.audience_group('all'),
+        ]
+        if self.user.is_verified:
+            self.groups_joined.append(realtime.audience_group('verified_users'))
+        
+        for group in self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
+        
+        await self.accept()
+        
+        await self.send(text_data=json.dumps({
+            'type': 'connection',
+            'status': 'connected',
+            'unread_count': await self.get_unread_count(),
+        }))
+    
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection"""
+        for group in self.groups_joined:
+            await self.channel_layer.group_discard(group, self.channel_name)
+    
+    async def receive(self, text_data):
+        """Handle incoming messages"""
+        try:
+            data = json.loads(text_data)
+            action = data.get('action')
+            
+            if action == 'ping':
+                await self.send(text_data=json.dumps({'type': 'pong'}))
+            elif action == 'mark_read':
+                await self.mark_read(data.get('notification_id'))
+                await self.send_unread_count()
+            elif action == 'get_unread_count':
+                await self.send_unread_count()
+        
+        except Exception as e:
+            await self.send(text_data=json.dumps({
+                'type': 'error',
+                'message': str(e)
+            }))
+    
+    async def send_unread_count(self):
+        await self.send(text_data=json.dumps({
+            'type': 'unread_count',
+            'unread_count': await self.get_unread_count(),
+        }))
+    
+    @database_sync_to_async
+    def get_unread_count(self):
+        return realtime.get_unread_count(self.user)
+    
+    @database_sync_to_async
+    def mark_read(self, notification_id):
+        from .models import Notification
+        
+        notification = Notification.objects.for_user(self.user).filter(id=notification_id).first()
+        if notification:
+            notification.mark_read_for(self.user)
+    
+    # Handlers for group messages sent by notifications.realtime
+    
+    async def notification_created(self, event):
+        message = {
+            'type': 'notification',
+            'notification': event['notification'],
+        }
+        if 'unread_count' in event:
+            message['unread_count'] = event['unread_count']
+        await self.send(text_data=json.dumps(message))
+    
+    async def notification_unread(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'unread_count',
+            'unread_count': event['unread_count'],
+        }))
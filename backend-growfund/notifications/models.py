@@ -1,11 +1,56 @@
 from django.db import models
+from django.db.models import Q, F, Exists, OuterRef, Case, When
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
+class NotificationQuerySet(models.QuerySet):
+    
+    def for_user(self, user):
+        """
+        Personal notifications plus the broadcasts the user is in the
+        audience for, in one query.
+        
+        Broadcast read/dismiss state lives in NotificationReceipt rows that
+        only exist once the user has acted on a broadcast. Each row is
+        annotated with ``is_read``; dismissed broadcasts are excluded.
+        """
+        audiences = ['all']
+        if user.is_verified:
+            audiences.append('verified_users')
+        
+        receipts = NotificationReceipt.objects.filter(notification=OuterRef('pk'), user=user)
+        
+        return self.filter(
+            Q(user=user) |
+            # Broadcasts sent after the user joined, like the old fan-out
+            Q(user__isnull=True, audience__in=audiences, created_at__gte=user.created_at)
+        ).annotate(
+            receipt_read=Exists(receipts.filter(read=True)),
+            receipt_dismissed=Exists(receipts.filter(dismissed=True)),
+        ).filter(
+            receipt_dismissed=False
+        ).annotate(
+            is_read=Case(
+                When(user__isnull=True, then=F('receipt_read')),
+                default=F('read'),
+                output_field=models.BooleanField(),
+            )
+        )
+    
+    def unread_count_for(self, user):
+        return self.for_user(user).filter(is_read=False).count()
+
+
 class Notification(models.Model):
-    """User notifications model"""
+    """
+    User notifications model.
+    
+    A row with a user is a personal notification. A row without one is a
+    broadcast to every user in ``audience``; it is stored once and merged
+    into each user's list on read (see NotificationQuerySet.for_user).
+    """
     
     NOTIFICATION_TYPES = [
         ('info', 'Info'),
@@ -14,23 +59,39 @@ class Notification(models.Model):
         ('error', 'Error'),
     ]
     
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    AUDIENCE_CHOICES = [
+        ('', 'Personal'),
+        ('all', 'All Users'),
+        ('verified_users', 'Verified Users'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications', null=True, blank=True)
+    audience = models.CharField(max_length=20, choices=AUDIENCE_CHOICES, blank=True, default='')
     title = models.CharField(max_length=200)
     message = models.TextField()
     type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES, default='info')
     read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = NotificationQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['user', 'read']),
+            models.Index(fields=['audience', '-created_at']),
         ]
     
     def __str__(self):
+        if self.is_broadcast:
+            return f"[{self.audience}] {self.title}"
         return f"{self.user.email} - {self.title}"
     
+    @property
+    def is_broadcast(self):
+        return self.user_id is None
+    
     @classmethod
     def create_notification(cls, user, title, message, notification_type='info'):
         """Helper method to create notifications"""
@@ -40,6 +101,62 @@ class Notification(models.Model):
             message=message,
             type=notification_type
         )
+    
+    @classmethod
+    def create_broadcast(cls, audience, title, message, notification_type='info'):
+        """Create one notification row shown to every user in the audience"""
+        return cls.objects.create(
+            audience=audience,
+            title=title,
+            message=message,
+            type=notification_type
+        )
+    
+    def mark_read_for(self, user):
+        """Mark this notification read for ``user`` (personal or broadcast)"""
+        from .realtime import adjust_unread_count
+        
+        if not self.is_broadcast:
+            if not self.read:
+                self.read = True
+                self.save(update_fields=['read'])
+                adjust_unread_count(user.id, -1)
+            return
+        receipt, _ = NotificationReceipt.objects.get_or_create(notification=self, user=user)
+        if not receipt.read:
+            receipt.read = True
+            receipt.save(update_fields=['read', 'updated_at'])
+            adjust_unread_count(user.id, -1)
+    
+    def dismiss_for(self, user):
+        """Remove this notification from ``user``'s list"""
+        from .realtime import invalidate_unread_count
+        
+        if not self.is_broadcast:
+            # post_delete keeps the unread counter in step
+            self.delete()
+            return
+        NotificationReceipt.objects.update_or_create(
+            notification=self, user=user, defaults={'dismissed': True}
+        )
+        invalidate_unread_count(user.id)
+
+
+class NotificationReceipt(models.Model):
+    """Per-user read/dismiss marker for a broadcast, created on first action"""
+    
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='receipts')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_receipts')
+    read = models.BooleanField(default=False)
+    dismissed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('notification', 'user')
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.notification_id}"
 
 
 class AdminNotification(models.Model):
@@ -0,0 +1,174 @@
+"""
+Real-time notification delivery and cached unread counters.
+
+Unread counts live in the Django cache under one key per user and are
+adjusted in place on create, read and mark-all-read, so badge lookups do
+not hit the database. Only caches with an atomic ``incr`` (Redis, locmem)
+adjust in place; the file cache's read-modify-write would let concurrent
+changes drift, so there the counter is dropped and recomputed. Broadcasts can't touch every user's key; instead
+they bump a shared version and each user's counter is recomputed lazily
+the next time it is read.
+
+New notifications are pushed over websockets to ``notifications_user_<id>``
+(personal) or ``notifications_<audience>`` (broadcasts) channel groups,
+which NotificationConsumer joins. Pushing is a no-op when Channels is not
+installed or no channel layer is configured.
+"""
+import logging
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+UNREAD_TTL = 300
+BROADCAST_VERSION_KEY = 'notifications:broadcast_version'
+
+
+def user_group(user_id):
+    return f'notifications_user_{user_id}'
+
+
+def audience_group(audience):
+    return f'notifications_{audience}'
+
+
+def _unread_key(user_id, version):
+    return f'notifications:unread:{user_id}:v{version}'
+
+
+def _broadcast_version():
+    return cache.get(BROADCAST_VERSION_KEY, 0)
+
+
+# ---------------------------------------------------------------------------
+# Unread counters
+# ---------------------------------------------------------------------------
+
+def get_unread_count(user):
+    """Cached unread count for ``user``; computed once per invalidation."""
+    from .models import Notification
+
+    key = _unread_key(user.id, _broadcast_version())
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.unread_count_for(user)
+        cache.set(key, count, UNREAD_TTL)
+    return count
+
+
+def adjust_unread_count(user_id, delta):
+    """Apply ``delta`` to a cached counter. Missing counters are left alone."""
+    key = _unread_key(user_id, _broadcast_version())
+    if not isinstance(caches['default'], (RedisCache, LocMemCache)):
+        cache.delete(key)
+        return
+    try:
+        if cache.incr(key, delta) < 0:
+            cache.delete(key)
+    except ValueError:
+        # Not cached; the next read recomputes it
+        pass
+
+
+def set_unread_count(user_id, count):
+    cache.set(_unread_key(user_id, _broadcast_version()), count, UNREAD_TTL)
+
+
+def invalidate_unread_count(*user_ids):
+    version = _broadcast_version()
+    cache.delete_many([_unread_key(uid, version) for uid in user_ids])
+
+
+def invalidate_all_unread_counts():
+    """Called when a broadcast is sent: every counter becomes stale."""
+    from core.cache import bump_versions
+
+    bump_versions(BROADCAST_VERSION_KEY)
+
+
+# ---------------------------------------------------------------------------
+# Notification list validators
+# ---------------------------------------------------------------------------
+
+# core.cache tags behind the conditional GET of notification lists: one for
+# broadcasts (everyone's list) and one per user for personal rows and receipts
+BROADCAST_LIST_TAG = 'notifications:broadcast'
+
+
+def list_tag(user_id):
+    return f'notifications:user:{user_id}'
+
+
+def invalidate_lists(*user_ids, broadcast=False):
+    from core.cache import invalidate_tags
+
+    tags = [list_tag(uid) for uid in user_ids if uid]
+    if broadcast:
+        tags.append(BROADCAST_LIST_TAG)
+    invalidate_tags(*tags)
+
+
+# ---------------------------------------------------------------------------
+# Websocket push
+# ---------------------------------------------------------------------------
+
+def _group_send(group, message):
+    try:
+        from channels.layers import get_channel_layer
+        from asgiref.sync import async_to_sync
+    except ImportError:
+        return
+
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    try:
+        async_to_sync(layer.group_send)(group, message)
+    except Exception as e:
+        logger.warning(f'Notification push to {group} failed: {e}')
+
+
+def push_notification(notification):
+    """Send a newly created notification to its recipient(s)."""
+    from .serializers import NotificationSerializer
+
+    data = NotificationSerializer(notification).data
+    if notification.is_broadcast:
+        _group_send(audience_group(notification.audience), {
+            'type': 'notification.created',
+            'notification': data,
+        })
+    else:
+        _group_send(user_group(notification.user_id), {
+            'type': 'notification.created',
+            'notification': data,
+            'unread_count': get_unread_count(notification.user),
+        })
+
+
+def push_unread_count(user):
+    _group_send(user_group(user.id), {
+        'type': 'notification.unread',
+        'unread_count': get_unread_count(user),
+    })
+
+
+def notify_bulk_created(notifications):
+    """
+    Counterpart of the post_save hook for ``bulk_create``, which skips
+    signals. Counters are invalidated in one call and each recipient gets
+    the notification without a count, like a broadcast, so a large batch
+    doesn't turn into one COUNT query per user.
+    """
+    from .serializers import NotificationSerializer
+
+    notifications = [n for n in notifications if n.user_id]
+    invalidate_unread_count(*{n.user_id for n in notifications})
+    invalidate_lists(*{n.user_id for n in notifications})
+    for notification in notifications:
+        _group_send(user_group(notification.user_id), {
+            'type': 'notification.created',
+            'notification': NotificationSerializer(notification).data,
+        })
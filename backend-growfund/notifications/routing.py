@@ -0,0 +1,10 @@
+"""
+WebSocket URL routing for notifications
+"""
+from django.urls import path
+from core.metrics import track_websockets
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/notifications/', track_websockets(consumers.NotificationConsumer)),
+]
@@ -5,12 +5,18 @@ from .models import Notification
 class NotificationSerializer(serializers.ModelSerializer):
     """Serializer for notifications"""
     
+    # Broadcast rows carry the per-user state in the is_read annotation
+    read = serializers.SerializerMethodField()
+    
     class Meta:
         model = Notification
         fields = [
             'id', 'title', 'message', 'type', 'read', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+    
+    def get_read(self, obj):
+        return getattr(obj, 'is_read', obj.read)
 
 
 class CreateNotificationSerializer(serializers.ModelSerializer):
@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Notification, NotificationReceipt
+from . import realtime
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    """Keep unread counters current and push new notifications."""
+    if not created:
+        return
+    
+    if instance.is_broadcast:
+        realtime.invalidate_all_unread_counts()
+    elif not instance.read:
+        realtime.adjust_unread_count(instance.user_id, 1)
+    
+    transaction.on_commit(lambda: realtime.push_notification(instance))
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if instance.is_broadcast:
+        realtime.invalidate_all_unread_counts()
+    elif not instance.read:
+        realtime.adjust_unread_count(instance.user_id, -1)
+
+
+@receiver([post_save, post_delete], sender=Notification)
+def notification_changed(sender, instance, **kwargs):
+    """Any change shows up in the lists the notification appears in."""
+    if instance.is_broadcast:
+        realtime.invalidate_lists(broadcast=True)
+    else:
+        realtime.invalidate_lists(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=NotificationReceipt)
+def receipt_changed(sender, instance, **kwargs):
+    realtime.invalidate_lists(instance.user_id)
@@ -4,26 +4,40 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.core.paginator import Paginator
 from django.contrib.auth import get_user_model
-from .models import Notification, AdminNotification
+from django.db import transaction
+from django.db.models import Count, Q
+from .models import Notification, NotificationReceipt, AdminNotification
 from .serializers import NotificationSerializer
+from . import realtime
+from core.conditional import conditional
 
 User = get_user_model()
 
 
+def _list_tags(request):
+    return [realtime.BROADCAST_LIST_TAG, realtime.list_tag(request.user.pk)]
+
+
+def _audience_state(request):
+    # Verification adds the 'verified_users' broadcasts to the list
+    return request.user.is_verified
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(tags=_list_tags, extra=_audience_state)
 def notification_list(request):
-    """Get user notifications with pagination"""
-    notifications = Notification.objects.filter(user=request.user)
+    """Get user notifications (personal and broadcast) with pagination"""
+    notifications = Notification.objects.for_user(request.user)
     
     # Filter by read status if specified
     read_status = request.query_params.get('read')
     if read_status is not None:
         read_bool = read_status.lower() == 'true'
-        notifications = notifications.filter(read=read_bool)
+        notifications = notifications.filter(is_read=read_bool)
     
     # Get unread count
-    unread_count = Notification.objects.filter(user=request.user, read=False).count()
+    unread_count = realtime.get_unread_count(request.user)
     
     # Pagination
     page_size = int(request.query_params.get('page_size', 20))
@@ -54,9 +68,9 @@ def notification_list(request):
 def mark_notification_read(request, notification_id):
     """Mark a notification as read"""
     try:
-        notification = Notification.objects.get(id=notification_id, user=request.user)
-        notification.read = True
-        notification.save()
+        notification = Notification.objects.for_user(request.user).get(id=notification_id)
+        notification.mark_read_for(request.user)
+        realtime.push_unread_count(request.user)
         
         return Response({
             'data': {'success': True, 'message': 'Notification marked as read'},
@@ -76,6 +90,27 @@ def mark_all_read(request):
     """Mark all user notifications as read"""
     count = Notification.objects.filter(user=request.user, read=False).update(read=True)
     
+    # Broadcasts: one receipt per unread broadcast, bounded by broadcast volume
+    unread_broadcasts = list(
+        Notification.objects.for_user(request.user)
+        .filter(user__isnull=True, is_read=False)
+        .values_list('id', flat=True)
+    )
+    if unread_broadcasts:
+        NotificationReceipt.objects.filter(
+            user=request.user, notification_id__in=unread_broadcasts
+        ).update(read=True)
+        NotificationReceipt.objects.bulk_create(
+            [NotificationReceipt(notification_id=nid, user=request.user, read=True)
+             for nid in unread_broadcasts],
+            ignore_conflicts=True,
+        )
+        count += len(unread_broadcasts)
+    
+    realtime.set_unread_count(request.user.id, 0)
+    realtime.invalidate_lists(request.user.id)
+    realtime.push_unread_count(request.user)
+    
     return Response({
         'data': {
             'success': True,
@@ -87,10 +122,11 @@ def mark_all_read(request):
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def delete_notification(request, notification_id):
-    """Delete a notification"""
+    """Delete a notification (broadcasts are dismissed for this user only)"""
     try:
-        notification = Notification.objects.get(id=notification_id, user=request.user)
-        notification.delete()
+        notification = Notification.objects.for_user(request.user).get(id=notification_id)
+        notification.dismiss_for(request.user)
+        realtime.push_unread_count(request.user)
         
         return Response({
             'data': {'success': True, 'message': 'Notification deleted'}
@@ -106,14 +142,19 @@ def delete_notification(request, notification_id):
 @permission_classes([IsAuthenticated])
 def notification_stats(request):
     """Get notification statistics"""
-    total = Notification.objects.filter(user=request.user).count()
-    unread = Notification.objects.filter(user=request.user, read=False).count()
+    # Both counts from one query, so they always add up; the cached unread
+    # counter is refreshed with the exact figure while we have it
+    counts = Notification.objects.for_user(request.user).aggregate(
+        total=Count('id'),
+        unread=Count('id', filter=Q(is_read=False)),
+    )
+    realtime.set_unread_count(request.user.id, counts['unread'])
     
     return Response({
         'data': {
-            'total_notifications': total,
-            'unread_notifications': unread,
-            'read_notifications': total - unread
+            'total_notifications': counts['total'],
+            'unread_notifications': counts['unread'],
+            'read_notifications': counts['total'] - counts['unread']
         }
     }, status=status.HTTP_200_OK)
 
@@ -190,14 +231,14 @@ def admin_send_notification(request):
             'error': 'Title and message are required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Determine target users
-    users_to_notify = []
+    if target not in ('all', 'verified_users', 'specific_users'):
+        return Response({
+            'success': False,
+            'error': 'target must be all, verified_users or specific_users'
+        }, status=status.HTTP_400_BAD_REQUEST)
     
-    if target == 'all':
-        users_to_notify = User.objects.filter(is_active=True)
-    elif target == 'verified_users':
-        users_to_notify = User.objects.filter(is_active=True, is_verified=True)
-    elif target == 'specific_users':
+    users_to_notify = None
+    if target == 'specific_users':
         if not target_users:
             return Response({
                 'success': False,
@@ -206,7 +247,9 @@ def admin_send_notification(request):
         
         # Parse comma-separated emails
         emails = [email.strip() for email in target_users.split(',')]
-        users_to_notify = User.objects.filter(email__in=emails, is_active=True)
+        users_to_notify = list(
+            User.objects.filter(email__in=emails, is_active=True).values_list('id', flat=True)
+        )
     
     # Create admin notification record
     admin_notification = AdminNotification.objects.create(
@@ -220,20 +263,29 @@ def admin_send_notification(request):
         status='sent'
     )
     
-    # Send to each user
-    sent_count = 0
-    for user in users_to_notify:
-        Notification.create_notification(
-            user=user,
+    if users_to_notify is None:
+        # Audience broadcast: a single row, merged into user lists on read
+        Notification.create_broadcast(
+            audience=target,
             title=title,
             message=message,
             notification_type=notification_type
         )
-        sent_count += 1
+        audience = User.objects.filter(is_active=True)
+        if target == 'verified_users':
+            audience = audience.filter(is_verified=True)
+        sent_count = audience.count()
+    else:
+        created = Notification.objects.bulk_create([
+            Notification(user_id=uid, title=title, message=message, type=notification_type)
+            for uid in users_to_notify
+        ])
+        transaction.on_commit(lambda: realtime.notify_bulk_created(created))
+        sent_count = len(users_to_notify)
     
     # Update sent count
     admin_notification.sent_count = sent_count
-    admin_notification.save()
+    admin_notification.save(update_fields=['sent_count'])
     
     return Response({
         'data': {
@@ -64,12 +64,9 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 # Optimize static files
 STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 
-# Reduce cache memory usage
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
-    }
-}
+# Reduce cache memory usage: the default (file-based unless REDIS_URL is
+# set) keeps entries on disk rather than in the worker's memory. A dummy
+# cache would turn cached counters into a query on every request.
 
 # Optimize REST framework
 REST_FRAMEWORK.update({
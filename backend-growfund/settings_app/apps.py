@@ -5,3 +5,8 @@ class SettingsAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'settings_app'
     verbose_name = 'Platform Settings'
+
+    def ready(self):
+        from .models import PlatformSettings, platform_settings_cache
+
+        platform_settings_cache.watch(PlatformSettings)
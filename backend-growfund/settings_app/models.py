@@ -2,6 +2,9 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
+from copy import copy
+
+from core.config_cache import VersionedConfig
 
 User = get_user_model()
 
@@ -226,10 +229,24 @@ class PlatformSettings(models.Model):
         super().save(*args, **kwargs)
     
     @classmethod
-    def get_settings(cls):
-        """Get or create singleton settings instance"""
-        settings, created = cls.objects.get_or_create(id=1)
-        return settings
+    def get_settings(cls, cached=True):
+        """
+        Get or create singleton settings instance
+        
+        Served from the process-local config cache; pass ``cached=False`` to
+        read the row itself (e.g. before updating it).
+        """
+        if not cached:
+            settings, created = cls.objects.get_or_create(id=1)
+            return settings
+        return copy(platform_settings_cache.get())
+
+
+def _load_platform_settings():
+    return PlatformSettings.get_settings(cached=False)
+
+
+platform_settings_cache = VersionedConfig('platform-settings', _load_platform_settings)
 
 
 class SettingsHistory(models.Model):
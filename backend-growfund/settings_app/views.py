@@ -4,16 +4,22 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.db import transaction as db_transaction
 
-from .models import PlatformSettings, SettingsHistory
+from core.conditional import conditional
+from .models import PlatformSettings, SettingsHistory, platform_settings_cache
 from .serializers import PlatformSettingsSerializer, SettingsHistorySerializer
 
 
+def _settings_updated_at(request):
+    return PlatformSettings.get_settings().updated_at
+
+
 class PlatformSettingsView(APIView):
     """
     Get and update platform settings (admin only)
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
     
+    @conditional(keys=[platform_settings_cache.version_key], last_modified=_settings_updated_at, per_user=False)
     def get(self, request):
         """Get current platform settings"""
         settings = PlatformSettings.get_settings()
@@ -26,7 +32,7 @@ class PlatformSettingsView(APIView):
     
     def put(self, request):
         """Update platform settings"""
-        settings = PlatformSettings.get_settings()
+        settings = PlatformSettings.get_settings(cached=False)
         
         # Store old values for history
         old_data = PlatformSettingsSerializer(settings).data
@@ -101,6 +107,7 @@ class PublicSettingsView(APIView):
     """
     permission_classes = []
     
+    @conditional(keys=[platform_settings_cache.version_key], last_modified=_settings_updated_at, per_user=False)
     def get(self, request):
         """Get public platform settings"""
         try:
@@ -323,194 +323,151 @@ def admin_reject_withdrawal(request, withdrawal_id):
         }, status=status.HTTP_404_NOT_FOUND)
 
 
+def _investment_row(row):
+    """API representation of an InvestmentLedger row."""
+    import uuid
+    
+    row_id = row['row_id']
+    if row['source'] in ('trade', 'capital_plan'):
+        # UUID columns cast to text come back without dashes on SQLite
+        row_id = str(uuid.UUID(row_id))
+    
+    asset = row['row_asset']
+    symbol = asset
+    if row['source'] == 'capital_plan':
+        asset, symbol = f"{row['row_asset'].title()} Plan", row['row_asset'].upper()
+    elif row['source'] == 'real_estate':
+        symbol = 'RE'
+    
+    data = {
+        'id': row_id,
+        'user': row['user_email'],
+        'user_id': row['row_user_id'],
+        'type': row['row_type'],
+        'asset': asset,
+        'symbol': symbol,
+        'amount': float(row['row_amount']),
+        'quantity': float(row['row_quantity']),
+        'price_at_purchase': float(row['row_price_at_purchase']),
+        'current_price': float(row['row_current_price']),
+        'currentValue': float(row['row_current_value']),
+        'profit_loss': float(row['row_profit_loss']),
+        'profit_loss_percentage': float(row['row_profit_loss_percentage']),
+        'status': row['row_status'],
+        'created_at': row['row_created_at'].isoformat(),
+    }
+    if row['source'] == 'capital_plan':
+        data['plan_details'] = {
+            'plan_type': row['row_asset'],
+            'growth_rate': float(row['row_growth_rate']),
+            'period_months': row['row_period_months'],
+            'months_elapsed': row['row_months_elapsed'],
+        }
+    return data
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_get_investments(request):
-    """Get all investments (admin only) - includes crypto, capital plans, and real estate"""
+    """
+    Get all investments (admin only) - includes crypto, capital plans, and real estate
+    
+    Value and P&L are computed in SQL, so the cost of a page does not grow
+    with the number of investments on the platform.
+    
+    Query params:
+      type       - crypto | capital_plan | real_estate (comma-separated)
+      search     - filter by user email (contains)
+      user_id    - filter by user
+      asset      - filter by asset symbol
+      date_from  - created on/after (YYYY-MM-DD)
+      date_to    - created on/before (YYYY-MM-DD)
+      sort       - created_at | amount | current_value | profit_loss |
+                   profit_loss_percentage, prefix with - for descending
+                   (default: -created_at)
+      page, page_size (default 50, max 500)
+    """
+    import math
+    from investments.valuation_service import InvestmentLedger
+    
     if not (request.user.is_staff or request.user.is_superuser):
         return Response({
             'success': False,
             'error': 'Admin access required'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    data = []
-    
-    # Pre-fetch admin crypto prices to avoid N+1 queries
-    admin_crypto_prices = {}
-    try:
-        from investments.admin_models import AdminCryptoPrice
-        prices = AdminCryptoPrice.objects.filter(is_active=True).values('coin', 'price')
-        admin_crypto_prices = {price['coin']: float(price['price']) for price in prices}
-    except:
-        pass
-    
-    # 1. Get crypto investments from Trade model
-    from investments.models import Trade
-    crypto_trades = Trade.objects.filter(status='open').select_related('user')
+    params = request.query_params
     
-    for trade in crypto_trades:
-        invested_amount = trade.entry_price * trade.quantity
-        current_value = trade.quantity * (trade.current_price if trade.current_price else trade.entry_price)
-        profit_loss = current_value - invested_amount
-        profit_loss_percentage = (profit_loss / invested_amount * 100) if invested_amount > 0 else 0
-        
-        data.append({
-            'id': str(trade.id),
-            'user': trade.user.email,
-            'user_id': trade.user.id,
-            'type': 'crypto',
-            'asset': trade.asset,
-            'symbol': trade.asset,
-            'amount': float(invested_amount),
-            'quantity': float(trade.quantity),
-            'price_at_purchase': float(trade.entry_price),
-            'current_price': float(trade.current_price) if trade.current_price else float(trade.entry_price),
-            'currentValue': float(current_value),
-            'profit_loss': float(profit_loss),
-            'profit_loss_percentage': float(profit_loss_percentage),
-            'status': trade.status,
-            'created_at': trade.created_at.isoformat()
-        })
-    
-    # 2. Get crypto investments from Transaction model (investment type)
-    crypto_investments = Transaction.objects.filter(
-        transaction_type='investment',
-        metadata__investment_type='crypto'
-    ).select_related('user')
-    
-    for inv in crypto_investments:
-        # Get metadata
-        metadata = inv.metadata or {}
-        asset = metadata.get('asset', 'BTC')
-        quantity = float(metadata.get('quantity', 0))
-        price_at_purchase = float(metadata.get('price_at_purchase', 0))
-        
-        # Use pre-fetched admin prices (no more N+1 queries!)
-        current_price = admin_crypto_prices.get(asset, price_at_purchase)
-        
-        current_value = quantity * current_price
-        profit_loss = current_value - float(inv.amount)
-        profit_loss_percentage = (profit_loss / float(inv.amount) * 100) if inv.amount > 0 else 0
-        
-        data.append({
-            'id': str(inv.id),
-            'user': inv.user.email,
-            'user_id': inv.user.id,
-            'type': 'crypto',
-            'asset': asset,
-            'symbol': asset,
-            'amount': float(inv.amount),
-            'quantity': quantity,
-            'price_at_purchase': price_at_purchase,
-            'current_price': current_price,
-            'currentValue': current_value,
-            'profit_loss': profit_loss,
-            'profit_loss_percentage': profit_loss_percentage,
-            'status': 'active',
-            'created_at': inv.created_at.isoformat()
-        })
-    
-    # 3. Get capital investment plans with optimized calculation
-    from investments.models import CapitalInvestmentPlan
-    from django.db.models import F, Case, When, Value, DecimalField
-    from decimal import Decimal
-    import math
-    
-    capital_plans = CapitalInvestmentPlan.objects.filter(status='active').select_related('user')
-    
-    for plan in capital_plans:
-        # Calculate months elapsed more efficiently
-        months_elapsed = 0
-        if plan.start_date:
-            from datetime import datetime
-            current_date = timezone.now()
-            months_elapsed = (current_date.year - plan.start_date.year) * 12 + (current_date.month - plan.start_date.month)
-            months_elapsed = min(months_elapsed, plan.period_months)  # Cap at plan duration
-        
-        # Use compound interest formula instead of loop: A = P(1 + r)^t
-        growth_rate = float(plan.growth_rate) / 100
-        current_value = float(plan.initial_amount) * ((1 + growth_rate) ** months_elapsed)
-        
-        profit_loss = current_value - float(plan.initial_amount)
-        profit_loss_percentage = (profit_loss / float(plan.initial_amount) * 100) if plan.initial_amount > 0 else 0
-        
-        data.append({
-            'id': str(plan.id),
-            'user': plan.user.email,
-            'user_id': plan.user.id,
-            'type': 'capital_plan',
-            'asset': f"{plan.plan_type.title()} Plan",
-            'symbol': plan.plan_type.upper(),
-            'amount': float(plan.initial_amount),
-            'quantity': 1,
-            'price_at_purchase': float(plan.initial_amount),
-            'current_price': current_value,
-            'currentValue': current_value,
-            'profit_loss': profit_loss,
-            'profit_loss_percentage': profit_loss_percentage,
-            'status': plan.status,
-            'created_at': plan.created_at.isoformat(),
-            'plan_details': {
-                'plan_type': plan.plan_type,
-                'growth_rate': float(plan.growth_rate),
-                'period_months': plan.period_months,
-                'months_elapsed': months_elapsed
-            }
-        })
+    types = [t for t in params.get('type', '').split(',') if t]
+    if any(t not in InvestmentLedger.TYPES for t in types):
+        return Response({
+            'success': False,
+            'error': f'type must be one of: {", ".join(InvestmentLedger.TYPES)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
     
-    # 4. Get real estate investments from transactions with optimized calculation
-    real_estate_investments = Transaction.objects.filter(
-        transaction_type='investment',
-        metadata__investment_type='real_estate'
-    ).select_related('user')
+    sort = params.get('sort', '-created_at')
+    if sort.lstrip('-') not in InvestmentLedger.SORT_FIELDS:
+        return Response({
+            'success': False,
+            'error': f'sort must be one of: {", ".join(InvestmentLedger.SORT_FIELDS)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
     
-    for inv in real_estate_investments:
-        metadata = inv.metadata or {}
-        property_name = metadata.get('asset', 'Real Estate')
-        
-        # Calculate months elapsed
-        months_elapsed = 0
-        if inv.created_at:
-            current_date = timezone.now()
-            months_elapsed = (current_date.year - inv.created_at.year) * 12 + (current_date.month - inv.created_at.month)
-        
-        # Use compound interest formula: A = P(1 + r)^t
-        growth_rate = 0.20  # 20% monthly for real estate
-        current_value = float(inv.amount) * ((1 + growth_rate) ** months_elapsed)
-        
-        profit_loss = current_value - float(inv.amount)
-        profit_loss_percentage = (profit_loss / float(inv.amount) * 100) if inv.amount > 0 else 0
-        
-        data.append({
-            'id': str(inv.id),
-            'user': inv.user.email,
-            'user_id': inv.user.id,
-            'type': 'real_estate',
-            'asset': property_name,
-            'symbol': 'RE',
-            'amount': float(inv.amount),
-            'quantity': 1,
-            'price_at_purchase': float(inv.amount),
-            'current_price': current_value,
-            'currentValue': current_value,
-            'profit_loss': profit_loss,
-            'profit_loss_percentage': profit_loss_percentage,
-            'status': 'active',
-            'created_at': inv.created_at.isoformat()
-        })
+    try:
+        created_from = datetime.strptime(params['date_from'], '%Y-%m-%d') if params.get('date_from') else None
+        created_to = datetime.strptime(params['date_to'], '%Y-%m-%d') if params.get('date_to') else None
+        user_id = int(params['user_id']) if params.get('user_id') else None
+        page = max(int(params.get('page', 1)), 1)
+        page_size = min(max(int(params.get('page_size', 50)), 1), 500)
+    except ValueError:
+        return Response({
+            'success': False,
+            'error': 'Invalid date, user_id or paging parameter'
+        }, status=status.HTTP_400_BAD_REQUEST)
     
+    if created_from:
+        created_from = timezone.make_aware(created_from)
+    if created_to:
+        created_to = timezone.make_aware(created_to.replace(hour=23, minute=59, second=59))
+    
+    ledger = InvestmentLedger()
+    branches = ledger.branches(
+        types=types,
+        search=params.get('search', '').strip(),
+        user_id=user_id,
+        asset=params.get('asset', '').strip(),
+        created_from=created_from,
+        created_to=created_to,
+    )
+    summary = ledger.summarize(branches)
+    total = summary['crypto_count'] + summary['capital_plans_count'] + summary['real_estate_count']
+    
+    descending = sort.startswith('-')
+    sort_column = f"{'-' if descending else ''}row_{sort.lstrip('-')}"
+    order = [sort_column, '-row_id' if descending else 'row_id']
+    offset = (page - 1) * page_size
+    rows = ledger.union(branches).order_by(*order)[offset:offset + page_size] if total else []
+    
+    total_pages = math.ceil(total / page_size) if total else 0
     return Response({
-        'data': data,
         'success': True,
-        'total_investments': len(data),
+        'total_investments': total,
         'summary': {
-            'crypto_count': len([d for d in data if d['type'] == 'crypto']),
-            'capital_plans_count': len([d for d in data if d['type'] == 'capital_plan']),
-            'real_estate_count': len([d for d in data if d['type'] == 'real_estate']),
-            'total_invested': sum(d['amount'] for d in data),
-            'total_current_value': sum(d['currentValue'] for d in data),
-            'total_profit_loss': sum(d['profit_loss'] for d in data)
-        }
+            'crypto_count': summary['crypto_count'],
+            'capital_plans_count': summary['capital_plans_count'],
+            'real_estate_count': summary['real_estate_count'],
+            'total_invested': float(summary['total_invested']),
+            'total_current_value': float(summary['total_current_value']),
+            'total_profit_loss': float(summary['total_profit_loss']),
+        },
+        'pagination': {
+            'current_page': page,
+            'page_size': page_size,
+            'total_pages': total_pages,
+            'total_count': total,
+            'has_next': page < total_pages,
+            'has_previous': page > 1,
+        },
+        'data': [_investment_row(row) for row in rows],
     }, status=status.HTTP_200_OK)
 
 
@@ -558,6 +515,146 @@ def admin_get_transactions(request):
     }, status=status.HTTP_200_OK)
 
 
+TRANSACTION_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('user_id', 'user_id'),
+    ('user__email', 'user'),
+    ('transaction_type', 'type'),
+    ('status', 'status'),
+    ('amount', 'amount'),
+    ('fee', 'fee'),
+    ('net_amount', 'net_amount'),
+    ('payment_method', 'method'),
+    ('reference', 'reference'),
+    ('description', 'description'),
+    ('created_at', 'created_at'),
+    ('completed_at', 'completed_at'),
+]
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_export_transactions(request):
+    """
+    Export transactions as CSV or NDJSON (admin only)
+    
+    Rows are streamed straight from the database cursor, so exports of any
+    size run in constant memory.
+    
+    Query params:
+      fmt        - csv | ndjson (default csv)
+      type       - transaction types (comma-separated)
+      status     - statuses (comma-separated)
+      user_id    - filter by user
+      date_from  - created on/after (YYYY-MM-DD)
+      date_to    - created on/before (YYYY-MM-DD)
+    """
+    from core.exports import export_response, parse_export_params
+    
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({
+            'success': False,
+            'error': 'Admin access required'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        params = parse_export_params(
+            request.query_params,
+            types=[t for t, _ in Transaction.TRANSACTION_TYPES],
+            statuses=[s for s, _ in Transaction.STATUS_CHOICES],
+        )
+        user_id = int(request.query_params['user_id']) if request.query_params.get('user_id') else None
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    transactions = params.filter_dates(Transaction.objects.all())
+    if params.types:
+        transactions = transactions.filter(transaction_type__in=params.types)
+    if params.statuses:
+        transactions = transactions.filter(status__in=params.statuses)
+    if user_id:
+        transactions = transactions.filter(user_id=user_id)
+    
+    rows = transactions.order_by('-created_at', '-id').values(*[key for key, _ in TRANSACTION_EXPORT_COLUMNS])
+    return export_response(rows, TRANSACTION_EXPORT_COLUMNS, fmt=params.fmt, filename='transactions')
+
+
+TRADE_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('user_id', 'user_id'),
+    ('user__email', 'user'),
+    ('asset', 'asset'),
+    ('trade_type', 'type'),
+    ('status', 'status'),
+    ('entry_price', 'entry_price'),
+    ('current_price', 'current_price'),
+    ('exit_price', 'exit_price'),
+    ('quantity', 'quantity'),
+    ('invested', 'invested'),
+    ('profit_loss', 'profit_loss'),
+    ('profit_loss_percentage', 'profit_loss_percentage'),
+    ('created_at', 'created_at'),
+    ('closed_at', 'closed_at'),
+]
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_export_trades(request):
+    """
+    Export trades as CSV or NDJSON (admin only)
+    
+    Query params:
+      fmt        - csv | ndjson (default csv)
+      type       - buy | sell (comma-separated)
+      status     - trade statuses (comma-separated)
+      asset      - filter by asset symbol
+      user_id    - filter by user
+      date_from  - created on/after (YYYY-MM-DD)
+      date_to    - created on/before (YYYY-MM-DD)
+    """
+    from django.db.models import F
+    from core.exports import export_response, parse_export_params
+    from investments.models import Trade
+    
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({
+            'success': False,
+            'error': 'Admin access required'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        params = parse_export_params(
+            request.query_params,
+            types=[t for t, _ in Trade.TRADE_TYPE_CHOICES],
+            statuses=[s for s, _ in Trade.STATUS_CHOICES],
+        )
+        user_id = int(request.query_params['user_id']) if request.query_params.get('user_id') else None
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    trades = params.filter_dates(Trade.objects.all())
+    if params.types:
+        trades = trades.filter(trade_type__in=params.types)
+    if params.statuses:
+        trades = trades.filter(status__in=params.statuses)
+    if request.query_params.get('asset'):
+        trades = trades.filter(asset__iexact=request.query_params['asset'].strip())
+    if user_id:
+        trades = trades.filter(user_id=user_id)
+    
+    rows = trades.annotate(
+        invested=F('entry_price') * F('quantity')
+    ).order_by('-created_at', '-id').values(*[key for key, _ in TRADE_EXPORT_COLUMNS])
+    return export_response(rows, TRADE_EXPORT_COLUMNS, fmt=params.fmt, filename='trades')
+
+
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def admin_edit_transaction(request, transaction_id):
@@ -6,23 +6,18 @@ class TransactionsConfig(AppConfig):
     name = 'transactions'
 
     def ready(self):
-        # Start USDT deposit checker in background thread
-        import os
-        import sys
-        
-        # Don't start during migrations, management commands, or collectstatic
-        if any(cmd in sys.argv for cmd in ['migrate', 'makemigrations', 'collectstatic', 'createsuperuser']):
-            return
-        
-        # Only start in the main process (not during development reloads)
-        if os.environ.get('RUN_MAIN') == 'true':
-            return
-            
-        try:
-            from .usdt_scheduler import start
-            start()
-        except Exception as e:
-            # Silently fail if database isn't ready yet
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.debug(f'USDT scheduler not started: {e}')
+        # USDT deposit polling runs on the scheduler leader only, so the
+        # number of TronGrid calls doesn't grow with the number of workers.
+        from django.conf import settings
+        from core.cache import invalidate_on_change
+        from core.scheduler import scheduler
+        from .models import Transaction, history_tag
+        from .tron_monitor import process_usdt_deposits
+
+        invalidate_on_change(Transaction, lambda t: [history_tag(t.user_id)])
+
+        scheduler.register(
+            'usdt-deposits',
+            process_usdt_deposits,
+            interval=getattr(settings, 'USDT_POLL_INTERVAL', 60),
+        )
@@ -9,14 +9,17 @@ Flow:
   STEP 4a — POST to query.php  → check final status
   STEP 4b — expressPay POSTs to post-url when async payment completes
 """
-import requests
 import uuid
 from decouple import config
 
+from core.metrics import ProviderSession
+
 
 SANDBOX_BASE = 'https://sandbox.expresspaygh.com/api'
 LIVE_BASE    = 'https://expresspaygh.com/api'
 
+http = ProviderSession('expresspay')
+
 
 class ExpressPayService:
 
@@ -61,7 +64,7 @@ class ExpressPayService:
             payload['post-url'] = post_url
 
         try:
-            resp = requests.post(
+            resp = http.post(
                 url,
                 data=payload,
                 headers={'Content-Type': 'application/x-www-form-urlencoded'},
@@ -119,7 +122,7 @@ class ExpressPayService:
         }
 
         try:
-            resp = requests.post(
+            resp = http.post(
                 url,
                 data=payload,
                 headers={'Content-Type': 'application/x-www-form-urlencoded'},
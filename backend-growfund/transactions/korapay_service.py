@@ -5,6 +5,11 @@ from django.conf import settings
 from decouple import config
 import json
 
+from core.metrics import ProviderSession
+
+http = ProviderSession('korapay')
+
+
 class KorapayService:
     """
     Korapay Payment Integration Service
@@ -56,7 +61,7 @@ class KorapayService:
             }
         
         try:
-            response = requests.post(url, json=payload, headers=self._get_headers())
+            response = http.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
             data = response.json()
             
@@ -86,7 +91,7 @@ class KorapayService:
         url = f"{self.base_url}/charges/{reference}"
         
         try:
-            response = requests.get(url, headers=self._get_headers())
+            response = http.get(url, headers=self._get_headers())
             response.raise_for_status()
             data = response.json()
             
@@ -137,7 +142,7 @@ class KorapayService:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=self._get_headers())
+            response = http.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
             data = response.json()
             
@@ -186,7 +191,7 @@ class KorapayService:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=self._get_headers())
+            response = http.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
             data = response.json()
             
@@ -217,7 +222,7 @@ class KorapayService:
         params = {'countryCode': country}
         
         try:
-            response = requests.get(url, params=params, headers=self._get_headers())
+            response = http.get(url, params=params, headers=self._get_headers())
             response.raise_for_status()
             data = response.json()
             
@@ -249,7 +254,7 @@ class KorapayService:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=self._get_headers())
+            response = http.post(url, json=payload, headers=self._get_headers())
             response.raise_for_status()
             data = response.json()
             
@@ -290,7 +295,7 @@ class KorapayService:
         url = f"{self.base_url}/balances"
         
         try:
-            response = requests.get(url, headers=self._get_headers())
+            response = http.get(url, headers=self._get_headers())
             response.raise_for_status()
             data = response.json()
             
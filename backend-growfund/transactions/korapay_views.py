@@ -328,38 +328,17 @@ def korapay_webhook(request):
         return Response({'success': False}, status=status.HTTP_401_UNAUTHORIZED)
     
     data = json.loads(payload)
-    event_type = data.get('event')
-    event_data = data.get('data', {})
+    reference = data.get('data', {}).get('reference')
     
-    reference = event_data.get('reference')
+    # Only acknowledge events for known transactions, so Korapay retries the rest
+    if not reference or not Transaction.objects.filter(reference=reference).exists():
+        return Response({'success': False}, status=status.HTTP_404_NOT_FOUND)
     
-    try:
-        transaction = Transaction.objects.get(reference=reference)
-        
-        if event_type == 'charge.success':
-            if transaction.status != 'completed':
-                transaction.status = 'completed'
-                transaction.completed_at = timezone.now()
-                transaction.save()
-                
-                # Credit user balance for deposits
-                if transaction.transaction_type == 'deposit':
-                    transaction.user.balance += transaction.amount
-                    transaction.user.save()
-        
-        elif event_type in ['charge.failed', 'transfer.failed']:
-            transaction.status = 'failed'
-            transaction.save()
-            
-            # Refund for failed withdrawals
-            if transaction.transaction_type == 'withdrawal':
-                transaction.user.balance += transaction.amount
-                transaction.user.save()
-        
-        return Response({'success': True}, status=status.HTTP_200_OK)
+    # Settle asynchronously so Korapay gets an immediate acknowledgement
+    from .tasks import process_korapay_webhook
+    process_korapay_webhook.enqueue(data)
     
-    except Transaction.DoesNotExist:
-        return Response({'success': False}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'success': True}, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
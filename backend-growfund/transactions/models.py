@@ -2,6 +2,12 @@ from django.db import models
 from django.conf import settings
 from decimal import Decimal
 
+
+def history_tag(user_id):
+    """core.cache tag bumped whenever ``user_id``'s transactions change (conditional GET of the list)"""
+    return f'transactions:user:{user_id}'
+
+
 class Transaction(models.Model):
     TRANSACTION_TYPES = (
         ('deposit', 'Deposit'),
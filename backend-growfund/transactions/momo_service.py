@@ -5,6 +5,11 @@ from decouple import config
 import base64
 import json
 
+from core.metrics import ProviderSession
+
+http = ProviderSession('momo')
+
+
 class MoMoAPIService:
     """
     MTN Mobile Money API Integration Service
@@ -34,7 +39,7 @@ class MoMoAPIService:
         }
         
         try:
-            response = requests.post(url, headers=headers)
+            response = http.post(url, headers=headers)
             response.raise_for_status()
             return response.json().get('access_token')
         except requests.exceptions.RequestException as e:
@@ -78,7 +83,7 @@ class MoMoAPIService:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = http.post(url, json=payload, headers=headers)
             
             if response.status_code == 202:
                 return {
@@ -111,7 +116,7 @@ class MoMoAPIService:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = http.get(url, headers=headers)
             response.raise_for_status()
             data = response.json()
             
@@ -164,7 +169,7 @@ class MoMoAPIService:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = http.post(url, json=payload, headers=headers)
             
             if response.status_code == 202:
                 return {
@@ -197,7 +202,7 @@ class MoMoAPIService:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = http.get(url, headers=headers)
             response.raise_for_status()
             data = response.json()
             
@@ -230,7 +235,7 @@ class MoMoAPIService:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = http.get(url, headers=headers)
             response.raise_for_status()
             data = response.json()
             
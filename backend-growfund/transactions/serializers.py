@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from core.money import MoneyField
 from .models import Transaction, MoMoPayment
 
 class TransactionSerializer(serializers.ModelSerializer):
-    amount = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
-    fee = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
-    net_amount = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    amount = MoneyField()
+    fee = MoneyField()
+    net_amount = MoneyField()
     
     class Meta:
         model = Transaction
@@ -0,0 +1,49 @@
+"""
+Background jobs for the transactions app (see core/jobs.py).
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from core.jobs import job
+from .models import Transaction
+
+User = get_user_model()
+
+
+@job(queue='webhooks', priority=10, max_attempts=5)
+def process_korapay_webhook(data):
+    """Apply a verified Korapay webhook event to its transaction."""
+    event_type = data.get('event')
+    event_data = data.get('data', {})
+    reference = event_data.get('reference')
+
+    with db_transaction.atomic():
+        # Raises DoesNotExist for an unknown reference, so the job fails
+        # visibly instead of being marked done
+        transaction = Transaction.objects.select_for_update().get(reference=reference)
+
+        if event_type == 'charge.success':
+            if transaction.status != 'completed':
+                transaction.status = 'completed'
+                transaction.completed_at = timezone.now()
+                transaction.save()
+
+                # Credit user balance for deposits
+                if transaction.transaction_type == 'deposit':
+                    user = User.objects.select_for_update().get(pk=transaction.user_id)
+                    user.balance += transaction.amount
+                    user.save(update_fields=['balance'])
+
+        elif event_type in ['charge.failed', 'transfer.failed']:
+            if transaction.status != 'failed':
+                transaction.status = 'failed'
+                transaction.save()
+
+                # Refund for failed withdrawals
+                if transaction.transaction_type == 'withdrawal':
+                    user = User.objects.select_for_update().get(pk=transaction.user_id)
+                    user.balance += transaction.amount
+                    user.save(update_fields=['balance'])
+
+    return f"{event_type} applied to {reference}"
@@ -0,0 +1,63 @@
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.jobs import JobWorker
+from core.models import Job
+
+from .models import Transaction
+from .tasks import process_korapay_webhook
+
+User = get_user_model()
+
+
+@mock.patch('transactions.korapay_views.korapay.verify_webhook_signature', return_value=True)
+class KorapayWebhookTests(TestCase):
+    """The webhook only acknowledges events it can settle."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(email='webhook@example.com', password='pw-12345')
+
+    def post(self, reference, event='charge.success'):
+        payload = json.dumps({'event': event, 'data': {'reference': reference}})
+        return self.client.post(
+            '/api/transactions/korapay/webhook/', payload,
+            content_type='application/json', HTTP_X_KORAPAY_SIGNATURE='sig',
+        )
+
+    def test_unknown_reference_is_not_acknowledged(self, verify):
+        response = self.post('NO-SUCH-REF')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Job.objects.filter(task=process_korapay_webhook.name).exists())
+
+    def test_known_reference_is_queued_and_settled(self, verify):
+        deposit = Transaction.objects.create(
+            user=self.user, transaction_type='deposit', amount=Decimal('50.00'),
+            net_amount=Decimal('50.00'), status='pending', reference='KP-1',
+        )
+
+        response = self.post('KP-1')
+        self.assertEqual(response.status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobWorker(queues=['webhooks']).run_once()
+
+        deposit.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(deposit.status, 'completed')
+        self.assertEqual(self.user.balance, Decimal('50.00'))
+
+    def test_job_for_missing_transaction_fails_instead_of_finishing(self, verify):
+        row = process_korapay_webhook.enqueue({'event': 'charge.success', 'data': {'reference': 'GONE'}})
+
+        JobWorker(queues=['webhooks']).run_once()
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'queued')
+        self.assertEqual(row.attempts, 1)
+        self.assertIn('does not exist', row.last_error)
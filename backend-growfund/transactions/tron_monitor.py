@@ -1,11 +1,12 @@
 import logging
 import uuid as _uuid
 from decimal import Decimal
-import requests
 from django.utils import timezone
 from django.db import transaction as db_transaction
 from django.conf import settings
 
+from core.metrics import ProviderSession, USDT_POLL_DURATION
+
 logger = logging.getLogger(__name__)
 
 TRONGRID_URL = 'https://api.trongrid.io/v1/accounts/{address}/transactions/trc20'
@@ -14,6 +15,8 @@ PLATFORM_WALLET = getattr(settings, 'USDT_WALLET_ADDRESS', 'TNGbuN1FPWJDsxd9wtoy
 TRONGRID_API_KEY = getattr(settings, 'TRONGRID_API_KEY', '')
 AMOUNT_TOLERANCE = Decimal('5.00')  # ±$5 tolerance
 
+http = ProviderSession('trongrid')
+
 
 def fetch_recent_trc20_transactions(limit=100):
     url = TRONGRID_URL.format(address=PLATFORM_WALLET)
@@ -21,7 +24,7 @@ def fetch_recent_trc20_transactions(limit=100):
     if TRONGRID_API_KEY:
         headers['TRON-PRO-API-KEY'] = TRONGRID_API_KEY
     try:
-        resp = requests.get(url, params={
+        resp = http.get(url, params={
             'limit': limit,
             'contract_address': USDT_CONTRACT,
             'only_to': 'true',
@@ -34,6 +37,11 @@ def fetch_recent_trc20_transactions(limit=100):
 
 
 def process_usdt_deposits():
+    with USDT_POLL_DURATION.time():
+        _process_usdt_deposits()
+
+
+def _process_usdt_deposits():
     from django.db import connection
     from .usdt_models import USDTDepositRequest
     from .models import Transaction
@@ -59,8 +59,12 @@ admin_urlpatterns = [
     
     # Transactions - support both int and UUID IDs
     path('transactions/', admin_views.admin_get_transactions, name='admin-transactions'),
+    path('transactions/export/', admin_views.admin_export_transactions, name='admin-export-transactions'),
     path('transactions/<str:transaction_id>/edit/', admin_views.admin_edit_transaction, name='admin-edit-transaction'),
     path('transactions/<str:transaction_id>/delete/', admin_views.admin_delete_transaction, name='admin-delete-transaction'),
+    
+    # Trades
+    path('trades/export/', admin_views.admin_export_trades, name='admin-export-trades'),
 ]
 
 urlpatterns += admin_urlpatterns
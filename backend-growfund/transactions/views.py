@@ -7,7 +7,8 @@ from django.db import models, transaction as db_transaction
 from decimal import Decimal
 import uuid
 
-from .models import Transaction, MoMoPayment
+from core.conditional import conditional
+from .models import Transaction, MoMoPayment, history_tag
 from .serializers import (
     TransactionSerializer, MoMoDepositSerializer,
     MoMoWithdrawalSerializer, CheckPaymentStatusSerializer
@@ -24,6 +25,10 @@ class TransactionListView(generics.ListAPIView):
     
     def get_queryset(self):
         return Transaction.objects.filter(user=self.request.user)
+    
+    @conditional(tags=lambda request: [history_tag(request.user.pk)])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
 
 @api_view(['POST'])
@@ -656,29 +661,29 @@ def admin_transaction_stats(request):
             'error': 'Admin access required'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    from django.db.models import Sum, Count
+    from core.rollups import rollups, bucket_sum
+    
+    txns = rollups.totals(['transactions'])['transactions']
     
     # Deposit stats
-    deposits = Transaction.objects.filter(transaction_type='deposit')
     deposit_stats = {
-        'total_count': deposits.count(),
-        'pending_count': deposits.filter(status='pending').count(),
-        'completed_count': deposits.filter(status='completed').count(),
-        'total_amount': float(deposits.aggregate(Sum('amount'))['amount__sum'] or 0),
-        'pending_amount': float(deposits.filter(status='pending').aggregate(Sum('amount'))['amount__sum'] or 0),
-        'completed_amount': float(deposits.filter(status='completed').aggregate(Sum('amount'))['amount__sum'] or 0),
+        'total_count': bucket_sum(txns, 'deposit:*'),
+        'pending_count': bucket_sum(txns, 'deposit:pending'),
+        'completed_count': bucket_sum(txns, 'deposit:completed'),
+        'total_amount': float(bucket_sum(txns, 'deposit:*', field='amount')),
+        'pending_amount': float(bucket_sum(txns, 'deposit:pending', field='amount')),
+        'completed_amount': float(bucket_sum(txns, 'deposit:completed', field='amount')),
     }
     
     # Withdrawal stats
-    withdrawals = Transaction.objects.filter(transaction_type='withdrawal')
     withdrawal_stats = {
-        'total_count': withdrawals.count(),
-        'pending_count': withdrawals.filter(status='pending').count(),
-        'processing_count': withdrawals.filter(status='processing').count(),
-        'completed_count': withdrawals.filter(status='completed').count(),
-        'total_amount': float(withdrawals.aggregate(Sum('amount'))['amount__sum'] or 0),
-        'pending_amount': float(withdrawals.filter(status='pending').aggregate(Sum('amount'))['amount__sum'] or 0),
-        'completed_amount': float(withdrawals.filter(status='completed').aggregate(Sum('amount'))['amount__sum'] or 0),
+        'total_count': bucket_sum(txns, 'withdrawal:*'),
+        'pending_count': bucket_sum(txns, 'withdrawal:pending'),
+        'processing_count': bucket_sum(txns, 'withdrawal:processing'),
+        'completed_count': bucket_sum(txns, 'withdrawal:completed'),
+        'total_amount': float(bucket_sum(txns, 'withdrawal:*', field='amount')),
+        'pending_amount': float(bucket_sum(txns, 'withdrawal:pending', field='amount')),
+        'completed_amount': float(bucket_sum(txns, 'withdrawal:completed', field='amount')),
     }
     
     # Recent transactions
@@ -743,40 +748,19 @@ def transaction_summary(request):
     """
     Get transaction summary for user dashboard
     """
-    user_transactions = Transaction.objects.filter(user=request.user)
-    
-    # Calculate totals - include admin credits as deposits
-    total_deposits = user_transactions.filter(
-        transaction_type__in=['deposit', 'admin_credit'], 
-        status='completed'
-    ).aggregate(total=models.Sum('amount'))['total'] or Decimal('0')
-    
-    total_withdrawals = user_transactions.filter(
-        transaction_type__in=['withdrawal', 'admin_debit'], 
-        status='completed'
-    ).aggregate(total=models.Sum('amount'))['total'] or Decimal('0')
-    
-    pending_deposits = user_transactions.filter(
-        transaction_type__in=['deposit', 'admin_credit'],
-        status__in=['pending', 'processing']
-    ).count()
-    
-    pending_withdrawals = user_transactions.filter(
-        transaction_type__in=['withdrawal', 'admin_debit'],
-        status__in=['pending', 'processing']
-    ).count()
-    
-    # Recent transactions (last 5)
-    recent_transactions = user_transactions.order_by('-created_at')[:5]
-    recent_serializer = TransactionSerializer(recent_transactions, many=True)
+    from accounts.dashboard_service import get_dashboard_snapshot
+    
+    snapshot = get_dashboard_snapshot(request.user)
+    totals = snapshot['transactions']
     
+    # Totals include admin credits/debits as deposits/withdrawals
     return Response({
         'data': {
-            'total_deposits': str(total_deposits),
-            'total_withdrawals': str(total_withdrawals),
-            'pending_deposits': pending_deposits,
-            'pending_withdrawals': pending_withdrawals,
+            'total_deposits': totals['all_deposits'],
+            'total_withdrawals': totals['all_withdrawals'],
+            'pending_deposits': totals['pending_deposits'],
+            'pending_withdrawals': totals['pending_withdrawals'],
             'current_balance': str(request.user.balance),
-            'recent_transactions': recent_serializer.data
+            'recent_transactions': snapshot['recent_transactions']
         }
     }, status=status.HTTP_200_OK)
\ No newline at end of file